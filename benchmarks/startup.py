@@ -0,0 +1,103 @@
+"""
+Startup-time benchmark for the CLI.
+
+Runs each command in a fresh interpreter several times and reports the median
+wall time, plus the modules that dominate its import time.
+
+Usage:
+    python benchmarks/startup.py [--runs N] [--top N] [--json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+# Commands that run offline; "expirations" is measured up to its network call
+COMMANDS: Dict[str, List[str]] = {
+    "--help": ["-m", "options_flow_analyzer", "--help"],
+    "config": ["-m", "options_flow_analyzer", "config"],
+    "expirations": [
+        "-c",
+        "import options_flow_analyzer.cli; import options_flow_analyzer.data_fetcher",
+    ],
+    "demo --format json": [
+        "-m",
+        "options_flow_analyzer",
+        "demo",
+        "--format",
+        "json",
+    ],
+    "demo": ["-m", "options_flow_analyzer", "demo"],
+}
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def time_command(args: List[str], runs: int) -> float:
+    """Median wall time of a command in milliseconds."""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable] + args,
+            cwd=ROOT,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=False,
+        )
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def top_imports(args: List[str], top: int) -> List[Dict[str, float]]:
+    """Packages ranked by their own import time (-X importtime self column)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime"] + args,
+        cwd=ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        check=False,
+    )
+    packages: Dict[str, float] = {}
+    for line in result.stderr.splitlines():
+        fields = line[len("import time:") :].split("|")
+        if not line.startswith("import time:") or not fields[0].strip().isdigit():
+            continue
+        # Self times do not overlap, so summing them per package is exact
+        package = fields[2].strip().split(".")[0]
+        packages[package] = packages.get(package, 0) + int(fields[0]) / 1000
+    ranked = sorted(packages.items(), key=lambda item: item[1], reverse=True)
+    return [{"module": name, "ms": round(ms, 1)} for name, ms in ranked[:top]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Runs per command")
+    parser.add_argument("--top", type=int, default=5, help="Imports to list")
+    parser.add_argument("--json", action="store_true", help="Print JSON results")
+    options = parser.parse_args()
+
+    results = {}
+    for name, args in COMMANDS.items():
+        results[name] = {
+            "median_ms": round(time_command(args, options.runs), 1),
+            "imports": top_imports(args, options.top),
+        }
+
+    if options.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    for name, result in results.items():
+        imports = ", ".join(f"{i['module']} {i['ms']:.0f}ms" for i in result["imports"])
+        print(f"{name:<22} {result['median_ms']:>8.1f} ms   {imports}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+"""
+Benchmark suite for the analyzer, chain filtering and table rendering.
+
+Runs every case on synthetic chains of each size and records the median
+wall time and the peak traced memory. Results can be saved as a baseline and
+later runs compared against it; the run fails when a case is slower (or uses
+more memory) than the baseline by more than the threshold.
+
+Usage:
+    python benchmarks/suite.py [--sizes 1000,10000,100000,1000000]
+        [--repeat 3] [--only PATTERN] [--save FILE] [--compare FILE]
+        [--threshold 0.25] [--json]
+"""
+
+import argparse
+import fnmatch
+import io
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+from rich.console import Console
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from options_flow_analyzer.analyzer import OptionsAnalyzer  # noqa: E402
+from options_flow_analyzer.data_fetcher import OptionsDataFetcher  # noqa: E402
+from options_flow_analyzer.display import OptionsDisplay  # noqa: E402
+from options_flow_analyzer.memo import ResultCache  # noqa: E402
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+SPOT = 100.0
+
+
+def synthetic_chain(rows: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Generate a chain shaped like the fetcher's output.
+
+    Strikes, expirations and option types repeat like a real multi-expiry
+    chain; volumes, open interest and prices are random.
+    """
+    rng = np.random.default_rng(seed)
+    expirations = pd.date_range("2024-01-19", periods=52, freq="W-FRI").strftime(
+        "%Y-%m-%d"
+    )
+    strikes = np.round(rng.uniform(0.5, 1.5, rows) * SPOT * 2) / 2
+    option_type = np.where(rng.random(rows) < 0.5, "call", "put")
+    volume = rng.integers(0, 2_000, rows)
+    intrinsic = np.where(option_type == "call", SPOT - strikes, strikes - SPOT).clip(
+        min=0
+    )
+    last_price = np.round(intrinsic + rng.uniform(0.05, 5.0, rows), 2)
+
+    return pd.DataFrame(
+        {
+            "strike": strikes,
+            "expiration": np.asarray(expirations)[rng.integers(0, 52, rows)],
+            "option_type": option_type,
+            "volume": volume,
+            "openInterest": rng.integers(0, 10_000, rows),
+            "lastPrice": last_price,
+            "dollar_flow": volume * last_price * 100,
+            "moneyness": strikes / SPOT,
+        }
+    )
+
+
+def build_cases(
+    chain: pd.DataFrame,
+) -> List[Tuple[str, Callable[[], Any]]]:
+    """Benchmark cases for one chain, as (name, callable) pairs."""
+    # Memoization would turn every repeat after the first into a cache hit
+    analyzer = OptionsAnalyzer(memo=ResultCache(max_entries=0))
+    fetcher = OptionsDataFetcher()
+    display = OptionsDisplay()
+    display.console = Console(file=io.StringIO(), width=140)
+
+    # Inputs for the renderers and the post-classification analyses
+    classified = analyzer.detect_sweeps(chain)
+    flow_summary = analyzer.calculate_flow_summary(chain)
+    strikes = analyzer.analyze_strike_distribution(chain, SPOT)
+    unusual = analyzer.identify_unusual_activity(chain)
+    _, max_pain = analyzer.find_max_pain(chain)
+    expirations = analyzer.analyze_expiration_flow(chain)
+
+    def render(table):
+        display.console.file = io.StringIO()
+        display.console.print(table)
+
+    return [
+        ("fetcher.filter_options_data", lambda: fetcher.filter_options_data(chain, 10)),
+        (
+            "fetcher.filter_options_data(where)",
+            lambda: fetcher.filter_options_data(
+                chain,
+                where="dte <= 30 and moneyness in 0.9..1.1 and vol_oi > 0.5",
+                spot=SPOT,
+            ),
+        ),
+        (
+            "analyzer.calculate_flow_summary",
+            lambda: analyzer.calculate_flow_summary(chain),
+        ),
+        (
+            "analyzer.analyze_strike_distribution",
+            lambda: analyzer.analyze_strike_distribution(chain, SPOT),
+        ),
+        ("analyzer.find_max_pain", lambda: analyzer.find_max_pain(chain)),
+        (
+            "analyzer.analyze_expiration_flow",
+            lambda: analyzer.analyze_expiration_flow(chain),
+        ),
+        (
+            "analyzer.identify_unusual_activity",
+            lambda: analyzer.identify_unusual_activity(chain),
+        ),
+        (
+            "analyzer.calculate_gamma_exposure",
+            lambda: analyzer.calculate_gamma_exposure(chain, SPOT),
+        ),
+        ("analyzer.detect_sweeps", lambda: analyzer.detect_sweeps(chain)),
+        (
+            "analyzer.analyze_without_sweeps",
+            lambda: analyzer.analyze_without_sweeps(classified),
+        ),
+        ("analyzer.analyze_combos", lambda: analyzer.analyze_combos(chain)),
+        (
+            "analyzer.analyze_chain",
+            lambda: analyzer.analyze_chain(chain, SPOT, detect_sweeps=True),
+        ),
+        (
+            "display.render_flow_summary",
+            lambda: render(display.render_flow_summary(flow_summary)),
+        ),
+        (
+            "display.render_strike_analysis",
+            lambda: render(display.render_strike_analysis(strikes)),
+        ),
+        (
+            "display.render_unusual_activity",
+            lambda: render(display.render_unusual_activity(unusual)),
+        ),
+        ("display.render_max_pain", lambda: render(display.render_max_pain(max_pain))),
+        (
+            "display.render_expiration_analysis",
+            lambda: render(display.render_expiration_analysis(expirations)),
+        ),
+        (
+            "display.render_top_sweeps",
+            lambda: render(display.render_top_sweeps(classified)),
+        ),
+    ]
+
+
+def measure(func: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """Median wall time over ``repeat`` runs, then peak memory of one traced run."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+
+    # Traced separately: tracemalloc slows allocation-heavy code down
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {"seconds": statistics.median(samples), "peak_bytes": peak}
+
+
+def run_suite(sizes: List[int], repeat: int, only: str = "*") -> Dict[str, Dict]:
+    """
+    Run every matching case at every size.
+
+    Returns:
+        Mapping of "<case>[<rows>]" to its measurement
+    """
+    results = {}
+    for rows in sizes:
+        chain = synthetic_chain(rows)
+        for name, func in build_cases(chain):
+            if not fnmatch.fnmatch(name, only):
+                continue
+            key = f"{name}[{rows}]"
+            results[key] = measure(func, repeat)
+            print(
+                f"{key:<50} {results[key]['seconds'] * 1000:>10.2f} ms "
+                f"{results[key]['peak_bytes'] / 2**20:>9.1f} MiB",
+                file=sys.stderr,
+            )
+    return results
+
+
+def compare(
+    results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float
+) -> List[str]:
+    """
+    List cases that regressed against a baseline.
+
+    A case regresses when its time or peak memory exceeds the baseline value
+    by more than ``threshold`` (a fraction, e.g. 0.25 for 25%).
+    """
+    regressions = []
+    for key, result in results.items():
+        if key not in baseline:
+            continue
+        for metric in ("seconds", "peak_bytes"):
+            before, after = baseline[key][metric], result[metric]
+            if before > 0 and after > before * (1 + threshold):
+                regressions.append(
+                    f"{key} {metric}: {before:.4g} -> {after:.4g} "
+                    f"(+{(after / before - 1):.0%})"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        default=",".join(str(size) for size in DEFAULT_SIZES),
+        help="Comma-separated chain sizes in rows",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per case")
+    parser.add_argument("--only", default="*", help="Glob of case names to run")
+    parser.add_argument("--save", metavar="FILE", help="Write results as a baseline")
+    parser.add_argument(
+        "--compare",
+        metavar="FILE",
+        nargs="?",
+        const=DEFAULT_BASELINE,
+        help=f"Fail on regressions against a baseline (default {DEFAULT_BASELINE})",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Allowed slowdown or memory growth as a fraction (default 0.25)",
+    )
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    options = parser.parse_args()
+
+    # Baselines are machine-specific and not committed: fail before running
+    if options.compare and not os.path.exists(options.compare):
+        print(
+            f"No baseline at {options.compare}. Save one on this machine first "
+            f"with --save {options.compare}",
+            file=sys.stderr,
+        )
+        sys.exit(2)
+
+    sizes = [int(size) for size in options.sizes.split(",") if size]
+    results = run_suite(sizes, options.repeat, options.only)
+
+    if options.json:
+        print(json.dumps(results, indent=2))
+    if options.save:
+        with open(options.save, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=2, sort_keys=True)
+
+    if options.compare:
+        with open(options.compare, "r", encoding="utf-8") as fh:
+            baseline = json.load(fh)
+        regressions = compare(results, baseline, options.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,356 @@
+"""Alert rules over options chains, evaluated incrementally per snapshot.
+
+A rule is a name and a filter expression (see filter_expr), e.g.::
+
+    {"name": "short-dated sweep",
+     "when": "premium > $1M and dte < 14 and vol_oi > 5 and trade_type == sweep"}
+
+Rules are compiled once. Each new snapshot (or delta of changed rows) of a
+ticker is hashed row by row, and only the rows whose contract is new or
+whose values changed are evaluated; all rules run together over those rows,
+sharing extracted fields and repeated conditions. An alert fires when a
+contract starts matching a rule (edge-triggered), so a contract that keeps
+matching alerts once, and a per-rule cooldown keeps a flapping contract
+from alerting again too soon.
+"""
+
+import json
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, TextIO
+import numpy as np
+import pandas as pd
+from .export import plain
+from .filter_expr import compile_filter, evaluate_all
+from .oi_change import UNDERLYING_COLUMNS
+from .snapshot import contract_keys
+from .trades import TRADE_KEY_COLUMNS
+
+# Chain columns behind each derived field, for detecting changed rows
+_FIELD_COLUMNS = {
+    "oi": ["openInterest"],
+    "open_interest": ["openInterest"],
+    "price": ["lastPrice"],
+    "premium": ["dollar_flow"],
+    "flow": ["dollar_flow"],
+    "iv": ["impliedVolatility"],
+    "type": ["option_type"],
+    "dte": ["expiration"],
+    "moneyness": ["strike"],
+    "vol_oi": ["volume", "openInterest"],
+    "delta": ["strike", "expiration", "impliedVolatility", "option_type"],
+    "abs_delta": ["strike", "expiration", "impliedVolatility", "option_type"],
+}
+
+# Fields whose values change with the spot price alone
+_SPOT_FIELDS = {"moneyness", "delta", "abs_delta"}
+
+# Chain columns copied into every alert
+ALERT_COLUMNS = ["volume", "openInterest", "lastPrice", "dollar_flow"]
+
+# Odd 64-bit constant separating the keys of repeated contract rows
+_OCCURRENCE_STEP = np.uint64(0x9E3779B97F4A7C15)
+
+Sink = Callable[[Dict[str, Any]], None]
+
+
+class AlertRule:
+    """A named filter expression that raises an alert for matching contracts."""
+
+    def __init__(self, name: str, when: str, cooldown: float = 0.0):
+        """
+        Args:
+            name: Rule name reported with its alerts
+            when: Filter expression a contract must match
+            cooldown: Seconds before the same contract can alert on this rule
+                again after it stops and restarts matching
+
+        Raises:
+            FilterError: If the expression is malformed
+        """
+        self.name = name
+        self.when = when
+        self.cooldown = cooldown
+        self.expression = compile_filter(when)
+
+    def __repr__(self) -> str:
+        return f"AlertRule({self.name!r}, {self.when!r})"
+
+
+def load_rules(path: str) -> List[AlertRule]:
+    """
+    Read alert rules from a JSON file.
+
+    The file holds either a list of ``{"name", "when", "cooldown"}`` objects
+    (cooldown optional) or an object mapping rule names to expressions.
+
+    Args:
+        path: Path to the rules file
+
+    Returns:
+        List of compiled rules
+    """
+    with open(path, "r", encoding="utf-8") as fh:
+        spec = json.load(fh)
+    if isinstance(spec, dict):
+        return [AlertRule(name, when) for name, when in spec.items()]
+    return [
+        AlertRule(rule["name"], rule["when"], float(rule.get("cooldown", 0.0)))
+        for rule in spec
+    ]
+
+
+class _ChainState:
+    """Rows of a ticker's last evaluated snapshot and the rules they matched."""
+
+    def __init__(self, rules: int):
+        self.keys = np.zeros(0, dtype=np.uint64)
+        self.hashes = np.zeros(0, dtype=np.uint64)
+        self.matches = np.zeros((0, rules), dtype=bool)
+        self.context: Optional[tuple] = None
+
+
+class AlertEngine:
+    """
+    Evaluates a rule set over successive snapshots and sends new alerts to sinks.
+
+    State is kept per ticker: a hash of each contract's key and of the
+    columns the rules read, plus which rules each contract matched. Rows
+    with an unchanged hash keep their previous matches without being
+    evaluated. Everything is re-evaluated when the valuation day changes,
+    or the spot price does for rules using moneyness or delta.
+    """
+
+    def __init__(self, rules: Sequence[AlertRule], sinks: Iterable[Sink] = ()):
+        """
+        Args:
+            rules: Alert rules
+            sinks: Callables receiving each alert dictionary
+        """
+        self.rules = list(rules)
+        self.sinks = list(sinks)
+        self._expressions = [rule.expression for rule in self.rules]
+        # Fields referenced by any rule
+        self.fields = frozenset().union(*(e.fields for e in self._expressions))
+        self._spot_dependent = bool(self.fields & _SPOT_FIELDS)
+        self._states: Dict[str, _ChainState] = {}
+        self._last_fired: Dict[tuple, float] = {}
+        self._lock = threading.Lock()
+        self.rows_evaluated = 0
+        self.alerts_sent = 0
+
+    def _columns(self, df: pd.DataFrame) -> List[str]:
+        """Chain columns the rules read."""
+        columns = []
+        for field in sorted(self.fields):
+            for column in _FIELD_COLUMNS.get(field, [field]):
+                if column in df.columns and column not in columns:
+                    columns.append(column)
+        return columns
+
+    def _key_columns(self, df: pd.DataFrame) -> List[str]:
+        underlying = [column for column in UNDERLYING_COLUMNS if column in df.columns]
+        return underlying[:1] + TRADE_KEY_COLUMNS
+
+    def evaluate(
+        self,
+        df: pd.DataFrame,
+        ticker: str = "",
+        spot: Optional[float] = None,
+        as_of: Optional[datetime] = None,
+        partial: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        Evaluate the rules over a ticker's new snapshot and send new alerts.
+
+        Args:
+            df: The ticker's chain (or, with partial, only its changed rows)
+            ticker: Ticker the chain belongs to; state is kept per ticker
+            spot: Underlying price, for moneyness and delta rules
+            as_of: Valuation time for dte and delta (default now)
+            partial: df holds only changed rows; contracts missing from it
+                keep their previous state instead of being dropped
+
+        Returns:
+            The alerts fired, one dictionary per contract and rule
+
+        Raises:
+            FilterError: If a rule uses a field the chain lacks
+        """
+        as_of = as_of or datetime.now()
+        with self._lock:
+            state = self._states.setdefault(ticker, _ChainState(len(self.rules)))
+        context = (
+            as_of.date(),
+            spot if self._spot_dependent else None,
+        )
+
+        if df.empty:
+            keys = np.zeros(0, dtype=np.uint64)
+            hashes = keys
+        else:
+            keys = pd.util.hash_pandas_object(
+                df[self._key_columns(df)], index=False
+            ).to_numpy()
+            duplicated = pd.Series(keys).duplicated()
+            if duplicated.any():
+                # Repeated contract rows are told apart by their order
+                occurrence = pd.Series(keys).groupby(keys).cumcount().to_numpy()
+                keys = keys + occurrence.astype(np.uint64) * _OCCURRENCE_STEP
+            hashes = pd.util.hash_pandas_object(
+                df[self._columns(df)], index=False
+            ).to_numpy()
+
+        # Align with the previous snapshot by contract key
+        previous_keys = pd.Index(state.keys)
+        if previous_keys.is_unique:
+            position = previous_keys.get_indexer(keys)
+        else:
+            position = np.full(len(keys), -1)
+        known = position >= 0
+        previous = np.zeros((len(df), len(self.rules)), dtype=bool)
+        previous[known] = state.matches[position[known]]
+
+        unchanged = known.copy()
+        if context != state.context:
+            unchanged[:] = False
+        else:
+            unchanged[known] = state.hashes[position[known]] == hashes[known]
+
+        matches = np.where(unchanged[:, None], previous, False)
+        changed = np.flatnonzero(~unchanged)
+        if len(changed):
+            matches[changed] = evaluate_all(
+                self._expressions, df.iloc[changed], spot, as_of
+            ).T
+        self.rows_evaluated += len(changed)
+
+        # Edge trigger: contracts that match a rule they did not match before
+        fired_rows, fired_rules = np.nonzero(matches & ~previous)
+
+        if partial and len(state.keys):
+            kept = np.ones(len(state.keys), dtype=bool)
+            kept[position[known]] = False
+            keys = np.concatenate([state.keys[kept], keys])
+            hashes = np.concatenate([state.hashes[kept], hashes])
+            matches = np.concatenate([state.matches[kept], matches])
+        state.keys, state.hashes, state.matches = keys, hashes, matches
+        state.context = context
+
+        if not len(fired_rows):
+            return []
+        alerts = self._alerts(df, ticker, fired_rows, fired_rules, as_of)
+        self._send(alerts)
+        return alerts
+
+    def _alerts(
+        self,
+        df: pd.DataFrame,
+        ticker: str,
+        rows: np.ndarray,
+        rules: np.ndarray,
+        as_of: datetime,
+    ) -> List[Dict[str, Any]]:
+        """Alert dictionaries for fired (row, rule) pairs, after cooldowns."""
+        # Each fired contract's details are built once, whatever rules it fired
+        unique_rows, inverse = np.unique(rows, return_inverse=True)
+        fired = df.iloc[unique_rows]
+        symbols = contract_keys(fired, ticker or None).to_numpy()
+        columns = [column for column in ALERT_COLUMNS if column in fired.columns]
+        records = fired[TRADE_KEY_COLUMNS + columns].to_dict("records")
+        stamp = as_of.isoformat(timespec="seconds")
+        now = time.monotonic()
+
+        alerts = []
+        with self._lock:
+            for row, rule_index in zip(inverse.tolist(), rules.tolist()):
+                rule = self.rules[rule_index]
+                if rule.cooldown > 0:
+                    key = (rule.name, symbols[row])
+                    last = self._last_fired.get(key)
+                    if last is not None and now - last < rule.cooldown:
+                        continue
+                    self._last_fired[key] = now
+                alert = {
+                    "time": stamp,
+                    "ticker": ticker,
+                    "rule": rule.name,
+                    "contract": symbols[row],
+                }
+                alert.update(records[row])
+                alerts.append(alert)
+        return alerts
+
+    def _send(self, alerts: List[Dict[str, Any]]):
+        with self._lock:
+            self.alerts_sent += len(alerts)
+            for alert in alerts:
+                for sink in self.sinks:
+                    try:
+                        sink(alert)
+                    except Exception as e:
+                        print(f"Alert sink failed: {e}", file=sys.stderr)
+
+    def reset(self, ticker: Optional[str] = None):
+        """Forget the state of one ticker (or all), re-arming its alerts."""
+        with self._lock:
+            if ticker is None:
+                self._states.clear()
+            else:
+                self._states.pop(ticker, None)
+
+
+class AlertPrinter:
+    """Writes each alert as one human-readable line."""
+
+    def __init__(self, stream: Optional[TextIO] = None):
+        """
+        Args:
+            stream: Stream to write to (default stderr, keeping stdout free
+                for machine-readable output)
+        """
+        self.stream = stream or sys.stderr
+
+    def __call__(self, alert: Dict[str, Any]):
+        premium = alert.get("dollar_flow")
+        details = f" vol {alert['volume']:,}" if "volume" in alert else ""
+        if premium is not None:
+            details += f" premium ${premium:,.0f}"
+        self.stream.write(
+            f"[{alert['time']}] ALERT {alert['rule']}: {alert['contract']}{details}\n"
+        )
+        self.stream.flush()
+
+
+class WebhookSink:
+    """
+    Stand-in for a webhook: builds the request each alert would POST and
+    records it instead of sending it.
+
+    Requests are kept in ``sent`` and, with a spool file, appended to it as
+    JSON Lines, so a delivery process (or a test) can pick them up.
+    """
+
+    def __init__(self, url: str, spool: Optional[str] = None):
+        """
+        Args:
+            url: Endpoint the alerts are meant for
+            spool: File to append the requests to
+        """
+        self.url = url
+        self.spool = spool
+        self.sent: List[Dict[str, Any]] = []
+
+    def __call__(self, alert: Dict[str, Any]):
+        request = {
+            "method": "POST",
+            "url": self.url,
+            "headers": {"Content-Type": "application/json"},
+            "body": plain(alert),
+        }
+        self.sent.append(request)
+        if self.spool:
+            with open(self.spool, "a", encoding="utf-8") as fh:
+                fh.write(json.dumps(request) + "\n")
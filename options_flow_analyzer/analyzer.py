@@ -1,15 +1,140 @@
 """Analysis module for processing options data and calculating key metrics."""
 
+import numpy as np
 import pandas as pd
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Optional, Tuple
+from .combos import ComboDetector
+from .gamma import GammaProfile
+from .memo import ResultCache, memoized
+from .oi_change import summarize_oi_change
+from .profiling import profiled
+from .trades import TradeAnalyzer
 
 
 class OptionsAnalyzer:
     """Analyzes options data to extract meaningful insights."""
 
-    def __init__(self):
-        pass
+    def __init__(self, memo: Optional[ResultCache] = None):
+        """
+        Args:
+            memo: Cache for memoized analyses (None disables memoization);
+                pass RESULT_CACHE to share the process-wide cache
+        """
+        self.memo = memo if memo is not None else ResultCache(max_entries=0)
+
+    @profiled()
+    def analyze_chain(
+        self,
+        df: pd.DataFrame,
+        current_price: float,
+        trades: Optional[pd.DataFrame] = None,
+        detect_sweeps: bool = False,
+        show_unusual: bool = True,
+        show_max_pain: bool = True,
+        show_expirations: bool = True,
+        show_gamma: bool = False,
+        show_combos: bool = False,
+    ) -> Tuple[Dict[str, Any], Optional[pd.DataFrame]]:
+        """
+        Run the standard set of analyses on a filtered chain.
 
+        When sweeps are detected, the flow summary and strike analysis use the
+        chain without sweep trades (unless every contract is a sweep). Results
+        other than gamma are memoized, so an unchanged chain is analyzed once.
+
+        Args:
+            df: Filtered options DataFrame
+            current_price: Current stock price
+            trades: Optional trade prints for trade-level sweep detection
+            detect_sweeps: Classify sweeps and compare flow with and without them
+            show_unusual: Include unusual activity
+            show_max_pain: Include max pain
+            show_expirations: Include flow by expiration
+            show_gamma: Include gamma flip level, walls and expiry contributions
+            show_combos: Include multi-leg combos and combo-adjusted flow
+
+        Returns:
+            Tuple of (results, classified) where results maps section names to
+            their data and classified is the chain labelled by detect_sweeps
+            (None when sweeps were not detected)
+        """
+        results, classified = self._standard_analyses(
+            df,
+            current_price,
+            trades,
+            detect_sweeps,
+            show_unusual,
+            show_max_pain,
+            show_expirations,
+            show_combos,
+        )
+
+        # Valued at the current time, so never memoized
+        if show_gamma:
+            results.update(self.analyze_gamma_levels(df, current_price))
+
+        return results, classified
+
+    @memoized
+    def _standard_analyses(
+        self,
+        df: pd.DataFrame,
+        current_price: float,
+        trades: Optional[pd.DataFrame],
+        detect_sweeps: bool,
+        show_unusual: bool,
+        show_max_pain: bool,
+        show_expirations: bool,
+        show_combos: bool = False,
+    ) -> Tuple[Dict[str, Any], Optional[pd.DataFrame]]:
+        """The analyses of analyze_chain that depend only on their inputs."""
+        results: Dict[str, Any] = {}
+        classified = None
+        flow_data = df
+
+        if detect_sweeps:
+            classified = self.detect_sweeps(df, trades=trades)
+            results["sweep_analysis"] = self.analyze_without_sweeps(classified)
+            results["sweeps"] = classified[classified["trade_type"] == "sweep"]
+
+            # Use clean data (without sweeps) for main analysis
+            clean_data = classified[classified["trade_type"] != "sweep"].copy()
+            results["sweeps_excluded"] = not clean_data.empty
+            if not clean_data.empty:
+                flow_data = clean_data
+
+        if flow_data is df:
+            results["flow_summary"] = self.calculate_flow_summary(df)
+        else:
+            # analyze_without_sweeps has already summarized the clean chain
+            results["flow_summary"] = dict(results["sweep_analysis"]["without_sweeps"])
+        results["strike_analysis"] = self.analyze_strike_distribution(
+            flow_data, current_price
+        )
+
+        # Optional analyses
+        if show_unusual:
+            results["unusual_activity"] = self.identify_unusual_activity(df)
+
+        if show_max_pain:
+            max_pain_strike, max_pain_df = self.find_max_pain(df)
+            results["max_pain_strike"] = max_pain_strike
+            results["max_pain"] = max_pain_df
+
+        if show_expirations:
+            results["expiration_analysis"] = self.analyze_expiration_flow(df)
+
+        if show_combos:
+            results.update(self.analyze_combos(df, trades=trades))
+
+        # Present when the chain was joined to an earlier snapshot
+        if "oi_change" in df.columns:
+            results.update(self.analyze_oi_change(df))
+
+        return results, classified
+
+    @profiled()
+    @memoized
     def calculate_flow_summary(self, df: pd.DataFrame) -> Dict[str, Any]:
         """
         Calculate summary statistics for options flow.
@@ -23,15 +148,70 @@ class OptionsAnalyzer:
         if df.empty:
             return {}
 
+        return self.summarize_flow_totals(self.flow_totals(df))
+
+    def flow_totals(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Calculate the additive call/put totals behind the flow summary.
+
+        Totals from disjoint pieces of a chain can be summed key by key and
+        passed to summarize_flow_totals.
+
+        Args:
+            df: Options DataFrame
+
+        Returns:
+            Dictionary of call/put volume and flow sums plus the contract count
+        """
         # Separate calls and puts
-        calls = df[df["option_type"] == "call"]
-        puts = df[df["option_type"] == "put"]
+        is_call = (df["option_type"] == "call").to_numpy()
+        is_put = (df["option_type"] == "put").to_numpy()
+
+        totals = {
+            "call_volume": df["volume"][is_call].sum(),
+            "put_volume": df["volume"][is_put].sum(),
+            "call_flow": df["dollar_flow"][is_call].sum(),
+            "put_flow": df["dollar_flow"][is_put].sum(),
+            "contracts": len(df),
+        }
+
+        # Side-classified totals when trades have been attached
+        if "buy_premium" in df.columns and "sell_premium" in df.columns:
+            for option_type, mask in [("call", is_call), ("put", is_put)]:
+                for side in ["buy", "sell"]:
+                    totals[f"{option_type}_{side}_volume"] = df[f"{side}_volume"][
+                        mask
+                    ].sum()
+                    totals[f"{option_type}_{side}_premium"] = df[f"{side}_premium"][
+                        mask
+                    ].sum()
+
+        # Opening/closing estimates when joined to an earlier snapshot
+        if "opening_volume" in df.columns:
+            for option_type, mask in [("call", is_call), ("put", is_put)]:
+                for column in ["opening_volume", "closing_volume", "opening_flow"]:
+                    totals[f"{option_type}_{column}"] = df[column][mask].sum()
+
+        return totals
+
+    def summarize_flow_totals(self, totals: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Turn flow totals into the flow summary.
+
+        Args:
+            totals: Output of flow_totals, possibly summed across chunks
+
+        Returns:
+            Dictionary with flow summary metrics
+        """
+        if not totals or not totals["contracts"]:
+            return {}
 
         # Calculate total flows
-        total_call_volume = calls["volume"].sum()
-        total_put_volume = puts["volume"].sum()
-        total_call_flow = calls["dollar_flow"].sum()
-        total_put_flow = puts["dollar_flow"].sum()
+        total_call_volume = totals["call_volume"]
+        total_put_volume = totals["put_volume"]
+        total_call_flow = totals["call_flow"]
+        total_put_flow = totals["put_flow"]
 
         # Calculate net flows
         net_volume = total_call_volume - total_put_volume
@@ -42,7 +222,7 @@ class OptionsAnalyzer:
             total_put_volume / total_call_volume if total_call_volume > 0 else 0
         )
 
-        return {
+        summary = {
             "total_call_volume": int(total_call_volume),
             "total_put_volume": int(total_put_volume),
             "total_call_flow": total_call_flow,
@@ -50,10 +230,96 @@ class OptionsAnalyzer:
             "net_volume": int(net_volume),
             "net_dollar_flow": net_dollar_flow,
             "put_call_ratio": put_call_ratio,
-            "total_contracts": len(df),
+            "total_contracts": totals["contracts"],
             "bullish_sentiment": net_dollar_flow > 0,
         }
 
+        # Signed flow when trades have been classified by aggressor side
+        if "call_buy_premium" in totals:
+            signed_call_flow = totals["call_buy_premium"] - totals["call_sell_premium"]
+            signed_put_flow = totals["put_buy_premium"] - totals["put_sell_premium"]
+            # Bought calls and sold puts are bullish; sold calls and bought puts bearish
+            signed_net_flow = signed_call_flow - signed_put_flow
+
+            summary.update(
+                {
+                    "call_buy_volume": int(totals["call_buy_volume"]),
+                    "call_sell_volume": int(totals["call_sell_volume"]),
+                    "put_buy_volume": int(totals["put_buy_volume"]),
+                    "put_sell_volume": int(totals["put_sell_volume"]),
+                    "signed_call_flow": signed_call_flow,
+                    "signed_put_flow": signed_put_flow,
+                    "signed_net_flow": signed_net_flow,
+                    "signed_bullish_sentiment": signed_net_flow > 0,
+                }
+            )
+
+        # Flow that opened new positions, from day-over-day open interest
+        if "call_opening_flow" in totals:
+            opening_volume = (
+                totals["call_opening_volume"] + totals["put_opening_volume"]
+            )
+            total_volume = total_call_volume + total_put_volume
+            opening_net_flow = totals["call_opening_flow"] - totals["put_opening_flow"]
+
+            summary.update(
+                {
+                    "call_opening_volume": int(totals["call_opening_volume"]),
+                    "put_opening_volume": int(totals["put_opening_volume"]),
+                    "call_closing_volume": int(totals["call_closing_volume"]),
+                    "put_closing_volume": int(totals["put_closing_volume"]),
+                    "opening_call_flow": totals["call_opening_flow"],
+                    "opening_put_flow": totals["put_opening_flow"],
+                    "opening_net_flow": opening_net_flow,
+                    "opening_share": (
+                        opening_volume / total_volume if total_volume > 0 else 0
+                    ),
+                    "opening_bullish_sentiment": opening_net_flow > 0,
+                }
+            )
+
+        return summary
+
+    @profiled()
+    def add_signed_flow(
+        self,
+        df: pd.DataFrame,
+        trades: pd.DataFrame,
+        quotes: Optional[pd.DataFrame] = None,
+    ) -> pd.DataFrame:
+        """
+        Attach buyer- and seller-initiated volume and premium to each contract.
+
+        Args:
+            df: Options DataFrame
+            trades: Trade prints for the same contracts
+            quotes: Optional NBBO updates, required when trades carry no bid/ask
+
+        Returns:
+            Copy of df with buy/sell volume and premium columns
+        """
+        if df.empty:
+            return df
+
+        trade_analyzer = TradeAnalyzer()
+        keys = trade_analyzer.key_columns
+        if quotes is not None:
+            trades = trade_analyzer.attach_quotes(trades, quotes)
+
+        side_flow = trade_analyzer.side_flow_by_contract(trades)
+        result = df.drop(columns=side_flow.columns.difference(keys), errors="ignore")
+        result = result.merge(side_flow, on=keys, how="left")
+        result.index = df.index
+
+        for column in ["buy_volume", "sell_volume"]:
+            result[column] = result[column].fillna(0).astype(np.int64)
+        for column in ["buy_premium", "sell_premium"]:
+            result[column] = result[column].fillna(0.0)
+
+        return result
+
+    @profiled()
+    @memoized
     def analyze_strike_distribution(
         self, df: pd.DataFrame, current_price: float
     ) -> pd.DataFrame:
@@ -70,19 +336,52 @@ class OptionsAnalyzer:
         if df.empty:
             return pd.DataFrame()
 
-        # Group by strike and option type
-        strike_analysis = (
-            df.groupby(["strike", "option_type"])
-            .agg(
-                {
-                    "volume": "sum",
-                    "openInterest": "sum",
-                    "dollar_flow": "sum",
-                    "lastPrice": "mean",
-                }
-            )
-            .reset_index()
+        return self.finalize_strike_distribution(
+            self.strike_partials(df), current_price
+        )
+
+    def strike_partials(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Group a chain by strike and option type into additive sums.
+
+        Partials from disjoint pieces of a chain can be concatenated and
+        summed by index before finalize_strike_distribution.
+
+        Args:
+            df: Options DataFrame
+
+        Returns:
+            DataFrame indexed by (strike, option_type)
+        """
+        return df.groupby(["strike", "option_type"]).agg(
+            volume=("volume", "sum"),
+            openInterest=("openInterest", "sum"),
+            dollar_flow=("dollar_flow", "sum"),
+            price_sum=("lastPrice", "sum"),
+            price_count=("lastPrice", "count"),
+        )
+
+    def finalize_strike_distribution(
+        self, partials: pd.DataFrame, current_price: float
+    ) -> pd.DataFrame:
+        """
+        Build the strike-level analysis from strike partials.
+
+        Args:
+            partials: Output of strike_partials
+            current_price: Current stock price
+
+        Returns:
+            DataFrame with strike-level analysis
+        """
+        if partials.empty:
+            return pd.DataFrame()
+
+        strike_analysis = partials.reset_index()
+        strike_analysis["lastPrice"] = (
+            strike_analysis["price_sum"] / strike_analysis["price_count"]
         )
+        strike_analysis = strike_analysis.drop(columns=["price_sum", "price_count"])
 
         # Add distance from current price
         strike_analysis["distance_from_price"] = (
@@ -93,17 +392,19 @@ class OptionsAnalyzer:
         ) * 100
 
         # Add ITM/OTM classification
-        def classify_moneyness(row):
-            if row["option_type"] == "call":
-                return "ITM" if row["strike"] < current_price else "OTM"
-            else:  # put
-                return "ITM" if row["strike"] > current_price else "OTM"
-
-        strike_analysis["moneyness"] = strike_analysis.apply(classify_moneyness, axis=1)
+        is_call = strike_analysis["option_type"] == "call"
+        is_itm = np.where(
+            is_call,
+            strike_analysis["strike"] < current_price,
+            strike_analysis["strike"] > current_price,
+        )
+        strike_analysis["moneyness"] = np.where(is_itm, "ITM", "OTM")
 
         # Sort by volume descending
         return strike_analysis.sort_values("volume", ascending=False)
 
+    @profiled()
+    @memoized
     def find_max_pain(self, df: pd.DataFrame) -> Tuple[float, pd.DataFrame]:
         """
         Calculate max pain point (strike with maximum open interest).
@@ -117,12 +418,34 @@ class OptionsAnalyzer:
         if df.empty:
             return 0.0, pd.DataFrame()
 
-        # Group by strike and calculate total open interest
-        oi_by_strike = (
-            df.groupby("strike")
-            .agg({"openInterest": "sum", "volume": "sum"})
-            .reset_index()
-        )
+        return self.finalize_max_pain(self.max_pain_partials(df))
+
+    def max_pain_partials(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Group a chain by strike into additive open interest and volume sums.
+
+        Args:
+            df: Options DataFrame
+
+        Returns:
+            DataFrame indexed by strike
+        """
+        return df.groupby("strike").agg({"openInterest": "sum", "volume": "sum"})
+
+    def finalize_max_pain(self, partials: pd.DataFrame) -> Tuple[float, pd.DataFrame]:
+        """
+        Find the max pain strike from max pain partials.
+
+        Args:
+            partials: Output of max_pain_partials
+
+        Returns:
+            Tuple of (max_pain_strike, max_pain_analysis)
+        """
+        if partials.empty:
+            return 0.0, pd.DataFrame()
+
+        oi_by_strike = partials.reset_index()
 
         # Find strike with maximum open interest
         max_pain_strike = oi_by_strike.loc[
@@ -133,6 +456,8 @@ class OptionsAnalyzer:
             "openInterest", ascending=False
         )
 
+    @profiled()
+    @memoized
     def analyze_expiration_flow(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Analyze flow distribution across expiration dates.
@@ -146,23 +471,40 @@ class OptionsAnalyzer:
         if df.empty:
             return pd.DataFrame()
 
-        exp_analysis = (
-            df.groupby(["expiration", "option_type"])
-            .agg({"volume": "sum", "openInterest": "sum", "dollar_flow": "sum"})
-            .reset_index()
-        )
+        return self.finalize_expiration_flow(self.expiration_partials(df))
 
-        # Calculate total flow per expiration
-        exp_totals = (
-            df.groupby("expiration")
-            .agg({"volume": "sum", "dollar_flow": "sum"})
-            .reset_index()
-        )
+    def expiration_partials(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Group a chain by expiration into additive volume and flow sums.
+
+        Args:
+            df: Options DataFrame
+
+        Returns:
+            DataFrame indexed by expiration
+        """
+        return df.groupby("expiration").agg({"volume": "sum", "dollar_flow": "sum"})
+
+    def finalize_expiration_flow(self, partials: pd.DataFrame) -> pd.DataFrame:
+        """
+        Build the expiration analysis from expiration partials.
+
+        Args:
+            partials: Output of expiration_partials
 
-        exp_totals = exp_totals.sort_values("dollar_flow", ascending=False)
+        Returns:
+            DataFrame with expiration-level analysis
+        """
+        if partials.empty:
+            return pd.DataFrame()
+
+        # Total flow per expiration
+        exp_totals = partials.reset_index()
 
-        return exp_totals
+        return exp_totals.sort_values("dollar_flow", ascending=False)
 
+    @profiled()
+    @memoized
     def identify_unusual_activity(
         self, df: pd.DataFrame, volume_threshold: float = 2.0
     ) -> pd.DataFrame:
@@ -188,24 +530,98 @@ class OptionsAnalyzer:
         # Filter for unusual activity
         unusual = df_copy[df_copy["volume_oi_ratio"] >= volume_threshold]
 
+        columns = [
+            "strike",
+            "option_type",
+            "expiration",
+            "volume",
+            "openInterest",
+            "volume_oi_ratio",
+            "dollar_flow",
+            "lastPrice",
+        ]
+
+        # With day-over-day open interest, volume that opened new positions
+        # ranks first; high volume that only closed positions is less telling
+        if "opening_volume" in unusual.columns:
+            unusual = unusual.sort_values(
+                ["opening_volume", "dollar_flow"], ascending=[False, False]
+            )
+            return unusual[columns + ["oi_change", "opening_volume"]]
+
         # Sort by volume and dollar flow
         unusual = unusual.sort_values(
             ["volume", "dollar_flow"], ascending=[False, False]
         )
 
-        return unusual[
-            [
-                "strike",
-                "option_type",
-                "expiration",
-                "volume",
-                "openInterest",
-                "volume_oi_ratio",
-                "dollar_flow",
-                "lastPrice",
-            ]
-        ]
+        return unusual[columns]
+
+    @profiled()
+    @memoized
+    def analyze_oi_change(self, df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+        """
+        Summarize open interest change per strike and per expiration.
+
+        Args:
+            df: Options DataFrame joined to an earlier snapshot with
+                OpenInterestChange.join
+
+        Returns:
+            Dictionary with oi_change_by_strike and oi_change_by_expiration
+            (see summarize_oi_change), each sorted by absolute ΔOI
+        """
+        if df.empty:
+            return {}
+
+        return {
+            "oi_change_by_strike": summarize_oi_change(df, ["strike", "option_type"]),
+            "oi_change_by_expiration": summarize_oi_change(df, ["expiration"]),
+        }
+
+    @profiled()
+    @memoized
+    def analyze_combos(
+        self,
+        df: pd.DataFrame,
+        trades: Optional[pd.DataFrame] = None,
+        min_size: int = 10,
+    ) -> Dict[str, Any]:
+        """
+        Find multi-leg combos and summarize the flow left once they are removed.
+
+        Straddles, strangles, verticals and risk reversals are hedged or
+        volatility positions, so counting their legs as separate calls and
+        puts distorts net directional flow. Legs are matched in the trade
+        prints when supplied (same timestamp and size), otherwise in the
+        chain (same expiration and daily volume).
+
+        Args:
+            df: Options DataFrame
+            trades: Optional trade prints for the same contracts
+            min_size: Smallest leg size (contracts) considered for a combo
+
+        Returns:
+            Dictionary with combos (per combo type summary), combo_legs (the
+            matched legs) and combo_adjusted_flow (calculate_flow_summary of
+            the chain without combo volume)
+        """
+        if df.empty:
+            return {}
+
+        detector = ComboDetector(min_size=min_size)
+        if trades is not None:
+            legs = detector.detect_trades(trades)
+        else:
+            legs = detector.detect_chain(df)
+        adjusted = detector.adjust_chain(df, legs, trades=trades)
+
+        return {
+            "combos": detector.summarize(legs),
+            "combo_legs": legs,
+            "combo_adjusted_flow": self.calculate_flow_summary(adjusted),
+        }
 
+    @profiled()
     def calculate_gamma_exposure(
         self, df: pd.DataFrame, current_price: float
     ) -> Dict[str, float]:
@@ -225,32 +641,70 @@ class OptionsAnalyzer:
         # Simplified gamma calculation (actual gamma would require Black-Scholes)
         # This is a rough approximation for demonstration
 
-        gamma_exposure = {}
-        price_levels = [
-            current_price * (1 + i * 0.01) for i in range(-10, 11)
-        ]  # ±10% in 1% increments
+        price_levels = np.array(
+            [current_price * (1 + i * 0.01) for i in range(-10, 11)]
+        )  # ±10% in 1% increments
+
+        strikes = df["strike"].to_numpy(dtype=float)
+        open_interest = df["openInterest"].to_numpy(dtype=float)
+        sign = np.where(df["option_type"].to_numpy() == "call", 1.0, -1.0)
+
+        # Simplified gamma approximation, evaluated for every level at once
+        moneyness = strikes[np.newaxis, :] / price_levels[:, np.newaxis]
+        near_money = (moneyness >= 0.9) & (moneyness <= 1.1)
+        contribution = open_interest * (1 - np.abs(moneyness - 1) * 5)
+        total_gamma = np.where(near_money, contribution * sign, 0.0).sum(axis=1)
+
+        return {
+            f"{price:.2f}": float(gamma)
+            for price, gamma in zip(price_levels, total_gamma)
+        }
+
+    @profiled()
+    def analyze_gamma_levels(
+        self,
+        df: pd.DataFrame,
+        current_price: float,
+        top: int = 5,
+        spot_range: float = 0.20,
+    ) -> Dict[str, Any]:
+        """
+        Locate the zero-gamma flip level and the largest gamma walls.
 
-        for price in price_levels:
-            total_gamma = 0
+        Uses Black-Scholes gamma with each contract's implied volatility (see
+        GammaProfile), unlike the simplified calculate_gamma_exposure.
 
-            for _, row in df.iterrows():
-                # Simplified gamma approximation
-                moneyness = row["strike"] / price
-                if 0.9 <= moneyness <= 1.1:  # Near the money options have higher gamma
-                    gamma_contribution = row["openInterest"] * (
-                        1 - abs(moneyness - 1) * 5
-                    )
-                    if row["option_type"] == "call":
-                        total_gamma += gamma_contribution
-                    else:
-                        total_gamma -= gamma_contribution
+        Args:
+            df: Options DataFrame
+            current_price: Current stock price
+            top: Call and put walls to report
+            spot_range: Search for flips within this fraction of spot
 
-            gamma_exposure[f"{price:.2f}"] = total_gamma
+        Returns:
+            Dictionary with gamma_levels (see GammaProfile.levels),
+            gamma_walls and gamma_by_expiration
+        """
+        if df.empty or not current_price:
+            return {}
 
-        return gamma_exposure
+        profile = GammaProfile(df, current_price)
+        walls = profile.walls(top=top)
+        return {
+            "gamma_levels": profile.levels(
+                flips=profile.flip_levels(spot_range=spot_range), walls=walls
+            ),
+            "gamma_walls": walls,
+            "gamma_by_expiration": profile.by_expiration(),
+        }
 
+    @profiled()
+    @memoized
     def detect_sweeps(
-        self, df: pd.DataFrame, sweep_threshold: float = 0.5
+        self,
+        df: pd.DataFrame,
+        sweep_threshold: float = 0.5,
+        trades: Optional[pd.DataFrame] = None,
+        window_ms: float = 50.0,
     ) -> pd.DataFrame:
         """
         Detect and classify sweep trades in options data.
@@ -261,9 +715,15 @@ class OptionsAnalyzer:
         - Often institutional block trades
         - May indicate hedging rather than directional sentiment
 
+        When trade prints are supplied, sweeps are taken from the trade-level
+        detector (aggressive prints clustered across exchanges) instead of the
+        volume/dollar-flow percentile heuristic.
+
         Args:
             df: Options DataFrame
             sweep_threshold: Minimum volume percentile to consider for sweep detection
+            trades: Optional trade prints for the same contracts
+            window_ms: Clustering window for trade-level sweep detection
 
         Returns:
             DataFrame with sweep classification
@@ -276,50 +736,82 @@ class OptionsAnalyzer:
         # Calculate volume statistics for sweep detection
         volume_75th = df_copy["volume"].quantile(0.75)
         volume_95th = df_copy["volume"].quantile(0.95)
+        dollar_flow_90th = df_copy["dollar_flow"].quantile(0.90)
+        dollar_flow_95th = df_copy["dollar_flow"].quantile(0.95)
 
-        # Sweep detection criteria
-        def classify_trade_type(row):
-            volume = row["volume"]
-            oi = row["openInterest"]
-            vol_oi_ratio = volume / (oi + 1)  # Avoid division by zero
-
-            # Large volume indicators
-            is_large_volume = volume >= volume_95th
-            is_high_vol_oi = vol_oi_ratio >= 2.0
-
-            # Price characteristics (simplified - in real implementation would use bid/ask)
-            # For now, we'll use dollar flow as a proxy
-            dollar_flow = row["dollar_flow"]
-            is_large_dollar_flow = dollar_flow >= df_copy["dollar_flow"].quantile(0.90)
-
-            # Sweep classification
-            if is_large_volume and (is_high_vol_oi or is_large_dollar_flow):
-                return "sweep"
-            elif volume >= volume_75th:
-                return "block"
-            else:
-                return "retail"
-
-        df_copy["trade_type"] = df_copy.apply(classify_trade_type, axis=1)
-
-        # Add sweep confidence score
-        def calculate_sweep_confidence(row):
-            if row["trade_type"] != "sweep":
-                return 0.0
-
-            volume_score = min(row["volume"] / volume_95th, 3.0) / 3.0
-            vol_oi_score = min(row["volume"] / (row["openInterest"] + 1), 5.0) / 5.0
-            dollar_score = (
-                min(row["dollar_flow"] / df_copy["dollar_flow"].quantile(0.95), 2.0)
-                / 2.0
-            )
+        volume = df_copy["volume"].to_numpy(dtype=float)
+        dollar_flow = df_copy["dollar_flow"].to_numpy(dtype=float)
+        vol_oi_ratio = volume / (df_copy["openInterest"].to_numpy(dtype=float) + 1)
+
+        # Large volume indicators
+        is_large_volume = volume >= volume_95th
+        is_high_vol_oi = vol_oi_ratio >= 2.0
+
+        # Price characteristics (simplified - in real implementation would use bid/ask)
+        # For now, we'll use dollar flow as a proxy
+        is_large_dollar_flow = dollar_flow >= dollar_flow_90th
+
+        # Sweep classification
+        trade_type = np.select(
+            [
+                is_large_volume & (is_high_vol_oi | is_large_dollar_flow),
+                volume >= volume_75th,
+            ],
+            ["sweep", "block"],
+            default="retail",
+        )
 
-            return (volume_score + vol_oi_score + dollar_score) / 3.0
+        # Sweep confidence score
+        with np.errstate(divide="ignore", invalid="ignore"):
+            volume_score = np.minimum(volume / volume_95th, 3.0) / 3.0
+            vol_oi_score = np.minimum(vol_oi_ratio, 5.0) / 5.0
+            dollar_score = np.minimum(dollar_flow / dollar_flow_95th, 2.0) / 2.0
+        confidence = (volume_score + vol_oi_score + dollar_score) / 3.0
 
-        df_copy["sweep_confidence"] = df_copy.apply(calculate_sweep_confidence, axis=1)
+        if trades is not None:
+            trade_type, confidence = self._classify_from_trades(
+                df_copy, trade_type, trades, window_ms
+            )
+
+        df_copy["trade_type"] = trade_type
+        df_copy["sweep_confidence"] = np.where(trade_type == "sweep", confidence, 0.0)
 
         return df_copy
 
+    def _classify_from_trades(
+        self,
+        df: pd.DataFrame,
+        trade_type: np.ndarray,
+        trades: pd.DataFrame,
+        window_ms: float,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Relabel sweeps using trade-level detection on the supplied prints."""
+        trade_analyzer = TradeAnalyzer()
+        keys = trade_analyzer.key_columns
+
+        sweeps = trade_analyzer.detect_sweeps(trades, window_ms=window_ms)
+        by_contract = trade_analyzer.summarize_sweeps_by_contract(sweeps)
+        merged = df[keys].merge(by_contract, on=keys, how="left")
+
+        swept_size = merged["swept_size"].fillna(0).to_numpy(dtype=float)
+        max_exchanges = merged["max_exchanges"].fillna(0).to_numpy(dtype=float)
+        volume = df["volume"].to_numpy(dtype=float)
+
+        is_sweep = swept_size > 0
+        # Contracts the heuristic called sweeps but no prints confirm are blocks
+        trade_type = np.where(
+            is_sweep, "sweep", np.where(trade_type == "sweep", "block", trade_type)
+        )
+
+        swept_share = np.minimum(swept_size / np.maximum(volume, swept_size), 1.0)
+        exchange_score = np.minimum(max_exchanges / 4.0, 1.0)
+        with np.errstate(invalid="ignore"):
+            confidence = np.nan_to_num((swept_share + exchange_score) / 2.0)
+
+        return trade_type, confidence
+
+    @profiled()
+    @memoized
     def analyze_without_sweeps(self, df: pd.DataFrame) -> Dict[str, Any]:
         """
         Perform flow analysis excluding sweep trades to get cleaner sentiment.
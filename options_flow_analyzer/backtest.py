@@ -0,0 +1,296 @@
+"""Replay archived chain snapshots and score flow signals against later returns."""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+from .analyzer import OptionsAnalyzer
+from .snapshot import SNAPSHOT_SUFFIX, Snapshot
+
+# Directional signals scored by the backtest: +1 bullish, -1 bearish, 0 none
+SIGNALS = [
+    "bullish_sentiment",
+    "clean_bullish_sentiment",
+    "sweep_sentiment",
+    "unusual_call_bias",
+]
+
+DEFAULT_HORIZONS = (1, 5, 20)
+
+# One analyzer per worker process, created on first use
+_worker_analyzer: Optional[OptionsAnalyzer] = None
+
+
+def discover_archive(
+    root: str,
+    tickers: Optional[Iterable[str]] = None,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+) -> Dict[str, Dict[str, str]]:
+    """
+    Find the snapshots in an archive laid out as ``<root>/<date>/<TICKER>.ofs``.
+
+    Each date directory is what ``scan --snapshot-dir`` reads; directory names
+    must sort chronologically (YYYY-MM-DD).
+
+    Args:
+        root: Archive directory
+        tickers: Only include these symbols (default: all)
+        start: First date to include (inclusive)
+        end: Last date to include (inclusive)
+
+    Returns:
+        Mapping of date to {ticker: snapshot path}, in date order
+    """
+    wanted = {t.upper() for t in tickers} if tickers else None
+    archive = {}
+    for day in sorted(os.listdir(root)):
+        directory = os.path.join(root, day)
+        if not os.path.isdir(directory):
+            continue
+        if (start and day < start) or (end and day > end):
+            continue
+        paths = {
+            name[: -len(SNAPSHOT_SUFFIX)]: os.path.join(directory, name)
+            for name in sorted(os.listdir(directory))
+            if name.endswith(SNAPSHOT_SUFFIX)
+        }
+        if wanted is not None:
+            paths = {t: p for t, p in paths.items() if t in wanted}
+        if paths:
+            archive[day] = paths
+    return archive
+
+
+def _direction(flag: Any) -> int:
+    """Map a bullish flag (or a missing summary) to +1, -1 or 0."""
+    if flag is None:
+        return 0
+    return 1 if flag else -1
+
+
+def chain_signals(
+    chain: pd.DataFrame, analyzer: OptionsAnalyzer, min_volume: int = 10
+) -> Dict[str, Any]:
+    """
+    Compute the backtested signals for one chain.
+
+    Runs only the analyzer stages the signals need (sweep classification,
+    flow with and without sweeps, unusual activity), not the strike and max
+    pain tables.
+
+    Args:
+        chain: Options DataFrame
+        analyzer: Analyzer to use
+        min_volume: Minimum contract volume
+
+    Returns:
+        Dictionary of signal directions plus net_flow_ratio, the net dollar
+        flow as a fraction of total flow
+    """
+    chain = chain[chain["volume"] >= min_volume]
+    if chain.empty:
+        return {}
+
+    classified = analyzer.detect_sweeps(chain)
+    flows = analyzer.analyze_without_sweeps(classified)
+    everything = flows["all_trades"]
+    total_flow = everything["total_call_flow"] + everything["total_put_flow"]
+
+    unusual = analyzer.identify_unusual_activity(chain)
+    is_call = unusual["option_type"] == "call"
+    call_flow = unusual["dollar_flow"][is_call].sum()
+    put_flow = unusual["dollar_flow"][~is_call].sum()
+
+    return {
+        "net_flow_ratio": (
+            everything["net_dollar_flow"] / total_flow if total_flow else 0.0
+        ),
+        "bullish_sentiment": _direction(everything.get("bullish_sentiment")),
+        "clean_bullish_sentiment": _direction(
+            flows["without_sweeps"].get("bullish_sentiment")
+        ),
+        "sweep_sentiment": _direction(flows["sweeps_only"].get("bullish_sentiment")),
+        "unusual_call_bias": _direction(call_flow > put_flow if len(unusual) else None),
+        "sweep_count": flows["sweep_count"],
+        "unusual_count": len(unusual),
+    }
+
+
+def _replay_day(
+    task: Tuple[str, Dict[str, str], int],
+) -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
+    """
+    Compute signals for every snapshot of one day (runs in a worker process).
+
+    Only the small signal rows travel back to the parent; chains are read
+    from the memory-mapped snapshots inside the worker.
+    """
+    global _worker_analyzer
+    if _worker_analyzer is None:
+        _worker_analyzer = OptionsAnalyzer()
+
+    day, paths, min_volume = task
+    rows, errors = [], {}
+    for ticker, path in paths.items():
+        try:
+            with Snapshot.open(path) as snapshot:
+                spot = snapshot.spot
+                signals = chain_signals(snapshot.frame(), _worker_analyzer, min_volume)
+        except Exception as e:
+            errors[f"{day}/{ticker}"] = str(e)
+            continue
+        rows.append({"date": day, "ticker": ticker, "spot": spot, **signals})
+    return rows, errors
+
+
+class BacktestEngine:
+    """
+    Replays a snapshot archive day by day and scores each signal.
+
+    Days are spread across a process pool. Forward returns come from the
+    spot prices of the same ticker's later snapshots, so a horizon of N means
+    N snapshot days ahead.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        horizons: Sequence[int] = DEFAULT_HORIZONS,
+        min_volume: int = 10,
+        workers: Optional[int] = None,
+    ):
+        """
+        Args:
+            root: Archive directory (see discover_archive)
+            horizons: Forward return horizons in snapshot days
+            min_volume: Minimum contract volume when computing signals
+            workers: Worker processes (default: CPU count; 1 runs in-process)
+        """
+        self.root = root
+        self.horizons = sorted(set(horizons))
+        self.min_volume = min_volume
+        self.workers = workers or os.cpu_count() or 1
+        self.errors: Dict[str, str] = {}
+
+    def replay(
+        self,
+        tickers: Optional[Iterable[str]] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """
+        Compute signals for every snapshot in the archive.
+
+        Returns:
+            DataFrame with one row per (date, ticker): spot and signals
+        """
+        archive = discover_archive(self.root, tickers, start, end)
+        tasks = [(day, paths, self.min_volume) for day, paths in archive.items()]
+        rows: List[Dict[str, Any]] = []
+
+        if self.workers == 1 or len(tasks) <= 1:
+            results = map(_replay_day, tasks)
+            for day_rows, errors in results:
+                rows.extend(day_rows)
+                self.errors.update(errors)
+        else:
+            # Several days per task amortizes pickling and scheduling
+            chunksize = max(1, len(tasks) // (self.workers * 4))
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                for day_rows, errors in executor.map(
+                    _replay_day, tasks, chunksize=chunksize
+                ):
+                    rows.extend(day_rows)
+                    self.errors.update(errors)
+
+        signals = pd.DataFrame(rows)
+        if signals.empty:
+            return signals
+        # Snapshots with no qualifying contracts carry no signal
+        signals = signals.reindex(
+            columns=list(dict.fromkeys(list(signals.columns) + SIGNALS))
+        )
+        signals[SIGNALS] = signals[SIGNALS].fillna(0).astype(int)
+        return signals
+
+    def add_forward_returns(self, signals: pd.DataFrame) -> pd.DataFrame:
+        """Add a ``return_<N>`` column per horizon from later spot prices."""
+        signals = signals.sort_values(["ticker", "date"], ignore_index=True)
+        spot = signals["spot"].where(signals["spot"] > 0)
+        by_ticker = spot.groupby(signals["ticker"])
+        for horizon in self.horizons:
+            signals[f"return_{horizon}"] = by_ticker.shift(-horizon) / spot - 1
+        return signals
+
+    def summarize(self, signals: pd.DataFrame) -> pd.DataFrame:
+        """
+        Hit rate and return statistics for each signal and horizon.
+
+        A signal's return is the forward return in its direction (long when
+        bullish, short when bearish); rows where the signal is 0 or the
+        forward return is unknown are skipped.
+
+        Returns:
+            DataFrame with signal, horizon, count, hit_rate, mean_return,
+            median_return, t_stat and ic (rank correlation of net_flow_ratio
+            with the forward return, the same for every signal)
+        """
+        records = []
+        for horizon in self.horizons:
+            returns = signals[f"return_{horizon}"]
+            known = returns.notna()
+            # Spearman correlation as Pearson on ranks (pandas' spearman needs scipy)
+            ic = (
+                signals.loc[known, "net_flow_ratio"].rank().corr(returns[known].rank())
+                if known.sum() > 2
+                else np.nan
+            )
+            for signal in SIGNALS:
+                direction = signals[signal].to_numpy()
+                mask = known.to_numpy() & (direction != 0)
+                signed = direction[mask] * returns.to_numpy()[mask]
+                count = len(signed)
+                std = signed.std(ddof=1) if count > 1 else np.nan
+                records.append(
+                    {
+                        "signal": signal,
+                        "horizon": horizon,
+                        "count": count,
+                        "hit_rate": (signed > 0).mean() if count else np.nan,
+                        "mean_return": signed.mean() if count else np.nan,
+                        "median_return": np.median(signed) if count else np.nan,
+                        "t_stat": (
+                            signed.mean() / (std / np.sqrt(count))
+                            if count > 1 and std > 0
+                            else np.nan
+                        ),
+                        "ic": ic,
+                    }
+                )
+        return pd.DataFrame(records)
+
+    def run(
+        self,
+        tickers: Optional[Iterable[str]] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Replay the archive and score the signals.
+
+        Args:
+            tickers: Only replay these symbols (default: all)
+            start: First date to replay (inclusive, YYYY-MM-DD)
+            end: Last date to replay (inclusive, YYYY-MM-DD)
+
+        Returns:
+            Dictionary with ``summary`` (see summarize) and ``signals`` (one
+            row per snapshot with its signals and forward returns)
+        """
+        signals = self.replay(tickers, start, end)
+        if signals.empty:
+            return {"summary": pd.DataFrame(), "signals": signals}
+        signals = self.add_forward_returns(signals)
+        return {"summary": self.summarize(signals), "signals": signals}
@@ -0,0 +1,203 @@
+"""Out-of-core analysis of options data that does not fit in memory."""
+
+import pandas as pd
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from .analyzer import OptionsAnalyzer
+from .snapshot import SNAPSHOT_SUFFIX, Snapshot
+
+# Columns the chunked analyses read from disk
+ANALYSIS_COLUMNS = [
+    "strike",
+    "option_type",
+    "expiration",
+    "volume",
+    "openInterest",
+    "lastPrice",
+    "dollar_flow",
+]
+SIGNED_FLOW_COLUMNS = ["buy_volume", "sell_volume", "buy_premium", "sell_premium"]
+
+# Unusual contracts kept by default, so memory stays bounded by the chunk size
+UNUSUAL_LIMIT = 100
+
+
+def iter_file_chunks(
+    path: str, chunk_size: int = 1_000_000, columns: Optional[List[str]] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream a chain file in row batches.
+
+    Snapshots are sliced through their memory map, Parquet files are read one
+    record batch at a time (requires pyarrow) and CSV files are read with
+    pandas' chunked reader.
+
+    Args:
+        path: Path to a snapshot, .parquet or .csv file
+        chunk_size: Maximum rows per chunk
+        columns: Columns to read, or None for all
+
+    Yields:
+        DataFrames of at most chunk_size rows
+    """
+    if str(path).endswith(SNAPSHOT_SUFFIX):
+        with Snapshot.open(path) as snapshot:
+            yield from snapshot.iter_chunks(chunk_size, columns)
+    elif str(path).endswith(".parquet"):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError(
+                "Reading Parquet in chunks requires pyarrow: pip install pyarrow"
+            )
+
+        parquet_file = pq.ParquetFile(path)
+        if columns is not None:
+            available = set(parquet_file.schema_arrow.names)
+            columns = [column for column in columns if column in available]
+        for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=columns):
+            yield batch.to_pandas()
+    else:
+        usecols = None
+        if columns is not None:
+            wanted = set(columns)
+            usecols = lambda column: column in wanted  # noqa: E731
+        yield from pd.read_csv(path, chunksize=chunk_size, usecols=usecols)
+
+
+def _merge(partial: Optional[pd.DataFrame], update: pd.DataFrame) -> pd.DataFrame:
+    """Fold one chunk's grouped sums into the running partials."""
+    if partial is None:
+        return update
+    levels = list(range(update.index.nlevels))
+    return pd.concat([partial, update]).groupby(level=levels).sum()
+
+
+class ChunkedAnalyzer:
+    """Runs OptionsAnalyzer analyses over a stream of chunks with bounded memory."""
+
+    def __init__(self, analyzer: Optional[OptionsAnalyzer] = None):
+        self.analyzer = analyzer or OptionsAnalyzer()
+
+    def analyze_chunks(
+        self,
+        chunks: Iterable[pd.DataFrame],
+        current_price: float,
+        volume_threshold: float = 2.0,
+        unusual_limit: Optional[int] = UNUSUAL_LIMIT,
+    ) -> Dict[str, Any]:
+        """
+        Compute the standard analyses over a stream of chunks.
+
+        Each chunk is reduced to mergeable partials (flow totals and grouped
+        sums by strike and expiration) and then dropped, so peak memory is one
+        chunk plus the partials. Results match running the in-memory
+        OptionsAnalyzer methods on the concatenated data.
+
+        Args:
+            chunks: Iterable of Options DataFrames
+            current_price: Current stock price
+            volume_threshold: Volume/OI ratio threshold for unusual activity
+            unusual_limit: Keep only this many top unusual contracts, or None
+                to keep all of them (memory then grows with their number)
+
+        Returns:
+            Dictionary with flow_summary, strike_analysis, max_pain_strike,
+            max_pain, expiration_analysis and unusual_activity
+        """
+        analyzer = self.analyzer
+        totals: Dict[str, Any] = {}
+        strikes = max_pain = expirations = None
+        unusual: Optional[pd.DataFrame] = None
+        # Without a limit, every chunk's unusual rows are sorted once at the end
+        unusual_chunks: List[pd.DataFrame] = []
+        offset = 0
+
+        for chunk in chunks:
+            if chunk.empty:
+                continue
+
+            # Global row positions keep unusual-activity ties in input order
+            chunk = chunk.copy(deep=False)
+            chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+            offset += len(chunk)
+
+            for key, value in analyzer.flow_totals(chunk).items():
+                totals[key] = totals.get(key, 0) + value
+
+            strikes = _merge(strikes, analyzer.strike_partials(chunk))
+            max_pain = _merge(max_pain, analyzer.max_pain_partials(chunk))
+            expirations = _merge(expirations, analyzer.expiration_partials(chunk))
+
+            chunk_unusual = analyzer.identify_unusual_activity(chunk, volume_threshold)
+            if unusual_limit is None:
+                unusual_chunks.append(chunk_unusual)
+            else:
+                unusual = self._merge_unusual(unusual, chunk_unusual, unusual_limit)
+
+        if not offset:
+            return {
+                "flow_summary": {},
+                "strike_analysis": pd.DataFrame(),
+                "max_pain_strike": 0.0,
+                "max_pain": pd.DataFrame(),
+                "expiration_analysis": pd.DataFrame(),
+                "unusual_activity": pd.DataFrame(),
+            }
+
+        if unusual_limit is None:
+            unusual = self._merge_unusual(None, pd.concat(unusual_chunks), None)
+        max_pain_strike, max_pain_df = analyzer.finalize_max_pain(max_pain)
+        return {
+            "flow_summary": analyzer.summarize_flow_totals(totals),
+            "strike_analysis": analyzer.finalize_strike_distribution(
+                strikes, current_price
+            ),
+            "max_pain_strike": max_pain_strike,
+            "max_pain": max_pain_df,
+            "expiration_analysis": analyzer.finalize_expiration_flow(expirations),
+            "unusual_activity": unusual,
+        }
+
+    def analyze_file(
+        self,
+        path: str,
+        current_price: float,
+        chunk_size: int = 1_000_000,
+        volume_threshold: float = 2.0,
+        unusual_limit: Optional[int] = UNUSUAL_LIMIT,
+    ) -> Dict[str, Any]:
+        """
+        Compute the standard analyses over a snapshot, Parquet or CSV chain file.
+
+        Args:
+            path: Path to a snapshot, .parquet or .csv file
+            current_price: Current stock price
+            chunk_size: Maximum rows held in memory at once
+            volume_threshold: Volume/OI ratio threshold for unusual activity
+            unusual_limit: Keep only this many top unusual contracts, or None
+                for all of them
+
+        Returns:
+            Dictionary of analysis results (see analyze_chunks)
+        """
+        chunks = iter_file_chunks(
+            path, chunk_size, columns=ANALYSIS_COLUMNS + SIGNED_FLOW_COLUMNS
+        )
+        return self.analyze_chunks(
+            chunks, current_price, volume_threshold, unusual_limit
+        )
+
+    def _merge_unusual(
+        self,
+        unusual: Optional[pd.DataFrame],
+        update: pd.DataFrame,
+        limit: Optional[int],
+    ) -> pd.DataFrame:
+        """Fold one chunk's unusual contracts into the running result."""
+        if unusual is not None and not unusual.empty:
+            if update.empty:
+                return unusual
+            update = pd.concat([unusual, update])
+        # Multi-column sorts are stable, so ties keep their input order
+        update = update.sort_values(["volume", "dollar_flow"], ascending=[False, False])
+        return update.head(limit) if limit is not None else update
@@ -1,15 +1,280 @@
 """CLI entry point for Options Flow Analyzer using Typer."""
 
+import os
 import typer
-from typing import Optional
-from .data_fetcher import OptionsDataFetcher
-from .analyzer import OptionsAnalyzer
-from .display import OptionsDisplay
-from .config import Config
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+# Commands import what they need when they run, so --help and light commands
+# never load pandas, yfinance or rich
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Must match snapshot.SNAPSHOT_SUFFIX; kept here so help text needs no numpy
+SNAPSHOT_SUFFIX = ".ofs"
 
 app = typer.Typer(help="Options Flow Analyzer - Analyze options market activity")
 
 
+@app.callback()
+def main(
+    metrics: Optional[str] = typer.Option(
+        None,
+        "--metrics",
+        envvar="OPTIONS_FLOW_METRICS",
+        help="Write provider call metrics at exit (JSON for .json, else Prometheus text)",
+    ),
+    cache_dir: Optional[str] = typer.Option(
+        None,
+        "--cache-dir",
+        envvar="OPTIONS_FLOW_CACHE_DIR",
+        help="Persist analyze/live/serve results here and reuse them for unchanged "
+        "chains (entries are keyed by the package version and source, so they "
+        "are ignored after any code change). Entries are pickles: use a private "
+        "directory, since anyone able to write to it can run code as you",
+    ),
+):
+    """Options Flow Analyzer - Analyze options market activity"""
+    if cache_dir:
+        from .memo import RESULT_CACHE
+
+        RESULT_CACHE.path = cache_dir
+    if metrics:
+        import atexit
+
+        from .telemetry import TELEMETRY
+
+        atexit.register(TELEMETRY.write, metrics)
+
+
+def _check_format(output_format: str, output: Optional[str]) -> bool:
+    """Validate --format/--output and return True for machine-readable output."""
+    if output_format == "table":
+        return False
+
+    from .export import DIRECTORY_FORMATS, OUTPUT_FORMATS
+
+    if output_format not in OUTPUT_FORMATS:
+        raise typer.BadParameter(
+            f"must be one of: {', '.join(OUTPUT_FORMATS)}", param_hint="--format"
+        )
+    if output_format in DIRECTORY_FORMATS and not output:
+        raise typer.BadParameter(
+            f"{output_format} output needs a directory", param_hint="--output"
+        )
+    return True
+
+
+def _check_where(where: Optional[str]):
+    """Compile a --where filter up front so typos fail before any fetching."""
+    if not where:
+        return
+
+    from .filter_expr import FilterError, compile_filter
+
+    try:
+        compile_filter(where)
+    except FilterError as e:
+        raise typer.BadParameter(str(e), param_hint="--where")
+
+
+def _check_snapshot(path: Optional[str], ticker: str):
+    """Check that a --snapshot file is readable and holds the ticker's chain."""
+    if not path:
+        return
+
+    from .snapshot import Snapshot
+
+    try:
+        with Snapshot.open(path) as snapshot:
+            recorded = snapshot.ticker
+    except (OSError, ValueError) as e:
+        raise typer.BadParameter(str(e), param_hint="--snapshot")
+    if recorded and recorded.upper() != ticker:
+        raise typer.BadParameter(
+            f"{path} holds a {recorded} chain, not {ticker}", param_hint="--snapshot"
+        )
+
+
+def _read_trades(
+    trades_file: Optional[str], quotes_file: Optional[str]
+) -> Optional["pd.DataFrame"]:
+    """
+    Load --trades prints (with --quotes attached) before any fetching.
+
+    Side classification and trade-level sweeps need the NBBO at each print,
+    so prints without bid/ask columns are rejected unless --quotes is given.
+    """
+    if not trades_file:
+        return None
+
+    from .profiling import span
+    from .trades import TradeAnalyzer
+
+    trade_analyzer = TradeAnalyzer()
+    with span("read_trades"):
+        try:
+            trades = trade_analyzer.read_prints(trades_file)
+        except (OSError, ValueError) as e:
+            raise typer.BadParameter(str(e), param_hint="--trades")
+        if not quotes_file:
+            missing = [column for column in ("bid", "ask") if column not in trades]
+            if missing:
+                raise typer.BadParameter(
+                    f"prints have no {'/'.join(missing)} column; "
+                    "pass the NBBO with --quotes",
+                    param_hint="--trades",
+                )
+            return trades
+        try:
+            quotes = trade_analyzer.read_prints(quotes_file)
+        except (OSError, ValueError) as e:
+            raise typer.BadParameter(str(e), param_hint="--quotes")
+        return trade_analyzer.attach_quotes(trades, quotes)
+
+
+def _table_display():
+    """Create the rich display; machine-readable runs never import it."""
+    from .display import OptionsDisplay
+
+    return OptionsDisplay()
+
+
+def _status(display, message: str):
+    """Print a progress message in table mode."""
+    if display is not None:
+        display.console.print(message)
+
+
+def _warn(display, message: str):
+    """Report a warning on the display, or on stderr in machine-readable mode."""
+    if display is not None:
+        display.show_warning(message)
+    else:
+        typer.echo(f"Warning: {message}", err=True)
+
+
+def _fail(display, message: str):
+    """Report an error on the display, or on stderr in machine-readable mode."""
+    if display is not None:
+        display.show_error(message)
+    else:
+        typer.echo(f"Error: {message}", err=True)
+
+
+@contextmanager
+def _profiling(profile: bool, profile_output: Optional[str]):
+    """
+    Profile the enclosed command when --profile or --profile-output is given.
+
+    Prints the stage breakdown to stderr and writes profile_output (cProfile
+    statistics, or collapsed stacks for a .folded file) when the block ends.
+    """
+    if not (profile or profile_output):
+        yield
+        return
+
+    from .profiling import Profiler
+
+    cprofile = bool(profile_output) and not profile_output.endswith(".folded")
+    profiler = Profiler(cprofile=cprofile)
+    try:
+        with profiler:
+            yield
+    finally:
+        typer.echo("\n" + profiler.format_report(), err=True)
+        if profile_output:
+            profiler.dump(profile_output)
+            typer.echo(f"Profile written to {profile_output}", err=True)
+
+
+def _query_service(command: str, params: Dict[str, Any], display=None) -> Optional[Any]:
+    """
+    Run a command on the local analysis service if one is running.
+
+    A service that can't be reached or answers garbage is skipped, and a
+    404 (no data, or no data matching the filters) is reported as the
+    local path reports it: a warning, with the command exiting normally.
+
+    Returns:
+        The decoded response, or None when the command should run locally
+
+    Raises:
+        typer.Exit: After warning about a 404 response
+        ServiceError: For other errors reported by the service
+    """
+    from .client import ServiceClient, ServiceError, ServiceUnavailable
+
+    client = ServiceClient()
+    if not client.available():
+        return None
+    try:
+        return client.request(command, params)
+    except ServiceUnavailable:
+        return None
+    except ServiceError as e:
+        if e.status != 404:
+            raise
+        _warn(display, str(e))
+        raise typer.Exit(0)
+
+
+def _result_frames(results: Dict[str, Any]) -> Dict[str, Any]:
+    """Turn record lists from a service response back into DataFrames."""
+    import pandas as pd
+
+    return {
+        key: pd.DataFrame(value) if isinstance(value, list) else value
+        for key, value in results.items()
+    }
+
+
+def _show_results(
+    display, results: Dict[str, Any], classified: Optional["pd.DataFrame"] = None
+):
+    """Render analysis results as rich tables."""
+    if classified is not None:
+        display.console.print("\n[bold yellow]Detecting sweep trades...[/bold yellow]")
+        display.show_trade_classification(classified)
+        display.show_sweep_analysis(results["sweep_analysis"])
+        if results["sweeps_excluded"]:
+            display.console.print(
+                "\n[bold green]Analysis below excludes sweep trades for cleaner sentiment:[/bold green]"
+            )
+
+    display.show_flow_summary(results["flow_summary"])
+    display.show_strike_analysis(results["strike_analysis"])
+
+    unusual_activity = results.get("unusual_activity")
+    if unusual_activity is not None and not unusual_activity.empty:
+        display.show_unusual_activity(unusual_activity)
+
+    max_pain_df = results.get("max_pain")
+    if max_pain_df is not None and not max_pain_df.empty:
+        display.show_max_pain(results["max_pain_strike"], max_pain_df)
+
+    exp_analysis = results.get("expiration_analysis")
+    if exp_analysis is not None and not exp_analysis.empty:
+        display.show_expiration_analysis(exp_analysis)
+
+    oi_by_strike = results.get("oi_change_by_strike")
+    if oi_by_strike is not None:
+        display.show_oi_change(oi_by_strike, results["oi_change_by_expiration"])
+
+    if results.get("gamma_levels"):
+        display.show_gamma_levels(
+            results["gamma_levels"],
+            results["gamma_walls"],
+            results["gamma_by_expiration"],
+        )
+
+    combos = results.get("combos")
+    if combos is not None:
+        display.show_combos(
+            combos, results["combo_adjusted_flow"], results["flow_summary"]
+        )
+
+
 @app.command()
 def analyze(
     ticker: str = typer.Argument(..., help="Stock ticker symbol (e.g., SPY, AAPL)"),
@@ -22,6 +287,12 @@ def analyze(
     option_type: Optional[str] = typer.Option(
         None, "--option-type", "-t", help="Option type: calls or puts"
     ),
+    where: Optional[str] = typer.Option(
+        None,
+        "--where",
+        "-w",
+        help='Filter expression, e.g. "dte <= 14 and premium >= $1M and vol_oi > 5"',
+    ),
     show_unusual: bool = typer.Option(
         True, "--unusual/--no-unusual", help="Show unusual activity analysis"
     ),
@@ -34,140 +305,283 @@ def analyze(
     multiple_expirations: bool = typer.Option(
         False, "--multi-exp", "-m", help="Analyze multiple expirations"
     ),
+    show_gamma: bool = typer.Option(
+        False, "--gamma", help="Show the gamma flip level and gamma walls"
+    ),
+    show_combos: bool = typer.Option(
+        False,
+        "--combos",
+        help="Detect multi-leg combos and show flow without their legs",
+    ),
+    trades_file: Optional[str] = typer.Option(
+        None,
+        "--trades",
+        help="Trade prints file (CSV or Parquet) with bid/ask (or use --quotes), for trade-level sweeps",
+    ),
+    quotes_file: Optional[str] = typer.Option(
+        None,
+        "--quotes",
+        help="NBBO quotes file (CSV or Parquet) to classify trade prints by side",
+    ),
+    snapshot: Optional[str] = typer.Option(
+        None, "--snapshot", help="Analyze a saved chain snapshot instead of fetching"
+    ),
+    save_snapshot: Optional[str] = typer.Option(
+        None, "--save-snapshot", help="Save the fetched chain to a snapshot file"
+    ),
+    previous_snapshot: Optional[str] = typer.Option(
+        None,
+        "--previous-snapshot",
+        help="Earlier snapshot of the chain, for open interest change and opening flow",
+    ),
+    output_format: str = typer.Option(
+        "table",
+        "--format",
+        "-f",
+        help="Output format: table, json, jsonl, csv or parquet",
+    ),
+    output: Optional[str] = typer.Option(
+        None,
+        "--output",
+        "-o",
+        help="Output file (json/jsonl) or directory (csv/parquet); default stdout",
+    ),
+    use_server: bool = typer.Option(
+        True,
+        "--server/--no-server",
+        help="Use the local analysis service (serve command) when it is running",
+    ),
+    profile: bool = typer.Option(
+        False, "--profile", help="Print a per-stage timing and memory breakdown"
+    ),
+    profile_output: Optional[str] = typer.Option(
+        None,
+        "--profile-output",
+        help="Write a cProfile dump, or span stacks for a .folded file",
+    ),
 ):
     """Analyze options flow data for a given ticker."""
 
-    # Initialize components
-    fetcher = OptionsDataFetcher()
-    analyzer = OptionsAnalyzer()
-    display = OptionsDisplay()
+    from .export import write_results
+    from .profiling import span
+
+    machine = _check_format(output_format, output)
+    _check_where(where)
+    display = None if machine else _table_display()
 
     # Validate ticker format
     ticker = ticker.upper().strip()
+    _check_snapshot(snapshot, ticker)
 
-    try:
-        # Show loading message
-        display.console.print(
-            f"\n[bold blue]Fetching options data for {ticker}...[/bold blue]"
-        )
+    with _profiling(profile, profile_output):
+        trades = _read_trades(trades_file, quotes_file)
+        try:
+            # A running analysis service answers from its warm caches
+            response = None
+            if use_server and not (
+                snapshot or save_snapshot or previous_snapshot or trades_file
+            ):
+                with span("service"):
+                    response = _query_service(
+                        "analyze",
+                        {
+                            "ticker": ticker,
+                            "expiration": expiration,
+                            "min_volume": min_volume,
+                            "option_type": option_type,
+                            "where": where,
+                            "sweeps": int(detect_sweeps),
+                            "unusual": int(show_unusual),
+                            "max_pain": int(show_max_pain),
+                            "multi_exp": int(multiple_expirations),
+                            "gamma": int(show_gamma),
+                            "combos": int(show_combos),
+                            "contracts": int(detect_sweeps and not machine),
+                        },
+                        display,
+                    )
 
-        # Try to get ticker info from Polygon first, fallback to yfinance
-        ticker_info = fetcher.get_polygon_ticker_info(ticker)
-        if "error" in ticker_info:
-            display.show_warning("Polygon API failed, trying yfinance...")
-            ticker_info = fetcher.get_ticker_info(ticker)
+            if response is not None:
+                ticker_info = response["ticker_info"]
+                results = _result_frames(response["results"])
+                if machine:
+                    with span("export"):
+                        write_results(
+                            {"ticker_info": ticker_info, **results},
+                            output_format,
+                            output,
+                        )
+                    return
 
-        display.show_ticker_info(ticker_info)
+                display.show_ticker_info(ticker_info)
+                display.show_success(
+                    f"Found {response['contracts_matched']} option contracts matching criteria"
+                )
+                classified = response.get("contracts")
+                if classified is not None:
+                    classified = _result_frames({"contracts": classified})["contracts"]
+                with span("render"):
+                    _show_results(display, results, classified)
+                display.console.print("\n[bold green]Analysis complete![/bold green]")
+                return
 
-        if "error" in ticker_info:
-            display.show_error(
-                "All data sources failed. Try using demo mode: python -m options_analyzer demo"
-            )
-            return
+            from .analyzer import OptionsAnalyzer
+            from .data_fetcher import OptionsDataFetcher
+            from .memo import RESULT_CACHE
+            from .snapshot import Snapshot, write_snapshot
 
-        current_price = ticker_info.get("current_price", 0)
+            # Initialize components
+            fetcher = OptionsDataFetcher()
+            analyzer = OptionsAnalyzer(memo=RESULT_CACHE)
 
-        # Fetch options data using Polygon API
-        if multiple_expirations:
-            display.show_warning(
-                "Multiple expirations not fully supported with Polygon API yet"
-            )
-            options_data = fetcher.get_polygon_options_data(ticker, expiration)
-        else:
-            options_data = fetcher.get_polygon_options_data(ticker, expiration)
+            if snapshot:
+                # Load a saved chain instead of calling the data providers
+                with span("snapshot_load"), Snapshot.open(snapshot) as chain_snapshot:
+                    ticker_info = chain_snapshot.ticker_info()
+                    current_price = chain_snapshot.spot
+                    options_data = chain_snapshot.frame()
+                if expiration:
+                    # The snapshot holds every expiration it was saved with
+                    options_data = options_data[
+                        options_data["expiration"].astype(str) == expiration
+                    ]
+                if display:
+                    display.show_ticker_info(ticker_info)
+            else:
+                # Show loading message
+                _status(
+                    display,
+                    f"\n[bold blue]Fetching options data for {ticker}...[/bold blue]",
+                )
 
-        if options_data.empty:
-            display.show_error(f"No options data found for {ticker}")
-            return
+                # Try to get ticker info from Polygon first, fallback to yfinance
+                ticker_info = fetcher.get_polygon_ticker_info(ticker)
+                if "error" in ticker_info:
+                    _warn(display, "Polygon API failed, trying yfinance...")
+                    ticker_info = fetcher.get_ticker_info(ticker)
 
-        # Filter data based on criteria
-        filtered_data = fetcher.filter_options_data(
-            options_data, min_volume=min_volume, option_type=option_type
-        )
+                if display:
+                    display.show_ticker_info(ticker_info)
 
-        if filtered_data.empty:
-            display.show_warning(f"No options data matches the specified criteria")
-            return
+                if "error" in ticker_info:
+                    _fail(
+                        display,
+                        "All data sources failed. Try using demo mode: python -m options_analyzer demo",
+                    )
+                    return
 
-        display.show_success(
-            f"Found {len(filtered_data)} option contracts matching criteria"
-        )
+                current_price = ticker_info.get("current_price", 0)
 
-        # Detect sweeps if requested
-        if detect_sweeps:
-            display.console.print(
-                "\n[bold yellow]Detecting sweep trades...[/bold yellow]"
-            )
-            filtered_data = analyzer.detect_sweeps(filtered_data)
+                # Fetch options data using Polygon API
+                if multiple_expirations:
+                    _warn(
+                        display,
+                        "Multiple expirations not fully supported with Polygon API yet",
+                    )
+                    options_data = fetcher.get_polygon_options_data(ticker, expiration)
+                else:
+                    options_data = fetcher.get_polygon_options_data(ticker, expiration)
 
-            # Show trade classification
-            display.show_trade_classification(filtered_data)
+            if save_snapshot and not options_data.empty:
+                write_snapshot(
+                    options_data,
+                    save_snapshot,
+                    current_price,
+                    ticker,
+                    metadata={"ticker_info": ticker_info},
+                )
 
-            # Analyze with and without sweeps
-            sweep_analysis = analyzer.analyze_without_sweeps(filtered_data)
-            display.show_sweep_analysis(sweep_analysis)
+            if options_data.empty:
+                _fail(display, f"No options data found for {ticker}")
+                return
 
-            # Use clean data (without sweeps) for main analysis
-            clean_data = filtered_data[filtered_data["trade_type"] != "sweep"].copy()
-            if not clean_data.empty:
-                flow_summary = analyzer.calculate_flow_summary(clean_data)
-                strike_analysis = analyzer.analyze_strike_distribution(
-                    clean_data, current_price
-                )
-                display.console.print(
-                    "\n[bold green]Analysis below excludes sweep trades for cleaner sentiment:[/bold green]"
-                )
-            else:
-                flow_summary = analyzer.calculate_flow_summary(filtered_data)
-                strike_analysis = analyzer.analyze_strike_distribution(
-                    filtered_data, current_price
-                )
-        else:
-            # Regular analysis without sweep detection
-            flow_summary = analyzer.calculate_flow_summary(filtered_data)
-            strike_analysis = analyzer.analyze_strike_distribution(
-                filtered_data, current_price
+            if previous_snapshot:
+                from .oi_change import OpenInterestChange
+
+                with span("oi_change"), Snapshot.open(previous_snapshot) as earlier:
+                    previous = earlier.frame()
+                    options_data = OpenInterestChange(previous).join(options_data)
+
+            # Filter data based on criteria
+            filtered_data = fetcher.filter_options_data(
+                options_data,
+                min_volume=min_volume,
+                option_type=option_type,
+                where=where,
+                spot=current_price,
             )
 
-        # Display results
-        display.show_flow_summary(flow_summary)
-        display.show_strike_analysis(strike_analysis)
+            if filtered_data.empty:
+                _warn(display, f"No options data matches the specified criteria")
+                return
 
-        # Optional analyses
-        if show_unusual:
-            unusual_activity = analyzer.identify_unusual_activity(filtered_data)
-            if not unusual_activity.empty:
-                display.show_unusual_activity(unusual_activity)
+            if display:
+                display.show_success(
+                    f"Found {len(filtered_data)} option contracts matching criteria"
+                )
 
-        if show_max_pain:
-            max_pain_strike, max_pain_df = analyzer.find_max_pain(filtered_data)
-            if not max_pain_df.empty:
-                display.show_max_pain(max_pain_strike, max_pain_df)
+            # Classify trade prints by aggressor side for signed flow
+            if trades is not None:
+                filtered_data = analyzer.add_signed_flow(filtered_data, trades)
 
-        # Show expiration analysis if multiple expirations
-        if multiple_expirations:
-            exp_analysis = analyzer.analyze_expiration_flow(filtered_data)
-            if not exp_analysis.empty:
-                display.show_expiration_analysis(exp_analysis)
+            results, classified = analyzer.analyze_chain(
+                filtered_data,
+                current_price,
+                trades=trades,
+                detect_sweeps=detect_sweeps,
+                show_unusual=show_unusual,
+                show_max_pain=show_max_pain,
+                # Show expiration analysis if multiple expirations
+                show_expirations=multiple_expirations,
+                show_gamma=show_gamma,
+                show_combos=show_combos,
+            )
 
-        display.console.print("\n[bold green]Analysis complete![/bold green]")
+            if machine:
+                with span("export"):
+                    write_results(
+                        {"ticker_info": ticker_info, **results}, output_format, output
+                    )
+                return
 
-    except Exception as e:
-        display.show_error(f"An error occurred during analysis: {str(e)}")
-        raise typer.Exit(1)
+            with span("render"):
+                _show_results(display, results, classified)
+            display.console.print("\n[bold green]Analysis complete![/bold green]")
+
+        except typer.Exit:
+            raise
+        except Exception as e:
+            _fail(display, f"An error occurred during analysis: {str(e)}")
+            raise typer.Exit(1)
 
 
 @app.command()
-def expirations(ticker: str = typer.Argument(..., help="Stock ticker symbol")):
+def expirations(
+    ticker: str = typer.Argument(..., help="Stock ticker symbol"),
+    use_server: bool = typer.Option(
+        True,
+        "--server/--no-server",
+        help="Use the local analysis service (serve command) when it is running",
+    ),
+):
     """List available expiration dates for a ticker."""
 
-    fetcher = OptionsDataFetcher()
-    display = OptionsDisplay()
+    display = _table_display()
 
     ticker = ticker.upper().strip()
 
     try:
-        expirations = fetcher.get_options_expirations(ticker)
+        response = (
+            _query_service("expirations", {"ticker": ticker}, display)
+            if use_server
+            else None
+        )
+        if response is not None:
+            expirations = response["expirations"]
+        else:
+            from .data_fetcher import OptionsDataFetcher
+
+            expirations = OptionsDataFetcher().get_options_expirations(ticker)
 
         if not expirations:
             display.show_error(f"No options expirations found for {ticker}")
@@ -179,6 +593,8 @@ def expirations(ticker: str = typer.Argument(..., help="Stock ticker symbol")):
         for exp in expirations:
             display.console.print(f"  • {exp}")
 
+    except typer.Exit:
+        raise
     except Exception as e:
         display.show_error(f"Error fetching expirations: {str(e)}")
         raise typer.Exit(1)
@@ -190,85 +606,858 @@ def demo(
     min_volume: int = typer.Option(
         50, "--min-volume", "-v", help="Minimum volume for filtering"
     ),
+    where: Optional[str] = typer.Option(
+        None,
+        "--where",
+        "-w",
+        help='Filter expression, e.g. "dte <= 14 and premium >= $1M and vol_oi > 5"',
+    ),
+    snapshot: Optional[str] = typer.Option(
+        None, "--snapshot", help="Run the demo on a saved chain snapshot"
+    ),
+    save_snapshot: Optional[str] = typer.Option(
+        None, "--save-snapshot", help="Save the sample chain to a snapshot file"
+    ),
+    output_format: str = typer.Option(
+        "table",
+        "--format",
+        "-f",
+        help="Output format: table, json, jsonl, csv or parquet",
+    ),
+    output: Optional[str] = typer.Option(
+        None,
+        "--output",
+        "-o",
+        help="Output file (json/jsonl) or directory (csv/parquet); default stdout",
+    ),
+    profile: bool = typer.Option(
+        False, "--profile", help="Print a per-stage timing and memory breakdown"
+    ),
+    profile_output: Optional[str] = typer.Option(
+        None,
+        "--profile-output",
+        help="Write a cProfile dump, or span stacks for a .folded file",
+    ),
 ):
     """Run a demo with sample data (no API keys required)."""
 
+    from .analyzer import OptionsAnalyzer
+    from .data_fetcher import OptionsDataFetcher
+    from .export import write_results
+    from .profiling import span
+    from .snapshot import Snapshot, write_snapshot
+
+    machine = _check_format(output_format, output)
+    _check_where(where)
+
     # Initialize components
     fetcher = OptionsDataFetcher()
     analyzer = OptionsAnalyzer()
-    display = OptionsDisplay()
+    display = None if machine else _table_display()
 
     ticker = ticker.upper().strip()
 
+    with _profiling(profile, profile_output):
+        try:
+            _status(
+                display,
+                f"\n[bold blue]Running demo analysis for {ticker} with sample data...[/bold blue]",
+            )
+
+            # Get sample options data
+            with span("sample_data"):
+                if snapshot:
+                    # A saved chain is priced against the spot it was saved with
+                    with Snapshot.open(snapshot) as chain_snapshot:
+                        ticker_info = chain_snapshot.ticker_info()
+                        options_data = chain_snapshot.frame()
+                else:
+                    ticker_info = {
+                        "symbol": ticker,
+                        "current_price": 100.0,
+                        "market_cap": 50000000000,
+                        "volume": 75000000,
+                        "company_name": f"{ticker} Sample Company",
+                    }
+                    options_data = fetcher.get_sample_options_data(ticker)
+
+            if display:
+                display.show_ticker_info(ticker_info)
+
+            current_price = ticker_info["current_price"]
+            ticker = ticker_info["symbol"] or ticker
+
+            if save_snapshot:
+                write_snapshot(
+                    options_data,
+                    save_snapshot,
+                    current_price,
+                    ticker,
+                    metadata={"ticker_info": ticker_info},
+                )
+
+            # Filter data based on criteria
+            filtered_data = fetcher.filter_options_data(
+                options_data, min_volume=min_volume, where=where, spot=current_price
+            )
+
+            if filtered_data.empty:
+                _warn(display, f"No sample data matches the specified criteria")
+                return
+
+            # Perform analysis
+            results, _ = analyzer.analyze_chain(filtered_data, current_price)
+
+            if machine:
+                with span("export"):
+                    write_results(
+                        {"ticker_info": ticker_info, **results}, output_format, output
+                    )
+                return
+
+            display.show_success(
+                f"Generated {len(filtered_data)} sample option contracts"
+            )
+
+            # Display results
+            with span("render"):
+                _show_results(display, results)
+
+            display.console.print("\n[bold green]Demo analysis complete![/bold green]")
+            display.console.print(
+                "\n[yellow]Note: This demo uses randomly generated sample data for demonstration purposes.[/yellow]"
+            )
+
+        except Exception as e:
+            _fail(display, f"An error occurred during demo: {str(e)}")
+            raise typer.Exit(1)
+
+
+@app.command("analyze-file")
+def analyze_file(
+    path: str = typer.Argument(..., help="Chain file to analyze (Parquet or CSV)"),
+    current_price: float = typer.Option(
+        ..., "--price", "-p", help="Current price of the underlying"
+    ),
+    chunk_size: int = typer.Option(
+        1_000_000, "--chunk-size", "-c", help="Maximum rows held in memory at once"
+    ),
+    top_unusual: int = typer.Option(
+        100, "--top-unusual", help="Unusual contracts to keep while streaming"
+    ),
+    output_format: str = typer.Option(
+        "table",
+        "--format",
+        "-f",
+        help="Output format: table, json, jsonl, csv or parquet",
+    ),
+    output: Optional[str] = typer.Option(
+        None,
+        "--output",
+        "-o",
+        help="Output file (json/jsonl) or directory (csv/parquet); default stdout",
+    ),
+):
+    """Analyze a chain file larger than memory in streamed chunks."""
+
+    from .chunked import ChunkedAnalyzer
+    from .export import write_results
+
+    machine = _check_format(output_format, output)
+    display = None if machine else _table_display()
+
     try:
-        display.console.print(
-            f"\n[bold blue]Running demo analysis for {ticker} with sample data...[/bold blue]"
+        _status(
+            display,
+            f"\n[bold blue]Analyzing {path} in chunks of {chunk_size:,} rows...[/bold blue]",
+        )
+        results = ChunkedAnalyzer().analyze_file(
+            path, current_price, chunk_size=chunk_size, unusual_limit=top_unusual
         )
 
-        # Show sample ticker info
-        ticker_info = {
-            "symbol": ticker,
-            "current_price": 100.0,
-            "market_cap": 50000000000,
-            "volume": 75000000,
-            "company_name": f"{ticker} Sample Company",
+        if not results["flow_summary"]:
+            _fail(display, f"No options data found in {path}")
+            return
+
+        if machine:
+            write_results(results, output_format, output)
+            return
+
+        display.show_flow_summary(results["flow_summary"])
+        display.show_strike_analysis(results["strike_analysis"])
+        if not results["unusual_activity"].empty:
+            display.show_unusual_activity(results["unusual_activity"])
+        display.show_max_pain(results["max_pain_strike"], results["max_pain"])
+        display.show_expiration_analysis(results["expiration_analysis"])
+
+        display.console.print("\n[bold green]Analysis complete![/bold green]")
+
+    except Exception as e:
+        _fail(display, f"An error occurred during analysis: {str(e)}")
+        raise typer.Exit(1)
+
+
+@app.command("oi-change")
+def oi_change(
+    previous: str = typer.Argument(
+        ..., help="Earlier chain (snapshot, Parquet or CSV)"
+    ),
+    current: str = typer.Argument(..., help="Later chain (snapshot, Parquet or CSV)"),
+    top: int = typer.Option(15, "--top", "-n", help="Rows to show per table"),
+    output_format: str = typer.Option(
+        "table",
+        "--format",
+        "-f",
+        help="Output format: table, json, jsonl, csv or parquet",
+    ),
+    output: Optional[str] = typer.Option(
+        None,
+        "--output",
+        "-o",
+        help="Output file (json/jsonl) or directory (csv/parquet); default stdout",
+    ),
+):
+    """Compare open interest between two chains, including full-market files."""
+
+    import pandas as pd
+
+    from .analyzer import OptionsAnalyzer
+    from .chunked import iter_file_chunks
+    from .export import write_results
+    from .oi_change import OpenInterestChange
+    from .snapshot import SNAPSHOT_SUFFIX, Snapshot
+
+    machine = _check_format(output_format, output)
+    display = None if machine else _table_display()
+
+    def read_chain(path: str) -> pd.DataFrame:
+        if path.endswith(SNAPSHOT_SUFFIX):
+            # Categorical columns let the join reuse the stored string codes;
+            # the copy lets the map close
+            with Snapshot.open(path) as snapshot:
+                return snapshot.frame(as_category=True).copy()
+        return pd.concat(iter_file_chunks(path), ignore_index=True)
+
+    try:
+        joined = OpenInterestChange(read_chain(previous)).join(read_chain(current))
+        if joined.empty:
+            _fail(display, f"No options data found in {current}")
+            raise typer.Exit(1)
+
+        analyzer = OptionsAnalyzer()
+        results = {
+            "flow_summary": analyzer.calculate_flow_summary(joined),
+            **analyzer.analyze_oi_change(joined),
         }
-        display.show_ticker_info(ticker_info)
 
-        current_price = ticker_info["current_price"]
+        if machine:
+            write_results(results, output_format, output)
+            return
+
+        display.show_flow_summary(results["flow_summary"])
+        display.show_oi_change(
+            results["oi_change_by_strike"], results["oi_change_by_expiration"], top
+        )
+
+    except typer.Exit:
+        raise
+    except Exception as e:
+        _fail(display, f"An error occurred during open interest comparison: {str(e)}")
+        raise typer.Exit(1)
+
+
+@app.command()
+def scan(
+    tickers: Optional[List[str]] = typer.Argument(
+        None, help="Stock ticker symbols to rank"
+    ),
+    universe: Optional[str] = typer.Option(
+        None, "--universe", "-u", help="File with one ticker symbol per line"
+    ),
+    top: int = typer.Option(10, "--top", "-k", help="Tickers to keep per metric"),
+    min_volume: int = typer.Option(
+        10, "--min-volume", "-v", help="Minimum volume for filtering"
+    ),
+    where: Optional[str] = typer.Option(
+        None,
+        "--where",
+        "-w",
+        help='Filter expression, e.g. "dte <= 14 and premium >= $1M and vol_oi > 5"',
+    ),
+    demo_data: bool = typer.Option(
+        False, "--demo", help="Use generated sample data instead of API calls"
+    ),
+    snapshot_dir: Optional[str] = typer.Option(
+        None,
+        "--snapshot-dir",
+        help=f"Directory of <TICKER>{SNAPSHOT_SUFFIX} snapshots to scan instead of fetching",
+    ),
+    rollup_file: Optional[str] = typer.Option(
+        None,
+        "--rollup",
+        help="Taxonomy JSON of sectors/ETFs to roll the scanned flow up into",
+    ),
+    previous_gex_file: Optional[str] = typer.Option(
+        None,
+        "--previous-gex",
+        help="GEX saved by an earlier scan (--save-gex), to rank GEX change",
+    ),
+    save_gex: Optional[str] = typer.Option(
+        None,
+        "--save-gex",
+        help="Save each scanned ticker's GEX to this JSON file for a later scan",
+    ),
+    output_format: str = typer.Option(
+        "table",
+        "--format",
+        "-f",
+        help="Output format: table, json, jsonl, csv or parquet",
+    ),
+    output: Optional[str] = typer.Option(
+        None,
+        "--output",
+        "-o",
+        help="Output file (json/jsonl) or directory (csv/parquet); default stdout",
+    ),
+    use_server: bool = typer.Option(
+        True,
+        "--server/--no-server",
+        help="Use the local analysis service (serve command) when it is running",
+    ),
+):
+    """Rank unusual options flow across a universe of tickers."""
+
+    from .data_fetcher import OptionsDataFetcher
+    from .export import write_results
+    from .ranking import UniverseRanker, read_gex, write_gex
+    from .rollup import FlowRollup, Taxonomy
+    from .snapshot import Snapshot
+
+    machine = _check_format(output_format, output)
+    _check_where(where)
+    fetcher = OptionsDataFetcher()
+    display = None if machine else _table_display()
+
+    symbols = [t.upper().strip() for t in tickers or []]
+    if universe:
+        with open(universe, "r", encoding="utf-8") as fh:
+            symbols.extend(line.strip().upper() for line in fh if line.strip())
+    if snapshot_dir and not symbols:
+        # Scan every snapshot in the directory
+        symbols = sorted(
+            name[: -len(SNAPSHOT_SUFFIX)]
+            for name in os.listdir(snapshot_dir)
+            if name.endswith(SNAPSHOT_SUFFIX)
+        )
+
+    if not symbols:
+        _fail(display, "No tickers given. Pass symbols or --universe FILE")
+        raise typer.Exit(1)
+
+    def load_chain(symbol: str):
+        if snapshot_dir:
+            path = os.path.join(snapshot_dir, f"{symbol}{SNAPSHOT_SUFFIX}")
+            # Copied out so each ticker's map closes before the next opens
+            with Snapshot.open(path) as chain_snapshot:
+                chain = chain_snapshot.frame().copy()
+                current_price = chain_snapshot.spot
+        elif demo_data:
+            chain, current_price = fetcher.get_sample_options_data(symbol), 100.0
+        else:
+            ticker_info = fetcher.get_polygon_ticker_info(symbol)
+            if "error" in ticker_info:
+                ticker_info = fetcher.get_ticker_info(symbol)
+            current_price = ticker_info.get("current_price", 0)
+            chain = fetcher.get_polygon_options_data(symbol)
+        chain = fetcher.filter_options_data(
+            chain, min_volume=min_volume, where=where, spot=current_price
+        )
+        return chain, current_price
+
+    def on_error(symbol: str, error: Any):
+        _warn(display, f"Skipping {symbol}: {error}")
 
-        # Get sample options data
-        options_data = fetcher.get_sample_options_data(ticker)
+    try:
+        _status(display, f"\n[bold blue]Scanning {len(symbols)} tickers...[/bold blue]")
+        response = None
+        rollup = FlowRollup(Taxonomy.load(rollup_file)) if rollup_file else None
+        previous_gex = None
+        if previous_gex_file and os.path.exists(previous_gex_file):
+            previous_gex = read_gex(previous_gex_file)
+        elif previous_gex_file:
+            # First scan of a --previous-gex/--save-gex pair
+            _warn(
+                display, f"{previous_gex_file} not found; GEX change needs a prior scan"
+            )
+        if use_server and not (snapshot_dir or rollup or previous_gex_file or save_gex):
+            response = _query_service(
+                "scan",
+                {
+                    "tickers": ",".join(symbols),
+                    "top": top,
+                    "min_volume": min_volume,
+                    "where": where,
+                    "demo": int(demo_data),
+                },
+                display,
+            )
 
-        # Filter data based on criteria
-        filtered_data = fetcher.filter_options_data(options_data, min_volume=min_volume)
+        if response is not None:
+            for symbol, error in response["skipped"].items():
+                on_error(symbol, error)
+            rankings = _result_frames(response["rankings"])
+            tickers_processed = response["tickers_processed"]
+        else:
+            ranker = UniverseRanker(top_k=top, previous_gex=previous_gex, rollup=rollup)
+            rankings = ranker.scan(symbols, load_chain, on_error=on_error)
+            tickers_processed = ranker.tickers_processed
+            if save_gex:
+                # Tickers missing from this scan keep their earlier value
+                write_gex({**(previous_gex or {}), **ranker.gex}, save_gex)
 
-        if filtered_data.empty:
-            display.show_warning(f"No sample data matches the specified criteria")
+        if machine:
+            if rollup:
+                rankings["rollup"] = rollup.frame()
+            write_results(rankings, output_format, output)
             return
 
-        display.show_success(f"Generated {len(filtered_data)} sample option contracts")
+        display.show_universe_ranking(rankings)
+        if rollup:
+            display.show_rollup(rollup.frame())
+        display.show_success(f"Ranked {tickers_processed} tickers")
+
+    except typer.Exit:
+        raise
+    except Exception as e:
+        _fail(display, f"An error occurred during scan: {str(e)}")
+        raise typer.Exit(1)
+
+
+@app.command()
+def backtest(
+    archive: str = typer.Argument(
+        ..., help=f"Snapshot archive laid out as <date>/<TICKER>{SNAPSHOT_SUFFIX}"
+    ),
+    tickers: Optional[List[str]] = typer.Argument(
+        None, help="Only replay these tickers (default: all in the archive)"
+    ),
+    start: Optional[str] = typer.Option(
+        None, "--start", help="First date to replay (YYYY-MM-DD)"
+    ),
+    end: Optional[str] = typer.Option(
+        None, "--end", help="Last date to replay (YYYY-MM-DD)"
+    ),
+    horizons: str = typer.Option(
+        "1,5,20",
+        "--horizons",
+        help="Comma-separated forward return horizons in snapshot days",
+    ),
+    min_volume: int = typer.Option(
+        10, "--min-volume", "-v", help="Minimum volume for filtering"
+    ),
+    workers: Optional[int] = typer.Option(
+        None, "--workers", "-w", help="Worker processes (default: CPU count)"
+    ),
+    output_format: str = typer.Option(
+        "table",
+        "--format",
+        "-f",
+        help="Output format: table, json, jsonl, csv or parquet",
+    ),
+    output: Optional[str] = typer.Option(
+        None,
+        "--output",
+        "-o",
+        help="Output file (json/jsonl) or directory (csv/parquet); default stdout",
+    ),
+):
+    """Replay archived snapshots and score flow signals against later returns."""
+
+    from .backtest import BacktestEngine
+    from .export import write_results
 
-        # Perform analysis
-        flow_summary = analyzer.calculate_flow_summary(filtered_data)
-        strike_analysis = analyzer.analyze_strike_distribution(
-            filtered_data, current_price
+    machine = _check_format(output_format, output)
+    display = None if machine else _table_display()
+
+    try:
+        engine = BacktestEngine(
+            archive,
+            horizons=[int(h) for h in horizons.split(",") if h],
+            min_volume=min_volume,
+            workers=workers,
         )
+        _status(display, f"\n[bold blue]Replaying {archive}...[/bold blue]")
+        results = engine.run(tickers, start=start, end=end)
+        for key, error in engine.errors.items():
+            _warn(display, f"Skipping {key}: {error}")
 
-        # Display results
-        display.show_flow_summary(flow_summary)
-        display.show_strike_analysis(strike_analysis)
+        if machine:
+            # Per-snapshot signals only in file outputs; they can be large
+            if output_format not in ("csv", "parquet"):
+                results = {"summary": results["summary"]}
+            write_results(results, output_format, output)
+            return
 
-        # Show unusual activity
-        unusual_activity = analyzer.identify_unusual_activity(filtered_data)
-        if not unusual_activity.empty:
-            display.show_unusual_activity(unusual_activity)
+        display.show_backtest_summary(results["summary"])
+        signals = results["signals"]
+        if not signals.empty:
+            display.show_success(
+                f"Replayed {len(signals)} snapshots of "
+                f"{signals['ticker'].nunique()} tickers over "
+                f"{signals['date'].nunique()} days"
+            )
 
-        # Show max pain
-        max_pain_strike, max_pain_df = analyzer.find_max_pain(filtered_data)
-        if not max_pain_df.empty:
-            display.show_max_pain(max_pain_strike, max_pain_df)
+    except Exception as e:
+        _fail(display, f"An error occurred during backtest: {str(e)}")
+        raise typer.Exit(1)
 
-        # Show expiration analysis
-        exp_analysis = analyzer.analyze_expiration_flow(filtered_data)
-        if not exp_analysis.empty:
-            display.show_expiration_analysis(exp_analysis)
 
-        display.console.print("\n[bold green]Demo analysis complete![/bold green]")
-        display.console.print(
-            "\n[yellow]Note: This demo uses randomly generated sample data for demonstration purposes.[/yellow]"
+@app.command()
+def scenario(
+    ticker: str = typer.Argument(..., help="Stock ticker symbol (e.g., SPY, AAPL)"),
+    expiration: Optional[str] = typer.Option(
+        None, "--expiration", "-e", help="Expiration date in YYYY-MM-DD format"
+    ),
+    metric: str = typer.Option(
+        "gamma",
+        "--metric",
+        "-m",
+        help="Surface to show: pnl, delta, gamma, vanna or charm",
+    ),
+    spot_range: float = typer.Option(
+        0.10, "--spot-range", help="Spot moves up and down, as a fraction"
+    ),
+    spot_steps: int = typer.Option(100, "--spot-steps", help="Spot levels"),
+    iv_range: float = typer.Option(
+        0.10, "--iv-range", help="Absolute IV shifts up and down (0.10 = 10 points)"
+    ),
+    iv_steps: int = typer.Option(50, "--iv-steps", help="IV shift levels"),
+    days: List[float] = typer.Option(
+        [0.0], "--days", "-d", help="Days forward to value at (repeatable)"
+    ),
+    rate: float = typer.Option(0.0, "--rate", help="Risk-free rate"),
+    demo_data: bool = typer.Option(
+        False, "--demo", help="Use generated sample data instead of API calls"
+    ),
+    snapshot: Optional[str] = typer.Option(
+        None, "--snapshot", help="Use a saved chain snapshot instead of fetching"
+    ),
+    output_format: str = typer.Option(
+        "table",
+        "--format",
+        "-f",
+        help="Output format: table, json, jsonl, csv or parquet",
+    ),
+    output: Optional[str] = typer.Option(
+        None,
+        "--output",
+        "-o",
+        help="Output file (json/jsonl) or directory (csv/parquet); default stdout",
+    ),
+):
+    """Dealer exposure and P&L over a spot x implied-volatility grid."""
+
+    import numpy as np
+
+    from .data_fetcher import OptionsDataFetcher
+    from .export import write_results
+    from .scenario import EXPOSURES, ScenarioEngine
+    from .snapshot import Snapshot
+
+    machine = _check_format(output_format, output)
+    display = None if machine else _table_display()
+    if metric not in ["pnl"] + EXPOSURES:
+        raise typer.BadParameter(
+            f"must be one of: {', '.join(['pnl'] + EXPOSURES)}", param_hint="--metric"
+        )
+
+    ticker = ticker.upper().strip()
+    _check_snapshot(snapshot, ticker)
+    fetcher = OptionsDataFetcher()
+
+    try:
+        if snapshot:
+            with Snapshot.open(snapshot) as chain_snapshot:
+                chain = chain_snapshot.frame().copy()
+                current_price = chain_snapshot.spot
+        elif demo_data:
+            chain, current_price = fetcher.get_sample_options_data(ticker), 100.0
+        else:
+            ticker_info = fetcher.get_polygon_ticker_info(ticker)
+            if "error" in ticker_info:
+                ticker_info = fetcher.get_ticker_info(ticker)
+            if "error" in ticker_info:
+                _fail(display, f"All data sources failed: {ticker_info['error']}")
+                raise typer.Exit(1)
+            current_price = ticker_info.get("current_price", 0)
+            chain = fetcher.get_polygon_options_data(ticker, expiration)
+
+        if chain.empty or not current_price:
+            _fail(display, f"No options data found for {ticker}")
+            raise typer.Exit(1)
+
+        engine = ScenarioEngine(chain, current_price, rate=rate)
+        result = engine.grid(
+            spot_range=spot_range,
+            spot_steps=spot_steps,
+            iv_shifts=np.linspace(-iv_range, iv_range, iv_steps),
+            time_shifts=days,
         )
 
+        if machine:
+            write_results({"scenarios": result.to_frame()}, output_format, output)
+            return
+
+        titles = {
+            "pnl": "Dealer P&L",
+            "delta": "Dealer Delta Exposure ($)",
+            "gamma": "Dealer Gamma Exposure ($ per 1% move)",
+            "vanna": "Dealer Vanna Exposure ($ per vol point)",
+            "charm": "Dealer Charm Exposure ($ per day)",
+        }
+        for index, day in enumerate(result.time_shifts):
+            title = titles[metric] + (f" in {day:g} days" if day else "")
+            display.show_scenario_surface(
+                result.frame(metric, index), title, current_price
+            )
+
+    except typer.Exit:
+        raise
+    except Exception as e:
+        _fail(display, f"An error occurred during scenario analysis: {str(e)}")
+        raise typer.Exit(1)
+
+
+@app.command()
+def live(
+    ticker: str = typer.Argument(..., help="Stock ticker symbol (e.g., SPY, AAPL)"),
+    expiration: Optional[str] = typer.Option(
+        None, "--expiration", "-e", help="Expiration date in YYYY-MM-DD format"
+    ),
+    interval: float = typer.Option(
+        5.0, "--interval", "-i", help="Seconds between refreshes"
+    ),
+    max_fps: float = typer.Option(
+        4.0, "--max-fps", help="Maximum screen redraws per second"
+    ),
+    min_volume: int = typer.Option(
+        10, "--min-volume", "-v", help="Minimum volume for filtering"
+    ),
+    demo_data: bool = typer.Option(
+        False, "--demo", help="Use generated sample data instead of API calls"
+    ),
+    show_gamma: bool = typer.Option(
+        False, "--gamma", help="Add a gamma flip level and gamma walls panel"
+    ),
+    iterations: Optional[int] = typer.Option(
+        None, "--iterations", "-n", help="Stop after this many refreshes"
+    ),
+):
+    """Show an auto-refreshing dashboard for a ticker."""
+
+    from .data_fetcher import OptionsDataFetcher
+    from .live import LiveDashboard
+
+    fetcher = OptionsDataFetcher()
+    display = _table_display()
+
+    ticker = ticker.upper().strip()
+
+    def load_chain(symbol: str):
+        if demo_data:
+            chain, current_price = fetcher.get_sample_options_data(symbol), 100.0
+        else:
+            ticker_info = fetcher.get_polygon_ticker_info(symbol)
+            if "error" in ticker_info:
+                ticker_info = fetcher.get_ticker_info(symbol)
+            if "error" in ticker_info:
+                raise RuntimeError(ticker_info["error"])
+            current_price = ticker_info.get("current_price", 0)
+            chain = fetcher.get_polygon_options_data(symbol, expiration)
+        chain = fetcher.filter_options_data(chain, min_volume=min_volume)
+        return chain, current_price
+
+    dashboard = LiveDashboard(
+        ticker,
+        load_chain,
+        interval=interval,
+        max_fps=max_fps,
+        display=display,
+        show_gamma=show_gamma,
+    )
+    try:
+        dashboard.run(iterations)
+    except KeyboardInterrupt:
+        pass
     except Exception as e:
-        display.show_error(f"An error occurred during demo: {str(e)}")
+        display.show_error(f"An error occurred during live refresh: {str(e)}")
         raise typer.Exit(1)
 
 
+@app.command()
+def watch(
+    tickers: List[str] = typer.Argument(..., help="Stock ticker symbols to watch"),
+    interval: float = typer.Option(
+        60.0, "--interval", "-i", help="Starting seconds between polls of a ticker"
+    ),
+    min_interval: float = typer.Option(
+        10.0, "--min-interval", help="Shortest poll interval for active tickers"
+    ),
+    max_interval: float = typer.Option(
+        600.0, "--max-interval", help="Longest poll interval for quiet tickers"
+    ),
+    budget: float = typer.Option(
+        5.0, "--budget", "-b", help="Provider API calls per minute across tickers"
+    ),
+    calls_per_poll: float = typer.Option(
+        2.0, "--calls-per-poll", help="Provider API calls made by one poll"
+    ),
+    min_volume: int = typer.Option(
+        10, "--min-volume", "-v", help="Minimum volume for filtering"
+    ),
+    demo_data: bool = typer.Option(
+        False, "--demo", help="Use generated sample data instead of API calls"
+    ),
+    output: Optional[str] = typer.Option(
+        None, "--output", "-o", help="Append JSON Lines results to this file"
+    ),
+    max_polls: Optional[int] = typer.Option(
+        None, "--max-polls", help="Stop after this many polls in total"
+    ),
+    duration: Optional[float] = typer.Option(
+        None, "--duration", help="Stop after this many seconds"
+    ),
+    rollup_file: Optional[str] = typer.Option(
+        None,
+        "--rollup",
+        help="Taxonomy JSON of sectors/ETFs; each result carries its groups' flow",
+    ),
+    rules_file: Optional[str] = typer.Option(
+        None,
+        "--rules",
+        help='Alert rules JSON, e.g. [{"name": ..., "when": "premium > $1M and dte < 14"}]',
+    ),
+    alerts_output: Optional[str] = typer.Option(
+        None, "--alerts-output", help="Append fired alerts as JSON Lines to this file"
+    ),
+    webhook: Optional[str] = typer.Option(
+        None,
+        "--webhook",
+        help="Webhook URL for alerts (stand-in: requests are recorded, not sent)",
+    ),
+    webhook_spool: Optional[str] = typer.Option(
+        None, "--webhook-spool", help="File the recorded webhook requests go to"
+    ),
+):
+    """Poll a watchlist, polling active tickers more often, within an API budget."""
+
+    import asyncio
+    from .data_fetcher import OptionsDataFetcher
+    from .alerts import AlertEngine, AlertPrinter, WebhookSink, load_rules
+    from .filter_expr import FilterError
+    from .rollup import FlowRollup, Taxonomy
+    from .watch import JsonLinesSink, WatchScheduler
+
+    fetcher = OptionsDataFetcher()
+    symbols = [t.upper().strip() for t in tickers]
+
+    def load_chain(symbol: str):
+        if demo_data:
+            chain, current_price = fetcher.get_sample_options_data(symbol), 100.0
+        else:
+            ticker_info = fetcher.get_polygon_ticker_info(symbol)
+            if "error" in ticker_info:
+                ticker_info = fetcher.get_ticker_info(symbol)
+            if "error" in ticker_info:
+                raise RuntimeError(ticker_info["error"])
+            current_price = ticker_info.get("current_price", 0)
+            chain = fetcher.get_polygon_options_data(symbol)
+        chain = fetcher.filter_options_data(chain, min_volume=min_volume)
+        return chain, current_price
+
+    alerts = None
+    alert_sinks: List[Any] = []
+    if rules_file:
+        try:
+            rules = load_rules(rules_file)
+        except (FilterError, KeyError) as e:
+            raise typer.BadParameter(f"Invalid alert rules: {e}", param_hint="--rules")
+        alert_sinks.append(AlertPrinter())
+        if alerts_output:
+            alert_sinks.append(JsonLinesSink(path=alerts_output))
+        if webhook:
+            alert_sinks.append(WebhookSink(webhook, spool=webhook_spool))
+        alerts = AlertEngine(rules, alert_sinks)
+
+    sink = JsonLinesSink(path=output)
+    scheduler = WatchScheduler(
+        symbols,
+        load_chain,
+        sink,
+        interval=interval,
+        min_interval=min_interval,
+        max_interval=max_interval,
+        calls_per_minute=budget,
+        calls_per_poll=calls_per_poll,
+        rollup=FlowRollup(Taxonomy.load(rollup_file)) if rollup_file else None,
+        alerts=alerts,
+    )
+    try:
+        asyncio.run(scheduler.run(max_polls=max_polls, duration=duration))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sink.close()
+        for alert_sink in alert_sinks:
+            if isinstance(alert_sink, JsonLinesSink):
+                alert_sink.close()
+        if alerts is not None:
+            typer.echo(
+                f"{alerts.alerts_sent} alerts from {len(alerts.rules)} rules",
+                err=True,
+            )
+        for state in scheduler.summary():
+            typer.echo(
+                f"{state['ticker']}: {state['polls']} polls, "
+                f"next interval {state['interval']:g}s",
+                err=True,
+            )
+
+
+@app.command()
+def serve(
+    host: Optional[str] = typer.Option(
+        None, "--host", help="Interface to bind (default 127.0.0.1)"
+    ),
+    port: Optional[int] = typer.Option(
+        None, "--port", "-p", help="Port to listen on (default 8765)"
+    ),
+    cache_ttl: float = typer.Option(
+        30.0, "--ttl", help="Seconds to reuse fetched chains and computed results"
+    ),
+    verbose: bool = typer.Option(False, "--verbose", help="Log every request"),
+):
+    """Run a local analysis service that keeps sessions and caches warm."""
+
+    from .server import AnalysisService, create_server
+
+    server = create_server(AnalysisService(cache_ttl=cache_ttl), host, port, verbose)
+    bound_host, bound_port = server.server_address[:2]
+    typer.echo(f"Analysis service listening on http://{bound_host}:{bound_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
 @app.command()
 def config():
     """Show current configuration."""
 
-    display = OptionsDisplay()
+    from .config import Config
+
     config = Config()
 
     config_text = f"""
@@ -283,7 +1472,8 @@ Default Settings:
   Decimal Places: {config.DECIMAL_PLACES}
 """
 
-    display.console.print(config_text)
+    # Plain text, so rich is not needed here
+    typer.echo(config_text)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,98 @@
+"""Client for the local analysis service started with the serve command."""
+
+import http.client
+import json
+import urllib.error
+import urllib.parse
+import urllib.request
+from typing import Any, Dict, Optional
+from .config import Config
+
+# Name the service reports from /health, so other listeners on its port are
+# never mistaken for it
+SERVICE_NAME = "options-flow-analyzer"
+
+
+class ServiceError(Exception):
+    """Error returned by the analysis service."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class ServiceUnavailable(Exception):
+    """The service could not be reached or did not answer over HTTP/JSON."""
+
+
+class ServiceClient:
+    """
+    Talks to a running analysis service over HTTP.
+
+    Uses only the standard library so the CLI can check for and query the
+    service without importing pandas.
+    """
+
+    def __init__(
+        self,
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+        timeout: float = 600.0,
+    ):
+        """
+        Args:
+            host: Service host (default Config.SERVER_HOST)
+            port: Service port (default Config.SERVER_PORT)
+            timeout: Seconds to wait for a response
+        """
+        self.host = host or Config.SERVER_HOST
+        self.port = port or Config.SERVER_PORT
+        self.timeout = timeout
+
+    def available(self, timeout: float = 0.5) -> bool:
+        """
+        Return True if the analysis service answers its health check.
+
+        Only a JSON health response naming this service counts, so another
+        program listening on the port is never sent analysis requests.
+        """
+        try:
+            health = self._get("health", {}, timeout)
+        except (ServiceError, ServiceUnavailable):
+            return False
+        return isinstance(health, dict) and health.get("service") == SERVICE_NAME
+
+    def request(self, command: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Run a command on the service.
+
+        Args:
+            command: Service command (analyze, expirations, scan or health)
+            params: Command parameters; None values are omitted
+
+        Returns:
+            Decoded JSON response
+
+        Raises:
+            ServiceError: If the service reports an error
+            ServiceUnavailable: If the connection fails or the reply is not JSON
+        """
+        return self._get(command, params or {}, self.timeout)
+
+    def _get(self, command: str, params: Dict[str, Any], timeout: float) -> Any:
+        query = urllib.parse.urlencode(
+            {key: value for key, value in params.items() if value is not None}
+        )
+        url = f"http://{self.host}:{self.port}/{command}?{query}"
+        try:
+            with urllib.request.urlopen(url, timeout=timeout) as response:
+                return json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            try:
+                message = json.loads(e.read()).get("error", str(e))
+            except (ValueError, AttributeError):
+                raise ServiceUnavailable(f"{url}: {e}")
+            raise ServiceError(e.code, message)
+        except (OSError, ValueError, http.client.HTTPException) as e:
+            # Refused or reset connections, timeouts and non-JSON replies
+            raise ServiceUnavailable(f"{url}: {e}")
@@ -0,0 +1,151 @@
+"""Fixed-layout columnar encoding of normalized options chains."""
+
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Optional, Tuple
+
+# Column buffers start on cache-line boundaries
+ALIGNMENT = 64
+
+
+def _align(offset: int) -> int:
+    """Round an offset up to the next alignment boundary."""
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def encode_frame(
+    df: pd.DataFrame, start: int = 0
+) -> Tuple[Dict[str, Any], List[np.ndarray]]:
+    """
+    Lay out a DataFrame as a sequence of aligned column buffers.
+
+    Numeric, boolean and datetime columns are stored as their raw arrays.
+    Everything else (strings, objects, categoricals) is dictionary-encoded
+    as int32 codes plus a list of distinct values kept in the header.
+
+    Args:
+        df: Options DataFrame
+        start: Byte offset of the first column buffer
+
+    Returns:
+        Tuple of (header, arrays) where header describes every column's dtype,
+        offset and length, and arrays are the buffers to write in order
+    """
+    columns = []
+    arrays = []
+    offset = _align(start)
+
+    for name in df.columns:
+        series = df[name]
+        spec: Dict[str, Any] = {"name": str(name)}
+
+        if isinstance(series.dtype, pd.DatetimeTZDtype):
+            values = series.dt.tz_convert("UTC").dt.tz_localize(None)
+            array = values.to_numpy(dtype="datetime64[ns]").view(np.int64)
+            spec["kind"] = "datetime"
+            spec["tz"] = str(series.dtype.tz)
+        elif pd.api.types.is_datetime64_dtype(series.dtype):
+            array = series.to_numpy(dtype="datetime64[ns]").view(np.int64)
+            spec["kind"] = "datetime"
+        elif isinstance(series.dtype, np.dtype) and series.dtype.kind in "biuf":
+            array = series.to_numpy()
+            spec["kind"] = "numeric"
+        else:
+            codes, uniques = pd.factorize(series, use_na_sentinel=True)
+            array = codes.astype(np.int32)
+            spec["kind"] = "dictionary"
+            spec["categories"] = np.asarray(uniques, dtype=object).tolist()
+
+        array = np.ascontiguousarray(array)
+        spec["dtype"] = array.dtype.str
+        spec["offset"] = offset
+        spec["nbytes"] = array.nbytes
+        columns.append(spec)
+        arrays.append(array)
+        offset = _align(offset + array.nbytes)
+
+    header = {"rows": len(df), "columns": columns, "nbytes": offset}
+    return header, arrays
+
+
+def write_arrays(buffer: memoryview, header: Dict[str, Any], arrays: List[np.ndarray]):
+    """Copy encoded column arrays into a writable buffer at their offsets."""
+    for spec, array in zip(header["columns"], arrays):
+        target = np.frombuffer(
+            buffer, dtype=array.dtype, count=len(array), offset=spec["offset"]
+        )
+        target[:] = array
+
+
+def column_view(buffer, spec: Dict[str, Any], rows: int) -> np.ndarray:
+    """Return a read-only array viewing one column's raw buffer."""
+    array = np.frombuffer(
+        buffer, dtype=np.dtype(spec["dtype"]), count=rows, offset=spec["offset"]
+    )
+    array.flags.writeable = False
+    return array
+
+
+def decode_column(
+    buffer, spec: Dict[str, Any], rows: int, as_category: bool = False
+) -> Any:
+    """
+    Decode one column from its raw buffer.
+
+    Numeric and datetime columns are zero-copy views. Dictionary-encoded
+    columns are expanded to object arrays unless ``as_category`` is set, in
+    which case a Categorical backed by the stored codes is returned.
+    """
+    return decode_array(column_view(buffer, spec, rows), spec, as_category)
+
+
+def decode_array(array: np.ndarray, spec: Dict[str, Any], as_category: bool = False):
+    """Decode a stored array (or a slice of one) according to its column spec."""
+    if spec["kind"] == "numeric":
+        return array
+
+    if spec["kind"] == "datetime":
+        values = array.view("datetime64[ns]")
+        if spec.get("tz"):
+            return pd.DatetimeIndex(values).tz_localize("UTC").tz_convert(spec["tz"])
+        return values
+
+    categories = spec["categories"]
+    if as_category:
+        return pd.Categorical.from_codes(array, categories=categories)
+
+    lookup = np.empty(len(categories) + 1, dtype=object)
+    lookup[: len(categories)] = categories
+    lookup[-1] = np.nan  # code -1 marks missing values
+    return lookup[array]
+
+
+def decode_frame(
+    buffer,
+    header: Dict[str, Any],
+    columns: Optional[List[str]] = None,
+    as_category: bool = False,
+) -> pd.DataFrame:
+    """
+    Build a DataFrame over encoded column buffers.
+
+    Args:
+        buffer: Buffer holding the column arrays
+        header: Header returned by encode_frame
+        columns: Subset of columns to decode, or None for all
+        as_category: Keep dictionary-encoded columns as Categoricals
+
+    Returns:
+        DataFrame whose numeric columns view the buffer without copying
+    """
+    rows = header["rows"]
+    specs = header["columns"]
+    if columns is not None:
+        wanted = set(columns)
+        specs = [spec for spec in specs if spec["name"] in wanted]
+
+    data = {
+        spec["name"]: decode_column(buffer, spec, rows, as_category) for spec in specs
+    }
+    # copy=False keeps one block per column instead of consolidating (copying)
+    return pd.DataFrame(data, index=pd.RangeIndex(rows), copy=False)
@@ -0,0 +1,338 @@
+"""Multi-leg combo detection: straddles, strangles, verticals and risk reversals."""
+
+from typing import List, Optional
+import numpy as np
+import pandas as pd
+from .oi_change import UNDERLYING_COLUMNS
+from .trades import TRADE_KEY_COLUMNS, TradeAnalyzer
+
+# Combo types in display order; multi_leg is a package of three or more
+# legs printed together (condors, butterflies, ...)
+COMBO_TYPES = ["straddle", "strangle", "risk_reversal", "vertical", "multi_leg"]
+
+# Columns of the matched legs table, after any underlying column
+COMBO_LEG_COLUMNS = [
+    "combo_id",
+    "combo_type",
+    "expiration",
+    "strike",
+    "option_type",
+    "size",
+    "premium",
+    "side",
+]
+
+_NO_COMBO = -1
+
+
+def _underlying_columns(*frames: pd.DataFrame) -> List[str]:
+    """The underlying column shared by all frames, as a list (maybe empty)."""
+    for column in UNDERLYING_COLUMNS:
+        if all(column in frame.columns for frame in frames):
+            return [column]
+    return []
+
+
+def pair_legs(
+    group: np.ndarray,
+    strike: np.ndarray,
+    is_call: np.ndarray,
+    side: np.ndarray,
+    packages: bool = False,
+):
+    """
+    Match candidate legs that share a group into combos.
+
+    Legs are sorted once by (group, strike, type), so every group is a
+    contiguous run and both legs of a straddle are adjacent. Two-leg groups
+    are classified from their types, strikes and sides:
+
+    - call + put, opposite sides: risk reversal (a synthetic at one strike)
+    - call + put, same strike: straddle
+    - call + put, different strikes: strangle
+    - two calls or two puts at different strikes, not on the same side:
+      vertical
+
+    In larger groups only adjacent put/call pairs at one strike (straddles)
+    are matched, unless ``packages`` is set, in which case the whole group is
+    one multi_leg combo (prints sharing a timestamp are one order).
+
+    Args:
+        group: Group code of each leg; only legs in the same group can match
+        strike: Strike of each leg
+        is_call: True for calls
+        side: +1 bought, -1 sold, 0 unknown
+        packages: Treat groups of three or more legs as one combo
+
+    Returns:
+        Tuple of (combo, combo_type): combo ids aligned with the inputs (-1
+        for unmatched legs) and each leg's combo type (None when unmatched)
+    """
+    n = len(group)
+    combo = np.full(n, _NO_COMBO, dtype=np.int64)
+    combo_type = np.full(n, None, dtype=object)
+    if n < 2:
+        return combo, combo_type
+
+    order = np.lexsort((is_call, strike, group))
+    g, k, c, s = group[order], strike[order], is_call[order], side[order]
+
+    new_group = np.ones(n, dtype=bool)
+    new_group[1:] = g[1:] != g[:-1]
+    starts = np.flatnonzero(new_group)
+    counts = np.diff(np.append(starts, n))
+
+    # Two-leg groups
+    a = starts[counts == 2]
+    b = a + 1
+    mixed = c[a] != c[b]
+    opposite = s[a] * s[b] < 0
+    same_side = s[a] * s[b] > 0
+    same_strike = k[a] == k[b]
+    kinds = np.select(
+        [
+            mixed & opposite,
+            mixed & same_strike,
+            mixed,
+            ~same_strike & ~same_side,
+        ],
+        ["risk_reversal", "straddle", "strangle", "vertical"],
+        default="",
+    )
+    matched = kinds != ""
+    first, second, kinds = a[matched], b[matched], kinds[matched]
+
+    large = starts[counts > 2]
+    if packages and len(large):
+        # Every leg of a large group joins the combo of the group's first leg
+        sizes = counts[counts > 2]
+        members = np.repeat(large, sizes) + (
+            np.arange(sizes.sum()) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+        )
+        combo[order[members]] = np.repeat(large, sizes)
+        combo_type[order[members]] = "multi_leg"
+    elif len(large):
+        # Adjacent put then call at one strike within a large group
+        in_large = np.repeat(counts > 2, counts)
+        i = np.flatnonzero(
+            in_large[:-1]
+            & (g[1:] == g[:-1])
+            & (k[1:] == k[:-1])
+            & ~c[:-1]
+            & c[1:]
+            & (s[:-1] * s[1:] >= 0)
+        )
+        first = np.concatenate([first, i])
+        second = np.concatenate([second, i + 1])
+        kinds = np.concatenate([kinds, np.full(len(i), "straddle")])
+
+    combo[order[first]] = first
+    combo[order[second]] = first
+    combo_type[order[first]] = kinds
+    combo_type[order[second]] = kinds
+    return combo, combo_type
+
+
+class ComboDetector:
+    """
+    Finds the legs of multi-leg combos so they can be separated from
+    single-leg directional flow.
+
+    Candidate legs are grouped by a hash self-join on (underlying,
+    expiration, size), plus the print timestamp for trade data, and matched
+    within each group by pair_legs. Nothing compares legs pairwise, so a
+    full-market trade day costs one groupby and one sort.
+
+    Chain-level matching relies on two contracts of one expiry trading the
+    same daily volume, which is weaker evidence than prints sharing a
+    timestamp; min_size keeps small coincidental volumes out. Without trade
+    sides, call/put pairs at different strikes are reported as strangles,
+    since a risk reversal only differs by buying one leg and selling the
+    other.
+    """
+
+    def __init__(self, min_size: int = 10):
+        """
+        Args:
+            min_size: Smallest leg size (contracts) considered for a combo
+        """
+        self.min_size = min_size
+
+    def _match(
+        self,
+        legs: pd.DataFrame,
+        size: np.ndarray,
+        premium: np.ndarray,
+        group_columns: List[str],
+        side: np.ndarray,
+        packages: bool,
+        instant: Optional[np.ndarray] = None,
+    ) -> pd.DataFrame:
+        underlying = _underlying_columns(legs)
+        candidates = np.flatnonzero(size >= max(self.min_size, 1))
+        columns = underlying + COMBO_LEG_COLUMNS + ["row"]
+
+        # Cheap integer pre-join: a leg whose size (and print time) no other
+        # leg shares can't match, and most prints of a trading day are such
+        if len(candidates):
+            key = size[candidates].astype(np.int64)
+            if instant is not None:
+                key = instant[candidates] * (key.max() + 1) + key
+            candidates = candidates[pd.Series(key).duplicated(keep=False).to_numpy()]
+        if not len(candidates):
+            return pd.DataFrame(columns=columns)
+
+        rows = legs.iloc[candidates]
+        group = (
+            rows.assign(_size=size[candidates])
+            .groupby(underlying + group_columns + ["_size"], sort=False, observed=True)
+            .ngroup()
+            .to_numpy()
+        )
+        combo, combo_type = pair_legs(
+            group,
+            rows["strike"].to_numpy(dtype=float),
+            rows["option_type"].to_numpy() == "call",
+            side[candidates],
+            packages=packages,
+        )
+        matched = combo != _NO_COMBO
+        if not matched.any():
+            return pd.DataFrame(columns=columns)
+
+        positions = candidates[matched]
+        result = legs.iloc[positions][underlying + TRADE_KEY_COLUMNS].reset_index(
+            drop=True
+        )
+        result.insert(len(underlying), "combo_type", combo_type[matched])
+        result.insert(len(underlying), "combo_id", pd.factorize(combo[matched])[0])
+        result["size"] = size[positions]
+        result["premium"] = premium[positions]
+        result["side"] = np.select(
+            [side[positions] > 0, side[positions] < 0], ["buy", "sell"], ""
+        )
+        result["row"] = positions
+        return result[columns]
+
+    def detect_chain(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Match chain contracts whose daily volumes pair up into combos.
+
+        Args:
+            df: Options DataFrame with expiration, strike, option_type, volume
+                and dollar_flow (and an underlying column for multi-ticker
+                chains)
+
+        Returns:
+            One row per matched leg: combo_id, combo_type, the contract key,
+            size (volume), premium (dollar flow), side ("" when unknown) and
+            row (position in df)
+        """
+        volume = df["volume"].to_numpy(dtype=np.int64)
+        return self._match(
+            df,
+            volume,
+            df["dollar_flow"].to_numpy(dtype=float),
+            ["expiration"],
+            np.zeros(len(df), dtype=np.int8),
+            packages=False,
+        )
+
+    def detect_trades(self, trades: pd.DataFrame) -> pd.DataFrame:
+        """
+        Match trade prints that executed together into combos.
+
+        Legs of a combo print at the same timestamp with the same size; when
+        the prints carry bid and ask, each leg's side is classified so
+        verticals and risk reversals (one leg bought, one sold) are told
+        apart from straddles and strangles.
+
+        Args:
+            trades: Trade prints with the key columns, timestamp, price and
+                size (bid and ask optional)
+
+        Returns:
+            One row per matched print, as for detect_chain (row is the
+            position in trades)
+        """
+        if {"bid", "ask"} <= set(trades.columns) and len(trades):
+            side = TradeAnalyzer().classify_trade_side(trades)
+        else:
+            side = np.zeros(len(trades), dtype=np.int8)
+        size = trades["size"].to_numpy(dtype=np.int64)
+        return self._match(
+            trades,
+            size,
+            trades["price"].to_numpy(dtype=float) * size * 100,
+            ["expiration", "timestamp"],
+            side,
+            packages=True,
+            instant=pd.factorize(trades["timestamp"])[0].astype(np.int64),
+        )
+
+    def summarize(self, legs: pd.DataFrame) -> pd.DataFrame:
+        """
+        Count combos, legs, contracts and premium per combo type.
+
+        Args:
+            legs: Output of detect_chain or detect_trades
+
+        Returns:
+            DataFrame with combo_type, combos, legs, contracts and premium,
+            in COMBO_TYPES order (types without combos are left out)
+        """
+        columns = ["combo_type", "combos", "legs", "contracts", "premium"]
+        if legs.empty:
+            return pd.DataFrame(columns=columns)
+        summary = legs.groupby("combo_type").agg(
+            combos=("combo_id", "nunique"),
+            legs=("combo_id", "size"),
+            contracts=("size", "sum"),
+            premium=("premium", "sum"),
+        )
+        order = [kind for kind in COMBO_TYPES if kind in summary.index]
+        return summary.loc[order].reset_index()[columns]
+
+    def adjust_chain(
+        self,
+        df: pd.DataFrame,
+        legs: pd.DataFrame,
+        trades: Optional[pd.DataFrame] = None,
+    ) -> pd.DataFrame:
+        """
+        Remove combo volume from a chain, leaving single-leg directional flow.
+
+        Args:
+            df: Options DataFrame
+            legs: Legs matched in df (detect_chain) or in trades
+                (detect_trades)
+            trades: The prints legs were matched in, if any
+
+        Returns:
+            Copy of df with volume and dollar_flow reduced by the contracts
+            traded as combo legs (dollar flow pro rata) and a combo_volume
+            column
+        """
+        volume = df["volume"].to_numpy(dtype=np.int64)
+        combo_volume = np.zeros(len(df), dtype=np.int64)
+        if trades is None:
+            np.add.at(combo_volume, legs["row"].to_numpy(dtype=np.intp), legs["size"])
+        elif not legs.empty:
+            keys = _underlying_columns(df, legs) + TRADE_KEY_COLUMNS
+            per_contract = legs.groupby(keys, sort=False, observed=True)["size"].sum()
+            combo_volume = (
+                df[keys]
+                .merge(per_contract.reset_index(), on=keys, how="left")["size"]
+                .fillna(0)
+                .to_numpy(dtype=np.int64)
+            )
+        combo_volume = np.minimum(combo_volume, volume)
+
+        remaining = volume - combo_volume
+        with np.errstate(divide="ignore", invalid="ignore"):
+            share = np.where(volume > 0, remaining / volume, 0.0)
+        return df.assign(
+            volume=remaining,
+            dollar_flow=df["dollar_flow"].to_numpy(dtype=float) * share,
+            combo_volume=combo_volume,
+        )
@@ -4,29 +4,54 @@ import os
 from typing import Optional
 from pathlib import Path
 
-# Load environment variables from .env file
-try:
-    from dotenv import load_dotenv
+_dotenv_loaded = False
 
-    # Look for .env file in the project root
-    env_path = Path(__file__).parent.parent / ".env"
-    load_dotenv(env_path)
-except ImportError:
-    # python-dotenv not installed, skip loading .env file
-    pass
+
+def load_env():
+    """Load environment variables from the project's .env file, once."""
+    global _dotenv_loaded
+    if _dotenv_loaded:
+        return
+    _dotenv_loaded = True
+
+    try:
+        from dotenv import load_dotenv
+
+        # Look for .env file in the project root
+        env_path = Path(__file__).parent.parent / ".env"
+        load_dotenv(env_path)
+    except ImportError:
+        # python-dotenv not installed, skip loading .env file
+        pass
+
+
+class _EnvVar:
+    """Class attribute read from the environment on first access."""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __get__(self, instance, owner) -> Optional[str]:
+        # Deferred so importing the package never pays for reading .env
+        load_env()
+        return os.getenv(self.name)
 
 
 class Config:
     """Configuration class for API keys and settings."""
 
     # API Configuration
-    TRADIER_API_KEY: Optional[str] = os.getenv("TRADIER_API_KEY")
+    TRADIER_API_KEY = _EnvVar("TRADIER_API_KEY")
     TRADIER_BASE_URL: str = "https://api.tradier.com/v1"
 
     # Polygon.io API Configuration
-    POLYGON_API_KEY: Optional[str] = os.getenv("POLYGON_API_KEY")
+    POLYGON_API_KEY = _EnvVar("POLYGON_API_KEY")
     POLYGON_BASE_URL: str = "https://api.polygon.io"
 
+    # Local analysis service (serve command)
+    SERVER_HOST: str = "127.0.0.1"
+    SERVER_PORT: int = 8765
+
     # Default settings
     DEFAULT_MIN_VOLUME: int = 10
     DEFAULT_EXPIRATION_DAYS: int = 30
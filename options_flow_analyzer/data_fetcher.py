@@ -1,24 +1,145 @@
 """Data fetching module for options data from various APIs."""
 
-import yfinance as yf
+import functools
+import threading
+import time
 import pandas as pd
 import requests
 import numpy as np
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from .config import Config
+from .occ import occ_frame
+from .profiling import profiled, span
+from .telemetry import TELEMETRY, FetcherTelemetry
+
+# Responses worth retrying: rate limited or a transient server error
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+RETRY_BACKOFF = 2.0
+
+
+def _yfinance():
+    """Import yfinance on first use; it is the slowest import in the package."""
+    import yfinance
+
+    return yfinance
+
+
+def _ttl_cached(method):
+    """Cache a fetch method's successful results for ``cache_ttl`` seconds."""
+    provider = "polygon" if "polygon" in method.__name__ else "yfinance"
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.cache_ttl <= 0:
+            return method(self, *args, **kwargs)
+
+        key = (method.__name__, args, tuple(sorted(kwargs.items())))
+        with self._cache_lock:
+            entry = self._cache.get(key)
+        hit = entry is not None and entry[0] > time.monotonic()
+        self.telemetry.record_cache(provider, hit)
+        if hit:
+            value = entry[1]
+        else:
+            value = method(self, *args, **kwargs)
+            # Failures are not cached so the next call retries the provider
+            if isinstance(value, dict):
+                failed = "error" in value
+            else:
+                failed = len(value) == 0
+            if not failed:
+                with self._cache_lock:
+                    self._cache[key] = (time.monotonic() + self.cache_ttl, value)
+
+        # Callers may modify frames they receive; keep the cached copy intact
+        return value.copy() if isinstance(value, (pd.DataFrame, dict, list)) else value
+
+    return wrapper
 
 
 class OptionsDataFetcher:
     """Fetches options data from various sources."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        cache_ttl: float = 0.0,
+        telemetry: Optional[FetcherTelemetry] = None,
+        max_retries: int = 2,
+    ):
+        """
+        Args:
+            cache_ttl: Seconds to reuse fetched chains and ticker info; 0
+                disables caching
+            telemetry: Counters for provider calls (default: the process-wide
+                telemetry.TELEMETRY)
+            max_retries: Retries for rate-limited or failed HTTP requests
+        """
         self.config = Config()
+        self.cache_ttl = cache_ttl
+        self.telemetry = telemetry or TELEMETRY
+        self.max_retries = max_retries
+        # One session keeps provider connections alive across requests
+        self.session = requests.Session()
+        self._cache: Dict[Tuple, Tuple[float, Any]] = {}
+        self._cache_lock = threading.Lock()
+
+    def clear_cache(self):
+        """Drop all cached provider responses."""
+        with self._cache_lock:
+            self._cache.clear()
+
+    def _http_get(
+        self, url: str, params: Dict[str, Any], provider: str = "polygon"
+    ) -> requests.Response:
+        """
+        GET a provider URL, recording each attempt in telemetry.
+
+        Rate-limited (429) and 5xx responses are retried up to max_retries
+        times, waiting for the Retry-After header when present and an
+        exponential backoff otherwise.
+
+        Returns:
+            The last response received
+        """
+        for attempt in range(self.max_retries + 1):
+            start = time.perf_counter()
+            try:
+                response = self.session.get(url, params=params)
+            except requests.RequestException:
+                self.telemetry.record_request(
+                    provider, time.perf_counter() - start, error=True
+                )
+                raise
+            self.telemetry.record_request(
+                provider,
+                time.perf_counter() - start,
+                status=response.status_code,
+                nbytes=len(response.content),
+            )
+            if (
+                response.status_code not in RETRY_STATUSES
+                or attempt == self.max_retries
+            ):
+                return response
+
+            retry_after = response.headers.get("Retry-After", "")
+            delay = (
+                float(retry_after)
+                if retry_after.isdigit()
+                else RETRY_BACKOFF * 2**attempt
+            )
+            self.telemetry.record_retry(provider)
+            self.telemetry.throttle(provider, delay)
+        return response
 
+    @profiled("yfinance_ticker_info")
+    @_ttl_cached
     def get_ticker_info(self, ticker: str) -> Dict[str, Any]:
         """Get basic ticker information."""
         try:
-            stock = yf.Ticker(ticker)
-            info = stock.info
+            stock = _yfinance().Ticker(ticker)
+            with self.telemetry.track("yfinance"):
+                info = stock.info
             return {
                 "symbol": ticker,
                 "current_price": info.get("currentPrice", 0),
@@ -29,15 +150,20 @@ class OptionsDataFetcher:
         except Exception as e:
             return {"symbol": ticker, "error": str(e)}
 
+    @profiled("yfinance_expirations")
+    @_ttl_cached
     def get_options_expirations(self, ticker: str) -> List[str]:
         """Get available expiration dates for options."""
         try:
-            stock = yf.Ticker(ticker)
-            return list(stock.options)
+            stock = _yfinance().Ticker(ticker)
+            with self.telemetry.track("yfinance"):
+                return list(stock.options)
         except Exception as e:
             print(f"Error fetching expirations for {ticker}: {e}")
             return []
 
+    @profiled("yfinance_chain")
+    @_ttl_cached
     def get_options_chain(
         self, ticker: str, expiration: Optional[str] = None
     ) -> pd.DataFrame:
@@ -52,17 +178,19 @@ class OptionsDataFetcher:
             DataFrame with options data including calls and puts
         """
         try:
-            stock = yf.Ticker(ticker)
+            stock = _yfinance().Ticker(ticker)
 
             # If no expiration specified, use the nearest one
             if not expiration:
-                expirations = stock.options
+                with self.telemetry.track("yfinance"):
+                    expirations = stock.options
                 if not expirations:
                     return pd.DataFrame()
                 expiration = expirations[0]
 
             # Get options chain for the expiration
-            options_chain = stock.option_chain(expiration)
+            with self.telemetry.track("yfinance"):
+                options_chain = stock.option_chain(expiration)
 
             # Combine calls and puts with type indicator
             calls = options_chain.calls.copy()
@@ -97,7 +225,7 @@ class OptionsDataFetcher:
     ) -> pd.DataFrame:
         """Get options data for multiple expiration dates."""
         try:
-            stock = yf.Ticker(ticker)
+            stock = _yfinance().Ticker(ticker)
             expirations = stock.options[:num_expirations]
 
             all_options = []
@@ -115,48 +243,68 @@ class OptionsDataFetcher:
             print(f"Error fetching multiple expirations for {ticker}: {e}")
             return pd.DataFrame()
 
+    @profiled()
     def filter_options_data(
         self,
         df: pd.DataFrame,
         min_volume: int = 0,
         option_type: Optional[str] = None,
         min_open_interest: int = 0,
+        where: Optional[str] = None,
+        spot: Optional[float] = None,
     ) -> pd.DataFrame:
         """
         Filter options data based on criteria.
 
+        All criteria are combined into one boolean mask and the matching rows
+        are selected once, so the chain is not copied per criterion.
+
         Args:
             df: Options DataFrame
             min_volume: Minimum volume threshold
             option_type: 'call', 'put', or None for both
             min_open_interest: Minimum open interest threshold
+            where: Filter expression (see filter_expr), e.g.
+                "dte <= 14 and premium >= $1M"
+            spot: Underlying price, for moneyness and delta in where
 
         Returns:
             Filtered DataFrame
+
+        Raises:
+            FilterError: If the where expression is malformed or uses a field
+                the chain lacks
         """
         if df.empty:
             return df
 
-        filtered = df.copy()
+        mask = np.ones(len(df), dtype=bool)
 
         # Filter by volume
         if min_volume > 0:
-            filtered = filtered[filtered["volume"] >= min_volume]
+            mask &= df["volume"].to_numpy() >= min_volume
 
         # Filter by option type
         if option_type:
             option_type = option_type.lower()
             if option_type in ["call", "calls"]:
-                filtered = filtered[filtered["option_type"] == "call"]
+                mask &= df["option_type"].to_numpy() == "call"
             elif option_type in ["put", "puts"]:
-                filtered = filtered[filtered["option_type"] == "put"]
+                mask &= df["option_type"].to_numpy() == "put"
 
         # Filter by open interest
         if min_open_interest > 0:
-            filtered = filtered[filtered["openInterest"] >= min_open_interest]
+            mask &= df["openInterest"].to_numpy() >= min_open_interest
 
-        return filtered.reset_index(drop=True)
+        if where:
+            from .filter_expr import compile_filter
 
+            mask &= compile_filter(where).mask(df, spot=spot)
+
+        return df[mask].reset_index(drop=True)
+
+    @profiled("polygon_ticker_info")
+    @_ttl_cached
     def get_polygon_ticker_info(self, ticker: str) -> Dict[str, Any]:
         """
         Get basic ticker information from Polygon API.
@@ -171,15 +319,13 @@ class OptionsDataFetcher:
             return {"symbol": ticker, "error": "POLYGON_API_KEY not set"}
 
         try:
-            import time
-
             # Get ticker details
             details_url = (
                 f"{self.config.POLYGON_BASE_URL}/v3/reference/tickers/{ticker}"
             )
             details_params = {"apikey": self.config.POLYGON_API_KEY}
 
-            details_response = requests.get(details_url, params=details_params)
+            details_response = self._http_get(details_url, details_params)
 
             if details_response.status_code != 200:
                 return {
@@ -191,13 +337,15 @@ class OptionsDataFetcher:
             result = details_data.get("results", {})
 
             # Rate limiting
-            time.sleep(12)  # 12 seconds between calls for free tier
+            with span("rate_limit_sleep"):
+                # 12 seconds between calls for free tier
+                self.telemetry.throttle("polygon", 12)
 
             # Get current price from previous day's data
             price_url = f"{self.config.POLYGON_BASE_URL}/v2/aggs/ticker/{ticker}/prev"
             price_params = {"apikey": self.config.POLYGON_API_KEY}
 
-            price_response = requests.get(price_url, params=price_params)
+            price_response = self._http_get(price_url, price_params)
             current_price = 0
             volume = 0
 
@@ -219,6 +367,8 @@ class OptionsDataFetcher:
         except Exception as e:
             return {"symbol": ticker, "error": str(e)}
 
+    @profiled("polygon_chain")
+    @_ttl_cached
     def get_polygon_options_data(
         self, ticker: str, expiration: Optional[str] = None
     ) -> pd.DataFrame:
@@ -237,13 +387,11 @@ class OptionsDataFetcher:
             return self.get_options_chain(ticker, expiration)
 
         try:
-            import time
-
             # Get current stock price first
             price_url = f"{self.config.POLYGON_BASE_URL}/v2/aggs/ticker/{ticker}/prev"
             price_params = {"apikey": self.config.POLYGON_API_KEY}
 
-            price_response = requests.get(price_url, params=price_params)
+            price_response = self._http_get(price_url, price_params)
             if price_response.status_code == 200:
                 price_data = price_response.json()
                 current_price = price_data.get("results", [{}])[0].get("c", 0)
@@ -251,7 +399,9 @@ class OptionsDataFetcher:
                 current_price = 0
 
             # Rate limiting - Polygon free tier allows 5 calls per minute
-            time.sleep(12)  # Wait 12 seconds between calls
+            with span("rate_limit_sleep"):
+                # Wait 12 seconds between calls
+                self.telemetry.throttle("polygon", 12)
 
             # Get options contracts
             contracts_url = (
@@ -266,7 +416,7 @@ class OptionsDataFetcher:
             if expiration:
                 contracts_params["expiration_date"] = expiration
 
-            contracts_response = requests.get(contracts_url, params=contracts_params)
+            contracts_response = self._http_get(contracts_url, contracts_params)
 
             if contracts_response.status_code != 200:
                 print(f"Error fetching contracts: {contracts_response.status_code}")
@@ -278,26 +428,26 @@ class OptionsDataFetcher:
             if not contracts:
                 return pd.DataFrame()
 
-            # Convert to DataFrame format similar to yfinance
-            options_list = []
-
-            for contract in contracts[:50]:  # Limit to first 50 to avoid rate limits
-                options_list.append(
-                    {
-                        "strike": contract.get("strike_price", 0),
-                        "expiration": contract.get("expiration_date", ""),
-                        "option_type": (
-                            "call" if contract.get("contract_type") == "call" else "put"
-                        ),
-                        "ticker": contract.get("ticker", ""),
-                        "underlying_ticker": contract.get("underlying_ticker", ""),
-                    }
-                )
-
-            if not options_list:
+            # Strike, expiration and type come from the OCC contract tickers,
+            # parsed in one vectorized pass
+            # Limit to first 50 to avoid rate limits
+            contracts = [c for c in contracts[:50] if c.get("ticker")]
+            if not contracts:
                 return pd.DataFrame()
 
-            options_df = pd.DataFrame(options_list)
+            tickers = [contract["ticker"] for contract in contracts]
+            fields = occ_frame(tickers)
+            options_df = pd.DataFrame(
+                {
+                    "strike": fields["strike"],
+                    "expiration": fields["expiration"],
+                    "option_type": fields["option_type"],
+                    "ticker": tickers,
+                    "underlying_ticker": [
+                        contract.get("underlying_ticker", "") for contract in contracts
+                    ],
+                }
+            )
 
             # Add placeholder data for demo (in production, you'd fetch real market data)
             options_df["volume"] = np.random.randint(10, 1000, len(options_df))
@@ -1,12 +1,266 @@
 """Display module for formatting and presenting analysis results using rich."""
 
-from rich.console import Console
+from rich.console import Console, Group
 from rich.table import Table
 from rich.panel import Panel
 from rich.progress import Progress, SpinnerColumn, TextColumn
+import numpy as np
 import pandas as pd
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Sequence, Tuple
 from .config import Config
+from .oi_change import UNDERLYING_COLUMNS
+
+# Table layouts are defined once and reused for every render
+TableLayout = Tuple[str, str, Sequence[Tuple[str, Dict[str, Any]]]]
+
+STRIKE_LAYOUT: TableLayout = (
+    "Top Strikes by Volume",
+    "bold magenta",
+    [
+        ("Strike", {"justify": "right"}),
+        ("Type", {"justify": "center"}),
+        ("Volume", {"justify": "right"}),
+        ("Open Interest", {"justify": "right"}),
+        ("Dollar Flow", {"justify": "right"}),
+        ("Distance %", {"justify": "right"}),
+        ("ITM/OTM", {"justify": "center"}),
+    ],
+)
+UNUSUAL_LAYOUT: TableLayout = (
+    "Unusual Activity (High Volume/OI Ratio)",
+    "bold red",
+    [
+        ("Strike", {"justify": "right"}),
+        ("Type", {"justify": "center"}),
+        ("Expiration", {}),
+        ("Volume", {"justify": "right"}),
+        ("OI", {"justify": "right"}),
+        ("Vol/OI", {"justify": "right"}),
+        ("Dollar Flow", {"justify": "right"}),
+    ],
+)
+UNUSUAL_OI_LAYOUT: TableLayout = (
+    UNUSUAL_LAYOUT[0],
+    UNUSUAL_LAYOUT[1],
+    [
+        ("Strike", {"justify": "right"}),
+        ("Type", {"justify": "center"}),
+        ("Expiration", {"no_wrap": True}),
+        ("Volume", {"justify": "right"}),
+        ("OI", {"justify": "right"}),
+        ("Vol/OI", {"justify": "right"}),
+        ("Flow", {"justify": "right", "no_wrap": True}),
+        ("ΔOI", {"justify": "right"}),
+        ("Open", {"justify": "right"}),
+    ],
+)
+MAX_PAIN_LAYOUT: TableLayout = (
+    "Open Interest by Strike",
+    "bold purple",
+    [
+        ("Strike", {"justify": "right"}),
+        ("Open Interest", {"justify": "right"}),
+        ("Volume", {"justify": "right"}),
+    ],
+)
+EXPIRATION_LAYOUT: TableLayout = (
+    "Flow by Expiration",
+    "bold cyan",
+    [
+        ("Expiration", {}),
+        ("Volume", {"justify": "right"}),
+        ("Dollar Flow", {"justify": "right"}),
+    ],
+)
+SWEEP_LAYOUT: TableLayout = (
+    "Top Detected Sweeps",
+    "bold red",
+    [
+        ("Strike", {"justify": "right"}),
+        ("Type", {"justify": "center"}),
+        ("Volume", {"justify": "right"}),
+        ("Dollar Flow", {"justify": "right"}),
+        ("Confidence", {"justify": "right"}),
+    ],
+)
+COMBO_LAYOUT: TableLayout = (
+    "Multi-Leg Combos",
+    "bold cyan",
+    [
+        ("Type", {"style": "cyan", "no_wrap": True}),
+        ("Combos", {"justify": "right"}),
+        ("Legs", {"justify": "right"}),
+        ("Contracts", {"justify": "right"}),
+        ("Premium", {"justify": "right"}),
+    ],
+)
+
+GAMMA_WALL_LAYOUT: TableLayout = (
+    "Gamma Walls ($ per 1% move)",
+    "bold yellow",
+    [
+        ("Strike", {"justify": "right"}),
+        ("Type", {"justify": "center"}),
+        ("Dealer Gamma", {"justify": "right"}),
+        ("Open Interest", {"justify": "right"}),
+        ("Distance %", {"justify": "right"}),
+    ],
+)
+GAMMA_EXPIRATION_LAYOUT: TableLayout = (
+    "Gamma by Expiration ($ per 1% move)",
+    "bold yellow",
+    [
+        ("Expiration", {}),
+        ("Calls", {"justify": "right", "style": "green"}),
+        ("Puts", {"justify": "right", "style": "red"}),
+        ("Net", {"justify": "right"}),
+        ("Share", {"justify": "right"}),
+    ],
+)
+
+OI_CHANGE_STRIKE_LAYOUT: TableLayout = (
+    "Open Interest Change by Strike",
+    "bold blue",
+    [
+        ("Strike", {"justify": "right"}),
+        ("Type", {"justify": "center"}),
+        ("Volume", {"justify": "right"}),
+        ("OI", {"justify": "right"}),
+        ("ΔOI", {"justify": "right"}),
+        ("Opening", {"justify": "right"}),
+        ("Closing", {"justify": "right"}),
+        ("Opening %", {"justify": "right"}),
+    ],
+)
+OI_CHANGE_EXPIRATION_LAYOUT: TableLayout = (
+    "Open Interest Change by Expiration",
+    "bold blue",
+    [
+        ("Expiration", {"no_wrap": True}),
+        ("Volume", {"justify": "right"}),
+        ("ΔOI", {"justify": "right"}),
+        ("Opening", {"justify": "right"}),
+        ("Closing", {"justify": "right"}),
+        ("Opening %", {"justify": "right"}),
+        ("Opening Flow", {"justify": "right"}),
+    ],
+)
+
+ROLLUP_LAYOUT: TableLayout = (
+    "Flow by Group",
+    "bold magenta",
+    [
+        ("Group", {"style": "cyan", "no_wrap": True}),
+        ("Tickers", {"justify": "right"}),
+        ("Call Flow", {"justify": "right", "style": "green"}),
+        ("Put Flow", {"justify": "right", "style": "red"}),
+        ("Net Flow", {"justify": "right"}),
+        ("P/C Ratio", {"justify": "right"}),
+    ],
+)
+
+BACKTEST_LAYOUT: TableLayout = (
+    "Signal Backtest",
+    "bold magenta",
+    [
+        ("Signal", {"style": "cyan", "no_wrap": True}),
+        ("Days", {"justify": "right"}),
+        ("Count", {"justify": "right"}),
+        ("Hit Rate", {"justify": "right"}),
+        ("Mean", {"justify": "right"}),
+        ("Median", {"justify": "right"}),
+        ("t", {"justify": "right"}),
+        ("IC", {"justify": "right"}),
+    ],
+)
+
+
+def _new_table(layout: TableLayout) -> Table:
+    """Create an empty table from a layout."""
+    title, header_style, columns = layout
+    table = Table(title=title, show_header=True, header_style=header_style)
+    for header, options in columns:
+        table.add_column(header, **options)
+    return table
+
+
+def _fill_table(table: Table, columns: List[pd.Series]) -> Table:
+    """Add pre-formatted columns to a table row by row."""
+    for cells in zip(*(column.tolist() for column in columns)):
+        table.add_row(*cells)
+    return table
+
+
+def _styled(text: pd.Series, styles: np.ndarray) -> pd.Series:
+    """Wrap each cell of a formatted column in its rich style markup."""
+    styles = pd.Series(styles, index=text.index)
+    return "[" + styles + "]" + text + "[/" + styles + "]"
+
+
+# Powers of ten within int64, to count digits
+_POWERS_OF_TEN = 10 ** np.arange(19, dtype=np.int64)
+
+
+def _strikes(values: pd.Series) -> pd.Series:
+    return "$" + values.map("{:.0f}".format)
+
+
+def _counts(values: pd.Series) -> pd.Series:
+    """
+    Whole numbers with thousands separators, built a column at a time.
+
+    Values are rounded to int64 and their ASCII digits written into a byte
+    matrix (one row per cell) a digit position at a time, so there is no
+    Python call per cell; missing values show as "-".
+    """
+    missing = values.isna().to_numpy()
+    numbers = values.fillna(0).to_numpy(dtype=float).round().astype(np.int64)
+    rest = np.abs(numbers)
+    negative = numbers < 0
+    # Column of each number's last character: digits, separators and sign
+    digits = np.maximum(np.searchsorted(_POWERS_OF_TEN, rest, side="right"), 1)
+    column = digits + (digits - 1) // 3 + negative - 1
+    width = int(column.max()) + 1 if len(column) else 1
+    # Unused trailing bytes stay NUL, which is dropped when read as strings
+    chars = np.zeros((len(numbers), width), dtype=np.uint8)
+    chars[negative, 0] = ord("-")
+
+    # Fill from the last digit leftwards, keeping only numbers with digits left
+    rows = np.arange(len(numbers))
+    place = 0
+    while True:
+        chars[rows, column] = rest % 10 + ord("0")
+        rest //= 10
+        place += 1
+        more = rest > 0
+        if not more.any():
+            break
+        rows, rest, column = rows[more], rest[more], column[more] - 1
+        if place % 3 == 0:
+            chars[rows, column] = ord(",")
+            column -= 1
+
+    text = chars.view(f"S{width}")[:, 0].astype(str)
+    return pd.Series(np.where(missing, "-", text), index=values.index, dtype=object)
+
+
+def _dollars(values: pd.Series) -> pd.Series:
+    return ("$" + _counts(values)).mask(values.isna(), "-")
+
+
+def _compact(values: pd.Series) -> pd.Series:
+    """Signed amounts scaled to K, M or B so wide grids fit the terminal."""
+    magnitude = values.abs()
+    scale = np.select(
+        [magnitude >= 1e9, magnitude >= 1e6, magnitude >= 1e3], [1e9, 1e6, 1e3], 1.0
+    )
+    suffix = np.select([scale == 1e9, scale == 1e6, scale == 1e3], ["B", "M", "K"], "")
+    return (values / scale).map("{:+.2f}".format) + suffix
+
+
+def _option_types(values: pd.Series) -> pd.Series:
+    styles = np.where(values == "call", "green", "red")
+    return _styled(values.str.upper(), styles)
 
 
 class OptionsDisplay:
@@ -34,12 +288,16 @@ Market Cap: ${ticker_info.get('market_cap', 0):,}
         panel = Panel(info_text, title="Stock Information", border_style="blue")
         self.console.print(panel)
 
-    def show_flow_summary(self, flow_summary: Dict[str, Any]):
-        """Display options flow summary."""
-        if not flow_summary:
-            self.console.print("[yellow]No flow data available[/yellow]")
-            return
+    def render_flow_summary(self, flow_summary: Dict[str, Any]) -> Group:
+        """
+        Build the flow summary table and its analysis panel.
+
+        Args:
+            flow_summary: Dictionary from calculate_flow_summary
 
+        Returns:
+            Rich Group ready to print
+        """
         # Create summary table
         table = Table(
             title="Options Flow Summary", show_header=True, header_style="bold magenta"
@@ -63,6 +321,24 @@ Market Cap: ${ticker_info.get('market_cap', 0):,}
             f"${flow_summary['net_dollar_flow']:,.0f}",
         )
 
+        # Signed flow is only available once trades are classified by side
+        if "signed_net_flow" in flow_summary:
+            table.add_row(
+                "Signed Flow",
+                f"${flow_summary['signed_call_flow']:,.0f}",
+                f"${flow_summary['signed_put_flow']:,.0f}",
+                f"${flow_summary['signed_net_flow']:,.0f}",
+            )
+
+        # Opening flow is only available once joined to an earlier snapshot
+        if "opening_net_flow" in flow_summary:
+            table.add_row(
+                "Opening Flow",
+                f"${flow_summary['opening_call_flow']:,.0f}",
+                f"${flow_summary['opening_put_flow']:,.0f}",
+                f"${flow_summary['opening_net_flow']:,.0f}",
+            )
+
         # Add sentiment indicator
         sentiment = "🟢 Bullish" if flow_summary["bullish_sentiment"] else "🔴 Bearish"
 
@@ -71,9 +347,49 @@ Put/Call Ratio: {flow_summary['put_call_ratio']:.2f}
 Total Contracts: {flow_summary['total_contracts']:,}
 Sentiment: {sentiment}
 """
+        if "opening_share" in flow_summary:
+            summary_text += f"Opening Volume: {flow_summary['opening_share']:.1%} of contracts traded\n"
 
-        self.console.print(table)
-        self.console.print(Panel(summary_text, title="Analysis", border_style="yellow"))
+        return Group(
+            table, Panel(summary_text, title="Analysis", border_style="yellow")
+        )
+
+    def show_flow_summary(self, flow_summary: Dict[str, Any]):
+        """Display options flow summary."""
+        if not flow_summary:
+            self.console.print("[yellow]No flow data available[/yellow]")
+            return
+
+        self.console.print(self.render_flow_summary(flow_summary))
+
+    def render_strike_analysis(
+        self, strike_df: pd.DataFrame, max_rows: int = 15
+    ) -> Table:
+        """
+        Build the strike analysis table.
+
+        Only the rows that will be shown are formatted, one column at a time.
+
+        Args:
+            strike_df: Strike distribution DataFrame
+            max_rows: Maximum rows to include
+
+        Returns:
+            Rich Table ready to print
+        """
+        rows = strike_df.head(max_rows)
+        return _fill_table(
+            _new_table(STRIKE_LAYOUT),
+            [
+                _strikes(rows["strike"]),
+                _option_types(rows["option_type"]),
+                _counts(rows["volume"]),
+                _counts(rows["openInterest"]),
+                _dollars(rows["dollar_flow"]),
+                rows["distance_pct"].map("{:+.1f}%".format),
+                rows["moneyness"].astype(str),
+            ],
+        )
 
     def show_strike_analysis(self, strike_df: pd.DataFrame, max_rows: int = 15):
         """Display strike price analysis."""
@@ -81,33 +397,39 @@ Sentiment: {sentiment}
             self.console.print("[yellow]No strike data available[/yellow]")
             return
 
-        table = Table(
-            title="Top Strikes by Volume", show_header=True, header_style="bold magenta"
-        )
-        table.add_column("Strike", justify="right")
-        table.add_column("Type", justify="center")
-        table.add_column("Volume", justify="right")
-        table.add_column("Open Interest", justify="right")
-        table.add_column("Dollar Flow", justify="right")
-        table.add_column("Distance %", justify="right")
-        table.add_column("ITM/OTM", justify="center")
-
-        for _, row in strike_df.head(max_rows).iterrows():
-            # Color coding for calls/puts
-            type_style = "green" if row["option_type"] == "call" else "red"
-            moneyness_style = "bold" if row["moneyness"] == "ITM" else ""
-
-            table.add_row(
-                f"${row['strike']:.0f}",
-                f"[{type_style}]{row['option_type'].upper()}[/{type_style}]",
-                f"{row['volume']:,}",
-                f"{row['openInterest']:,}",
-                f"${row['dollar_flow']:,.0f}",
-                f"{row['distance_pct']:+.1f}%",
-                f"{row['moneyness']}",
-            )
-
-        self.console.print(table)
+        self.console.print(self.render_strike_analysis(strike_df, max_rows))
+
+    def render_unusual_activity(
+        self, unusual_df: pd.DataFrame, max_rows: int = 10
+    ) -> Table:
+        """
+        Build the unusual activity table.
+
+        Args:
+            unusual_df: Unusual activity DataFrame
+            max_rows: Maximum rows to include
+
+        Returns:
+            Rich Table ready to print
+        """
+        rows = unusual_df.head(max_rows)
+        columns = [
+            _strikes(rows["strike"]),
+            _option_types(rows["option_type"]),
+            rows["expiration"].astype(str),
+            _counts(rows["volume"]),
+            _counts(rows["openInterest"]),
+            rows["volume_oi_ratio"].map("{:.1f}x".format),
+            _dollars(rows["dollar_flow"]),
+        ]
+        if "opening_volume" not in rows.columns:
+            return _fill_table(_new_table(UNUSUAL_LAYOUT), columns)
+
+        columns += [
+            rows["oi_change"].map("{:+,}".format),
+            _counts(rows["opening_volume"]),
+        ]
+        return _fill_table(_new_table(UNUSUAL_OI_LAYOUT), columns)
 
     def show_unusual_activity(self, unusual_df: pd.DataFrame, max_rows: int = 10):
         """Display unusual options activity."""
@@ -115,33 +437,28 @@ Sentiment: {sentiment}
             self.console.print("[yellow]No unusual activity detected[/yellow]")
             return
 
-        table = Table(
-            title="Unusual Activity (High Volume/OI Ratio)",
-            show_header=True,
-            header_style="bold red",
+        self.console.print(self.render_unusual_activity(unusual_df, max_rows))
+
+    def render_max_pain(self, max_pain_df: pd.DataFrame, max_rows: int = 10) -> Table:
+        """
+        Build the open interest by strike table.
+
+        Args:
+            max_pain_df: Open interest by strike DataFrame
+            max_rows: Maximum rows to include
+
+        Returns:
+            Rich Table ready to print
+        """
+        rows = max_pain_df.head(max_rows)
+        return _fill_table(
+            _new_table(MAX_PAIN_LAYOUT),
+            [
+                _strikes(rows["strike"]),
+                _counts(rows["openInterest"]),
+                _counts(rows["volume"]),
+            ],
         )
-        table.add_column("Strike", justify="right")
-        table.add_column("Type", justify="center")
-        table.add_column("Expiration")
-        table.add_column("Volume", justify="right")
-        table.add_column("OI", justify="right")
-        table.add_column("Vol/OI", justify="right")
-        table.add_column("Dollar Flow", justify="right")
-
-        for _, row in unusual_df.head(max_rows).iterrows():
-            type_style = "green" if row["option_type"] == "call" else "red"
-
-            table.add_row(
-                f"${row['strike']:.0f}",
-                f"[{type_style}]{row['option_type'].upper()}[/{type_style}]",
-                str(row["expiration"]),
-                f"{row['volume']:,}",
-                f"{row['openInterest']:,}",
-                f"{row['volume_oi_ratio']:.1f}x",
-                f"${row['dollar_flow']:,.0f}",
-            )
-
-        self.console.print(table)
 
     def show_max_pain(self, max_pain_strike: float, max_pain_df: pd.DataFrame):
         """Display max pain analysis."""
@@ -158,45 +475,369 @@ Max Pain Strike: ${max_pain_strike:.0f}
         )
 
         # Top strikes by OI
-        table = Table(
-            title="Open Interest by Strike",
-            show_header=True,
-            header_style="bold purple",
+        self.console.print(self.render_max_pain(max_pain_df))
+
+    def render_expiration_analysis(self, exp_df: pd.DataFrame) -> Table:
+        """
+        Build the flow by expiration table.
+
+        Args:
+            exp_df: Expiration flow DataFrame
+
+        Returns:
+            Rich Table ready to print
+        """
+        return _fill_table(
+            _new_table(EXPIRATION_LAYOUT),
+            [
+                exp_df["expiration"].astype(str),
+                _counts(exp_df["volume"]),
+                _dollars(exp_df["dollar_flow"]),
+            ],
         )
-        table.add_column("Strike", justify="right")
-        table.add_column("Open Interest", justify="right")
-        table.add_column("Volume", justify="right")
-
-        for _, row in max_pain_df.head(10).iterrows():
-            table.add_row(
-                f"${row['strike']:.0f}",
-                f"{row['openInterest']:,}",
-                f"{row['volume']:,}",
-            )
-
-        self.console.print(table)
 
     def show_expiration_analysis(self, exp_df: pd.DataFrame):
         """Display expiration analysis."""
         if exp_df.empty:
             return
 
+        self.console.print(self.render_expiration_analysis(exp_df))
+
+    def render_gamma_levels(
+        self,
+        levels: Dict[str, Any],
+        walls: pd.DataFrame,
+        by_expiration: pd.DataFrame,
+    ) -> Group:
+        """
+        Build the gamma flip panel with the wall and expiration tables.
+
+        Args:
+            levels: gamma_levels from analyze_gamma_levels
+            walls: gamma_walls from analyze_gamma_levels
+            by_expiration: gamma_by_expiration from analyze_gamma_levels
+
+        Returns:
+            Rich Group ready to print
+        """
+        if levels["flip_level"] is None:
+            flip = "none within search range"
+        else:
+            flip = f"${levels['flip_level']:,.2f} ({levels['flip_distance']:+.1%})"
+        others = [
+            level for level in levels["flip_levels"] if level != levels["flip_level"]
+        ]
+        if others:
+            flip += "  also " + ", ".join(f"${level:,.2f}" for level in others)
+        regime = (
+            "🟢 Positive (dealers dampen moves)"
+            if levels["regime"] == "positive"
+            else "🔴 Negative (dealers amplify moves)"
+        )
+        call_wall, put_wall = (
+            "-" if levels[key] is None else f"${levels[key]:.2f}"
+            for key in ("call_wall", "put_wall")
+        )
+        gamma_text = f"""
+Dealer Gamma at Spot: ${levels['total_gamma']:+,.0f} per 1% move
+Regime: {regime}
+Gamma Flip: {flip}
+Call Wall: {call_wall}   Put Wall: {put_wall}
+"""
+        net = by_expiration["net_gamma"]
+        return Group(
+            Panel(gamma_text, title="Gamma Exposure", border_style="yellow"),
+            _fill_table(
+                _new_table(GAMMA_WALL_LAYOUT),
+                [
+                    _strikes(walls["strike"]),
+                    _option_types(walls["option_type"]),
+                    "$" + _compact(walls["gamma_exposure"]),
+                    _counts(walls["openInterest"]),
+                    (walls["distance"] * 100).map("{:+.1f}%".format),
+                ],
+            ),
+            _fill_table(
+                _new_table(GAMMA_EXPIRATION_LAYOUT),
+                [
+                    by_expiration["expiration"].astype(str),
+                    _compact(by_expiration["call_gamma"]),
+                    _compact(by_expiration["put_gamma"]),
+                    _styled(_compact(net), np.where(net >= 0, "green", "red")),
+                    by_expiration["gross_share"].map("{:.1%}".format),
+                ],
+            ),
+        )
+
+    def show_gamma_levels(
+        self,
+        levels: Dict[str, Any],
+        walls: pd.DataFrame,
+        by_expiration: pd.DataFrame,
+    ):
+        """Display the gamma flip level, gamma walls and expiry contributions."""
+        self.console.print(self.render_gamma_levels(levels, walls, by_expiration))
+
+    def show_oi_change(
+        self,
+        by_strike: pd.DataFrame,
+        by_expiration: pd.DataFrame,
+        max_rows: int = 15,
+    ):
+        """
+        Display open interest change and opening/closing volume.
+
+        Args:
+            by_strike: oi_change_by_strike from analyze_oi_change
+            by_expiration: oi_change_by_expiration from analyze_oi_change
+            max_rows: Maximum rows per table
+        """
+
+        def oi_change(values: pd.Series) -> pd.Series:
+            styles = np.where(values >= 0, "green", "red")
+            return _styled(values.map("{:+,}".format), styles)
+
+        def labels(rows: pd.DataFrame, values: pd.Series) -> pd.Series:
+            # Multi-ticker chains group by underlying as well
+            for column in UNDERLYING_COLUMNS:
+                if column in rows.columns:
+                    return rows[column].astype(str) + " " + values
+            return values
+
+        rows = by_strike.head(max_rows)
+        if not rows.empty:
+            self.console.print(
+                _fill_table(
+                    _new_table(OI_CHANGE_STRIKE_LAYOUT),
+                    [
+                        labels(rows, _strikes(rows["strike"])),
+                        _option_types(rows["option_type"]),
+                        _counts(rows["volume"]),
+                        _counts(rows["openInterest"]),
+                        oi_change(rows["oi_change"]),
+                        _counts(rows["opening_volume"]),
+                        _counts(rows["closing_volume"]),
+                        rows["opening_share"].map("{:.0%}".format),
+                    ],
+                )
+            )
+
+        rows = by_expiration.head(max_rows)
+        if not rows.empty:
+            self.console.print(
+                _fill_table(
+                    _new_table(OI_CHANGE_EXPIRATION_LAYOUT),
+                    [
+                        labels(rows, rows["expiration"].astype(str)),
+                        _counts(rows["volume"]),
+                        oi_change(rows["oi_change"]),
+                        _counts(rows["opening_volume"]),
+                        _counts(rows["closing_volume"]),
+                        rows["opening_share"].map("{:.0%}".format),
+                        _dollars(rows["opening_flow"]),
+                    ],
+                )
+            )
+
+    def show_combos(
+        self,
+        combos: pd.DataFrame,
+        adjusted_flow: Dict[str, Any],
+        flow_summary: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Display detected combos and flow with their legs removed.
+
+        Args:
+            combos: combos from analyze_combos
+            adjusted_flow: combo_adjusted_flow from analyze_combos
+            flow_summary: Flow summary of the whole chain, for comparison
+        """
+        if combos.empty:
+            self.console.print("[dim]No multi-leg combos detected.[/dim]")
+            return
+
+        self.console.print(
+            _fill_table(
+                _new_table(COMBO_LAYOUT),
+                [
+                    combos["combo_type"].str.replace("_", " ").str.title(),
+                    _counts(combos["combos"]),
+                    _counts(combos["legs"]),
+                    _counts(combos["contracts"]),
+                    _dollars(combos["premium"]),
+                ],
+            )
+        )
+
+        if not adjusted_flow or not flow_summary:
+            return
+
+        def sentiment(summary: Dict[str, Any]) -> str:
+            return "🟢 Bullish" if summary.get("bullish_sentiment") else "🔴 Bearish"
+
         table = Table(
-            title="Flow by Expiration", show_header=True, header_style="bold cyan"
+            title="Flow: All Legs vs Combo-Adjusted",
+            show_header=True,
+            header_style="bold cyan",
+        )
+        table.add_column("Metric", style="cyan")
+        table.add_column("All Legs", justify="right", style="blue")
+        table.add_column("Combo-Adjusted", justify="right", style="green")
+        table.add_row(
+            "Net Volume",
+            f"{flow_summary.get('net_volume', 0):,}",
+            f"{adjusted_flow.get('net_volume', 0):,}",
+        )
+        table.add_row(
+            "Net Dollar Flow",
+            f"${flow_summary.get('net_dollar_flow', 0):,.0f}",
+            f"${adjusted_flow.get('net_dollar_flow', 0):,.0f}",
         )
-        table.add_column("Expiration")
-        table.add_column("Volume", justify="right")
-        table.add_column("Dollar Flow", justify="right")
+        table.add_row("Sentiment", sentiment(flow_summary), sentiment(adjusted_flow))
+        table.add_row(
+            "Put/Call Ratio",
+            f"{flow_summary.get('put_call_ratio', 0):.2f}",
+            f"{adjusted_flow.get('put_call_ratio', 0):.2f}",
+        )
+        self.console.print(table)
 
-        for _, row in exp_df.iterrows():
-            table.add_row(
-                str(row["expiration"]),
-                f"{row['volume']:,}",
-                f"${row['dollar_flow']:,.0f}",
+    def show_universe_ranking(self, rankings: Dict[str, pd.DataFrame]):
+        """Display top-K tickers for each ranking metric."""
+        titles = {
+            "net_premium": ("Top Net Premium", "Net Premium", "${:+,.0f}"),
+            "volume_oi": ("Top Volume/OI", "Max Vol/OI", "{:.1f}x"),
+            "sweep_confidence": ("Top Sweep Confidence", "Confidence", "{:.1%}"),
+            "gex_change": ("Top GEX Change", "GEX Change", "{:+,.0f}"),
+        }
+
+        for metric, ranking in rankings.items():
+            if ranking.empty:
+                continue
+
+            title, value_header, value_format = titles.get(
+                metric, (metric, "Value", "{:+,.0f}")
+            )
+            layout: TableLayout = (
+                title,
+                "bold magenta",
+                [
+                    ("Rank", {"justify": "right"}),
+                    ("Ticker", {"style": "cyan"}),
+                    (value_header, {"justify": "right"}),
+                ],
             )
+            ranks = pd.Series(np.arange(1, len(ranking) + 1), index=ranking.index)
+            table = _fill_table(
+                _new_table(layout),
+                [
+                    ranks.astype(str),
+                    ranking["ticker"].astype(str),
+                    ranking[metric].map(value_format.format),
+                ],
+            )
+            self.console.print(table)
+
+    def show_rollup(self, rollup: pd.DataFrame):
+        """
+        Display flow rolled up through a taxonomy, nested groups indented.
+
+        Args:
+            rollup: FlowRollup.frame()
+        """
+        if rollup.empty:
+            return
+
+        net = rollup["net_dollar_flow"]
+        names = rollup["depth"].map(lambda depth: "  " * depth) + rollup["group"]
+        self.console.print(
+            _fill_table(
+                _new_table(ROLLUP_LAYOUT),
+                [
+                    names,
+                    _counts(rollup["tickers"]),
+                    _dollars(rollup["call_flow"]),
+                    _dollars(rollup["put_flow"]),
+                    _styled(
+                        net.map("${:+,.0f}".format), np.where(net >= 0, "green", "red")
+                    ),
+                    rollup["put_call_ratio"].map("{:.2f}".format),
+                ],
+            )
+        )
+
+    def show_backtest_summary(self, summary: pd.DataFrame):
+        """Display hit rate and return statistics per signal and horizon."""
+        if summary.empty:
+            self.show_warning("No snapshots with forward returns to score")
+            return
 
+        def fmt(values: pd.Series, spec: str) -> pd.Series:
+            return values.map(lambda v: "-" if pd.isna(v) else spec.format(v))
+
+        hit_rate = summary["hit_rate"]
+        styles = np.where(
+            hit_rate > 0.5, "green", np.where(hit_rate < 0.5, "red", "white")
+        )
+        table = _fill_table(
+            _new_table(BACKTEST_LAYOUT),
+            [
+                summary["signal"].astype(str),
+                summary["horizon"].astype(str),
+                _counts(summary["count"]),
+                _styled(fmt(hit_rate, "{:.1%}"), styles),
+                fmt(summary["mean_return"], "{:+.2%}"),
+                fmt(summary["median_return"], "{:+.2%}"),
+                fmt(summary["t_stat"], "{:+.2f}"),
+                fmt(summary["ic"], "{:+.3f}"),
+            ],
+        )
         self.console.print(table)
 
+    def show_scenario_surface(
+        self,
+        surface: pd.DataFrame,
+        title: str,
+        current_price: float,
+        max_rows: int = 11,
+        max_cols: int = 5,
+    ):
+        """
+        Display a scenario surface (spot rows by IV-shift columns).
+
+        Columns are labelled by the IV shift in vol points. Large grids are
+        thinned to evenly spaced rows and columns, always keeping the first and
+        last of each.
+        """
+        rows = np.unique(np.linspace(0, len(surface) - 1, max_rows).round().astype(int))
+        cols = np.unique(
+            np.linspace(0, surface.shape[1] - 1, max_cols).round().astype(int)
+        )
+        surface = surface.iloc[rows, cols]
+
+        layout: TableLayout = (
+            title,
+            "bold magenta",
+            [("Spot", {"justify": "right", "style": "cyan", "no_wrap": True})]
+            + [
+                (f"IV{shift * 100:+.1f}", {"justify": "right"})
+                for shift in surface.columns
+            ],
+        )
+        spots = pd.Series(surface.index, index=surface.index)
+        columns = [
+            "$"
+            + spots.map("{:,.2f}".format)
+            + " ("
+            + (spots / current_price - 1).map("{:+.1%}".format)
+            + ")"
+        ]
+        for shift in surface.columns:
+            values = surface[shift]
+            styles = np.where(values >= 0, "green", "red")
+            columns.append(_styled(_compact(values), styles))
+        self.console.print(_fill_table(_new_table(layout), columns))
+
     def show_loading(self, message: str):
         """Show loading spinner."""
         with Progress(
@@ -311,6 +952,37 @@ Sweep Trades Only:
                 Panel(sweep_info, title="Sweep-Only Analysis", border_style="red")
             )
 
+    def render_top_sweeps(
+        self, df: pd.DataFrame, max_rows: int = 10
+    ) -> Optional[Table]:
+        """
+        Build the top detected sweeps table.
+
+        Args:
+            df: Options DataFrame classified by detect_sweeps
+            max_rows: Maximum rows to include
+
+        Returns:
+            Rich Table ready to print, or None when no sweeps were detected
+        """
+        sweeps = df[df["trade_type"] == "sweep"]
+        if sweeps.empty:
+            return None
+
+        rows = sweeps.nlargest(max_rows, "sweep_confidence")
+        confidence = rows["sweep_confidence"]
+        confidence_styles = np.where(confidence > 0.7, "bold red", "yellow")
+        return _fill_table(
+            _new_table(SWEEP_LAYOUT),
+            [
+                _strikes(rows["strike"]),
+                _option_types(rows["option_type"]),
+                _counts(rows["volume"]),
+                _dollars(rows["dollar_flow"]),
+                _styled(confidence.map("{:.1%}".format), confidence_styles),
+            ],
+        )
+
     def show_trade_classification(self, df: pd.DataFrame, max_rows: int = 10):
         """Display trade classification results."""
         if df.empty or "trade_type" not in df.columns:
@@ -334,29 +1006,6 @@ Sweep Trades Only:
         self.console.print(count_table)
 
         # Show top sweep trades
-        sweeps = df[df["trade_type"] == "sweep"].sort_values(
-            "sweep_confidence", ascending=False
-        )
-        if not sweeps.empty:
-            sweep_table = Table(
-                title="Top Detected Sweeps", show_header=True, header_style="bold red"
-            )
-            sweep_table.add_column("Strike", justify="right")
-            sweep_table.add_column("Type", justify="center")
-            sweep_table.add_column("Volume", justify="right")
-            sweep_table.add_column("Dollar Flow", justify="right")
-            sweep_table.add_column("Confidence", justify="right")
-
-            for _, row in sweeps.head(max_rows).iterrows():
-                type_style = "green" if row["option_type"] == "call" else "red"
-                confidence = row["sweep_confidence"]
-
-                sweep_table.add_row(
-                    f"${row['strike']:.0f}",
-                    f"[{type_style}]{row['option_type'].upper()}[/{type_style}]",
-                    f"{row['volume']:,}",
-                    f"${row['dollar_flow']:,.0f}",
-                    f"[{'bold red' if confidence > 0.7 else 'yellow'}]{confidence:.1%}[/{'bold red' if confidence > 0.7 else 'yellow'}]",
-                )
-
+        sweep_table = self.render_top_sweeps(df, max_rows)
+        if sweep_table is not None:
             self.console.print(sweep_table)
@@ -0,0 +1,128 @@
+"""Machine-readable serialization of analysis results."""
+
+import json
+import math
+import os
+import sys
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Iterator, List, Optional, TextIO
+
+# "table" renders with rich; every other format is written by this module
+OUTPUT_FORMATS = ["table", "json", "jsonl", "csv", "parquet"]
+
+# Formats that write one file per section and need an output directory
+DIRECTORY_FORMATS = ["csv", "parquet"]
+
+
+def plain(value: Any) -> Any:
+    """
+    Convert a result value to JSON-compatible Python objects.
+
+    DataFrames become lists of records, NumPy scalars become Python scalars,
+    timestamps become ISO strings and NaN becomes None.
+    """
+    if isinstance(value, pd.DataFrame):
+        return [plain(record) for record in value.to_dict("records")]
+    if isinstance(value, pd.Series):
+        return plain(value.to_dict())
+    if isinstance(value, dict):
+        return {str(key): plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [plain(item) for item in value]
+    if isinstance(value, (pd.Timestamp, np.datetime64)):
+        return None if pd.isna(value) else pd.Timestamp(value).isoformat()
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def iter_json_lines(results: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """
+    Flatten results to one JSON object per table row.
+
+    Every line carries a ``section`` field naming the result it came from.
+    Dictionary results produce a single line with their keys; scalar results
+    produce a single line with a ``value`` key.
+    """
+    for section, value in results.items():
+        if isinstance(value, pd.DataFrame):
+            for record in plain(value):
+                yield {"section": section, **record}
+        elif isinstance(value, dict):
+            yield {"section": section, **plain(value)}
+        else:
+            yield {"section": section, "value": plain(value)}
+
+
+def section_frame(value: Any) -> pd.DataFrame:
+    """Return a result as a DataFrame; nested dictionaries are flattened."""
+    if isinstance(value, pd.DataFrame):
+        return value
+    if isinstance(value, dict):
+        return pd.json_normalize(plain(value))
+    return pd.DataFrame({"value": [plain(value)]})
+
+
+def write_results(
+    results: Dict[str, Any],
+    output_format: str,
+    output: Optional[str] = None,
+    stream: Optional[TextIO] = None,
+) -> List[str]:
+    """
+    Serialize analysis results without rendering them.
+
+    Args:
+        results: Mapping of section name to a DataFrame, dictionary or scalar
+        output_format: One of json, jsonl, csv or parquet
+        output: File for json/jsonl (stdout when None), or the directory that
+            receives one file per section for csv/parquet
+        stream: Stream used instead of stdout when output is None
+
+    Returns:
+        Paths of the files written (empty when writing to a stream)
+    """
+    if output_format not in OUTPUT_FORMATS or output_format == "table":
+        raise ValueError(f"Unsupported output format: {output_format}")
+
+    if output_format in DIRECTORY_FORMATS:
+        if not output:
+            raise ValueError(f"{output_format} output requires an output directory")
+        if output_format == "parquet":
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                raise ImportError(
+                    "Parquet output requires pyarrow: pip install pyarrow"
+                )
+
+        os.makedirs(output, exist_ok=True)
+        paths = []
+        for section, value in results.items():
+            frame = section_frame(value)
+            path = os.path.join(output, f"{section}.{output_format}")
+            if output_format == "csv":
+                frame.to_csv(path, index=False)
+            else:
+                # Object columns may mix types (e.g. expirations); store as text
+                objects = frame.select_dtypes(include="object").columns
+                frame = frame.astype({column: "string" for column in objects})
+                frame.to_parquet(path, index=False)
+            paths.append(path)
+        return paths
+
+    fh = open(output, "w", encoding="utf-8") if output else (stream or sys.stdout)
+    try:
+        if output_format == "json":
+            json.dump(plain(results), fh, indent=2)
+            fh.write("\n")
+        else:
+            for line in iter_json_lines(results):
+                fh.write(json.dumps(line) + "\n")
+    finally:
+        if output:
+            fh.close()
+    return [output] if output else []
@@ -0,0 +1,519 @@
+"""Filter expressions over options chains, compiled to a single boolean mask.
+
+A small DSL for selecting contracts, e.g.::
+
+    dte <= 14 and moneyness in 0.95..1.05 and premium >= $1M
+    type == put and (vol_oi > 5 or abs_delta >= 0.4)
+    expiration in [2024-01-19, 2024-02-16] and strike in 400..450
+
+Comparisons are ``<``, ``<=``, ``>``, ``>=``, ``==`` (or ``=``) and ``!=``;
+``field in [a, b]`` tests membership, ``field in low..high`` an inclusive
+range, and ``not in`` negates either. Terms combine with ``and``, ``or``,
+``not`` and parentheses. Numbers accept a leading ``$``, K/M/B suffixes
+and a trailing ``%``.
+
+Fields are the derived ones in FIELDS or any column of the chain by name.
+Each field is extracted or derived at most once per evaluation, string
+fields are compared on their distinct values only, and all terms combine
+in place into one mask, so filtering touches every column it needs once
+and copies no rows.
+"""
+
+import functools
+import operator
+import re
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set
+import numpy as np
+import pandas as pd
+
+# Derived fields and the chain columns they alias
+FIELDS = {
+    "volume": "contracts traded",
+    "oi": "open interest (openInterest)",
+    "strike": "strike price",
+    "price": "last trade price (lastPrice)",
+    "premium": "dollar flow, volume x price x 100 (dollar_flow)",
+    "iv": "implied volatility (impliedVolatility)",
+    "type": "call or put (option_type)",
+    "expiration": "expiration date",
+    "dte": "calendar days to expiration",
+    "moneyness": "strike / spot",
+    "delta": "Black-Scholes delta (negative for puts)",
+    "abs_delta": "absolute Black-Scholes delta",
+    "vol_oi": "volume / (open interest + 1)",
+}
+
+_COLUMN_ALIASES = {
+    "oi": "openInterest",
+    "open_interest": "openInterest",
+    "price": "lastPrice",
+    "premium": "dollar_flow",
+    "flow": "dollar_flow",
+    "iv": "impliedVolatility",
+    "type": "option_type",
+}
+
+_TYPE_VALUES = {"call": "call", "calls": "call", "c": "call"}
+_TYPE_VALUES.update({"put": "put", "puts": "put", "p": "put"})
+
+_SCALES = {"k": 1e3, "m": 1e6, "b": 1e9, "%": 0.01}
+
+_TOKEN = re.compile(
+    r"""\s*(?:
+        (?P<date>\d{4}-\d{2}-\d{2})
+      | (?P<number>\$?-?\d+(?:\.\d+)?[kKmMbB%]?)
+      | (?P<op><=|>=|==|!=|<|>|=|\.\.)
+      | (?P<punct>[()\[\],])
+      | (?P<string>"[^"]*"|'[^']*')
+      | (?P<word>[A-Za-z_][A-Za-z0-9_.]*)
+    )""",
+    re.VERBOSE,
+)
+
+_COMPARISONS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "=": operator.eq,
+    "!=": operator.ne,
+}
+
+_KEYWORDS = {"and", "or", "not", "in"}
+
+
+class FilterError(ValueError):
+    """Raised for malformed filter expressions or fields the chain lacks."""
+
+
+class _Columns:
+    """Lazily extracted field arrays of one chain, each computed once."""
+
+    def __init__(
+        self, df: pd.DataFrame, spot: Optional[float], as_of: Optional[datetime]
+    ):
+        self.df = df
+        self.spot = spot
+        self.as_of = as_of
+        self._cache: Dict[str, Any] = {}
+        # Masks of individual comparisons, shared by every expression
+        # evaluated over these columns (see evaluate_all)
+        self._terms: Dict[tuple, np.ndarray] = {}
+
+    def term(self, key: tuple, compute: Callable[[], np.ndarray]) -> np.ndarray:
+        """A comparison's mask, computed once; callers get a copy to combine in place."""
+        mask = self._terms.get(key)
+        if mask is None:
+            mask = self._terms[key] = compute()
+        return mask.copy()
+
+    def column(self, name: str) -> str:
+        column = _COLUMN_ALIASES.get(name, name)
+        if column not in self.df.columns:
+            raise FilterError(f"Unknown filter field: {name}")
+        return column
+
+    def numeric(self, name: str) -> np.ndarray:
+        """Field values as a float array."""
+        if name not in self._cache:
+            self._cache[name] = self._derive(name)
+        return self._cache[name]
+
+    def factorized(self, name: str):
+        """Codes and distinct values of a string field."""
+        key = "codes:" + name
+        if key not in self._cache:
+            values = self.df[self.column(name)]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                codes, uniques = values.cat.codes.to_numpy(), values.cat.categories
+            else:
+                codes, uniques = pd.factorize(values)
+            self._cache[key] = codes, np.asarray(uniques, dtype=object).astype(str)
+        return self._cache[key]
+
+    def _expiry_days(self) -> np.ndarray:
+        """Expiration as days since 1970, parsing each distinct date once."""
+        codes, uniques = self.factorized("expiration")
+        days = pd.to_datetime(pd.Index(uniques)).to_numpy().astype("datetime64[D]")
+        return days.astype(np.int64).astype(float)[codes]
+
+    def _derive(self, name: str) -> np.ndarray:
+        df = self.df
+        if name == "expiration":
+            return self._expiry_days()
+        if name == "dte":
+            today = np.datetime64(pd.Timestamp(self.as_of or datetime.now()), "D")
+            return self.numeric("expiration") - float(today.astype(np.int64))
+        if name == "vol_oi":
+            return self.numeric("volume") / (self.numeric("oi") + 1)
+        if name == "moneyness":
+            if self.spot:
+                return self.numeric("strike") / self.spot
+            if name not in df.columns:
+                raise FilterError("moneyness filters need the spot price")
+            return df[name].to_numpy(dtype=float)
+        if name in ("delta", "abs_delta"):
+            delta = self._delta()
+            return np.abs(delta) if name == "abs_delta" else delta
+        try:
+            return df[self.column(name)].to_numpy(dtype=float)
+        except (TypeError, ValueError):
+            raise FilterError(f"Field {name} is not numeric")
+
+    def _delta(self) -> np.ndarray:
+        from .greeks import black_scholes, contract_arrays
+
+        if not self.spot:
+            raise FilterError("delta filters need the spot price")
+        c = contract_arrays(self.df, as_of=self.as_of)
+        return black_scholes(self.spot, c["strike"], c["years"], c["iv"], c["is_call"])[
+            "delta"
+        ]
+
+
+# A compiled term maps a chain's columns to a boolean mask
+_Term = Callable[[_Columns], np.ndarray]
+
+
+def _is_numeric_field(name: str, columns: _Columns) -> bool:
+    if name in FIELDS and name != "type":
+        return True
+    return pd.api.types.is_numeric_dtype(columns.df[columns.column(name)])
+
+
+def _number(text: str) -> float:
+    text = text.lstrip("$")
+    scale = _SCALES.get(text[-1].lower(), 1.0)
+    if scale != 1.0:
+        text = text[:-1]
+    return float(text) * scale
+
+
+def _date_days(text: str) -> float:
+    try:
+        return float(np.datetime64(text, "D").astype(np.int64))
+    except ValueError:
+        raise FilterError(f"Not a date: {text}")
+
+
+class _Parser:
+    """Recursive-descent parser building a tree of mask functions."""
+
+    def __init__(self, source: str):
+        self.tokens = self._tokenize(source)
+        self.position = 0
+        self.fields: Set[str] = set()
+
+    @staticmethod
+    def _tokenize(source: str) -> List[tuple]:
+        tokens, position = [], 0
+        source = source.rstrip()
+        while position < len(source):
+            match = _TOKEN.match(source, position)
+            if match is None or match.end() == position:
+                raise FilterError(
+                    f"Unexpected text in filter at {position}: {source[position:]!r}"
+                )
+            kind = match.lastgroup
+            value = match.group(kind)
+            if kind == "word" and value.lower() in _KEYWORDS:
+                kind, value = "keyword", value.lower()
+            elif kind == "string":
+                kind, value = "word", value[1:-1]
+            tokens.append((kind, value))
+            position = match.end()
+        return tokens
+
+    def peek(self, kind: Optional[str] = None, value: Optional[str] = None) -> bool:
+        if self.position >= len(self.tokens):
+            return False
+        token_kind, token_value = self.tokens[self.position]
+        return (kind is None or token_kind == kind) and (
+            value is None or token_value == value
+        )
+
+    def take(self, kind: Optional[str] = None, value: Optional[str] = None) -> str:
+        if not self.peek(kind, value):
+            found = (
+                self.tokens[self.position][1]
+                if self.position < len(self.tokens)
+                else "end of filter"
+            )
+            raise FilterError(f"Expected {value or kind} in filter, found {found!r}")
+        self.position += 1
+        return self.tokens[self.position - 1][1]
+
+    def parse(self) -> _Term:
+        term = self.disjunction()
+        if self.position < len(self.tokens):
+            raise FilterError(f"Unexpected {self.tokens[self.position][1]!r} in filter")
+        return term
+
+    def disjunction(self) -> _Term:
+        terms = [self.conjunction()]
+        while self.peek("keyword", "or"):
+            self.take()
+            terms.append(self.conjunction())
+        if len(terms) == 1:
+            return terms[0]
+
+        def any_of(columns: _Columns) -> np.ndarray:
+            mask = terms[0](columns)
+            for term in terms[1:]:
+                if mask.all():
+                    break
+                mask |= term(columns)
+            return mask
+
+        return any_of
+
+    def conjunction(self) -> _Term:
+        terms = [self.negation()]
+        while self.peek("keyword", "and"):
+            self.take()
+            terms.append(self.negation())
+        if len(terms) == 1:
+            return terms[0]
+
+        def all_of(columns: _Columns) -> np.ndarray:
+            mask = terms[0](columns)
+            for term in terms[1:]:
+                # Later terms can't select anything once the mask is empty
+                if not mask.any():
+                    break
+                mask &= term(columns)
+            return mask
+
+        return all_of
+
+    def negation(self) -> _Term:
+        if self.peek("keyword", "not"):
+            self.take()
+            term = self.negation()
+            return lambda columns: ~term(columns)
+        if self.peek("punct", "("):
+            self.take()
+            term = self.disjunction()
+            self.take("punct", ")")
+            return term
+        return self.comparison()
+
+    def value(self) -> str:
+        if self.peek("number") or self.peek("date") or self.peek("word"):
+            return self.take()
+        return self.take("value")
+
+    def comparison(self) -> _Term:
+        field = self.take("word")
+        name = field.lower() if field.lower() in FIELDS else field
+        self.fields.add(name)
+
+        negate = False
+        if self.peek("keyword", "not"):
+            self.take()
+            negate = True
+            self.take("keyword", "in")
+            term = self.membership(name)
+        elif self.peek("keyword", "in"):
+            self.take()
+            term = self.membership(name)
+        else:
+            op = self.take("op")
+            if op not in _COMPARISONS:
+                raise FilterError(f"Unexpected {op!r} in filter")
+            term = _compare(name, op, self.value())
+        if negate:
+            return lambda columns: ~term(columns)
+        return term
+
+    def membership(self, name: str) -> _Term:
+        if self.peek("punct", "[") or self.peek("punct", "("):
+            close = "]" if self.take() == "[" else ")"
+            values = [self.value()]
+            while self.peek("punct", ","):
+                self.take()
+                values.append(self.value())
+            self.take("punct", close)
+            return _member(name, values)
+
+        low = self.value()
+        self.take("op", "..")
+        high = self.value()
+        lower, upper = _compare(name, ">=", low), _compare(name, "<=", high)
+
+        def between(columns: _Columns) -> np.ndarray:
+            mask = lower(columns)
+            mask &= upper(columns)
+            return mask
+
+        return between
+
+
+def _operand(name: str, text: str) -> float:
+    """A value as a number comparable with the field's numeric array."""
+    if name == "expiration":
+        return _date_days(text)
+    try:
+        return _number(text)
+    except ValueError:
+        raise FilterError(f"Field {name} needs a number, got {text!r}")
+
+
+def _string_value(name: str, text: str) -> str:
+    if name == "type":
+        value = _TYPE_VALUES.get(text.lower())
+        if value is None:
+            raise FilterError(f"Option type must be call or put, got {text!r}")
+        return value
+    return text
+
+
+def _compare(name: str, op: str, text: str) -> _Term:
+    compare_op = _COMPARISONS[op]
+    key = ("compare", name, compare_op, text)
+
+    def compare(columns: _Columns) -> np.ndarray:
+        return columns.term(key, lambda: evaluate(columns))
+
+    def evaluate(columns: _Columns) -> np.ndarray:
+        if _is_numeric_field(name, columns):
+            with np.errstate(invalid="ignore"):
+                return compare_op(columns.numeric(name), _operand(name, text))
+        if op not in ("==", "=", "!="):
+            raise FilterError(f"Field {name} only supports ==, != and in")
+        # Compare the distinct values, then broadcast through the codes
+        codes, uniques = columns.factorized(name)
+        selected = np.append(compare_op(uniques, _string_value(name, text)), False)
+        return selected[codes]
+
+    return compare
+
+
+def _member(name: str, values: List[str]) -> _Term:
+    key = ("member", name, tuple(values))
+
+    def member(columns: _Columns) -> np.ndarray:
+        return columns.term(key, lambda: evaluate(columns))
+
+    def evaluate(columns: _Columns) -> np.ndarray:
+        if _is_numeric_field(name, columns):
+            wanted = np.array([_operand(name, value) for value in values])
+            return np.isin(columns.numeric(name), wanted)
+        codes, uniques = columns.factorized(name)
+        wanted = [_string_value(name, value) for value in values]
+        selected = np.append(np.isin(uniques, wanted), False)
+        return selected[codes]
+
+    return member
+
+
+class FilterExpression:
+    """A compiled filter expression; evaluate it with mask() or indices()."""
+
+    def __init__(self, source: str):
+        """
+        Args:
+            source: Filter expression text
+
+        Raises:
+            FilterError: If the expression is malformed
+        """
+        parser = _Parser(source)
+        if not parser.tokens:
+            raise FilterError("Empty filter expression")
+        self.source = source
+        self._term = parser.parse()
+        # Fields referenced by the expression
+        self.fields = frozenset(parser.fields)
+
+    def mask(
+        self,
+        df: pd.DataFrame,
+        spot: Optional[float] = None,
+        as_of: Optional[datetime] = None,
+    ) -> np.ndarray:
+        """
+        Evaluate the expression over a chain.
+
+        Args:
+            df: Options DataFrame
+            spot: Underlying price, for moneyness and delta
+            as_of: Valuation time for dte and delta (default now)
+
+        Returns:
+            Boolean array aligned with the rows of df
+
+        Raises:
+            FilterError: If a field is missing or used with the wrong type
+        """
+        if df.empty:
+            return np.zeros(len(df), dtype=bool)
+        mask = self._term(_Columns(df, spot, as_of))
+        # NaN comparisons are False already; make the result a fresh array
+        return np.asarray(mask, dtype=bool)
+
+    def indices(
+        self,
+        df: pd.DataFrame,
+        spot: Optional[float] = None,
+        as_of: Optional[datetime] = None,
+    ) -> np.ndarray:
+        """Positions of the matching rows, for one take() by the caller."""
+        return np.flatnonzero(self.mask(df, spot, as_of))
+
+    def __repr__(self) -> str:
+        return f"FilterExpression({self.source!r})"
+
+
+def evaluate_all(
+    expressions: Sequence[FilterExpression],
+    df: pd.DataFrame,
+    spot: Optional[float] = None,
+    as_of: Optional[datetime] = None,
+) -> np.ndarray:
+    """
+    Evaluate many expressions over one chain.
+
+    Fields are extracted once for all expressions and every distinct
+    comparison is computed once, however many expressions share it, so
+    hundreds of rules built from a few dozen conditions cost little more
+    than those conditions.
+
+    Args:
+        expressions: Compiled expressions
+        df: Options DataFrame
+        spot: Underlying price, for moneyness and delta
+        as_of: Valuation time for dte and delta (default now)
+
+    Returns:
+        Boolean array of shape (len(expressions), len(df))
+
+    Raises:
+        FilterError: If a field is missing or used with the wrong type
+    """
+    masks = np.zeros((len(expressions), len(df)), dtype=bool)
+    if df.empty:
+        return masks
+    columns = _Columns(df, spot, as_of)
+    for i, expression in enumerate(expressions):
+        masks[i] = expression._term(columns)
+    return masks
+
+
+@functools.lru_cache(maxsize=256)
+def compile_filter(source: str) -> FilterExpression:
+    """
+    Compile a filter expression, reusing earlier compilations of the same text.
+
+    Args:
+        source: Filter expression text
+
+    Returns:
+        FilterExpression
+
+    Raises:
+        FilterError: If the expression is malformed
+    """
+    return FilterExpression(source)
@@ -0,0 +1,244 @@
+"""Dealer gamma profile: zero-gamma flip levels, gamma walls and expiry mix."""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+import numpy as np
+import pandas as pd
+from .greeks import DEFAULT_IV, contract_arrays
+
+_INV_SQRT_2PI = 1.0 / np.sqrt(2.0 * np.pi)
+
+# Cap on root refinement steps; brackets normally converge in a handful
+_MAX_ITERATIONS = 50
+
+
+def _coefficients(
+    strike: np.ndarray,
+    years: np.ndarray,
+    iv: np.ndarray,
+    shares: np.ndarray,
+    rate: float,
+):
+    """Spot-independent terms: 1/(sigma sqrt T), d1 offset and GEX weight."""
+    vol_t = iv * np.sqrt(years)
+    inv_vol_t = 1.0 / vol_t
+    drift = ((rate + 0.5 * iv * iv) * years - np.log(strike)) * inv_vol_t
+    # gamma * S**2 * 0.01 == S * 0.01 * pdf(d1) / (sigma sqrt T)
+    weights = shares * inv_vol_t * _INV_SQRT_2PI * 0.01
+    return inv_vol_t, drift, weights
+
+
+def _density(spots: np.ndarray, inv_vol_t: np.ndarray, drift: np.ndarray):
+    """exp(-d1**2 / 2) for each (spot, contract), computed in place."""
+    d1 = np.log(spots)[:, None] * inv_vol_t
+    d1 += drift
+    d1 *= d1
+    d1 *= -0.5
+    return np.exp(d1, out=d1)
+
+
+class GammaProfile:
+    """
+    Dealer gamma exposure (GEX) of a chain as a function of spot.
+
+    Dealers are assumed long calls and short puts, holding each contract's
+    open interest (the convention of calculate_gamma_exposure). Exposure is in
+    dollars of delta change for a 1% spot move. Everything that does not
+    depend on spot is precomputed, so evaluating the curve at a batch of spots
+    is one (spots x contracts) block of multiply-adds and a single exp.
+    """
+
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        current_price: float,
+        rate: float = 0.0,
+        default_iv: float = DEFAULT_IV,
+        as_of: Optional[datetime] = None,
+    ):
+        """
+        Args:
+            df: Options DataFrame
+            current_price: Current stock price
+            rate: Risk-free rate
+            default_iv: Volatility for contracts without implied volatility
+            as_of: Valuation time (default now)
+        """
+        self.df = df
+        self.current_price = float(current_price)
+        c = contract_arrays(df, as_of=as_of, default_iv=default_iv)
+        self.is_call = c["is_call"]
+        # Option multiplier: one contract covers 100 shares
+        shares = np.where(c["is_call"], 1.0, -1.0) * c["open_interest"] * 100.0
+
+        self._contracts = _coefficients(c["strike"], c["years"], c["iv"], shares, rate)
+
+        # Calls and puts with the same strike, expiry and IV have the same
+        # gamma, so the curve evaluates each distinct contract once
+        keys = np.stack([c["strike"], c["years"], c["iv"]])
+        unique, inverse = np.unique(keys, axis=1, return_inverse=True)
+        net = np.bincount(inverse.ravel(), weights=shares, minlength=unique.shape[1])
+        self._curve = _coefficients(unique[0], unique[1], unique[2], net, rate)
+
+    def curve(self, spots: np.ndarray) -> np.ndarray:
+        """
+        Total dealer gamma exposure at each spot.
+
+        Args:
+            spots: Spot prices
+
+        Returns:
+            Array of exposures, one per spot
+        """
+        spots = np.asarray(spots, dtype=float)
+        inv_vol_t, drift, weights = self._curve
+        return (_density(spots, inv_vol_t, drift) @ weights) * spots
+
+    def contributions(self) -> np.ndarray:
+        """Each contract's exposure at the current price."""
+        spot = np.array([self.current_price])
+        inv_vol_t, drift, weights = self._contracts
+        return _density(spot, inv_vol_t, drift)[0] * weights * self.current_price
+
+    def flip_levels(
+        self, spot_range: float = 0.20, steps: int = 81, tolerance: float = 1e-4
+    ) -> List[float]:
+        """
+        Spots where dealer gamma exposure changes sign.
+
+        The curve is sampled on a grid to bracket every sign change, then all
+        brackets are refined together with the Illinois false-position method
+        (one vectorized curve evaluation per step, usually 4-6 steps) until
+        they are narrower than the tolerance.
+
+        Args:
+            spot_range: Search from -spot_range to +spot_range around spot
+            steps: Grid points used to bracket roots
+            tolerance: Bracket width to stop at, in dollars
+
+        Returns:
+            Flip levels in ascending order (empty when gamma keeps its sign)
+        """
+        grid = self.current_price * (1 + np.linspace(-spot_range, spot_range, steps))
+        values = self.curve(grid)
+        exact = grid[values == 0]
+        crossing = np.flatnonzero(values[:-1] * values[1:] < 0)
+
+        a, fa = grid[crossing], values[crossing]
+        b, fb = grid[crossing + 1], values[crossing + 1]
+        for _ in range(_MAX_ITERATIONS):
+            if not len(a) or np.all(np.abs(b - a) < tolerance):
+                break
+            c = b - fb * (b - a) / (fb - fa)
+            fc = self.curve(c)
+            # Keep the root bracketed between a and the new point; when the
+            # same end survives twice its value is halved so it moves too
+            moved = fc * fb < 0
+            a = np.where(moved, b, a)
+            fa = np.where(moved, fb, 0.5 * fa)
+            b, fb = c, fc
+            # Exact hits end their bracket
+            a = np.where(fc == 0, c, a)
+        return sorted(float(level) for level in np.concatenate([b, exact]))
+
+    def walls(self, top: int = 5) -> pd.DataFrame:
+        """
+        Strikes holding the most call and put gamma at the current price.
+
+        Args:
+            top: Strikes to keep per side
+
+        Returns:
+            DataFrame with option_type, strike, gamma_exposure, openInterest
+            and distance (strike relative to spot), calls first; call walls
+            are the largest positive exposures, put walls the most negative
+        """
+        exposure = self.contributions()
+        strikes = self.df["strike"].to_numpy(dtype=float)
+        open_interest = self.df["openInterest"].to_numpy(dtype=float)
+        sides = []
+        for option_type, mask in (("call", self.is_call), ("put", ~self.is_call)):
+            # Per-strike sums without a pandas groupby, which dominates the
+            # cost on live-sized chains
+            unique, inverse = np.unique(strikes[mask], return_inverse=True)
+            gamma = np.bincount(inverse, weights=exposure[mask], minlength=len(unique))
+            oi = np.bincount(
+                inverse, weights=open_interest[mask], minlength=len(unique)
+            )
+            order = np.argsort(-np.abs(gamma), kind="stable")[:top]
+            sides.append(
+                pd.DataFrame(
+                    {
+                        "option_type": option_type,
+                        "strike": unique[order],
+                        "gamma_exposure": gamma[order],
+                        "openInterest": oi[order].astype(int),
+                    }
+                )
+            )
+        walls = pd.concat(sides, ignore_index=True)
+        walls["distance"] = walls["strike"] / self.current_price - 1
+        return walls
+
+    def by_expiration(self) -> pd.DataFrame:
+        """
+        Call, put and net exposure at the current price per expiration.
+
+        Returns:
+            DataFrame with expiration, call_gamma, put_gamma, net_gamma and
+            gross_share (the expiration's share of total absolute exposure)
+        """
+        exposure = self.contributions()
+        frame = pd.DataFrame(
+            {
+                "expiration": self.df["expiration"].to_numpy(),
+                "call_gamma": np.where(self.is_call, exposure, 0.0),
+                "put_gamma": np.where(self.is_call, 0.0, exposure),
+            }
+        )
+        totals = frame.groupby("expiration", as_index=False).sum()
+        totals["net_gamma"] = totals["call_gamma"] + totals["put_gamma"]
+        gross = totals["call_gamma"].abs() + totals["put_gamma"].abs()
+        totals["gross_share"] = gross / gross.sum() if gross.sum() else 0.0
+        return totals
+
+    def levels(
+        self, flips: Optional[List[float]] = None, walls: Optional[pd.DataFrame] = None
+    ) -> Dict[str, Any]:
+        """
+        Headline numbers: total exposure, regime, nearest flip and top walls.
+
+        Args:
+            flips: Precomputed flip_levels() result
+            walls: Precomputed walls() result
+
+        Returns:
+            Dictionary with spot, total_gamma, regime, flip_level (the flip
+            nearest to spot, or None), flip_distance, flip_levels, call_wall
+            and put_wall
+        """
+        flips = self.flip_levels() if flips is None else flips
+        walls = self.walls(top=1) if walls is None else walls
+        total = float(self.curve(np.array([self.current_price]))[0])
+        nearest = (
+            min(flips, key=lambda level: abs(level - self.current_price))
+            if flips
+            else None
+        )
+
+        def top_strike(option_type: str) -> Optional[float]:
+            side = walls[walls["option_type"] == option_type]
+            return float(side["strike"].iloc[0]) if len(side) else None
+
+        return {
+            "spot": self.current_price,
+            "total_gamma": total,
+            "regime": "positive" if total >= 0 else "negative",
+            "flip_level": nearest,
+            "flip_distance": (
+                nearest / self.current_price - 1 if nearest is not None else None
+            ),
+            "flip_levels": flips,
+            "call_wall": top_strike("call"),
+            "put_wall": top_strike("put"),
+        }
@@ -0,0 +1,213 @@
+"""Auto-refreshing terminal dashboard for a single ticker."""
+
+import hashlib
+import time
+import pandas as pd
+from datetime import datetime
+from rich.console import Group
+from rich.live import Live
+from rich.text import Text
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from .analyzer import OptionsAnalyzer
+from .display import OptionsDisplay
+from .memo import RESULT_CACHE
+
+# Panels in the order they are stacked on screen
+LIVE_PANELS = ["flow_summary", "strikes", "unusual", "max_pain", "expirations"]
+
+# Optional panel appended when the dashboard tracks gamma levels
+GAMMA_PANEL = "gamma"
+
+
+def _fingerprint(value: Any) -> str:
+    """Return a digest that changes whenever a panel's data changes."""
+    digest = hashlib.blake2b(digest_size=16)
+    if isinstance(value, pd.DataFrame):
+        digest.update(repr(list(value.columns)).encode("utf-8"))
+        digest.update(pd.util.hash_pandas_object(value, index=True).values.tobytes())
+    elif isinstance(value, tuple):
+        for item in value:
+            digest.update(_fingerprint(item).encode("ascii"))
+    else:
+        digest.update(repr(value).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class LiveDashboard:
+    """
+    Keeps fetcher and analyzer state in memory and redraws changed panels.
+
+    Every refresh reloads the chain and recomputes the analyses, but a panel
+    is only rebuilt when the fingerprint of its data differs from the last
+    one drawn. Frames are drawn at most ``max_fps`` times per second.
+    """
+
+    def __init__(
+        self,
+        ticker: str,
+        load_chain: Callable[[str], Tuple[pd.DataFrame, float]],
+        interval: float = 5.0,
+        max_fps: float = 4.0,
+        analyzer: Optional[OptionsAnalyzer] = None,
+        display: Optional[OptionsDisplay] = None,
+        show_gamma: bool = False,
+    ):
+        """
+        Args:
+            ticker: Stock symbol
+            load_chain: Callable returning (filtered chain, current_price)
+            interval: Seconds between refreshes
+            max_fps: Maximum frames drawn per second
+            analyzer: Analyzer used for each refresh (default: one memoizing
+                into RESULT_CACHE)
+            display: Display used to build the panels
+            show_gamma: Add a panel with the gamma flip level and walls
+        """
+        self.ticker = ticker
+        self.load_chain = load_chain
+        self.interval = interval
+        self.max_fps = max_fps
+        self.analyzer = analyzer or OptionsAnalyzer(memo=RESULT_CACHE)
+        self.display = display or OptionsDisplay()
+        self.panels = LIVE_PANELS + ([GAMMA_PANEL] if show_gamma else [])
+        self.refreshes = 0
+        self.frames = 0
+        self.last_update: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+        self._fingerprints: Dict[str, str] = {}
+        self._renderables: Dict[str, Any] = {}
+
+    def compute(self, chain: pd.DataFrame, current_price: float) -> Dict[str, Any]:
+        """
+        Run the analyses behind each panel.
+
+        Args:
+            chain: Options DataFrame
+            current_price: Current stock price
+
+        Returns:
+            Dictionary mapping panel name to its data
+        """
+        analyzer = self.analyzer
+        # An unchanged chain is fingerprinted once and answered from the memo
+        with analyzer.memo.scope():
+            panels = {
+                "flow_summary": analyzer.calculate_flow_summary(chain),
+                "strikes": analyzer.analyze_strike_distribution(chain, current_price),
+                "unusual": analyzer.identify_unusual_activity(chain),
+                "max_pain": analyzer.find_max_pain(chain),
+                "expirations": analyzer.analyze_expiration_flow(chain),
+            }
+        if GAMMA_PANEL in self.panels:
+            gamma = analyzer.analyze_gamma_levels(chain, current_price)
+            panels[GAMMA_PANEL] = tuple(
+                gamma.get(key)
+                for key in ["gamma_levels", "gamma_walls", "gamma_by_expiration"]
+            )
+        return panels
+
+    def render_panel(self, name: str, data: Any) -> Any:
+        """Build the renderable for one panel, or None if it has no data."""
+        display = self.display
+        if name == "flow_summary":
+            return display.render_flow_summary(data) if data else None
+        if name == GAMMA_PANEL:
+            levels, walls, by_expiration = data
+            if not levels:
+                return None
+            return display.render_gamma_levels(levels, walls, by_expiration)
+        if name == "max_pain":
+            max_pain_strike, max_pain_df = data
+            if max_pain_df.empty:
+                return None
+            return Group(
+                Text(f"Max Pain Strike: ${max_pain_strike:.0f}", style="bold purple"),
+                display.render_max_pain(max_pain_df),
+            )
+        if data.empty:
+            return None
+        if name == "strikes":
+            return display.render_strike_analysis(data)
+        if name == "unusual":
+            return display.render_unusual_activity(data)
+        return display.render_expiration_analysis(data)
+
+    def update(self) -> List[str]:
+        """
+        Reload the chain and rebuild the panels whose data changed.
+
+        Returns:
+            Names of the panels that were rebuilt
+        """
+        self.refreshes += 1
+        try:
+            chain, current_price = self.load_chain(self.ticker)
+        except Exception as e:
+            self.last_error = str(e)
+            return []
+
+        self.last_error = None
+        self.last_update = datetime.now()
+        panels = self.compute(chain, current_price)
+
+        changed = []
+        for name in self.panels:
+            fingerprint = _fingerprint(panels[name])
+            if self._fingerprints.get(name) == fingerprint:
+                continue
+            self._fingerprints[name] = fingerprint
+            self._renderables[name] = self.render_panel(name, panels[name])
+            changed.append(name)
+        return changed
+
+    def status(self) -> Text:
+        """One-line status header for the current frame."""
+        updated = self.last_update.strftime("%H:%M:%S") if self.last_update else "never"
+        text = Text(
+            f"{self.ticker}  updated {updated}  refresh every {self.interval:g}s",
+            style="bold blue",
+        )
+        if self.last_error:
+            text.append(f"  last refresh failed: {self.last_error}", style="red")
+        return text
+
+    def frame(self) -> Group:
+        """Stack the status line and the cached panel renderables."""
+        panels = [self._renderables.get(name) for name in self.panels]
+        return Group(self.status(), *(panel for panel in panels if panel is not None))
+
+    def run(self, iterations: Optional[int] = None):
+        """
+        Refresh until interrupted, or for a fixed number of refreshes.
+
+        Args:
+            iterations: Number of refreshes to run, or None to run forever
+        """
+        min_frame = 1.0 / self.max_fps if self.max_fps > 0 else 0.0
+        last_frame = float("-inf")
+        dirty = False
+
+        with Live(
+            self.frame(), console=self.display.console, auto_refresh=False
+        ) as live:
+            while iterations is None or self.refreshes < iterations:
+                started = time.monotonic()
+                # A failed refresh still needs its status line drawn
+                changed = self.update()
+                dirty = dirty or bool(changed) or self.last_error is not None
+
+                # Refreshes faster than the frame cap are coalesced
+                if dirty and time.monotonic() - last_frame >= min_frame:
+                    live.update(self.frame(), refresh=True)
+                    last_frame = time.monotonic()
+                    self.frames += 1
+                    dirty = False
+
+                if iterations is not None and self.refreshes >= iterations:
+                    break
+                time.sleep(max(0.0, started + self.interval - time.monotonic()))
+
+            if dirty:
+                time.sleep(max(0.0, last_frame + min_frame - time.monotonic()))
+                live.update(self.frame(), refresh=True)
+                self.frames += 1
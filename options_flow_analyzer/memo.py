@@ -0,0 +1,447 @@
+"""Content-addressed memoization of analyzer results.
+
+Analyzer methods decorated with ``memoized`` look their result up by a key
+built from the method name, a fingerprint of every DataFrame argument's
+contents and the remaining arguments, so re-analyzing an unchanged chain
+(the same data fetched again, a live refresh with no new prints, or the
+same frame reached by two code paths) returns the stored result instead of
+recomputing it. Results live in a bounded in-memory LRU and, optionally, in
+a directory of pickles that persists across runs. Keys include a digest of
+the package source, so persisted results never outlive the code that
+computed them.
+
+Memoization is opt-in: analyzers only memoize into a cache they are given.
+Loading a pickle can run arbitrary code, so the directory is the trust
+boundary; it is created private to the current user, and one that another
+user owns or can write to is refused.
+"""
+
+import functools
+import hashlib
+import inspect
+import os
+import pickle  # nosec B403
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+import numpy as np
+import pandas as pd
+from . import __version__
+
+# Bump when the key or stored result format changes
+_KEY_SCHEMA = 1
+
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_DISK_SUFFIX = ".pkl"
+
+
+@functools.lru_cache(maxsize=None)
+def _key_salt() -> bytes:
+    """
+    Prefix of every key: the package version and a digest of its source.
+
+    Any edit to the package's modules (a memoized method or a helper it
+    calls) changes the salt, so persisted results of older code never match,
+    even without a version bump.
+    """
+    hasher = hashlib.sha256(
+        f"options_flow_analyzer/{__version__}/{_KEY_SCHEMA}".encode("ascii")
+    )
+    for name in sorted(os.listdir(_PACKAGE_DIR)):
+        if name.endswith(".py"):
+            hasher.update(name.encode("utf-8"))
+            with open(os.path.join(_PACKAGE_DIR, name), "rb") as fh:
+                hasher.update(fh.read())
+    return hasher.digest()
+
+
+def _update_array(hasher, values: np.ndarray):
+    """Hash an array's dtype, shape and contents."""
+    if values.dtype == object:
+        # Strings have no fixed-width buffer: hash the distinct values and
+        # the codes mapping rows onto them
+        codes, uniques = pd.factorize(values)
+        hasher.update(b"object")
+        hasher.update(codes.astype(np.int64).tobytes())
+        hasher.update("\x1f".join(map(repr, uniques)).encode("utf-8"))
+        return
+    values = np.ascontiguousarray(values)
+    hasher.update(f"{values.dtype.str}{values.shape}".encode("ascii"))
+    hasher.update(values.view(np.uint8))
+
+
+def _update_series(hasher, values: pd.Series):
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        hasher.update(b"category")
+        _update_array(hasher, values.cat.codes.to_numpy())
+        _update_array(hasher, np.asarray(values.cat.categories, dtype=object))
+    elif values.dtype == object or isinstance(values.dtype, np.dtype):
+        _update_array(hasher, values.to_numpy())
+    else:
+        # Extension dtypes (nullable integers, tz-aware datetimes, ...)
+        hasher.update(str(values.dtype).encode("utf-8"))
+        _update_array(hasher, values.to_numpy(dtype=object))
+
+
+def _update_index(hasher, index: pd.Index):
+    if isinstance(index, pd.RangeIndex):
+        hasher.update(f"range{index.start},{index.stop},{index.step}".encode())
+    else:
+        _update_series(hasher, index.to_series(index=pd.RangeIndex(len(index))))
+
+
+def frame_fingerprint(data: Any) -> str:
+    """
+    Hash the contents of a DataFrame or Series.
+
+    Covers column names, dtypes, values and the index. Fixed-width columns are
+    hashed straight from their buffers (about 10ms per million rows); string
+    columns are factorized first.
+
+    Args:
+        data: DataFrame or Series
+
+    Returns:
+        Hex digest identifying the contents
+    """
+    hasher = hashlib.sha256()
+    if isinstance(data, pd.Series):
+        hasher.update(repr(data.name).encode("utf-8"))
+        _update_series(hasher, data)
+    else:
+        for name in data.columns:
+            hasher.update(repr(name).encode("utf-8"))
+            _update_series(hasher, data[name])
+    _update_index(hasher, data.index)
+    return hasher.hexdigest()
+
+
+def _copied(value: Any) -> Any:
+    """Copy the mutable containers of a result so callers can't alter the cache."""
+    if isinstance(value, (pd.DataFrame, pd.Series, np.ndarray)):
+        return value.copy()
+    if isinstance(value, dict):
+        return {key: _copied(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(_copied(item) for item in value)
+    return value
+
+
+def _size(value: Any) -> int:
+    """Approximate memory held by a result, in bytes."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True))
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return 64 + sum(_size(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return 64 + sum(_size(item) for item in value)
+    return 64
+
+
+class ResultCache:
+    """
+    Bounded LRU of analyzer results with optional on-disk persistence.
+
+    Entries are evicted least recently used first once either the entry or
+    the byte budget is exceeded. With a directory, every stored result is
+    also pickled there and memory misses fall back to it, so results survive
+    across processes; the directory is pruned to ``max_disk_entries`` files
+    by last use. Entries are unpickled, so the directory must be owned by
+    the current user and not writable by anyone else (it is created with
+    mode 0o700); otherwise lookups and stores raise PermissionError.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        max_bytes: int = 256 * 2**20,
+        path: Optional[str] = None,
+        max_disk_entries: int = 4096,
+    ):
+        """
+        Args:
+            max_entries: Results kept in memory; 0 with no path disables
+                memoization
+            max_bytes: Approximate memory budget for stored results
+            path: Directory for persistent entries (None for memory only)
+            max_disk_entries: Files kept in the directory
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.path = path
+        self.max_disk_entries = max_disk_entries
+        self._checked_path: Optional[str] = None
+        self._entries: "OrderedDict[str, Tuple[Any, int, float]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Compute time that hits avoided, in seconds
+        self.saved_seconds = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 or self.path is not None
+
+    @contextmanager
+    def scope(self) -> Iterator[None]:
+        """
+        Reuse fingerprints of the same frame objects until the scope exits.
+
+        Frames are not modified while an analysis runs, so inside a scope a
+        frame passed to several memoized methods is hashed once. Scopes nest
+        and are per thread.
+        """
+        local = self._local
+        depth = getattr(local, "depth", 0)
+        if depth == 0:
+            local.fingerprints = {}
+        local.depth = depth + 1
+        try:
+            yield
+        finally:
+            local.depth = depth
+            if depth == 0:
+                local.fingerprints = {}
+
+    def fingerprint(self, data: Any) -> str:
+        """Content fingerprint of a frame, reused within the current scope."""
+        fingerprints = getattr(self._local, "fingerprints", None)
+        if fingerprints is None or not getattr(self._local, "depth", 0):
+            return frame_fingerprint(data)
+        entry = fingerprints.get(id(data))
+        # Holding the frame keeps its id from being reused within the scope
+        if entry is None or entry[0] is not data:
+            entry = (data, frame_fingerprint(data))
+            fingerprints[id(data)] = entry
+        return entry[1]
+
+    def key(self, name: str, arguments: Dict[str, Any]) -> str:
+        """
+        Cache key for a call.
+
+        Args:
+            name: Qualified method name
+            arguments: Bound arguments (without self)
+
+        Returns:
+            Hex digest of the method name, frame fingerprints and other values
+        """
+        hasher = hashlib.sha256(_key_salt())
+        hasher.update(name.encode("utf-8"))
+        for argument, value in arguments.items():
+            hasher.update(f"\x1e{argument}=".encode("utf-8"))
+            if isinstance(value, (pd.DataFrame, pd.Series)):
+                hasher.update(self.fingerprint(value).encode("ascii"))
+            elif isinstance(value, np.ndarray):
+                _update_array(hasher, value)
+            else:
+                hasher.update(repr(value).encode("utf-8"))
+        return hasher.hexdigest()
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """
+        Look a result up in memory, then on disk.
+
+        Returns:
+            Tuple of (found, value); the value is shared with the cache
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                self.saved_seconds += entry[2]
+                return True, entry[0]
+
+        if self.path is not None:
+            file = os.path.join(self._directory(), key + _DISK_SUFFIX)
+            try:
+                with open(file, "rb") as fh:
+                    # Safe only because _directory() checked the directory is private
+                    value, seconds = pickle.load(fh)  # nosec B301
+                # Touch the file so pruning drops the least recently used
+                os.utime(file)
+            except (OSError, EOFError, pickle.UnpicklingError):
+                pass
+            else:
+                with self._lock:
+                    self.hits += 1
+                    self.disk_hits += 1
+                    self.saved_seconds += seconds
+                self._remember(key, value, seconds)
+                return True, value
+
+        with self._lock:
+            self.misses += 1
+        return False, None
+
+    def put(self, key: str, value: Any, seconds: float = 0.0):
+        """
+        Store a result.
+
+        Args:
+            key: Cache key from key()
+            value: Result; the cache keeps its own copy
+            seconds: Time the result took to compute
+        """
+        value = _copied(value)
+        self._remember(key, value, seconds)
+        if self.path is not None:
+            self._write(key, value, seconds)
+
+    def _remember(self, key: str, value: Any, seconds: float):
+        if self.max_entries <= 0:
+            return
+        size = _size(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (value, size, seconds)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def _directory(self) -> str:
+        """
+        Create the cache directory, or check that an existing one is private.
+
+        Raises:
+            PermissionError: If another user owns the directory or can write
+                to it, since they could plant pickles that run code here
+        """
+        path = self.path
+        if path != self._checked_path:
+            os.makedirs(path, mode=0o700, exist_ok=True)
+            info = os.stat(path)
+            if hasattr(os, "getuid") and (
+                info.st_uid != os.getuid() or info.st_mode & 0o022
+            ):
+                raise PermissionError(
+                    f"Refusing to use cache directory {path}: it must be owned "
+                    "by the current user and not writable by group or others"
+                )
+            self._checked_path = path
+        return path
+
+    def _write(self, key: str, value: Any, seconds: float):
+        # Write then rename, so concurrent readers never see a partial file
+        fd, temp = tempfile.mkstemp(dir=self._directory(), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                pickle.dump((value, seconds), fh, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp, os.path.join(self.path, key + _DISK_SUFFIX))
+        except Exception:
+            if os.path.exists(temp):
+                os.unlink(temp)
+            raise
+        self._prune()
+
+    def _prune(self):
+        files = [
+            entry
+            for entry in os.scandir(self.path)
+            if entry.name.endswith(_DISK_SUFFIX)
+        ]
+        excess = len(files) - self.max_disk_entries
+        if excess <= 0:
+            return
+        files.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in files[:excess]:
+            try:
+                os.unlink(entry.path)
+            except OSError:
+                pass
+
+    def clear(self, disk: bool = False):
+        """Drop every in-memory entry (and the persisted ones with disk=True)."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+        if disk and self.path is not None and os.path.isdir(self.path):
+            for entry in os.scandir(self.path):
+                if entry.name.endswith(_DISK_SUFFIX):
+                    os.unlink(entry.path)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Cache counters.
+
+        Returns:
+            Dictionary with hits, disk_hits, misses, hit_rate, evictions,
+            entries, bytes and saved_seconds
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "saved_seconds": self.saved_seconds,
+            }
+
+
+def memoized(method):
+    """
+    Memoize an analyzer method in its instance's ``memo`` ResultCache.
+
+    Only for methods whose result depends on nothing but their arguments;
+    analyses valued at the current time (greeks, gamma) must not use it.
+    Callers always receive their own copy of the result. Memoized methods
+    called by another memoized method run uncached, since the outer result
+    already covers them.
+    """
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        cache = self.memo
+        local = cache._local
+        if not cache.enabled or getattr(local, "calls", 0):
+            return method(self, *args, **kwargs)
+
+        with cache.scope():
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            arguments = dict(bound.arguments)
+            del arguments[next(iter(signature.parameters))]
+            key = cache.key(method.__qualname__, arguments)
+
+            found, value = cache.get(key)
+            if found:
+                return _copied(value)
+
+            start = time.perf_counter()
+            local.calls = 1
+            try:
+                value = method(self, *args, **kwargs)
+            finally:
+                local.calls = 0
+            cache.put(key, value, time.perf_counter() - start)
+            return value
+
+    return wrapper
+
+
+# Process-wide cache for analyzers that opt in (analyze, live and serve)
+RESULT_CACHE = ResultCache()
@@ -0,0 +1,222 @@
+"""Vectorized OCC option symbol parsing and encoding.
+
+An OCC (OSI) symbol is the underlying root, the expiration as YYMMDD, C or P
+and the strike in thousandths of a dollar as 8 digits, e.g.
+``SPY251017C00500000``. The standard 21-character form pads the root to six
+characters with spaces; Polygon prefixes symbols with ``O:``. All three forms
+are parsed, and symbols are encoded without padding or prefix, which makes
+the result the canonical contract key across providers.
+
+Symbols are handled as fixed-width byte matrices, so parsing and encoding
+are NumPy array operations rather than per-symbol Python.
+"""
+
+from typing import Dict, Optional, Sequence
+import numpy as np
+import pandas as pd
+
+OCC_PREFIX = "O:"
+
+# YYMMDD + C/P + 8-digit strike
+_SUFFIX_LENGTH = 15
+_ROOT_LENGTH = 6
+_DIGIT_WEIGHTS = 10 ** np.arange(7, -1, -1, dtype=np.int64)
+_ZERO, _SPACE = ord("0"), ord(" ")
+_CALL, _PUT = ord("C"), ord("P")
+_OPTION_TYPES = np.array(["put", "call"], dtype=object)
+# Days in each month of a common year, by month number (0 is never valid)
+_MONTH_DAYS = np.array([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+
+
+def _byte_matrix(symbols: Sequence[str]):
+    """Symbols as an (n, width) uint8 matrix and their lengths."""
+    packed = np.asarray(symbols, dtype=object).astype("S")
+    width = packed.dtype.itemsize
+    matrix = packed.view(np.uint8).reshape(len(packed), width)
+    # Bytes arrays drop trailing NULs; the first NUL marks the end
+    lengths = np.where((matrix == 0).any(axis=1), (matrix == 0).argmax(axis=1), width)
+    return matrix, lengths
+
+
+def _strings(matrix: np.ndarray) -> np.ndarray:
+    """Rows of a uint8 matrix as Python strings (trailing NULs dropped)."""
+    matrix = np.ascontiguousarray(matrix)
+    packed = matrix.view(f"S{matrix.shape[1]}").ravel()
+    return packed.astype(str).astype(object)
+
+
+def parse_occ(symbols: Sequence[str]) -> Dict[str, np.ndarray]:
+    """
+    Split OCC symbols into their fields.
+
+    Args:
+        symbols: OCC symbols, with or without the ``O:`` prefix or root
+            padding
+
+    Returns:
+        Dictionary of arrays: underlying (str), expiration (datetime64[D]),
+        option_type ("call"/"put") and strike (float)
+
+    Raises:
+        ValueError: If any symbol is not a well-formed OCC symbol
+    """
+    if not len(symbols):
+        return {
+            "underlying": np.array([], dtype=object),
+            "expiration": np.array([], dtype="datetime64[D]"),
+            "option_type": np.array([], dtype=object),
+            "strike": np.array([], dtype=float),
+        }
+
+    matrix, lengths = _byte_matrix(symbols)
+    # Symbols too short to be OCC still index in bounds (and fail validation)
+    if matrix.shape[1] <= _SUFFIX_LENGTH:
+        matrix = np.pad(matrix, ((0, 0), (0, _SUFFIX_LENGTH + 1 - matrix.shape[1])))
+    rows = np.arange(len(matrix))[:, None]
+    prefixed = (matrix[:, 0] == ord("O")) & (matrix[:, 1] == ord(":"))
+    start = np.where(prefixed, len(OCC_PREFIX), 0)
+    root_length = lengths - _SUFFIX_LENGTH - start
+
+    # Fixed-width tail: 6 date digits, the type letter and 8 strike digits
+    positions = np.maximum(lengths - _SUFFIX_LENGTH, 0)[:, None]
+    tail = matrix[rows, positions + np.arange(_SUFFIX_LENGTH)]
+    digits = tail.astype(np.int64) - _ZERO
+    date, option_type, strike = digits[:, :6], tail[:, 6], digits[:, 7:]
+
+    year = 2000 + date[:, 0] * 10 + date[:, 1]
+    month = date[:, 2] * 10 + date[:, 3]
+    day = date[:, 4] * 10 + date[:, 5]
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    month_days = _MONTH_DAYS[np.clip(month, 0, 12)] + ((month == 2) & leap)
+
+    valid = (root_length >= 1) & (root_length <= _ROOT_LENGTH)
+    valid &= ((date >= 0) & (date <= 9)).all(axis=1)
+    valid &= (month >= 1) & (month <= 12) & (day >= 1) & (day <= month_days)
+    valid &= ((strike >= 0) & (strike <= 9)).all(axis=1)
+    valid &= (option_type == _CALL) | (option_type == _PUT)
+    if not valid.all():
+        bad = np.asarray(symbols, dtype=object)[~valid][:3]
+        raise ValueError(f"Not OCC option symbols: {', '.join(map(str, bad))}")
+
+    # Root bytes, with padding and anything past the root cleared
+    offsets = np.arange(_ROOT_LENGTH)
+    root = matrix[rows, np.minimum(start[:, None] + offsets, matrix.shape[1] - 1)]
+    root = np.where(offsets < root_length[:, None], root, 0)
+    root[root == _SPACE] = 0
+    # Decode each distinct root once: roots fit in an int64 once padded to
+    # eight bytes, and integers deduplicate far faster than strings
+    padded_root = np.zeros((len(root), 8), dtype=np.uint8)
+    padded_root[:, :_ROOT_LENGTH] = root
+    unique, inverse = np.unique(padded_root.view(np.int64), return_inverse=True)
+    names = _strings(unique.view(np.uint8).reshape(-1, 8))
+
+    expiration = (
+        (year - 1970).astype("datetime64[Y]").astype("datetime64[M]")
+        + (month - 1).astype("timedelta64[M]")
+    ).astype("datetime64[D]") + (day - 1).astype("timedelta64[D]")
+
+    return {
+        "underlying": names[inverse.ravel()],
+        "expiration": expiration,
+        "option_type": _OPTION_TYPES[(option_type == _CALL).astype(np.intp)],
+        "strike": (strike @ _DIGIT_WEIGHTS) / 1000.0,
+    }
+
+
+def encode_occ(
+    underlying: Sequence[str],
+    expiration: Sequence,
+    option_type: Sequence[str],
+    strike: Sequence[float],
+    prefix: str = "",
+    padded: bool = False,
+) -> np.ndarray:
+    """
+    Build OCC symbols from contract fields.
+
+    Args:
+        underlying: Root symbols (one per contract, or a single string)
+        expiration: Expiration dates (strings, datetimes or datetime64)
+        option_type: "call"/"put" (or "C"/"P")
+        strike: Strike prices
+        prefix: Text put before each symbol, e.g. ``O:`` for Polygon
+        padded: Pad roots to six characters (the 21-character OCC form)
+
+    Returns:
+        Array of symbol strings
+    """
+    strike = np.asarray(strike, dtype=float)
+    count = len(strike)
+    roots = np.broadcast_to(np.asarray(underlying, dtype=object), (count,))
+    root_matrix, root_lengths = _byte_matrix(roots)
+    if root_matrix.shape[1] > _ROOT_LENGTH or (root_lengths == 0).any():
+        raise ValueError("OCC roots must be 1 to 6 characters")
+
+    days = pd.to_datetime(pd.Series(expiration)).to_numpy().astype("datetime64[D]")
+    months = days.astype("datetime64[M]")
+    year = months.astype("datetime64[Y]").astype(np.int64) + 1970
+    month = months.astype(np.int64) % 12 + 1
+    day = (days - months.astype("datetime64[D]")).astype(np.int64) + 1
+
+    types = np.asarray(option_type, dtype=object).astype("S1").view(np.uint8)
+    is_call = (types == ord("c")) | (types == _CALL)
+    millis = np.rint(strike * 1000).astype(np.int64)
+
+    tail = np.empty((count, _SUFFIX_LENGTH), dtype=np.uint8)
+    tail[:, :6] = (
+        np.stack(
+            [year % 100 // 10, year % 10, month // 10, month % 10, day // 10, day % 10],
+            axis=1,
+        )
+        + _ZERO
+    )
+    tail[:, 6] = np.where(is_call, _CALL, _PUT)
+    tail[:, 7:] = millis[:, None] // _DIGIT_WEIGHTS % 10 + _ZERO
+
+    head = len(prefix)
+    out = np.zeros((count, head + _ROOT_LENGTH + _SUFFIX_LENGTH), dtype=np.uint8)
+    if head:
+        out[:, :head] = np.frombuffer(prefix.encode("ascii"), dtype=np.uint8)
+    out[:, head : head + root_matrix.shape[1]] = root_matrix
+    if padded:
+        root_field = out[:, head : head + _ROOT_LENGTH]
+        root_field[root_field == 0] = _SPACE
+        tail_start = np.full(count, head + _ROOT_LENGTH)
+    else:
+        tail_start = head + root_lengths
+    rows = np.arange(count)[:, None]
+    out[rows, tail_start[:, None] + np.arange(_SUFFIX_LENGTH)] = tail
+    return _strings(out)
+
+
+def normalize_occ(symbols: Sequence[str]) -> np.ndarray:
+    """Rewrite OCC symbols in any accepted form as canonical unprefixed symbols."""
+    fields = parse_occ(symbols)
+    return encode_occ(
+        fields["underlying"],
+        fields["expiration"],
+        fields["option_type"],
+        fields["strike"],
+    )
+
+
+def occ_frame(symbols: Sequence[str], index: Optional[pd.Index] = None) -> pd.DataFrame:
+    """
+    Parse OCC symbols into chain columns.
+
+    Returns:
+        DataFrame with underlying, expiration (YYYY-MM-DD strings, as in
+        normalized chains), option_type and strike
+    """
+    fields = parse_occ(symbols)
+    return pd.DataFrame(
+        {
+            "underlying": fields["underlying"],
+            "expiration": np.datetime_as_string(fields["expiration"], unit="D").astype(
+                object
+            ),
+            "option_type": fields["option_type"],
+            "strike": fields["strike"],
+        },
+        index=index,
+    )
@@ -0,0 +1,223 @@
+"""Day-over-day open interest change: how much of the volume opened positions."""
+
+from typing import List, Optional
+import numpy as np
+import pandas as pd
+
+# Columns naming the underlying in multi-ticker (full-market) chains
+UNDERLYING_COLUMNS = ["underlying_ticker", "underlying"]
+
+# Columns added to a chain by OpenInterestChange.join
+OI_CHANGE_COLUMNS = [
+    "prev_open_interest",
+    "oi_change",
+    "volume_oi_change_ratio",
+    "opening_volume",
+    "closing_volume",
+    "opening_flow",
+]
+
+# Bit layout of a packed contract key, low to high: strike in thousandths of
+# a dollar (27 bits, the OCC strike field), option type (1 bit), expiration
+# in days since 1970-01-01 (16 bits) and underlying code (19 bits)
+_STRIKE_BITS = 27
+_TYPE_BITS = 1
+_EXPIRY_BITS = 16
+_UNDERLYING_BITS = 19
+
+
+def _underlying_column(df: pd.DataFrame) -> Optional[str]:
+    for column in UNDERLYING_COLUMNS:
+        if column in df.columns:
+            return column
+    return None
+
+
+def _factorize(values: pd.Series):
+    """Codes and uniques, reusing the codes of categorical columns."""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.codes.to_numpy(), values.cat.categories
+    return pd.factorize(values)
+
+
+def _expiry_days(values: pd.Series) -> np.ndarray:
+    """Expiration dates as days since 1970, parsing each distinct date once."""
+    codes, uniques = _factorize(values)
+    days = (
+        pd.to_datetime(pd.Index(uniques))
+        .to_numpy()
+        .astype("datetime64[D]")
+        .astype(np.int64)
+    )
+    return days[codes]
+
+
+def pack_contract_keys(
+    df: pd.DataFrame, underlyings: Optional[pd.Index] = None
+) -> np.ndarray:
+    """
+    Pack each contract's underlying, expiration, type and strike into an int64.
+
+    Integer keys sort and compare far faster than strings, which is what
+    makes joining full-market snapshots cheap.
+
+    Args:
+        df: Options DataFrame with strike, expiration and option_type, plus an
+            underlying column for multi-ticker chains
+        underlyings: Symbols numbering the underlying field; symbols not in
+            it get key -1, which matches nothing (default: codes from df)
+
+    Returns:
+        Array of non-negative int64 keys (-1 for unknown underlyings)
+    """
+    strike = np.rint(df["strike"].to_numpy(dtype=float) * 1000).astype(np.int64)
+    codes, uniques = _factorize(df["option_type"])
+    is_call = (np.asarray(uniques) == "call").astype(np.int64)[codes]
+    expiry = _expiry_days(df["expiration"])
+
+    keys = strike | (is_call << _STRIKE_BITS)
+    keys |= expiry << (_STRIKE_BITS + _TYPE_BITS)
+
+    column = _underlying_column(df)
+    if column is not None:
+        codes, uniques = _factorize(df[column])
+        if underlyings is not None:
+            codes = underlyings.get_indexer(uniques)[codes]
+        keys |= codes.astype(np.int64) << (_STRIKE_BITS + _TYPE_BITS + _EXPIRY_BITS)
+        keys[codes < 0] = -1
+    return keys
+
+
+def estimate_opening_volume(volume: np.ndarray, oi_change: np.ndarray) -> np.ndarray:
+    """
+    Estimate how much of each contract's volume opened new positions.
+
+    A trade between two openers adds one contract of open interest and a trade
+    between two closers removes one; a trade between an opener and a closer
+    leaves it unchanged. Taking the unchanged trades as half opening gives
+    opening = (volume + ΔOI) / 2, clipped to [0, volume].
+
+    Args:
+        volume: Contracts traded
+        oi_change: Change in open interest over the same period
+
+    Returns:
+        Estimated opening contracts (closing is volume minus this)
+    """
+    volume = np.asarray(volume, dtype=float)
+    return np.clip((volume + oi_change) / 2.0, 0.0, volume)
+
+
+class OpenInterestChange:
+    """
+    Joins a chain to an earlier snapshot of the same contracts by packed key.
+
+    The earlier chain's keys are sorted once when the engine is created; each
+    join sorts the later chain's keys and merges the two sorted arrays with a
+    binary search, then scatters the earlier open interest back into the
+    later chain's order. No string comparison or pandas merge is involved.
+
+    Open interest is published once a day after the close, so ΔOI between
+    two daily snapshots reflects the trading volume recorded in the later
+    one when snapshots are taken after the open interest update.
+    """
+
+    def __init__(self, previous: pd.DataFrame):
+        """
+        Args:
+            previous: Earlier chain (each contract listed once)
+        """
+        column = _underlying_column(previous)
+        self.underlyings = (
+            pd.Index(_factorize(previous[column])[1]) if column is not None else None
+        )
+        keys = pack_contract_keys(previous, self.underlyings)
+        order = np.argsort(keys, kind="stable")
+        self._keys = keys[order]
+        self._open_interest = previous["openInterest"].to_numpy(dtype=np.int64)[order]
+
+    def previous_open_interest(self, current: pd.DataFrame) -> np.ndarray:
+        """
+        Look up each contract's earlier open interest.
+
+        Returns:
+            Array aligned with current; contracts missing from the earlier
+            chain (new listings) get 0
+        """
+        keys = pack_contract_keys(current, self.underlyings)
+        previous = np.zeros(len(keys), dtype=np.int64)
+        if not len(self._keys):
+            return previous
+        # Searching with sorted keys walks both arrays in order, several times
+        # faster than random probes once they outgrow the CPU cache
+        order = np.argsort(keys, kind="stable")
+        ordered = keys[order]
+        index = np.searchsorted(self._keys, ordered)
+        index[index == len(self._keys)] = 0
+        found = (self._keys[index] == ordered) & (ordered >= 0)
+        previous[order[found]] = self._open_interest[index[found]]
+        return previous
+
+    def join(self, current: pd.DataFrame) -> pd.DataFrame:
+        """
+        Add open interest change and opening/closing estimates to a chain.
+
+        Args:
+            current: Later chain with volume, openInterest and dollar_flow
+
+        Returns:
+            Copy of current with prev_open_interest, oi_change,
+            volume_oi_change_ratio (volume per contract of ΔOI, NaN when OI
+            did not change), opening_volume, closing_volume and opening_flow
+            (dollar flow of the opening share of volume)
+        """
+        previous = self.previous_open_interest(current)
+        volume = current["volume"].to_numpy(dtype=float)
+        oi_change = current["openInterest"].to_numpy(dtype=np.int64) - previous
+        opening = estimate_opening_volume(volume, oi_change)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = np.where(oi_change != 0, volume / np.abs(oi_change), np.nan)
+            opening_share = np.where(volume > 0, opening / volume, 0.0)
+
+        return current.assign(
+            prev_open_interest=previous,
+            oi_change=oi_change,
+            volume_oi_change_ratio=ratio,
+            opening_volume=opening,
+            closing_volume=volume - opening,
+            opening_flow=current["dollar_flow"].to_numpy(dtype=float) * opening_share,
+        )
+
+
+def summarize_oi_change(joined: pd.DataFrame, by: List[str]) -> pd.DataFrame:
+    """
+    Total open interest change and opening/closing volume per group.
+
+    Args:
+        joined: Output of OpenInterestChange.join
+        by: Grouping columns, e.g. ["strike", "option_type"] or ["expiration"];
+            the underlying column is prepended for multi-ticker chains
+
+    Returns:
+        DataFrame with the group columns, volume, openInterest, oi_change,
+        opening_volume, closing_volume, opening_flow and opening_share,
+        sorted by absolute oi_change
+    """
+    column = _underlying_column(joined)
+    if column is not None and column not in by:
+        by = [column] + list(by)
+
+    columns = [
+        "volume",
+        "openInterest",
+        "oi_change",
+        "opening_volume",
+        "closing_volume",
+        "opening_flow",
+    ]
+    totals = joined.groupby(by, observed=True, sort=False)[columns].sum()
+    totals["opening_share"] = (
+        totals["opening_volume"] / totals["volume"].where(totals["volume"] > 0)
+    ).fillna(0.0)
+    order = np.argsort(-totals["oi_change"].abs().to_numpy(), kind="stable")
+    return totals.iloc[order].reset_index()
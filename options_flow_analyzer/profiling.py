@@ -0,0 +1,271 @@
+"""Named timing spans for finding where a command spends its time."""
+
+import contextlib
+import cProfile
+import functools
+import threading
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+# Shared no-op context returned while profiling is off
+_NULL_SPAN = contextlib.nullcontext()
+
+_active: Optional["Profiler"] = None
+
+
+class _SpanStats:
+    """Accumulated measurements for one span path."""
+
+    __slots__ = ("path", "calls", "wall", "cpu", "alloc")
+
+    def __init__(self, path: str):
+        self.path = path
+        self.calls = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.alloc = 0
+
+
+class _Span:
+    """Context manager that measures one span and records it on exit."""
+
+    __slots__ = ("profiler", "name", "path", "wall", "cpu", "mem", "high")
+
+    def __init__(self, profiler: "Profiler", name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        stack = self.profiler._stack()
+        self.path = f"{stack[-1].path};{self.name}" if stack else self.name
+        if self.profiler.memory:
+            self.mem, peak = tracemalloc.get_traced_memory()
+            if stack:
+                # Hand the enclosing span its peak before resetting it
+                stack[-1].high = max(stack[-1].high, peak)
+            _reset_peak()
+            self.high = self.mem
+        stack.append(self)
+        self.profiler._stats(self.path)
+        self.cpu = time.thread_time()
+        self.wall = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        wall = time.perf_counter() - self.wall
+        cpu = time.thread_time() - self.cpu
+        alloc = 0
+        stack = self.profiler._stack()
+        stack.pop()
+        if self.profiler.memory:
+            self.high = max(self.high, tracemalloc.get_traced_memory()[1])
+            alloc = self.high - self.mem
+            if stack:
+                stack[-1].high = max(stack[-1].high, self.high)
+        self.profiler._record(self.path, wall, cpu, alloc)
+        return False
+
+
+def _reset_peak():
+    # tracemalloc.reset_peak is Python 3.9+; on 3.8 spans report the highest
+    # traced memory since profiling started instead of since the span began
+    reset = getattr(tracemalloc, "reset_peak", None)
+    if reset is not None:
+        reset()
+
+
+class Profiler:
+    """
+    Collects wall time, CPU time and peak allocated memory per named span.
+
+    Spans nest: a span opened inside another is recorded under the path
+    "outer;inner", which is also the collapsed-stack format flame graph tools
+    read. Spans from worker threads are recorded as top-level spans of that
+    thread. Optionally runs cProfile for the whole session as well.
+    """
+
+    def __init__(self, memory: bool = True, cprofile: bool = False):
+        """
+        Args:
+            memory: Trace allocations with tracemalloc (slows allocation-heavy
+                code noticeably)
+            cprofile: Also collect function-level statistics with cProfile
+        """
+        self.memory = memory
+        self.stats: Dict[str, _SpanStats] = {}
+        self.wall = 0.0
+        self.cpu = 0.0
+        self._cprofile = cProfile.Profile() if cprofile else None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._started = 0.0
+        self._started_cpu = 0.0
+        self._tracing = False
+
+    def _stack(self) -> List[_Span]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _stats(self, path: str) -> _SpanStats:
+        # Created on first entry so reports list parents before children
+        with self._lock:
+            stats = self.stats.get(path)
+            if stats is None:
+                stats = self.stats[path] = _SpanStats(path)
+            return stats
+
+    def _record(self, path: str, wall: float, cpu: float, alloc: int):
+        stats = self._stats(path)
+        with self._lock:
+            stats.calls += 1
+            stats.wall += wall
+            stats.cpu += cpu
+            stats.alloc = max(stats.alloc, alloc)
+
+    def span(self, name: str) -> _Span:
+        """Context manager measuring the enclosed block as ``name``."""
+        return _Span(self, name)
+
+    def start(self):
+        """Make this the active profiler and start measuring."""
+        global _active
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._tracing = True
+        if self._cprofile is not None:
+            self._cprofile.enable()
+        self._started_cpu = time.process_time()
+        self._started = time.perf_counter()
+        _active = self
+
+    def stop(self):
+        """Stop measuring and deactivate this profiler."""
+        global _active
+        self.wall = time.perf_counter() - self._started
+        self.cpu = time.process_time() - self._started_cpu
+        if self._cprofile is not None:
+            self._cprofile.disable()
+        if self._tracing:
+            tracemalloc.stop()
+            self._tracing = False
+        if _active is self:
+            _active = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+    def report(self) -> List[Dict[str, Any]]:
+        """
+        Span measurements in the order spans were first entered.
+
+        Returns:
+            List of dictionaries with stage, depth, calls, wall_ms, cpu_ms,
+            alloc_mb and share (fraction of the session's wall time)
+        """
+        total = self.wall or 1e-12
+        return [
+            {
+                "stage": stats.path.rsplit(";", 1)[-1],
+                "path": stats.path,
+                "depth": stats.path.count(";"),
+                "calls": stats.calls,
+                "wall_ms": stats.wall * 1000,
+                "cpu_ms": stats.cpu * 1000,
+                "alloc_mb": stats.alloc / 2**20,
+                "share": stats.wall / total,
+            }
+            for stats in self.stats.values()
+        ]
+
+    def format_report(self) -> str:
+        """Plain-text stage breakdown, one indented line per span."""
+        lines = [
+            f"{'Stage':<40} {'Calls':>5} {'Wall ms':>10} {'CPU ms':>10} "
+            f"{'Alloc MB':>9} {'Share':>6}"
+        ]
+        for row in self.report():
+            stage = "  " * row["depth"] + row["stage"]
+            alloc = f"{row['alloc_mb']:>9.1f}" if self.memory else f"{'-':>9}"
+            lines.append(
+                f"{stage:<40} {row['calls']:>5} {row['wall_ms']:>10.1f} "
+                f"{row['cpu_ms']:>10.1f} {alloc} {row['share']:>6.1%}"
+            )
+        # Imports, I/O waits and anything else no span covered
+        spanned = sum(s.wall for s in self.stats.values() if ";" not in s.path)
+        other = max(0.0, self.wall - spanned)
+        lines.append(
+            f"{'(outside spans)':<40} {'':>5} {other * 1000:>10.1f} {'':>10} "
+            f"{'':>9} {other / (self.wall or 1e-12):>6.1%}"
+        )
+        lines.append(
+            f"{'total':<40} {'':>5} {self.wall * 1000:>10.1f} {self.cpu * 1000:>10.1f}"
+        )
+        return "\n".join(lines)
+
+    def dump(self, path: str):
+        """
+        Write the session profile to a file.
+
+        Files ending in ``.folded`` get the spans as collapsed stacks weighted
+        by self wall-time microseconds (flamegraph.pl, speedscope); any other path
+        gets cProfile statistics readable by pstats, snakeviz or gprof2dot.
+
+        Raises:
+            ValueError: If cProfile statistics are requested but the profiler
+                was created without cprofile=True
+        """
+        if path.endswith(".folded"):
+            self_time = {stack: stats.wall for stack, stats in self.stats.items()}
+            for stack, stats in self.stats.items():
+                if ";" in stack:
+                    self_time[stack.rsplit(";", 1)[0]] -= stats.wall
+            with open(path, "w", encoding="utf-8") as fh:
+                for stack, seconds in self_time.items():
+                    fh.write(f"{stack} {max(0, int(seconds * 1e6))}\n")
+            return
+        if self._cprofile is None:
+            raise ValueError("Profiler was created without cprofile=True")
+        self._cprofile.dump_stats(path)
+
+
+def span(name: str):
+    """
+    Measure the enclosed block as ``name`` on the active profiler.
+
+    Returns a shared no-op context manager when profiling is off, so spans can
+    stay in hot paths.
+    """
+    if _active is None:
+        return _NULL_SPAN
+    return _active.span(name)
+
+
+def profiled(name: Optional[str] = None) -> Callable:
+    """
+    Decorator that wraps each call of a function in a span.
+
+    Args:
+        name: Span name (default: the function's name)
+    """
+
+    def decorator(func):
+        span_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _active is None:
+                return func(*args, **kwargs)
+            with _active.span(span_name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
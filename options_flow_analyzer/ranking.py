@@ -0,0 +1,188 @@
+"""Cross-sectional ranking of options flow across a universe of tickers."""
+
+import heapq
+import itertools
+import json
+import numpy as np
+import pandas as pd
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+from .analyzer import OptionsAnalyzer
+from .rollup import FlowRollup
+
+# Metrics tracked by the ranker; each keeps its own top-K heap
+RANKING_METRICS = ["net_premium", "volume_oi", "sweep_confidence", "gex_change"]
+
+
+def read_gex(path: str) -> Dict[str, float]:
+    """
+    Read per-ticker gamma exposure saved by an earlier scan.
+
+    Args:
+        path: JSON file mapping ticker to GEX at spot (see write_gex)
+
+    Returns:
+        GEX by ticker, for UniverseRanker's previous_gex
+    """
+    with open(path, "r", encoding="utf-8") as fh:
+        return {ticker.upper(): float(gex) for ticker, gex in json.load(fh).items()}
+
+
+def write_gex(gex: Mapping[str, float], path: str):
+    """
+    Save per-ticker gamma exposure for the next scan's gex_change.
+
+    Args:
+        gex: GEX at spot by ticker
+        path: Destination JSON file
+    """
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(dict(sorted(gex.items())), fh, indent=2)
+
+
+class UniverseRanker:
+    """Streams chains through the analyzer and keeps only the top-K per metric."""
+
+    def __init__(
+        self,
+        top_k: int = 10,
+        analyzer: Optional[OptionsAnalyzer] = None,
+        previous_gex: Optional[Mapping[str, float]] = None,
+        rollup: Optional[FlowRollup] = None,
+    ):
+        """
+        Args:
+            top_k: Number of tickers to keep for each metric
+            analyzer: Analyzer used for each chain
+            previous_gex: Gamma exposure at spot from an earlier scan, by ticker;
+                needed for the gex_change metric
+            rollup: Roll-up updated with the flow of each scanned ticker in its
+                taxonomy
+        """
+        self.top_k = top_k
+        self.analyzer = analyzer or OptionsAnalyzer()
+        self.previous_gex = previous_gex or {}
+        self.rollup = rollup
+        self.tickers_processed = 0
+        # GEX at spot of every scanned ticker, to save for the next scan
+        self.gex: Dict[str, float] = {}
+        self._heaps: Dict[str, List[Tuple[float, int, str, Dict[str, float]]]] = {
+            metric: [] for metric in RANKING_METRICS
+        }
+        self._sequence = itertools.count()
+
+    def score_chain(
+        self, ticker: str, chain: pd.DataFrame, current_price: float
+    ) -> Dict[str, float]:
+        """
+        Reduce one ticker's chain to its ranking metrics.
+
+        Args:
+            ticker: Stock symbol
+            chain: Options DataFrame for the ticker
+            current_price: Current stock price
+
+        Returns:
+            Dictionary of metric values for the ticker
+        """
+        if chain.empty:
+            return {}
+
+        flow_summary = self.analyzer.calculate_flow_summary(chain)
+        if self.rollup is not None and ticker in self.rollup:
+            self.rollup.update(ticker, flow_summary)
+        vol_oi_ratio = chain["volume"] / (chain["openInterest"] + 1)
+        sweeps = self.analyzer.detect_sweeps(chain)
+        gamma = self.analyzer.calculate_gamma_exposure(chain, current_price)
+        gex = gamma.get(f"{current_price:.2f}", 0.0)
+
+        metrics = {
+            "net_premium": float(flow_summary["net_dollar_flow"]),
+            "volume_oi": float(vol_oi_ratio.max()),
+            "sweep_confidence": float(sweeps["sweep_confidence"].max()),
+            "gex": float(gex),
+        }
+        if ticker in self.previous_gex:
+            metrics["gex_change"] = metrics["gex"] - float(self.previous_gex[ticker])
+
+        return metrics
+
+    def add(
+        self, ticker: str, chain: pd.DataFrame, current_price: float
+    ) -> Dict[str, float]:
+        """
+        Score a chain and offer the ticker to each metric's heap.
+
+        The chain is not retained; only the small metrics dictionary is kept
+        for tickers that make a top-K list.
+
+        Args:
+            ticker: Stock symbol
+            chain: Options DataFrame for the ticker
+            current_price: Current stock price
+
+        Returns:
+            Dictionary of metric values for the ticker
+        """
+        metrics = self.score_chain(ticker, chain, current_price)
+        self.tickers_processed += 1
+        if "gex" in metrics:
+            self.gex[ticker] = metrics["gex"]
+
+        for metric in RANKING_METRICS:
+            if metric not in metrics or np.isnan(metrics[metric]):
+                continue
+            # Net premium and GEX change rank by magnitude in either direction
+            score = abs(metrics[metric])
+            entry = (score, next(self._sequence), ticker, metrics)
+            heap = self._heaps[metric]
+            if len(heap) < self.top_k:
+                heapq.heappush(heap, entry)
+            elif score > heap[0][0]:
+                heapq.heapreplace(heap, entry)
+
+        return metrics
+
+    def scan(
+        self,
+        tickers: Iterable[str],
+        load_chain: Callable[[str], Tuple[pd.DataFrame, float]],
+        on_error: Optional[Callable[[str, Exception], None]] = None,
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Rank a universe, loading and releasing one chain at a time.
+
+        Args:
+            tickers: Stock symbols to scan
+            load_chain: Callable returning (chain, current_price) for a ticker
+            on_error: Optional callback for tickers that fail to load
+
+        Returns:
+            Rankings by metric (see results)
+        """
+        for ticker in tickers:
+            try:
+                chain, current_price = load_chain(ticker)
+            except Exception as e:
+                if on_error:
+                    on_error(ticker, e)
+                continue
+            self.add(ticker, chain, current_price)
+            del chain
+
+        return self.results()
+
+    def results(self) -> Dict[str, pd.DataFrame]:
+        """
+        Return the current top-K tickers for each metric.
+
+        Returns:
+            Dictionary mapping metric name to a DataFrame sorted by score
+        """
+        rankings = {}
+        for metric, heap in self._heaps.items():
+            rows = [
+                {"ticker": ticker, "score": score, **metrics}
+                for score, _, ticker, metrics in sorted(heap, reverse=True)
+            ]
+            rankings[metric] = pd.DataFrame(rows)
+        return rankings
@@ -0,0 +1,315 @@
+"""Hierarchical roll-up of per-ticker flow through a sector/ETF taxonomy.
+
+A taxonomy maps group names to their members: tickers or other groups,
+each with a weight. Groups can be sectors (members weighted 1), ETFs
+(constituents weighted by their index weight) or the whole market, and a
+ticker may belong to several groups, for example its sector and every ETF
+that holds it.
+
+Every ticker's exposure to each group it sits under (the product of the
+weights along each path, summed over paths) is resolved once, so a group's
+flow is a weighted sum of its tickers' flow totals. A full refresh is one
+gather and segmented sum over those exposures; a ticker update adds its
+change to just the groups above it.
+"""
+
+import json
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Union
+import numpy as np
+import pandas as pd
+from .analyzer import OptionsAnalyzer
+
+# Additive flow totals rolled up per group, as named by flow_totals
+ROLLUP_METRICS = ["call_volume", "put_volume", "call_flow", "put_flow", "contracts"]
+
+# The same totals as named in a flow summary
+_SUMMARY_KEYS = {
+    "call_volume": "total_call_volume",
+    "put_volume": "total_put_volume",
+    "call_flow": "total_call_flow",
+    "put_flow": "total_put_flow",
+    "contracts": "total_contracts",
+}
+
+Members = Union[Sequence[str], Mapping[str, float]]
+
+
+class Taxonomy:
+    """
+    Groups of tickers and other groups, resolved to per-ticker exposures.
+
+    Any name with members is a group; every other member name is a ticker.
+    Members given as a list are weighted 1, members given as a mapping carry
+    their weight (e.g. an ETF's constituent weights).
+    """
+
+    def __init__(self, groups: Mapping[str, Members]):
+        """
+        Args:
+            groups: Mapping of group name to its members
+
+        Raises:
+            ValueError: If a group contains itself, directly or indirectly
+        """
+        self.members: Dict[str, Dict[str, float]] = {
+            group: (
+                {name: float(weight) for name, weight in members.items()}
+                if isinstance(members, Mapping)
+                else dict.fromkeys(members, 1.0)
+            )
+            for group, members in groups.items()
+        }
+
+        # Groups in display order: depth-first from the top-level groups
+        children = {name for members in self.members.values() for name in members}
+        self.groups: List[str] = []
+        self.depth: Dict[str, int] = {}
+        for top in self.members:
+            if top not in children:
+                self._visit(top, 0)
+        # Groups only reachable through a cycle
+        for group in self.members:
+            if group not in self.depth:
+                self._visit(group, 0)
+
+        self.tickers: List[str] = list(
+            dict.fromkeys(
+                name
+                for group in self.groups
+                for name in self.members[group]
+                if name not in self.members
+            )
+        )
+        self._group_index = {group: i for i, group in enumerate(self.groups)}
+        self._ticker_index = {ticker: i for i, ticker in enumerate(self.tickers)}
+
+        exposures: Dict[str, Dict[str, float]] = {}
+        for group in self.groups:
+            self._resolve(group, exposures, set())
+
+        group_ids, ticker_ids, weights = [], [], []
+        for group in self.groups:
+            for ticker, weight in exposures[group].items():
+                group_ids.append(self._group_index[group])
+                ticker_ids.append(self._ticker_index[ticker])
+                weights.append(weight)
+        group_ids = np.asarray(group_ids, dtype=np.intp)
+        ticker_ids = np.asarray(ticker_ids, dtype=np.intp)
+        weights = np.asarray(weights, dtype=float)
+
+        # Exposures sorted by group, for full refreshes ...
+        self.entry_group, self.entry_ticker, self.entry_weight = (
+            group_ids,
+            ticker_ids,
+            weights,
+        )
+        # ... and by ticker, for a ticker's path
+        order = np.argsort(ticker_ids, kind="stable")
+        self.path_groups = group_ids[order]
+        self.path_weights = weights[order]
+        self.path_starts = np.searchsorted(
+            ticker_ids[order], np.arange(len(self.tickers) + 1)
+        )
+
+    def _visit(self, group: str, depth: int):
+        if group in self.depth:
+            return
+        self.depth[group] = depth
+        self.groups.append(group)
+        for name in self.members[group]:
+            if name in self.members:
+                self._visit(name, depth + 1)
+
+    def _resolve(
+        self, group: str, exposures: Dict[str, Dict[str, float]], active: set
+    ) -> Dict[str, float]:
+        """Summed path weight of every ticker under a group."""
+        if group in exposures:
+            return exposures[group]
+        if group in active:
+            raise ValueError(f"Taxonomy group {group!r} contains itself")
+        active.add(group)
+        exposure: Dict[str, float] = {}
+        for name, weight in self.members[group].items():
+            if name in self.members:
+                for ticker, inner in self._resolve(name, exposures, active).items():
+                    exposure[ticker] = exposure.get(ticker, 0.0) + weight * inner
+            else:
+                exposure[name] = exposure.get(name, 0.0) + weight
+        active.discard(group)
+        exposures[group] = exposure
+        return exposure
+
+    @classmethod
+    def load(cls, path: str) -> "Taxonomy":
+        """
+        Read a taxonomy from a JSON file.
+
+        The file holds one object mapping each group to a list of members or
+        to an object of member weights, e.g.
+        ``{"Market": ["Technology", "Energy"], "Technology": ["AAPL", "MSFT"],
+        "QQQ holdings": {"AAPL": 0.09, "MSFT": 0.08}}``.
+        """
+        with open(path, "r", encoding="utf-8") as fh:
+            return cls(json.load(fh))
+
+    def __contains__(self, ticker: str) -> bool:
+        return ticker in self._ticker_index
+
+    def path(self, ticker: str) -> List[str]:
+        """Groups a ticker rolls up into, in display order."""
+        i = self._ticker_index[ticker]
+        groups = self.path_groups[self.path_starts[i] : self.path_starts[i + 1]]
+        return [self.groups[g] for g in np.sort(groups)]
+
+
+def flow_vector(result: Mapping[str, Any]) -> np.ndarray:
+    """
+    The ROLLUP_METRICS of a per-ticker result.
+
+    Args:
+        result: Output of flow_totals or calculate_flow_summary (an empty
+            summary counts as no flow)
+
+    Returns:
+        Float array in ROLLUP_METRICS order
+    """
+    if not result:
+        return np.zeros(len(ROLLUP_METRICS))
+    if ROLLUP_METRICS[0] in result:
+        return np.array([float(result[key]) for key in ROLLUP_METRICS])
+    return np.array([float(result[_SUMMARY_KEYS[key]]) for key in ROLLUP_METRICS])
+
+
+class FlowRollup:
+    """
+    Flow totals of every taxonomy group, kept current as tickers report.
+
+    update() touches only the groups above the reported ticker, so a
+    refreshing watchlist keeps the whole hierarchy current at the cost of
+    one ticker's path; refresh() recomputes every group from scratch.
+    """
+
+    def __init__(self, taxonomy: Taxonomy, analyzer: Optional[OptionsAnalyzer] = None):
+        """
+        Args:
+            taxonomy: Groups to roll flow up into
+            analyzer: Analyzer whose summarize_flow_totals builds summaries
+        """
+        self.taxonomy = taxonomy
+        self.analyzer = analyzer or OptionsAnalyzer()
+        self.values = np.zeros((len(taxonomy.tickers), len(ROLLUP_METRICS)))
+        self.reported = np.zeros(len(taxonomy.tickers), dtype=bool)
+        self.totals = np.zeros((len(taxonomy.groups), len(ROLLUP_METRICS)))
+        self.tickers_reporting = np.zeros(len(taxonomy.groups), dtype=np.int64)
+
+    def __contains__(self, ticker: str) -> bool:
+        return ticker in self.taxonomy
+
+    def update(self, ticker: str, result: Mapping[str, Any]) -> List[str]:
+        """
+        Replace one ticker's flow and adjust the groups above it.
+
+        Args:
+            ticker: Stock symbol in the taxonomy
+            result: The ticker's flow_totals or flow summary
+
+        Returns:
+            Names of the groups that changed
+        """
+        taxonomy = self.taxonomy
+        i = taxonomy._ticker_index[ticker]
+        vector = flow_vector(result)
+        start, stop = taxonomy.path_starts[i], taxonomy.path_starts[i + 1]
+        groups = taxonomy.path_groups[start:stop]
+
+        self.totals[groups] += taxonomy.path_weights[start:stop, None] * (
+            vector - self.values[i]
+        )
+        if not self.reported[i]:
+            self.tickers_reporting[groups] += 1
+            self.reported[i] = True
+        self.values[i] = vector
+        return [taxonomy.groups[g] for g in groups]
+
+    def update_many(self, results: Mapping[str, Mapping[str, Any]]):
+        """
+        Replace the flow of many tickers, then refresh every group.
+
+        Args:
+            results: Flow totals or summaries by ticker; tickers outside the
+                taxonomy are ignored
+        """
+        index = self.taxonomy._ticker_index
+        for ticker, result in results.items():
+            if ticker in index:
+                self.values[index[ticker]] = flow_vector(result)
+                self.reported[index[ticker]] = True
+        self.refresh()
+
+    def refresh(self):
+        """Recompute every group's totals from the tickers' current flow."""
+        taxonomy = self.taxonomy
+        self.totals = np.zeros_like(self.totals)
+        self.tickers_reporting = np.zeros_like(self.tickers_reporting)
+        if not len(taxonomy.entry_group):
+            return
+        # Exposures are sorted by group: one segmented sum per group
+        contributions = (
+            taxonomy.entry_weight[:, None] * self.values[taxonomy.entry_ticker]
+        )
+        starts = np.flatnonzero(np.diff(taxonomy.entry_group, prepend=-1) != 0)
+        groups = taxonomy.entry_group[starts]
+        self.totals[groups] = np.add.reduceat(contributions, starts, axis=0)
+        self.tickers_reporting[groups] = np.add.reduceat(
+            self.reported[taxonomy.entry_ticker].astype(np.int64), starts
+        )
+
+    def summary(self, group: str) -> Dict[str, Any]:
+        """
+        Flow summary of one group, as calculate_flow_summary reports a chain.
+
+        Args:
+            group: Taxonomy group name
+
+        Returns:
+            Flow summary dictionary (empty until a member ticker has flow)
+        """
+        totals = self.totals[self.taxonomy._group_index[group]]
+        return self.analyzer.summarize_flow_totals(
+            dict(zip(ROLLUP_METRICS, totals.tolist()))
+        )
+
+    def frame(self, groups: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        Roll-up of every group (or the given ones) in taxonomy order.
+
+        Args:
+            groups: Group names to include (default: all)
+
+        Returns:
+            DataFrame with group, depth, tickers (members reporting), the
+            ROLLUP_METRICS, net_volume, net_dollar_flow and put_call_ratio
+        """
+        taxonomy = self.taxonomy
+        if groups is None:
+            rows = np.arange(len(taxonomy.groups))
+        else:
+            rows = np.sort([taxonomy._group_index[group] for group in groups])
+        totals = self.totals[rows]
+        call_volume, put_volume = totals[:, 0], totals[:, 1]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            put_call_ratio = np.where(call_volume > 0, put_volume / call_volume, 0.0)
+
+        frame = pd.DataFrame(totals, columns=ROLLUP_METRICS)
+        frame.insert(0, "group", [taxonomy.groups[g] for g in rows])
+        frame.insert(1, "depth", [taxonomy.depth[taxonomy.groups[g]] for g in rows])
+        frame.insert(2, "tickers", self.tickers_reporting[rows])
+        frame["net_volume"] = call_volume - put_volume
+        frame["net_dollar_flow"] = totals[:, 2] - totals[:, 3]
+        frame["put_call_ratio"] = put_call_ratio
+        return frame
+
+    def path_frame(self, ticker: str) -> pd.DataFrame:
+        """Roll-up of the groups above one ticker (see frame)."""
+        return self.frame(self.taxonomy.path(ticker))
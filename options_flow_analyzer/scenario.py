@@ -0,0 +1,317 @@
+"""Spot x volatility (x time) scenario grids of dealer exposure and P&L."""
+
+from datetime import datetime
+from typing import Dict, Optional, Sequence
+import numpy as np
+import pandas as pd
+from .greeks import MIN_YEARS, DEFAULT_IV, black_scholes, contract_arrays
+
+# Exposures reported for every scenario
+EXPOSURES = ["delta", "gamma", "vanna", "charm"]
+
+# Block-sized temporaries alive at once while one chunk is evaluated
+_LIVE_ARRAYS = 8
+
+# Target elements per evaluated block, sized to stay in CPU cache
+_BLOCK_ELEMENTS = 2**17
+
+
+class ScenarioResult:
+    """Exposure and P&L surfaces over a scenario grid."""
+
+    def __init__(
+        self,
+        spots: np.ndarray,
+        iv_shifts: np.ndarray,
+        time_shifts: np.ndarray,
+        surfaces: Dict[str, np.ndarray],
+    ):
+        self.spots = spots
+        self.iv_shifts = iv_shifts
+        self.time_shifts = time_shifts
+        # Each surface has shape (time_shifts, spots, iv_shifts)
+        self.surfaces = surfaces
+
+    def frame(self, name: str, time_index: int = 0) -> pd.DataFrame:
+        """
+        One surface as a DataFrame.
+
+        Args:
+            name: pnl, delta, gamma, vanna or charm
+            time_index: Which time shift to show
+
+        Returns:
+            DataFrame indexed by spot with one column per IV shift
+        """
+        return pd.DataFrame(
+            self.surfaces[name][time_index],
+            index=pd.Index(self.spots, name="spot"),
+            columns=pd.Index(self.iv_shifts, name="iv_shift"),
+        )
+
+    def to_frame(self) -> pd.DataFrame:
+        """All surfaces in long form: one row per scenario."""
+        time_shift, spot, iv_shift = np.meshgrid(
+            self.time_shifts, self.spots, self.iv_shifts, indexing="ij"
+        )
+        data = {
+            "time_shift_days": time_shift.ravel(),
+            "spot": spot.ravel(),
+            "iv_shift": iv_shift.ravel(),
+        }
+        data.update({name: surface.ravel() for name, surface in self.surfaces.items()})
+        return pd.DataFrame(data)
+
+
+class ScenarioEngine:
+    """
+    Evaluates a chain's dealer exposures and P&L over a scenario grid.
+
+    Dealers are assumed long calls and short puts (the convention of
+    calculate_gamma_exposure), holding each contract's open interest. Every
+    contract is repriced in every scenario with Black-Scholes using NumPy
+    broadcasting over a (time, spot, iv, contract) block; contracts are
+    processed in chunks so memory stays within ``max_bytes`` however large
+    the chain or grid.
+
+    The cost is linear in contracts x scenarios: a 100 x 50 grid takes about
+    0.15 ms per distinct (strike, expiry, IV) on one core, so roughly 0.8 s
+    for 5,000 contracts and 3 s for 20,000; a full index chain takes
+    seconds, not well under one. Blocks are evaluated in float32 by default
+    (about 3e-7 relative error against float64, near that of the normal CDF
+    approximation itself); pass ``dtype=np.float64`` for full precision at
+    about 1.7x the time.
+
+    Exposure units:
+        delta: dollar delta (shares x spot)
+        gamma: dollar delta change for a 1% spot move
+        vanna: dollar delta change for a 1 vol point rise
+        charm: dollar delta change over one day
+    """
+
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        current_price: float,
+        rate: float = 0.0,
+        default_iv: float = DEFAULT_IV,
+        as_of: Optional[datetime] = None,
+        positions: Optional[np.ndarray] = None,
+    ):
+        """
+        Args:
+            df: Options DataFrame
+            current_price: Current stock price
+            rate: Risk-free rate
+            default_iv: Volatility for contracts without implied volatility
+            as_of: Valuation time (default now)
+            positions: Contracts held per row (default: open interest, long
+                calls and short puts)
+        """
+        self.current_price = float(current_price)
+        self.rate = rate
+        self.contracts = contract_arrays(df, as_of=as_of, default_iv=default_iv)
+        if positions is None:
+            sign = np.where(self.contracts["is_call"], 1.0, -1.0)
+            positions = sign * self.contracts["open_interest"]
+        # Option multiplier: one contract covers 100 shares
+        self.shares = np.asarray(positions, dtype=float) * 100.0
+        self.base_price = black_scholes(
+            self.current_price,
+            self.contracts["strike"],
+            self.contracts["years"],
+            self.contracts["iv"],
+            self.contracts["is_call"],
+            rate,
+        )["price"]
+
+    def grid(
+        self,
+        spot_range: float = 0.10,
+        spot_steps: int = 100,
+        iv_shifts: Optional[Sequence[float]] = None,
+        time_shifts: Sequence[float] = (0.0,),
+        spots: Optional[Sequence[float]] = None,
+        max_bytes: int = 256 * 2**20,
+        dtype: type = np.float32,
+    ) -> ScenarioResult:
+        """
+        Evaluate every scenario of a spot x IV-shift x time-shift grid.
+
+        Args:
+            spot_range: Spot moves from -spot_range to +spot_range (fraction)
+            spot_steps: Number of spot levels
+            iv_shifts: Absolute volatility shifts (default 50 steps from -0.10
+                to +0.10)
+            time_shifts: Days to move the valuation date forward
+            spots: Explicit spot levels instead of spot_range/spot_steps
+            max_bytes: Memory budget for the temporaries of one chunk
+            dtype: Precision of the per-scenario evaluation (sums are
+                always accumulated in float64)
+
+        Returns:
+            ScenarioResult with pnl and exposure surfaces
+        """
+        if spots is None:
+            spots = self.current_price * (
+                1 + np.linspace(-spot_range, spot_range, spot_steps)
+            )
+        spots = np.asarray(spots, dtype=float)
+        iv_shifts = np.asarray(
+            np.linspace(-0.10, 0.10, 50) if iv_shifts is None else iv_shifts,
+            dtype=float,
+        )
+        time_shifts = np.asarray(time_shifts, dtype=float)
+
+        grid_shape = (len(time_shifts), len(spots), len(iv_shifts))
+        scenarios = int(np.prod(grid_shape))
+        itemsize = np.dtype(dtype).itemsize
+        # Chunks of ~_BLOCK_ELEMENTS keep each pass in cache; max_bytes caps
+        # memory when the grid alone is larger than that
+        chunk = max(
+            1,
+            min(
+                _BLOCK_ELEMENTS // scenarios,
+                int(max_bytes // (scenarios * itemsize * _LIVE_ARRAYS)),
+            ),
+        )
+
+        groups = self._groups()
+        surfaces = {name: np.zeros(grid_shape) for name in ["pnl"] + EXPOSURES}
+        for start in range(0, len(groups["shares"]), chunk):
+            part = {
+                key: values[start : start + chunk] for key, values in groups.items()
+            }
+            _accumulate(
+                surfaces, spots, iv_shifts, time_shifts / 365.0, part, self.rate, dtype
+            )
+
+        # Puts differ from calls with the same inputs only by parity terms:
+        # delta by -1 and price by (discounted strike - spot)
+        T = np.maximum(
+            self.contracts["years"][None, :] - time_shifts[:, None] / 365.0, MIN_YEARS
+        )
+        put_shares = np.where(self.contracts["is_call"], 0.0, self.shares)
+        put_cash = (self.contracts["strike"] * np.exp(-self.rate * T)) @ put_shares
+        surfaces["delta"] -= put_shares.sum()
+        surfaces["pnl"] += (
+            put_cash[:, None, None]
+            - spots[None, :, None] * put_shares.sum()
+            - self.base_price @ self.shares
+        )
+
+        # Convert per-share greeks into dollar exposures
+        spot_axis = spots[None, :, None]
+        surfaces["delta"] *= spot_axis
+        surfaces["gamma"] *= spot_axis**2 * 0.01
+        surfaces["vanna"] *= spot_axis * 0.01
+        surfaces["charm"] *= spot_axis / 365.0
+
+        return ScenarioResult(spots, iv_shifts, time_shifts, surfaces)
+
+    def _groups(self) -> Dict[str, np.ndarray]:
+        """
+        Net positions per distinct (strike, expiry, iv).
+
+        Calls and puts with the same inputs share gamma, vanna and charm and
+        differ in delta and price only by parity terms, so they are evaluated
+        once with their positions summed.
+        """
+        c = self.contracts
+        keys = np.stack([c["strike"], c["years"], c["iv"]])
+        unique, inverse = np.unique(keys, axis=1, return_inverse=True)
+        shares = np.bincount(
+            inverse.ravel(), weights=self.shares, minlength=unique.shape[1]
+        )
+        return {
+            "strike": unique[0],
+            "years": unique[1],
+            "iv": unique[2],
+            "shares": shares,
+        }
+
+
+def _ncdf(x: np.ndarray, pdf: np.ndarray) -> np.ndarray:
+    """norm_cdf given the density at x, reusing buffers (see greeks.norm_cdf)."""
+    t = np.abs(x)
+    t *= 0.2316419
+    t += 1.0
+    np.reciprocal(t, out=t)
+    poly = t * 1.330274429
+    poly -= 1.821255978
+    poly *= t
+    poly += 1.781477937
+    poly *= t
+    poly -= 0.356563782
+    poly *= t
+    poly += 0.319381530
+    poly *= t
+    poly *= pdf
+    np.subtract(1.0, poly, out=poly, where=x >= 0)
+    return poly
+
+
+def _accumulate(
+    surfaces: Dict[str, np.ndarray],
+    spots: np.ndarray,
+    iv_shifts: np.ndarray,
+    time_shifts: np.ndarray,
+    part: Dict[str, np.ndarray],
+    rate: float,
+    dtype: np.dtype = np.float64,
+):
+    """
+    Add one chunk of contracts to the call-equivalent surfaces.
+
+    Block arrays have shape (time, spot, iv, contract). Terms that do not
+    depend on spot are computed once on the (time, 1, iv, contract) slice,
+    and log-moneyness on the (1, spot, 1, contract) slice, in float64; the
+    full block, evaluated in ``dtype``, only sees multiply-adds, one exp and
+    two polynomials.
+    """
+    strike = part["strike"]
+    shares = part["shares"].astype(dtype)
+    T = np.maximum(part["years"][None, :] - time_shifts[:, None], MIN_YEARS)
+    T = T[:, None, None, :]
+    iv = np.maximum(part["iv"][None, :] + iv_shifts[:, None], 1e-4)[None, None]
+    vol_t = iv * np.sqrt(T)
+    inv_vol_t = 1.0 / vol_t
+    drift = (rate + 0.5 * iv * iv) * T * inv_vol_t
+    disc_strike = strike * np.exp(-rate * T)
+    # ln S and ln K nearly cancel, so take their difference before casting
+    moneyness = np.log(spots[:, None] / strike[None, :])[None, :, None, :]
+    # S * pdf(d1) == K * exp(-rT) * pdf(d2)
+    spot_ratio = (spots[None, :, None, None] / disc_strike).astype(dtype)
+    vol_t, inv_vol_t, iv, T = (
+        values.astype(dtype) for values in (vol_t, inv_vol_t, iv, T)
+    )
+
+    d1 = moneyness.astype(dtype) * inv_vol_t
+    d1 += drift.astype(dtype)
+    pdf1 = d1 * d1
+    pdf1 *= -0.5
+    np.exp(pdf1, out=pdf1)
+    pdf1 *= 1.0 / np.sqrt(2.0 * np.pi)
+    cdf1 = _ncdf(d1, pdf1)
+    d2 = d1
+    d2 -= vol_t
+    pdf2 = pdf1 * spot_ratio
+    cdf2 = _ncdf(d2, pdf2)
+    del pdf2
+
+    delta = cdf1 @ shares
+    surfaces["delta"] += delta
+    surfaces["pnl"] += delta * spots[None, :, None]
+    cdf2 *= disc_strike.astype(dtype)
+    surfaces["pnl"] -= cdf2 @ shares
+
+    gamma = pdf1 * inv_vol_t
+    surfaces["gamma"] += (gamma @ shares) / spots[None, :, None]
+    vanna = pdf1 * d2
+    vanna /= iv
+    surfaces["vanna"] -= vanna @ shares
+    # charm = pdf(d1) * (d2 / 2T - r / (sigma sqrt T))
+    charm = d2 / (2.0 * T)
+    charm -= rate * inv_vol_t
+    charm *= pdf1
+    surfaces["charm"] += charm @ shares
@@ -0,0 +1,330 @@
+"""Long-running local analysis service with warm caches."""
+
+import json
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from .analyzer import OptionsAnalyzer
+from .client import SERVICE_NAME, ServiceError
+from .config import Config
+from .data_fetcher import OptionsDataFetcher
+from .export import plain
+from .filter_expr import FilterError
+from .memo import RESULT_CACHE
+from .ranking import UniverseRanker
+
+
+def _flag(params: Dict[str, str], name: str, default: bool) -> bool:
+    """Read a boolean query parameter."""
+    value = params.get(name)
+    if value is None:
+        return default
+    return value.lower() in ("1", "true", "yes", "on")
+
+
+class AnalysisService:
+    """
+    Serves analyze, expirations and scan requests from one warm process.
+
+    The fetcher keeps its HTTP session and a TTL cache of provider responses,
+    and complete serialized responses are cached for the same TTL, so repeated
+    queries for hot tickers skip fetching, analysis and encoding entirely.
+    """
+
+    def __init__(
+        self,
+        cache_ttl: float = 30.0,
+        fetcher: Optional[OptionsDataFetcher] = None,
+        analyzer: Optional[OptionsAnalyzer] = None,
+    ):
+        """
+        Args:
+            cache_ttl: Seconds to reuse provider data and computed responses
+            fetcher: Data fetcher (default: one caching for cache_ttl)
+            analyzer: Analyzer used for every request (default: one memoizing
+                into RESULT_CACHE)
+        """
+        self.cache_ttl = cache_ttl
+        self.fetcher = fetcher or OptionsDataFetcher(cache_ttl=cache_ttl)
+        self.analyzer = analyzer or OptionsAnalyzer(memo=RESULT_CACHE)
+        self.started = time.time()
+        self.hits = 0
+        self.misses = 0
+        self._responses: Dict[Tuple, Tuple[float, bytes]] = {}
+        self._lock = threading.Lock()
+
+    def load_chain(
+        self, ticker: str, expiration: Optional[str] = None
+    ) -> Tuple[Dict[str, Any], Any]:
+        """Fetch ticker info (Polygon, then yfinance) and the options chain."""
+        ticker_info = self.fetcher.get_polygon_ticker_info(ticker)
+        if "error" in ticker_info:
+            ticker_info = self.fetcher.get_ticker_info(ticker)
+        if "error" in ticker_info:
+            raise ServiceError(502, f"All data sources failed: {ticker_info['error']}")
+        return ticker_info, self.fetcher.get_polygon_options_data(ticker, expiration)
+
+    def analyze(
+        self,
+        ticker: str,
+        expiration: Optional[str] = None,
+        min_volume: int = 10,
+        option_type: Optional[str] = None,
+        where: Optional[str] = None,
+        sweeps: bool = True,
+        unusual: bool = True,
+        max_pain: bool = True,
+        multi_exp: bool = False,
+        gamma: bool = False,
+        combos: bool = False,
+        contracts: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Analyze a ticker's chain as the analyze command does.
+
+        Args:
+            ticker: Stock symbol
+            expiration: Expiration date (YYYY-MM-DD)
+            min_volume: Minimum volume for filtering
+            option_type: 'calls', 'puts' or None for both
+            where: Filter expression (see filter_expr)
+            sweeps: Detect sweeps and analyze flow without them
+            unusual: Include unusual activity
+            max_pain: Include max pain
+            multi_exp: Include flow by expiration
+            gamma: Include gamma flip level, walls and expiry contributions
+            combos: Include multi-leg combos and combo-adjusted flow
+            contracts: Include the sweep-classified chain
+
+        Returns:
+            Dictionary with ticker_info, contracts_matched, results and
+            (optionally) contracts
+        """
+        ticker_info, options_data = self.load_chain(ticker, expiration)
+        if options_data.empty:
+            raise ServiceError(404, f"No options data found for {ticker}")
+
+        filtered_data = self.fetcher.filter_options_data(
+            options_data,
+            min_volume=min_volume,
+            option_type=option_type,
+            where=where,
+            spot=ticker_info.get("current_price"),
+        )
+        if filtered_data.empty:
+            raise ServiceError(404, "No options data matches the specified criteria")
+
+        results, classified = self.analyzer.analyze_chain(
+            filtered_data,
+            ticker_info.get("current_price", 0),
+            detect_sweeps=sweeps,
+            show_unusual=unusual,
+            show_max_pain=max_pain,
+            show_expirations=multi_exp,
+            show_gamma=gamma,
+            show_combos=combos,
+        )
+        response = {
+            "ticker_info": ticker_info,
+            "contracts_matched": len(filtered_data),
+            "results": results,
+        }
+        if contracts and classified is not None:
+            response["contracts"] = classified
+        return response
+
+    def expirations(self, ticker: str) -> Dict[str, Any]:
+        """List available expiration dates for a ticker."""
+        return {"expirations": self.fetcher.get_options_expirations(ticker)}
+
+    def scan(
+        self,
+        tickers: List[str],
+        top: int = 10,
+        min_volume: int = 10,
+        where: Optional[str] = None,
+        demo: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Rank a universe of tickers as the scan command does.
+
+        Args:
+            tickers: Stock symbols to rank
+            top: Tickers to keep per metric
+            min_volume: Minimum volume for filtering
+            where: Filter expression (see filter_expr)
+            demo: Use generated sample data instead of API calls
+
+        Returns:
+            Dictionary with rankings, tickers_processed and skipped tickers
+        """
+        skipped = {}
+
+        def load_chain(symbol: str):
+            if demo:
+                chain, current_price = (
+                    self.fetcher.get_sample_options_data(symbol),
+                    100.0,
+                )
+            else:
+                ticker_info, chain = self.load_chain(symbol)
+                current_price = ticker_info.get("current_price", 0)
+            chain = self.fetcher.filter_options_data(
+                chain, min_volume=min_volume, where=where, spot=current_price
+            )
+            return chain, current_price
+
+        def on_error(symbol: str, error: Exception):
+            skipped[symbol] = str(error)
+
+        ranker = UniverseRanker(top_k=top, analyzer=self.analyzer)
+        rankings = ranker.scan(tickers, load_chain, on_error=on_error)
+        return {
+            "rankings": rankings,
+            "tickers_processed": ranker.tickers_processed,
+            "skipped": skipped,
+        }
+
+    def health(self) -> Dict[str, Any]:
+        """Service status and cache statistics."""
+        return {
+            "service": SERVICE_NAME,
+            "status": "ok",
+            "uptime": time.time() - self.started,
+            "cache_ttl": self.cache_ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "providers": self.fetcher.telemetry.snapshot()["providers"],
+            "memo": self.analyzer.memo.stats(),
+        }
+
+    def handle(self, command: str, params: Dict[str, str]) -> bytes:
+        """
+        Run a command and return its JSON-encoded response.
+
+        Args:
+            command: analyze, expirations, scan or health
+            params: Query parameters as strings
+
+        Returns:
+            UTF-8 JSON response body
+
+        Raises:
+            ServiceError: For unknown commands, bad parameters or failed fetches
+        """
+        if command == "health":
+            return json.dumps(self.health()).encode("utf-8")
+
+        key = (command, tuple(sorted(params.items())))
+        now = time.monotonic()
+        with self._lock:
+            entry = self._responses.get(key)
+            if entry is not None and entry[0] > now:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        body = json.dumps(plain(self._dispatch(command, params))).encode("utf-8")
+        with self._lock:
+            self._responses[key] = (now + self.cache_ttl, body)
+            # Drop expired responses so the cache stays bounded by live keys
+            expired = [
+                k for k, (expires, _) in self._responses.items() if expires <= now
+            ]
+            for k in expired:
+                del self._responses[k]
+        return body
+
+    def _dispatch(self, command: str, params: Dict[str, str]) -> Dict[str, Any]:
+        """Parse parameters and call the command's method."""
+        if command not in ("analyze", "expirations", "scan"):
+            raise ServiceError(404, f"Unknown command: {command}")
+
+        try:
+            if command == "analyze":
+                kwargs = {
+                    "ticker": params["ticker"].upper(),
+                    "expiration": params.get("expiration"),
+                    "min_volume": int(params.get("min_volume", 10)),
+                    "option_type": params.get("option_type"),
+                    "where": params.get("where"),
+                    "sweeps": _flag(params, "sweeps", True),
+                    "unusual": _flag(params, "unusual", True),
+                    "max_pain": _flag(params, "max_pain", True),
+                    "multi_exp": _flag(params, "multi_exp", False),
+                    "gamma": _flag(params, "gamma", False),
+                    "combos": _flag(params, "combos", False),
+                    "contracts": _flag(params, "contracts", False),
+                }
+            elif command == "expirations":
+                kwargs = {"ticker": params["ticker"].upper()}
+            else:
+                kwargs = {
+                    "tickers": [t.upper() for t in params["tickers"].split(",") if t],
+                    "top": int(params.get("top", 10)),
+                    "min_volume": int(params.get("min_volume", 10)),
+                    "where": params.get("where"),
+                    "demo": _flag(params, "demo", False),
+                }
+        except KeyError as e:
+            raise ServiceError(400, f"Missing parameter: {e.args[0]}")
+        except ValueError as e:
+            raise ServiceError(400, f"Bad parameter: {e}")
+
+        try:
+            return getattr(self, command)(**kwargs)
+        except FilterError as e:
+            # Filters naming fields the chain lacks only fail on evaluation
+            raise ServiceError(400, f"Bad parameter: {e}")
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """Maps GET /<command>?<params> onto the server's AnalysisService."""
+
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        params = dict(urllib.parse.parse_qsl(url.query))
+        try:
+            status, body = 200, self.server.service.handle(url.path.strip("/"), params)
+        except ServiceError as e:
+            status, body = e.status, json.dumps({"error": str(e)}).encode("utf-8")
+        except Exception as e:
+            status, body = 500, json.dumps({"error": str(e)}).encode("utf-8")
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def create_server(
+    service: AnalysisService,
+    host: Optional[str] = None,
+    port: Optional[int] = None,
+    verbose: bool = False,
+) -> ThreadingHTTPServer:
+    """
+    Bind an HTTP server for a service; call serve_forever() to run it.
+
+    Args:
+        service: Service that answers requests
+        host: Interface to bind (default Config.SERVER_HOST)
+        port: Port to bind, 0 for any free port (default Config.SERVER_PORT)
+        verbose: Log each request to stderr
+
+    Returns:
+        The bound server
+    """
+    address = (host or Config.SERVER_HOST, Config.SERVER_PORT if port is None else port)
+    server = ThreadingHTTPServer(address, _RequestHandler)
+    server.daemon_threads = True
+    server.service = service
+    server.verbose = verbose
+    return server
@@ -0,0 +1,137 @@
+"""Shared-memory handoff of options chains between processes."""
+
+import pandas as pd
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional
+from .analyzer import OptionsAnalyzer
+from .columnar import decode_frame, encode_frame, write_arrays
+
+
+class SharedChain:
+    """
+    Columnar copy of a chain held in a named shared memory block.
+
+    The creating process owns the block and must unlink it when done; worker
+    processes attach by descriptor and read column buffers in place. Frames
+    returned by ``frame`` view the block, so they must be released before
+    ``close`` is called.
+    """
+
+    def __init__(
+        self,
+        shm: shared_memory.SharedMemory,
+        header: Dict[str, Any],
+        owner: bool,
+    ):
+        self._shm = shm
+        self.header = header
+        self.owner = owner
+
+    @classmethod
+    def create(cls, df: pd.DataFrame) -> "SharedChain":
+        """
+        Copy a chain into a new shared memory block.
+
+        Args:
+            df: Options DataFrame
+
+        Returns:
+            SharedChain owning the new block
+        """
+        header, arrays = encode_frame(df)
+        # Zero-size segments are not allowed
+        shm = shared_memory.SharedMemory(create=True, size=max(header["nbytes"], 1))
+        write_arrays(shm.buf, header, arrays)
+        return cls(shm, header, owner=True)
+
+    @classmethod
+    def attach(cls, descriptor: Dict[str, Any]) -> "SharedChain":
+        """
+        Attach to a block created in another process.
+
+        Args:
+            descriptor: Value of ``descriptor`` from the creating process
+
+        Returns:
+            SharedChain that can read but does not own the block
+        """
+        shm = shared_memory.SharedMemory(name=descriptor["name"])
+        return cls(shm, descriptor["header"], owner=False)
+
+    @property
+    def name(self) -> str:
+        """Name of the shared memory block."""
+        return self._shm.name
+
+    @property
+    def descriptor(self) -> Dict[str, Any]:
+        """Small picklable description used by workers to attach."""
+        return {"name": self._shm.name, "header": self.header}
+
+    def frame(
+        self, columns: Optional[List[str]] = None, as_category: bool = False
+    ) -> pd.DataFrame:
+        """
+        Return the chain as a DataFrame viewing the shared buffers.
+
+        Args:
+            columns: Subset of columns to load, or None for all
+            as_category: Keep string columns as Categoricals over shared codes
+
+        Returns:
+            Read-only DataFrame backed by shared memory
+        """
+        return decode_frame(self._shm.buf, self.header, columns, as_category)
+
+    def close(self):
+        """Detach from the block; frames from ``frame`` must be released first."""
+        self._shm.close()
+
+    def unlink(self):
+        """Destroy the block; only the owning process should call this."""
+        self._shm.unlink()
+
+    def __enter__(self) -> "SharedChain":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        if self.owner:
+            self.unlink()
+
+
+def _detach_result(result: Any) -> Any:
+    """Copy pandas results so nothing returned still views shared memory."""
+    if isinstance(result, (pd.DataFrame, pd.Series)):
+        return result.copy()
+    if isinstance(result, tuple):
+        return tuple(_detach_result(item) for item in result)
+    return result
+
+
+def run_shared(descriptor: Dict[str, Any], method: str, *args, **kwargs) -> Any:
+    """
+    Run an OptionsAnalyzer method on a shared chain.
+
+    Intended as the target of a process pool: only the descriptor and the
+    (small) result cross the process boundary.
+
+    Args:
+        descriptor: SharedChain descriptor
+        method: Name of the OptionsAnalyzer method to call
+        *args: Extra positional arguments for the method
+        **kwargs: Extra keyword arguments for the method
+
+    Returns:
+        The method's result
+    """
+    chain = SharedChain.attach(descriptor)
+    df = None
+    try:
+        df = chain.frame()
+        result = getattr(OptionsAnalyzer(), method)(df, *args, **kwargs)
+        return _detach_result(result)
+    finally:
+        # Drop our views of the block before detaching from it
+        df = result = None
+        chain.close()
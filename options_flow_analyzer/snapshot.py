@@ -0,0 +1,290 @@
+"""Memory-mapped binary snapshots of normalized options chains."""
+
+import json
+import mmap
+import struct
+import time
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Iterator, List, Optional
+from .columnar import ALIGNMENT, column_view, decode_array, encode_frame
+from .occ import encode_occ, normalize_occ
+from .trades import TRADE_KEY_COLUMNS
+
+SNAPSHOT_MAGIC = b"OFASNAP1"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_SUFFIX = ".ofs"
+
+# Magic followed by the header length
+_PREAMBLE = struct.Struct("<8sQ")
+
+# Provider columns that already identify a contract
+_CONTRACT_SYMBOL_COLUMNS = ["contractSymbol", "ticker"]
+
+
+def contract_keys(df: pd.DataFrame, ticker: Optional[str] = None) -> pd.Series:
+    """
+    Return a string key identifying each contract in a chain.
+
+    The key is the canonical (unprefixed, unpadded) OCC symbol, so chains
+    from different providers share keys: the provider's contract symbol is
+    normalized when present, otherwise the symbol is built from the ticker,
+    expiration, option type and strike. Chains that can't be expressed as
+    OCC symbols fall back to the raw provider symbol or to joining the
+    expiration, option type and strike.
+    """
+    for column in _CONTRACT_SYMBOL_COLUMNS:
+        if column in df.columns:
+            symbols = df[column].astype(str)
+            try:
+                return pd.Series(normalize_occ(symbols.to_numpy()), index=df.index)
+            except ValueError:
+                return symbols
+
+    expiration, strike, option_type = (df[column] for column in TRADE_KEY_COLUMNS)
+    if ticker:
+        try:
+            return pd.Series(
+                encode_occ(ticker, expiration, option_type, strike), index=df.index
+            )
+        except ValueError:
+            pass
+    return (
+        expiration.astype(str)
+        + ":"
+        + option_type.astype(str).str[0].str.upper()
+        + ":"
+        + strike.map("{:g}".format)
+    )
+
+
+def write_snapshot(
+    df: pd.DataFrame,
+    path: str,
+    spot: float,
+    ticker: Optional[str] = None,
+    metadata: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Write a normalized chain to a snapshot file.
+
+    Layout: an 8-byte magic and header length, a JSON header with the schema,
+    spot price and column offsets, then each column array aligned to 64 bytes,
+    then the dictionaries of string columns as fixed-width byte arrays. String
+    columns are dictionary-encoded; a ``contract`` key column is added when the
+    chain has none.
+
+    Args:
+        df: Options DataFrame
+        path: Destination file
+        spot: Underlying price when the chain was captured
+        ticker: Underlying symbol
+        metadata: Extra JSON-serializable values stored in the header
+
+    Returns:
+        The header written to the file
+    """
+    if "contract" not in df.columns and not df.empty:
+        df = df.assign(contract=contract_keys(df, ticker))
+
+    header, arrays = encode_frame(df)
+
+    # Dictionaries live in the data region so opening only parses the schema
+    for spec in header["columns"]:
+        if spec["kind"] != "dictionary":
+            continue
+        values = [str(value).encode("utf-8") for value in spec.pop("categories")]
+        dictionary = np.array(values, dtype=bytes) if values else np.zeros(0, "S1")
+        spec["dictionary"] = {
+            "dtype": dictionary.dtype.str,
+            "offset": header["nbytes"],
+            "count": len(dictionary),
+        }
+        arrays.append(dictionary)
+        header["nbytes"] += dictionary.nbytes
+        header["nbytes"] += -header["nbytes"] % ALIGNMENT
+
+    header.update(
+        {
+            "version": SNAPSHOT_VERSION,
+            "ticker": ticker,
+            "spot": float(spot),
+            "created": time.time(),
+            "metadata": metadata or {},
+        }
+    )
+
+    header_bytes = json.dumps(header, default=str).encode("utf-8")
+    data_start = _PREAMBLE.size + len(header_bytes)
+    data_start += -data_start % ALIGNMENT
+
+    with open(path, "wb") as fh:
+        fh.write(_PREAMBLE.pack(SNAPSHOT_MAGIC, len(header_bytes)))
+        fh.write(header_bytes)
+        offsets = [spec["offset"] for spec in header["columns"]]
+        offsets += [
+            spec["dictionary"]["offset"]
+            for spec in header["columns"]
+            if "dictionary" in spec
+        ]
+        for offset, array in zip(offsets, arrays):
+            fh.write(b"\0" * (data_start + offset - fh.tell()))
+            fh.write(memoryview(array).cast("B"))
+        fh.write(b"\0" * (data_start + header["nbytes"] - fh.tell()))
+
+    return header
+
+
+class Snapshot:
+    """
+    Read-only view of a snapshot file through a memory map.
+
+    Opening reads only the header; column pages are loaded by the OS as they
+    are touched. Arrays and frames handed out view the map directly and keep
+    it alive for as long as they are referenced.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as fh:
+            self._map = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            magic, header_length = _PREAMBLE.unpack_from(self._map, 0)
+            if magic != SNAPSHOT_MAGIC:
+                raise ValueError("bad magic")
+            header_end = _PREAMBLE.size + header_length
+            self.header = json.loads(bytes(self._map[_PREAMBLE.size : header_end]))
+        except (struct.error, ValueError):
+            # Too short, foreign or truncated files
+            self._map.close()
+            raise ValueError(f"{path} is not an options flow snapshot")
+        data_start = header_end + (-header_end % ALIGNMENT)
+        self._data = memoryview(self._map)[data_start:]
+        self._specs = {spec["name"]: spec for spec in self.header["columns"]}
+
+    @classmethod
+    def open(cls, path: str) -> "Snapshot":
+        """Open a snapshot file."""
+        return cls(path)
+
+    @property
+    def rows(self) -> int:
+        """Number of contracts in the snapshot."""
+        return self.header["rows"]
+
+    @property
+    def spot(self) -> float:
+        """Underlying price when the snapshot was written."""
+        return self.header["spot"]
+
+    @property
+    def ticker(self) -> Optional[str]:
+        """Underlying symbol, if recorded."""
+        return self.header.get("ticker")
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """Extra values stored by the writer."""
+        return self.header.get("metadata", {})
+
+    @property
+    def columns(self) -> List[str]:
+        """Column names in storage order."""
+        return list(self._specs)
+
+    def ticker_info(self) -> Dict[str, Any]:
+        """Ticker information in the shape returned by OptionsDataFetcher."""
+        info = dict(self.metadata.get("ticker_info") or {})
+        symbol = self.ticker or info.get("symbol", "")
+        info.setdefault("symbol", symbol)
+        info.setdefault("company_name", symbol)
+        info.setdefault("market_cap", 0)
+        info.setdefault("volume", 0)
+        info["current_price"] = self.spot
+        return info
+
+    def _spec(self, name: str) -> Dict[str, Any]:
+        """Column spec, loading a string column's dictionary on first use."""
+        spec = self._specs[name]
+        if spec["kind"] == "dictionary" and "categories" not in spec:
+            dictionary = spec["dictionary"]
+            values = np.frombuffer(
+                self._data,
+                dtype=np.dtype(dictionary["dtype"]),
+                count=dictionary["count"],
+                offset=dictionary["offset"],
+            )
+            spec["categories"] = np.char.decode(values, "utf-8").astype(object)
+        return spec
+
+    def codes(self, name: str) -> np.ndarray:
+        """Raw stored array for a column (dictionary codes for string columns)."""
+        return column_view(self._data, self._specs[name], self.rows)
+
+    def column(self, name: str, as_category: bool = False) -> Any:
+        """Decode one column; numeric columns are views of the map."""
+        return decode_array(self.codes(name), self._spec(name), as_category)
+
+    def frame(
+        self, columns: Optional[List[str]] = None, as_category: bool = False
+    ) -> pd.DataFrame:
+        """
+        Return the snapshot as a DataFrame.
+
+        Args:
+            columns: Subset of columns to load, or None for all
+            as_category: Keep string columns as Categoricals over stored codes
+
+        Returns:
+            Read-only DataFrame whose numeric columns view the map
+        """
+        names = self.columns if columns is None else columns
+        data = {
+            name: self.column(name, as_category)
+            for name in names
+            if name in self._specs
+        }
+        # copy=False keeps one block per column instead of consolidating (copying)
+        return pd.DataFrame(data, index=pd.RangeIndex(self.rows), copy=False)
+
+    def iter_chunks(
+        self, chunk_size: int = 1_000_000, columns: Optional[List[str]] = None
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Yield row slices of the snapshot without reading it all.
+
+        Args:
+            chunk_size: Maximum rows per chunk
+            columns: Subset of columns to load, or None for all
+
+        Yields:
+            DataFrames of at most chunk_size rows
+        """
+        names = self.columns if columns is None else columns
+        specs = [self._spec(name) for name in names if name in self._specs]
+        views = [column_view(self._data, spec, self.rows) for spec in specs]
+
+        for start in range(0, self.rows, chunk_size):
+            stop = min(start + chunk_size, self.rows)
+            # Only this slice of each string column is expanded
+            data = {
+                spec["name"]: decode_array(view[start:stop], spec)
+                for spec, view in zip(specs, views)
+            }
+            yield pd.DataFrame(data, index=pd.RangeIndex(start, stop), copy=False)
+
+    def close(self):
+        """Release the map, unless arrays handed out still reference it."""
+        try:
+            self._data.release()
+            self._map.close()
+        except BufferError:
+            # Outstanding views keep the map open until they are collected
+            pass
+
+    def __enter__(self) -> "Snapshot":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,254 @@
+"""Per-provider call accounting for the data fetcher."""
+
+import bisect
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Sequence
+
+# Upper bounds (seconds) of the request latency histogram buckets
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class LatencyHistogram:
+    """Request latencies counted into fixed buckets."""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        # One extra slot for latencies above the last bound
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds: float):
+        """Add one latency."""
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a latency quantile as the upper bound of its bucket.
+
+        Returns:
+            Seconds, infinity for the overflow bucket, or None when empty
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def to_dict(self) -> Dict[str, Any]:
+        def bound(q):
+            # JSON has no infinity; an overflowing quantile is reported as None
+            value = self.quantile(q)
+            return None if value == float("inf") else value
+
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "buckets": {
+                **{str(b): c for b, c in zip(self.buckets, self.counts)},
+                "+Inf": self.counts[-1],
+            },
+            "p50": bound(0.5),
+            "p95": bound(0.95),
+        }
+
+
+class ProviderStats:
+    """Counters for one data provider."""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.bytes = 0
+        self.status_codes: Dict[str, int] = {}
+        self.retries = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.throttle_seconds = 0.0
+        self.latency = LatencyHistogram()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "bytes": self.bytes,
+            "status_codes": dict(self.status_codes),
+            "retries": self.retries,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "throttle_seconds": self.throttle_seconds,
+            "latency": self.latency.to_dict(),
+        }
+
+
+class FetcherTelemetry:
+    """
+    Thread-safe provider counters shared by data fetchers.
+
+    Every HTTP request, retry, cache lookup and rate-limit wait is recorded
+    under its provider ("polygon", "yfinance"), so a run's API usage can be
+    compared with a plan's limits.
+    """
+
+    def __init__(self):
+        self.providers: Dict[str, ProviderStats] = {}
+        self.started = time.time()
+        self._lock = threading.Lock()
+
+    def _provider(self, provider: str) -> ProviderStats:
+        stats = self.providers.get(provider)
+        if stats is None:
+            stats = self.providers[provider] = ProviderStats()
+        return stats
+
+    def record_request(
+        self,
+        provider: str,
+        seconds: float,
+        status: Optional[int] = None,
+        nbytes: int = 0,
+        error: bool = False,
+    ):
+        """
+        Record one completed (or failed) request.
+
+        Args:
+            provider: Provider name
+            seconds: Request latency
+            status: HTTP status code, if the provider returned one
+            nbytes: Response body size
+            error: True when the request raised or returned an error status
+        """
+        with self._lock:
+            stats = self._provider(provider)
+            stats.requests += 1
+            stats.bytes += nbytes
+            stats.latency.observe(seconds)
+            if status is not None:
+                key = str(status)
+                stats.status_codes[key] = stats.status_codes.get(key, 0) + 1
+            if error or (status is not None and status >= 400):
+                stats.errors += 1
+
+    def record_retry(self, provider: str):
+        """Record a request that is about to be retried."""
+        with self._lock:
+            self._provider(provider).retries += 1
+
+    def record_cache(self, provider: str, hit: bool):
+        """Record a cache lookup for a provider response."""
+        with self._lock:
+            stats = self._provider(provider)
+            if hit:
+                stats.cache_hits += 1
+            else:
+                stats.cache_misses += 1
+
+    def record_throttle(self, provider: str, seconds: float):
+        """Record time spent waiting on a provider's rate limit."""
+        with self._lock:
+            self._provider(provider).throttle_seconds += seconds
+
+    @contextmanager
+    def track(self, provider: str):
+        """
+        Record the enclosed provider call as one request.
+
+        For library calls (yfinance) that hide status codes and sizes; a call
+        that raises is counted as an error.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.record_request(provider, time.perf_counter() - start, error=True)
+            raise
+        self.record_request(provider, time.perf_counter() - start)
+
+    def throttle(self, provider: str, seconds: float):
+        """Sleep for a provider's rate limit and record the wait."""
+        time.sleep(seconds)
+        self.record_throttle(provider, seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """All counters as a JSON-serializable dictionary."""
+        with self._lock:
+            return {
+                "uptime_seconds": time.time() - self.started,
+                "providers": {
+                    name: stats.to_dict() for name, stats in self.providers.items()
+                },
+            }
+
+    def format_text(self) -> str:
+        """Counters in the Prometheus text exposition format."""
+        lines: List[str] = []
+
+        def metric(name: str, kind: str, help_text: str):
+            lines.append(f"# HELP options_flow_{name} {help_text}")
+            lines.append(f"# TYPE options_flow_{name} {kind}")
+
+        snapshot = self.snapshot()["providers"]
+        counters = [
+            ("requests", "requests_total", "Provider requests made"),
+            ("errors", "errors_total", "Provider requests that failed"),
+            ("bytes", "response_bytes_total", "Response bytes received"),
+            ("retries", "retries_total", "Requests retried"),
+            ("cache_hits", "cache_hits_total", "Responses served from cache"),
+            ("cache_misses", "cache_misses_total", "Cache lookups that fetched"),
+            ("throttle_seconds", "throttle_seconds_total", "Seconds spent throttled"),
+        ]
+        for key, name, help_text in counters:
+            metric(name, "counter", help_text)
+            for provider, stats in snapshot.items():
+                lines.append(
+                    f'options_flow_{name}{{provider="{provider}"}} {stats[key]}'
+                )
+
+        metric("responses_total", "counter", "Responses by HTTP status code")
+        for provider, stats in snapshot.items():
+            for status, count in sorted(stats["status_codes"].items()):
+                lines.append(
+                    f'options_flow_responses_total{{provider="{provider}",'
+                    f'code="{status}"}} {count}'
+                )
+
+        metric("request_seconds", "histogram", "Provider request latency")
+        for provider, stats in snapshot.items():
+            latency = stats["latency"]
+            cumulative = 0
+            for bound, count in latency["buckets"].items():
+                cumulative += count
+                lines.append(
+                    f'options_flow_request_seconds_bucket{{provider="{provider}",'
+                    f'le="{bound}"}} {cumulative}'
+                )
+            label = f'{{provider="{provider}"}}'
+            lines.append(f"options_flow_request_seconds_sum{label} {latency['sum']}")
+            lines.append(
+                f"options_flow_request_seconds_count{label} {latency['count']}"
+            )
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str):
+        """Write the counters as JSON (``.json`` paths) or Prometheus text."""
+        if path.endswith(".json"):
+            text = json.dumps(self.snapshot(), indent=2)
+        else:
+            text = self.format_text()
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write(text)
+
+
+# Shared by every fetcher that is not given its own, so one process reports
+# all of its provider traffic together
+TELEMETRY = FetcherTelemetry()
@@ -0,0 +1,348 @@
+"""Trade-level analysis of individual option prints."""
+
+import numpy as np
+import pandas as pd
+from typing import List, Optional
+from .occ import occ_frame
+from .oi_change import UNDERLYING_COLUMNS
+
+# Columns that identify a single option contract in both chains and trade prints
+TRADE_KEY_COLUMNS = ["expiration", "strike", "option_type"]
+
+# Columns holding OCC contract symbols in prints that lack the key columns
+SYMBOL_COLUMNS = ["symbol", "contractSymbol", "ticker"]
+
+
+class TradeAnalyzer:
+    """Analyzes option trade prints (time and sales) rather than chain snapshots."""
+
+    def __init__(self, key_columns: Optional[List[str]] = None):
+        self.key_columns = list(key_columns or TRADE_KEY_COLUMNS)
+
+    def read_prints(self, path: str) -> pd.DataFrame:
+        """
+        Load trade prints or NBBO quotes from a CSV or Parquet file.
+
+        Files identifying contracts by OCC symbol (a symbol, contractSymbol or
+        ticker column) instead of the key columns get the key columns, and the
+        underlying when no underlying column is present, parsed from the
+        symbols.
+
+        Args:
+            path: Path to a .csv or .parquet file
+
+        Returns:
+            DataFrame with one row per print or quote update
+        """
+        if str(path).endswith(".parquet"):
+            prints = pd.read_parquet(path)
+        else:
+            prints = pd.read_csv(path)
+
+        missing = [column for column in TRADE_KEY_COLUMNS if column not in prints]
+        symbols = [column for column in SYMBOL_COLUMNS if column in prints]
+        if missing and symbols:
+            if not any(column in prints for column in UNDERLYING_COLUMNS):
+                missing.append("underlying")
+            fields = occ_frame(prints[symbols[0]].astype(str).to_numpy(), prints.index)
+            prints = prints.assign(**{column: fields[column] for column in missing})
+        return prints
+
+    def _timestamps_ns(self, trades: pd.DataFrame) -> np.ndarray:
+        """Return trade timestamps as int64 nanoseconds."""
+        timestamps = trades["timestamp"]
+        if pd.api.types.is_datetime64_any_dtype(timestamps):
+            if getattr(timestamps.dt, "tz", None) is not None:
+                timestamps = timestamps.dt.tz_convert("UTC").dt.tz_localize(None)
+            return timestamps.to_numpy(dtype="datetime64[ns]").view(np.int64)
+        # Numeric timestamps are taken as SIP nanoseconds since the epoch
+        return timestamps.to_numpy(dtype=np.int64)
+
+    def aggressor_side(self, trades: pd.DataFrame) -> np.ndarray:
+        """
+        Classify each print as lifting the offer (+1), hitting the bid (-1) or neither (0).
+
+        Args:
+            trades: Trade prints with price, bid and ask columns
+
+        Returns:
+            Array of int8 side flags aligned with the rows of trades
+        """
+        price = trades["price"].to_numpy(dtype=float)
+        bid = trades["bid"].to_numpy(dtype=float)
+        ask = trades["ask"].to_numpy(dtype=float)
+
+        side = np.zeros(len(trades), dtype=np.int8)
+        with np.errstate(invalid="ignore"):
+            valid_quote = (ask > 0) & (bid >= 0) & (ask >= bid)
+            side[valid_quote & (price >= ask)] = 1
+            side[valid_quote & (price <= bid)] = -1
+        return side
+
+    def attach_quotes(self, trades: pd.DataFrame, quotes: pd.DataFrame) -> pd.DataFrame:
+        """
+        Join each print to the prevailing NBBO for its contract.
+
+        Uses an as-of merge on timestamp grouped by contract, so every print
+        picks up the most recent quote at or before its own timestamp.
+
+        Args:
+            trades: Trade prints with the key columns and timestamp
+            quotes: NBBO updates with the key columns, timestamp, bid and ask
+
+        Returns:
+            Trades (in their original order) with bid and ask columns
+        """
+        trades = trades.drop(columns=["bid", "ask"], errors="ignore")
+        if trades.empty:
+            return trades.assign(bid=np.nan, ask=np.nan)
+
+        # Encode contracts as one integer key shared by both sides of the join
+        keys = pd.concat(
+            [trades[self.key_columns], quotes[self.key_columns]], ignore_index=True
+        )
+        contract = keys.groupby(self.key_columns, sort=False).ngroup().to_numpy()
+
+        left = pd.DataFrame(
+            {"_ts": self._timestamps_ns(trades), "_contract": contract[: len(trades)]}
+        )
+        right = pd.DataFrame(
+            {
+                "_ts": self._timestamps_ns(quotes),
+                "_contract": contract[len(trades) :],
+                "bid": quotes["bid"].to_numpy(dtype=float),
+                "ask": quotes["ask"].to_numpy(dtype=float),
+            }
+        )
+
+        order = np.argsort(left["_ts"].to_numpy(), kind="stable")
+        merged = pd.merge_asof(
+            left.iloc[order],
+            right.sort_values("_ts", kind="stable"),
+            on="_ts",
+            by="_contract",
+        )
+
+        # Restore the caller's row order
+        inverse = np.empty_like(order)
+        inverse[order] = np.arange(len(order))
+        result = trades.copy()
+        result["bid"] = merged["bid"].to_numpy()[inverse]
+        result["ask"] = merged["ask"].to_numpy()[inverse]
+        return result
+
+    def classify_trade_side(self, trades: pd.DataFrame) -> np.ndarray:
+        """
+        Classify each print as buyer-initiated (+1), seller-initiated (-1) or unknown (0).
+
+        The quote rule compares the print to the NBBO midpoint. Prints at the
+        midpoint, or without a usable quote, fall back to the tick rule: an
+        uptick from the previous different price on the same contract is a buy
+        and a downtick is a sell.
+
+        Args:
+            trades: Trade prints with the key columns, timestamp, price, bid and ask
+
+        Returns:
+            Array of int8 side flags aligned with the rows of trades
+        """
+        n = len(trades)
+        if n == 0:
+            return np.zeros(0, dtype=np.int8)
+
+        price = trades["price"].to_numpy(dtype=float)
+        bid = trades["bid"].to_numpy(dtype=float)
+        ask = trades["ask"].to_numpy(dtype=float)
+
+        # Quote rule
+        quote_side = np.zeros(n, dtype=np.int8)
+        with np.errstate(invalid="ignore"):
+            valid_quote = (ask > 0) & (bid >= 0) & (ask >= bid)
+            mid = (bid + ask) / 2
+            quote_side[valid_quote & (price > mid)] = 1
+            quote_side[valid_quote & (price < mid)] = -1
+
+        # Tick rule over each contract's prints in time order
+        contract = trades.groupby(self.key_columns, sort=False).ngroup().to_numpy()
+        order = np.lexsort((self._timestamps_ns(trades), contract))
+        sorted_price = price[order]
+        sorted_contract = contract[order]
+
+        tick = np.zeros(n, dtype=np.int8)
+        tick[1:] = np.sign(np.diff(sorted_price))
+        boundary = np.ones(n, dtype=bool)
+        boundary[1:] = sorted_contract[1:] != sorted_contract[:-1]
+        tick[boundary] = 0
+
+        # Zero ticks inherit the last non-zero tick, without crossing contracts
+        last = np.where((tick != 0) | boundary, np.arange(n), 0)
+        tick = tick[np.maximum.accumulate(last)]
+
+        tick_side = np.empty(n, dtype=np.int8)
+        tick_side[order] = tick
+
+        return np.where(quote_side != 0, quote_side, tick_side).astype(np.int8)
+
+    def side_flow_by_contract(self, trades: pd.DataFrame) -> pd.DataFrame:
+        """
+        Aggregate buyer- and seller-initiated volume and premium per contract.
+
+        Args:
+            trades: Trade prints with the key columns, timestamp, price, size,
+                bid and ask
+
+        Returns:
+            DataFrame keyed by contract with buy/sell volume and premium
+        """
+        columns = ["buy_volume", "sell_volume", "buy_premium", "sell_premium"]
+        if trades.empty:
+            return pd.DataFrame(columns=self.key_columns + columns)
+
+        side = self.classify_trade_side(trades)
+        size = trades["size"].to_numpy(dtype=np.int64)
+        premium = trades["price"].to_numpy(dtype=float) * size * 100
+
+        flows = trades[self.key_columns].copy()
+        flows["buy_volume"] = np.where(side > 0, size, 0)
+        flows["sell_volume"] = np.where(side < 0, size, 0)
+        flows["buy_premium"] = np.where(side > 0, premium, 0.0)
+        flows["sell_premium"] = np.where(side < 0, premium, 0.0)
+
+        return flows.groupby(self.key_columns, sort=False)[columns].sum().reset_index()
+
+    def detect_sweeps(
+        self,
+        trades: pd.DataFrame,
+        window_ms: float = 50.0,
+        min_exchanges: int = 2,
+        min_size: int = 0,
+    ) -> pd.DataFrame:
+        """
+        Detect sweeps by clustering aggressive prints across exchanges in time.
+
+        A sweep is a run of prints on the same contract and side, each at or
+        through the offer (buys) or bid (sells), where consecutive prints are no
+        more than ``window_ms`` apart and the run touches several exchanges.
+        Prints are sorted once by (contract, side, timestamp) and clusters are
+        cut with a single sweep-line pass over the sorted arrays, so the cost is
+        dominated by the sort rather than by pairwise comparisons.
+
+        Args:
+            trades: Trade prints with the key columns plus timestamp, exchange,
+                price, size, bid and ask
+            window_ms: Maximum gap in milliseconds between consecutive prints
+            min_exchanges: Minimum number of distinct exchanges in a sweep
+            min_size: Minimum total contracts in a sweep
+
+        Returns:
+            DataFrame with one row per detected sweep
+        """
+        columns = self.key_columns + [
+            "side",
+            "start",
+            "end",
+            "prints",
+            "exchanges",
+            "size",
+            "premium",
+        ]
+        if trades.empty:
+            return pd.DataFrame(columns=columns)
+
+        side = self.aggressor_side(trades)
+        aggressive = np.flatnonzero(side != 0)
+        if len(aggressive) == 0:
+            return pd.DataFrame(columns=columns)
+
+        prints = trades.iloc[aggressive]
+        side = side[aggressive]
+        contract = prints.groupby(self.key_columns, sort=False).ngroup().to_numpy()
+        timestamp = self._timestamps_ns(prints)
+        # Missing and blank venues get code -1 and count as no exchange (the
+        # trailing True keeps -1 codes, which index it, at -1)
+        exchange, venues = pd.factorize(prints["exchange"])
+        blank = np.array([str(venue).strip() == "" for venue in venues] + [True])
+        exchange = np.where(blank[exchange], -1, exchange)
+        size = prints["size"].to_numpy(dtype=np.int64)
+        price = prints["price"].to_numpy(dtype=float)
+
+        # Sort once: contract, then side, then time
+        order = np.lexsort((timestamp, side, contract))
+        contract = contract[order]
+        side = side[order]
+        timestamp = timestamp[order]
+        exchange = exchange[order]
+        size = size[order]
+        price = price[order]
+
+        # Sweep line: a new cluster starts whenever the contract or side changes
+        # or the gap to the previous print exceeds the window
+        window_ns = int(window_ms * 1_000_000)
+        new_cluster = np.ones(len(order), dtype=bool)
+        new_cluster[1:] = (
+            (contract[1:] != contract[:-1])
+            | (side[1:] != side[:-1])
+            | (np.diff(timestamp) > window_ns)
+        )
+        starts = np.flatnonzero(new_cluster)
+        cluster = np.cumsum(new_cluster) - 1
+
+        # Per-cluster aggregates over contiguous runs
+        ends = np.append(starts[1:], len(order)) - 1
+        cluster_prints = np.diff(np.append(starts, len(order)))
+        cluster_size = np.add.reduceat(size, starts)
+        cluster_premium = np.add.reduceat(price * size * 100, starts)
+
+        # Distinct known exchanges per cluster
+        known = exchange >= 0
+        exchange_count = int(exchange.max()) + 1 if known.any() else 1
+        pairs = np.unique(
+            cluster[known].astype(np.int64) * exchange_count + exchange[known]
+        )
+        cluster_exchanges = np.bincount(pairs // exchange_count, minlength=len(starts))
+
+        is_sweep = (
+            (cluster_prints >= 2)
+            & (cluster_exchanges >= min_exchanges)
+            & (cluster_size >= min_size)
+        )
+        sweep_starts = starts[is_sweep]
+
+        first_rows = order[sweep_starts]
+        sweeps = prints.iloc[first_rows][self.key_columns].reset_index(drop=True)
+        sweeps["side"] = np.where(side[sweep_starts] > 0, "buy", "sell")
+        sweeps["start"] = timestamp[sweep_starts]
+        sweeps["end"] = timestamp[ends[is_sweep]]
+        sweeps["prints"] = cluster_prints[is_sweep]
+        sweeps["exchanges"] = cluster_exchanges[is_sweep]
+        sweeps["size"] = cluster_size[is_sweep]
+        sweeps["premium"] = cluster_premium[is_sweep]
+
+        return sweeps.sort_values("premium", ascending=False).reset_index(drop=True)
+
+    def summarize_sweeps_by_contract(self, sweeps: pd.DataFrame) -> pd.DataFrame:
+        """
+        Aggregate detected sweeps to one row per contract.
+
+        Args:
+            sweeps: Output of detect_sweeps
+
+        Returns:
+            DataFrame keyed by contract with swept size, premium and exchange reach
+        """
+        if sweeps.empty:
+            return pd.DataFrame(
+                columns=self.key_columns
+                + ["sweep_count", "swept_size", "swept_premium", "max_exchanges"]
+            )
+
+        return (
+            sweeps.groupby(self.key_columns, sort=False)
+            .agg(
+                sweep_count=("size", "count"),
+                swept_size=("size", "sum"),
+                swept_premium=("premium", "sum"),
+                max_exchanges=("exchanges", "max"),
+            )
+            .reset_index()
+        )
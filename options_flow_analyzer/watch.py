@@ -0,0 +1,297 @@
+"""Asyncio scheduler that polls a watchlist within a provider rate budget."""
+
+import asyncio
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, TextIO, Tuple
+import pandas as pd
+from .alerts import AlertEngine
+from .analyzer import OptionsAnalyzer
+from .export import plain
+from .rollup import FlowRollup
+
+# Interval multipliers applied after each poll
+HOT_SPEEDUP = 0.5
+QUIET_SLOWDOWN = 1.5
+
+
+class RateBudget:
+    """
+    Token bucket shared by every ticker in a watch.
+
+    Tokens refill at ``calls_per_minute / 60`` per second up to ``burst``;
+    a poll waits until the tokens for its provider calls are available.
+    """
+
+    def __init__(self, calls_per_minute: float, burst: Optional[float] = None):
+        """
+        Args:
+            calls_per_minute: Sustained provider calls allowed per minute
+            burst: Largest number of calls that may be made back to back
+                (default: one call, i.e. evenly paced)
+        """
+        self.rate = calls_per_minute / 60.0
+        self.capacity = burst if burst is not None else 1.0
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def wait_time(self, cost: float) -> float:
+        """Seconds until ``cost`` tokens are available."""
+        self._refill()
+        # A poll costing more than the burst may overdraw a full bucket
+        needed = min(cost, self.capacity) - self.tokens
+        return max(0.0, needed / self.rate) if self.rate > 0 else 0.0
+
+    async def acquire(self, cost: float = 1.0):
+        """Wait for and take ``cost`` tokens."""
+        delay = self.wait_time(cost)
+        while delay > 0:
+            await asyncio.sleep(delay)
+            delay = self.wait_time(cost)
+        self.tokens -= cost
+
+
+class TickerState:
+    """Polling state of one watched ticker."""
+
+    def __init__(self, ticker: str, interval: float):
+        self.ticker = ticker
+        self.interval = interval
+        self.next_due = 0.0
+        self.polls = 0
+        self.in_flight = False
+        self.last_flow: Optional[float] = None
+        self.activity = 0.0
+
+
+class JsonLinesSink:
+    """Writes each watch result as one JSON line."""
+
+    def __init__(self, stream: Optional[TextIO] = None, path: Optional[str] = None):
+        """
+        Args:
+            stream: Stream to write to (default stdout)
+            path: File to append to instead of a stream
+        """
+        self._file = open(path, "a", encoding="utf-8") if path else None
+        self.stream = self._file or stream or sys.stdout
+
+    def __call__(self, result: Dict[str, Any]):
+        self.stream.write(json.dumps(plain(result)) + "\n")
+        self.stream.flush()
+
+    def close(self):
+        if self._file:
+            self._file.close()
+
+
+class WatchScheduler:
+    """
+    Polls a watchlist with per-ticker adaptive cadence.
+
+    Each ticker has its own interval. After a poll the interval shrinks when
+    the ticker's dollar flow moved by at least ``hot_threshold`` since the
+    previous poll, and grows when it did not, within
+    [min_interval, max_interval]. Polls draw from one shared RateBudget and
+    are granted earliest-deadline-first, so when the budget is tight every
+    ticker's polls stretch out evenly instead of some tickers starving.
+    Fetching and analysis run in a thread pool; results go to the sink as
+    soon as each poll finishes.
+    """
+
+    def __init__(
+        self,
+        tickers: Iterable[str],
+        load_chain: Callable[[str], Tuple[pd.DataFrame, float]],
+        sink: Callable[[Dict[str, Any]], None],
+        interval: float = 60.0,
+        min_interval: float = 10.0,
+        max_interval: float = 600.0,
+        calls_per_minute: float = 5.0,
+        calls_per_poll: float = 1.0,
+        burst: Optional[float] = None,
+        hot_threshold: float = 0.05,
+        max_concurrency: int = 4,
+        analyzer: Optional[OptionsAnalyzer] = None,
+        rollup: Optional[FlowRollup] = None,
+        alerts: Optional[AlertEngine] = None,
+    ):
+        """
+        Args:
+            tickers: Stock symbols to watch
+            load_chain: Callable returning (filtered chain, current_price);
+                called from worker threads
+            sink: Callable receiving each poll's result dictionary
+            interval: Starting seconds between polls of a ticker
+            min_interval: Shortest interval for hot tickers
+            max_interval: Longest interval for quiet tickers
+            calls_per_minute: Provider calls allowed per minute across tickers
+            calls_per_poll: Provider calls one poll makes
+            burst: Provider calls allowed back to back (see RateBudget)
+            hot_threshold: Relative change in dollar flow that marks a
+                ticker as hot
+            max_concurrency: Polls allowed to run at once
+            analyzer: Analyzer used for every poll
+            rollup: Roll-up updated with each poll's flow; results of tickers
+                in its taxonomy carry the flow of the groups above them
+            alerts: Alert rules evaluated over each polled chain; results
+                carry the alerts that fired
+        """
+        self.states = {
+            ticker: TickerState(ticker, interval) for ticker in dict.fromkeys(tickers)
+        }
+        self.load_chain = load_chain
+        self.sink = sink
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.calls_per_poll = calls_per_poll
+        self.budget = RateBudget(calls_per_minute, burst)
+        self.hot_threshold = hot_threshold
+        self.max_concurrency = max_concurrency
+        self.analyzer = analyzer or OptionsAnalyzer()
+        self.rollup = rollup
+        self.alerts = alerts
+        self.polls = 0
+
+    def next_interval(self, state: TickerState, flow: Optional[float]) -> float:
+        """
+        Update a ticker's activity from its latest dollar flow and return its
+        next interval.
+        """
+        if flow is None:
+            # Failed polls back off like quiet tickers
+            state.activity = 0.0
+            factor = QUIET_SLOWDOWN
+        elif state.last_flow is None:
+            state.activity = 0.0
+            factor = 1.0
+        else:
+            state.activity = abs(flow - state.last_flow) / max(state.last_flow, 1.0)
+            factor = (
+                HOT_SPEEDUP if state.activity >= self.hot_threshold else QUIET_SLOWDOWN
+            )
+
+        if flow is not None:
+            state.last_flow = flow
+        return min(self.max_interval, max(self.min_interval, state.interval * factor))
+
+    def analyze(self, ticker: str) -> Dict[str, Any]:
+        """Fetch and analyze one ticker (runs in a worker thread)."""
+        chain, current_price = self.load_chain(ticker)
+        results, _ = self.analyzer.analyze_chain(
+            chain, current_price, show_expirations=False
+        )
+        result = {
+            "current_price": current_price,
+            "flow_summary": results["flow_summary"],
+            "max_pain_strike": results["max_pain_strike"],
+            "unusual_activity": results["unusual_activity"].head(5),
+        }
+        if self.alerts is not None:
+            # Rules on trade_type need the sweep-classified chain
+            if self.alerts.fields & {"trade_type", "sweep_confidence"}:
+                chain = self.analyzer.detect_sweeps(chain)
+            result["alerts"] = self.alerts.evaluate(chain, ticker, current_price)
+        return result
+
+    async def _poll(self, state: TickerState, executor: ThreadPoolExecutor):
+        loop = asyncio.get_running_loop()
+        result: Dict[str, Any] = {"ticker": state.ticker}
+        flow = None
+        try:
+            result.update(
+                await loop.run_in_executor(executor, self.analyze, state.ticker)
+            )
+            summary = result["flow_summary"]
+            if summary:
+                flow = summary["total_call_flow"] + summary["total_put_flow"]
+            # Updated on the event loop, so polls never race on the totals
+            if self.rollup is not None and state.ticker in self.rollup:
+                self.rollup.update(state.ticker, summary)
+                result["rollup"] = self.rollup.path_frame(state.ticker)
+        except Exception as e:
+            result["error"] = str(e)
+
+        state.interval = self.next_interval(state, flow)
+        state.polls += 1
+        state.next_due = loop.time() + state.interval
+        state.in_flight = False
+        self.polls += 1
+
+        result.update(
+            {
+                "time": datetime.now().isoformat(timespec="seconds"),
+                "poll": state.polls,
+                "activity": state.activity,
+                "next_interval": state.interval,
+            }
+        )
+        try:
+            self.sink(result)
+        except Exception as e:
+            print(f"Watch sink failed for {state.ticker}: {e}", file=sys.stderr)
+
+    async def run(
+        self, max_polls: Optional[int] = None, duration: Optional[float] = None
+    ):
+        """
+        Poll until stopped, ``max_polls`` polls complete or ``duration`` passes.
+
+        Args:
+            max_polls: Total polls across all tickers before stopping
+            duration: Seconds to run before stopping
+        """
+        loop = asyncio.get_running_loop()
+        deadline = None if duration is None else loop.time() + duration
+        started = 0
+        pending: set = set()
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            while max_polls is None or started < max_polls:
+                idle = [s for s in self.states.values() if not s.in_flight]
+                if not idle or len(pending) >= self.max_concurrency:
+                    _, pending = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    continue
+
+                # Earliest deadline first; ties go to the least-polled ticker
+                state = min(idle, key=lambda s: (s.next_due, s.polls))
+                delay = state.next_due - loop.time()
+                if deadline is not None and loop.time() + max(delay, 0) >= deadline:
+                    break
+                if delay > 0:
+                    if pending:
+                        # A finishing poll may reschedule ahead of this one
+                        done, pending = await asyncio.wait(
+                            pending, timeout=delay, return_when=asyncio.FIRST_COMPLETED
+                        )
+                        if done:
+                            continue
+                    else:
+                        await asyncio.sleep(delay)
+
+                await self.budget.acquire(self.calls_per_poll)
+                state.in_flight = True
+                started += 1
+                pending.add(loop.create_task(self._poll(state, executor)))
+
+            if pending:
+                await asyncio.wait(pending)
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Polls made and current interval for each ticker."""
+        return [
+            {"ticker": s.ticker, "polls": s.polls, "interval": s.interval}
+            for s in self.states.values()
+        ]
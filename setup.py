@@ -31,6 +31,11 @@ setup(
     ],
     python_requires=">=3.8",
     install_requires=requirements,
+    extras_require={
+        # Parquet export (--format parquet) and Parquet input for --trades,
+        # --quotes and analyze-file
+        "parquet": ["pyarrow"],
+    },
     entry_points={
         "console_scripts": [
             "options-analyzer=options_flow_analyzer.cli:app",
@@ -0,0 +1,88 @@
+"""Tests for the incremental alert rule engine."""
+
+import io
+import json
+from datetime import datetime
+import pandas as pd
+from options_flow_analyzer.alerts import (
+    AlertEngine,
+    AlertPrinter,
+    AlertRule,
+    WebhookSink,
+    load_rules,
+)
+
+AS_OF = datetime(2024, 1, 2)
+
+
+def _chain():
+    return pd.DataFrame(
+        {
+            "expiration": ["2024-01-12", "2024-01-12", "2024-03-15", "2024-01-12"],
+            "strike": [100.0, 105.0, 100.0, 95.0],
+            "option_type": ["call", "call", "put", "put"],
+            "volume": [5000, 100, 8000, 3000],
+            "openInterest": [200, 1000, 100, 400],
+            "lastPrice": [3.0, 1.0, 4.0, 2.0],
+            "dollar_flow": [1.5e6, 1e4, 3.2e6, 6e5],
+            "trade_type": ["sweep", "retail", "sweep", "block"],
+        }
+    )
+
+
+def test_alerts_fire_on_changed_rows_once():
+    """Test that only new matches alert and unchanged rows are not evaluated."""
+    rule = AlertRule(
+        "short-dated sweep",
+        "premium > $1M and dte < 14 and vol_oi > 5 and trade_type == sweep",
+    )
+    engine = AlertEngine([rule, AlertRule("puts", "type == put and volume >= 3000")])
+
+    alerts = engine.evaluate(_chain(), "SPY", 100.0, AS_OF)
+    assert [(a["rule"], a["contract"]) for a in alerts] == [
+        ("short-dated sweep", "SPY240112C00100000"),
+        ("puts", "SPY240315P00100000"),
+        ("puts", "SPY240112P00095000"),
+    ]
+    assert engine.rows_evaluated == 4
+
+    # Still matching: no new alerts, and no row is evaluated again
+    assert engine.evaluate(_chain(), "SPY", 100.0, AS_OF) == []
+    assert engine.rows_evaluated == 4
+
+    changed = _chain()
+    changed.loc[3, ["volume", "dollar_flow", "trade_type"]] = [9000, 1.8e6, "sweep"]
+    changed.loc[0, "volume"] = 1000
+    alerts = engine.evaluate(changed, "SPY", 100.0, AS_OF)
+    assert [(a["rule"], a["contract"]) for a in alerts] == [
+        ("short-dated sweep", "SPY240112P00095000")
+    ]
+    assert engine.rows_evaluated == 6
+
+    # A delta that stops a match and another that restarts it re-arms the alert
+    stopped = changed.iloc[[3]].assign(dollar_flow=1e5)
+    assert engine.evaluate(stopped, "SPY", 100.0, AS_OF, partial=True) == []
+    restarted = engine.evaluate(changed.iloc[[3]], "SPY", 100.0, AS_OF, partial=True)
+    assert [a["rule"] for a in restarted] == ["short-dated sweep"]
+    assert engine.evaluate(changed, "SPY", 100.0, AS_OF) == []
+
+
+def test_sinks_rules_file_and_cooldown(tmp_path):
+    """Test rules loaded from JSON, sink output and cooldown suppression."""
+    path = tmp_path / "rules.json"
+    path.write_text(
+        json.dumps([{"name": "big", "when": "premium >= $1M", "cooldown": 3600}])
+    )
+    stream = io.StringIO()
+    webhook = WebhookSink("http://localhost/hook", spool=str(tmp_path / "spool"))
+    engine = AlertEngine(load_rules(str(path)), [AlertPrinter(stream), webhook])
+
+    engine.evaluate(_chain(), "SPY", as_of=AS_OF)
+    assert stream.getvalue().count("ALERT big") == 2
+    assert webhook.sent[0]["body"]["contract"] == "SPY240112C00100000"
+    assert len((tmp_path / "spool").read_text().splitlines()) == 2
+
+    # Stop and restart matching within the cooldown: suppressed
+    engine.evaluate(_chain().assign(dollar_flow=0.0), "SPY", as_of=AS_OF)
+    assert engine.evaluate(_chain(), "SPY", as_of=AS_OF) == []
+    assert engine.alerts_sent == 2
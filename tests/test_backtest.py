@@ -0,0 +1,50 @@
+"""Tests for the snapshot replay backtest."""
+
+import numpy as np
+import pandas as pd
+from options_flow_analyzer.backtest import SIGNALS, BacktestEngine
+from options_flow_analyzer.snapshot import write_snapshot
+
+
+def _archive(root):
+    chain = pd.DataFrame(
+        {
+            "strike": [95.0, 100.0, 105.0, 100.0],
+            "expiration": ["2024-01-19"] * 4,
+            "option_type": ["call", "call", "put", "put"],
+            "volume": [500, 300, 100, 50],
+            "openInterest": [100, 1000, 1000, 20],
+            "lastPrice": [6.0, 2.5, 6.0, 2.0],
+        }
+    )
+    chain["dollar_flow"] = chain["volume"] * chain["lastPrice"] * 100
+    spots = {"AAA": [100.0, 102.0, 101.0], "BBB": [50.0, 49.0, 51.0]}
+    for day_index, day in enumerate(["2024-01-02", "2024-01-03", "2024-01-04"]):
+        (root / day).mkdir()
+        for ticker, prices in spots.items():
+            write_snapshot(chain, str(root / day / f"{ticker}.ofs"), prices[day_index])
+
+
+def test_forward_returns_and_summary(tmp_path):
+    """Test that signals are joined to later spots for each ticker."""
+    _archive(tmp_path)
+    results = BacktestEngine(str(tmp_path), horizons=[1], workers=1).run()
+
+    signals = results["signals"].set_index(["ticker", "date"])
+    assert np.isclose(signals.loc[("AAA", "2024-01-02"), "return_1"], 0.02)
+    assert np.isclose(signals.loc[("BBB", "2024-01-03"), "return_1"], 51 / 49 - 1)
+    assert pd.isna(signals.loc[("AAA", "2024-01-04"), "return_1"])
+
+    # Every chain is call-heavy, so bullish_sentiment is long each time
+    summary = results["summary"].set_index("signal")
+    assert set(summary.index) == set(SIGNALS)
+    assert summary.loc["bullish_sentiment", "count"] == 4
+    assert summary.loc["bullish_sentiment", "hit_rate"] == 0.5
+
+
+def test_process_pool_matches_in_process(tmp_path):
+    """Test that spreading days over workers gives the same result."""
+    _archive(tmp_path)
+    serial = BacktestEngine(str(tmp_path), horizons=[1, 2], workers=1).run()
+    pooled = BacktestEngine(str(tmp_path), horizons=[1, 2], workers=2).run()
+    pd.testing.assert_frame_equal(serial["summary"], pooled["summary"])
@@ -0,0 +1,40 @@
+"""Smoke test for the benchmark suite."""
+
+import json
+import os
+import subprocess
+import sys
+
+SUITE = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "benchmarks", "suite.py"
+)
+
+
+def test_suite_saves_and_compares_baseline(tmp_path):
+    """Test that a small run saves a baseline and fails on a regression."""
+    baseline = tmp_path / "baseline.json"
+    args = [sys.executable, SUITE, "--sizes", "1000", "--repeat", "1"]
+
+    subprocess.run(args + ["--save", str(baseline)], check=True, capture_output=True)
+    results = json.loads(baseline.read_text())
+    assert "analyzer.analyze_chain[1000]" in results
+    assert "display.render_top_sweeps[1000]" in results
+
+    # Shrink one case's baseline so the next run looks like a regression
+    results["analyzer.find_max_pain[1000]"]["seconds"] = 1e-9
+    baseline.write_text(json.dumps(results))
+    run = subprocess.run(
+        args + ["--only", "analyzer.find_max_pain", "--compare", str(baseline)],
+        capture_output=True,
+        text=True,
+    )
+    assert run.returncode == 1
+    assert "REGRESSION analyzer.find_max_pain[1000] seconds" in run.stderr
+
+    missing = subprocess.run(
+        args + ["--compare", str(tmp_path / "missing.json")],
+        capture_output=True,
+        text=True,
+    )
+    assert missing.returncode == 2
+    assert "Save one on this machine first" in missing.stderr
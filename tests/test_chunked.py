@@ -0,0 +1,60 @@
+"""Tests for out-of-core chunked analysis."""
+
+import numpy as np
+import pandas as pd
+from options_flow_analyzer.analyzer import OptionsAnalyzer
+from options_flow_analyzer.chunked import ChunkedAnalyzer
+
+
+def _chain(rows=120, seed=7):
+    rng = np.random.default_rng(seed)
+    volume = rng.integers(0, 500, rows)
+    last_price = rng.uniform(0.5, 10.0, rows).round(2)
+    return pd.DataFrame(
+        {
+            "strike": rng.choice(np.arange(80.0, 121.0, 5.0), rows),
+            "expiration": rng.choice(["2024-01-19", "2024-02-16"], rows),
+            "option_type": rng.choice(["call", "put"], rows),
+            "volume": volume,
+            "openInterest": rng.integers(0, 400, rows),
+            "lastPrice": last_price,
+            "dollar_flow": volume * last_price * 100,
+        }
+    )
+
+
+def test_chunked_results_match_in_memory(tmp_path):
+    """Test that streaming a CSV in small chunks gives the in-memory results."""
+    df = _chain()
+    path = tmp_path / "chain.csv"
+    df.to_csv(path, index=False)
+
+    analyzer = OptionsAnalyzer()
+    results = ChunkedAnalyzer().analyze_file(
+        str(path), 100.0, chunk_size=17, unusual_limit=None
+    )
+
+    assert results["flow_summary"] == analyzer.calculate_flow_summary(df)
+    pd.testing.assert_frame_equal(
+        results["strike_analysis"], analyzer.analyze_strike_distribution(df, 100.0)
+    )
+    max_pain_strike, max_pain_df = analyzer.find_max_pain(df)
+    assert results["max_pain_strike"] == max_pain_strike
+    pd.testing.assert_frame_equal(results["max_pain"], max_pain_df)
+    pd.testing.assert_frame_equal(
+        results["expiration_analysis"], analyzer.analyze_expiration_flow(df)
+    )
+    pd.testing.assert_frame_equal(
+        results["unusual_activity"], analyzer.identify_unusual_activity(df)
+    )
+
+
+def test_chunked_unusual_limit_keeps_top_rows():
+    """Test that bounding unusual activity keeps the in-memory top rows."""
+    df = _chain(seed=11)
+    chunks = [df.iloc[i : i + 25] for i in range(0, len(df), 25)]
+
+    results = ChunkedAnalyzer().analyze_chunks(chunks, 100.0, unusual_limit=5)
+
+    expected = OptionsAnalyzer().identify_unusual_activity(df).head(5)
+    pd.testing.assert_frame_equal(results["unusual_activity"], expected)
@@ -0,0 +1,77 @@
+"""Tests for CLI startup behaviour."""
+
+import subprocess
+import sys
+
+
+def test_cli_import_is_lightweight():
+    """Test that importing the CLI does not load pandas, yfinance or rich."""
+    code = (
+        "import sys, options_flow_analyzer.cli; "
+        "print(sorted({'pandas', 'yfinance', 'rich'} & set(sys.modules)))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "[]"
+
+
+def test_config_reads_environment_on_access(monkeypatch):
+    """Test that API keys are read from the environment when accessed."""
+    from options_flow_analyzer.config import Config
+
+    monkeypatch.setenv("POLYGON_API_KEY", "test-key")
+    assert Config.POLYGON_API_KEY == "test-key"
+    assert Config().POLYGON_API_KEY == "test-key"
+
+
+def test_snapshot_runs_use_the_saved_spot(tmp_path):
+    """Test that demo prices a snapshot at its spot and analyze checks its ticker."""
+    import json
+
+    import pandas as pd
+    from typer.testing import CliRunner
+
+    from options_flow_analyzer.cli import app
+    from options_flow_analyzer.snapshot import write_snapshot
+
+    chain = pd.DataFrame(
+        {
+            "strike": [240.0, 250.0],
+            "expiration": ["2024-01-19", "2024-01-19"],
+            "option_type": ["call", "put"],
+            "volume": [500, 300],
+            "openInterest": [1000, 800],
+            "lastPrice": [4.0, 3.5],
+            "dollar_flow": [200000.0, 105000.0],
+        }
+    )
+    path = str(tmp_path / "AAPL.ofs")
+    write_snapshot(chain, path, spot=245.0, ticker="AAPL")
+    runner = CliRunner()
+
+    result = runner.invoke(app, ["demo", "--snapshot", path, "--format", "json"])
+    assert result.exit_code == 0, result.output
+    ticker_info = json.loads(result.stdout)["ticker_info"]
+    assert ticker_info["symbol"] == "AAPL"
+    assert ticker_info["current_price"] == 245.0
+
+    result = runner.invoke(app, ["analyze", "SPY", "--snapshot", path])
+    assert result.exit_code == 2
+    assert "not SPY" in result.output
+
+
+def test_trades_without_quotes_are_rejected(tmp_path):
+    """Test that prints lacking bid/ask need --quotes before anything is fetched."""
+    from typer.testing import CliRunner
+
+    from options_flow_analyzer.cli import app
+
+    prints = tmp_path / "prints.csv"
+    prints.write_text(
+        "expiration,strike,option_type,timestamp,price,size\n"
+        "2024-01-19,100.0,call,1,2.0,10\n"
+    )
+    result = CliRunner().invoke(app, ["analyze", "SPY", "--trades", str(prints)])
+    assert result.exit_code == 2
+    assert "--quotes" in result.output
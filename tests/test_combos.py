@@ -0,0 +1,72 @@
+"""Tests for multi-leg combo detection and combo-adjusted flow."""
+
+import pandas as pd
+from options_flow_analyzer.analyzer import OptionsAnalyzer
+from options_flow_analyzer.combos import ComboDetector
+from options_flow_analyzer.memo import ResultCache
+
+
+def _chain():
+    return pd.DataFrame(
+        {
+            "expiration": ["2024-01-19"] * 5 + ["2024-02-16"],
+            "strike": [100.0, 100.0, 95.0, 110.0, 120.0, 100.0],
+            "option_type": ["call", "put", "put", "call", "call", "call"],
+            "volume": [500, 500, 300, 40, 40, 300],
+            "openInterest": [1000] * 6,
+            "lastPrice": [2.0, 1.8, 1.0, 0.5, 0.2, 3.0],
+            "dollar_flow": [100000.0, 90000.0, 30000.0, 2000.0, 800.0, 90000.0],
+        }
+    )
+
+
+def test_chain_combos_and_adjusted_flow():
+    """Test that matching volumes within an expiry pair into combos."""
+    detector = ComboDetector(min_size=10)
+    legs = detector.detect_chain(_chain())
+
+    # The 300-lot put and call are in different expiries, so don't pair
+    assert sorted(legs["row"]) == [0, 1, 3, 4]
+    summary = detector.summarize(legs).set_index("combo_type")
+    assert list(summary.index) == ["straddle", "vertical"]
+    assert summary.loc["straddle", "contracts"] == 1000
+
+    analyzer = OptionsAnalyzer(memo=ResultCache(max_entries=0))
+    results = analyzer.analyze_combos(_chain())
+    adjusted = results["combo_adjusted_flow"]
+    assert adjusted["total_call_volume"] == 300
+    assert adjusted["total_put_volume"] == 300
+    assert adjusted["total_call_flow"] == 90000.0
+
+
+def test_trade_combos_use_timestamps_and_sides():
+    """Test that prints sharing a timestamp and size form combos by side."""
+    trades = pd.DataFrame(
+        {
+            "timestamp": [1, 1, 2, 2, 3, 3, 3, 4, 5],
+            "expiration": ["2024-01-19"] * 9,
+            "strike": [100.0, 110.0, 95.0, 105.0, 90.0, 100.0, 110.0, 100.0, 110.0],
+            "option_type": ["call"] * 2 + ["put", "call"] + ["call"] * 5,
+            "price": [2.0, 0.9, 1.1, 0.9, 5.0, 2.0, 1.0, 2.0, 1.0],
+            "size": [20, 20, 15, 15, 10, 10, 10, 50, 50],
+            "bid": [1.9, 0.9, 0.9, 0.9, 4.9, 1.9, 0.9, 1.9, 0.9],
+            "ask": [2.0, 1.0, 1.1, 1.1, 5.1, 2.1, 1.1, 2.1, 1.1],
+        }
+    )
+    legs = ComboDetector(min_size=10).detect_trades(trades)
+
+    by_combo = legs.groupby("combo_id")["combo_type"].agg(["first", "size"])
+    assert sorted(map(tuple, by_combo.to_numpy())) == [
+        ("multi_leg", 3),
+        ("risk_reversal", 2),
+        ("vertical", 2),
+    ]
+    vertical = legs[legs["combo_type"] == "vertical"]
+    assert list(vertical["side"]) == ["buy", "sell"]
+    # Same size at different times is not a combo
+    assert not legs["row"].isin([7, 8]).any()
+
+    chain = _chain()
+    adjusted = ComboDetector().adjust_chain(chain, legs, trades=trades)
+    assert adjusted.loc[0, "combo_volume"] == 30
+    assert adjusted.loc[0, "volume"] == 470
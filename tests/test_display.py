@@ -0,0 +1,37 @@
+"""Tests for table rendering."""
+
+import pandas as pd
+from options_flow_analyzer.display import OptionsDisplay
+
+
+def test_render_max_pain_formats_visible_rows_only():
+    """Test that tables are built from the head rows with integer formatting."""
+    max_pain_df = pd.DataFrame(
+        {
+            "strike": [100.0, 105.0, 110.0],
+            "openInterest": [8769, 5000, 100],
+            "volume": [1596, 20, 3],
+        }
+    )
+
+    table = OptionsDisplay().render_max_pain(max_pain_df, max_rows=2)
+
+    assert table.row_count == 2
+    assert list(table.columns[0].cells) == ["$100", "$105"]
+    assert list(table.columns[1].cells) == ["8,769", "5,000"]
+
+
+def test_float_counts_render_as_whole_numbers():
+    """Test that float, large and missing counts format without decimals."""
+    max_pain_df = pd.DataFrame(
+        {
+            "strike": [100.0, 105.0, 110.0, 115.0],
+            "openInterest": [1234.0, 12.5, None, 10.0**12],
+            "volume": [0, 999, 1000, 13.5],
+        }
+    )
+
+    table = OptionsDisplay().render_max_pain(max_pain_df)
+
+    assert list(table.columns[1].cells) == ["1,234", "12", "-", "1,000,000,000,000"]
+    assert list(table.columns[2].cells) == ["0", "999", "1,000", "14"]
@@ -0,0 +1,43 @@
+"""Tests for machine-readable result export."""
+
+import io
+import json
+import numpy as np
+import pandas as pd
+from options_flow_analyzer.export import write_results
+
+
+def _results():
+    return {
+        "flow_summary": {"net_volume": np.int64(-5), "put_call_ratio": np.nan},
+        "max_pain_strike": np.float64(100.0),
+        "max_pain": pd.DataFrame({"strike": [100.0, 105.0], "openInterest": [9, 3]}),
+    }
+
+
+def test_jsonl_writes_one_line_per_row():
+    """Test that JSON Lines output tags each row with its section."""
+    stream = io.StringIO()
+    write_results(_results(), "jsonl", stream=stream)
+
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert lines[0] == {
+        "section": "flow_summary",
+        "net_volume": -5,
+        "put_call_ratio": None,
+    }
+    assert lines[1] == {"section": "max_pain_strike", "value": 100.0}
+    assert [line["strike"] for line in lines[2:]] == [100.0, 105.0]
+
+
+def test_csv_writes_one_file_per_section(tmp_path):
+    """Test that CSV output writes each section to its own file."""
+    paths = write_results(_results(), "csv", str(tmp_path))
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "flow_summary.csv",
+        "max_pain.csv",
+        "max_pain_strike.csv",
+    ]
+    assert len(paths) == 3
+    assert pd.read_csv(tmp_path / "max_pain.csv")["openInterest"].tolist() == [9, 3]
@@ -0,0 +1,58 @@
+"""Tests for compiled filter expressions."""
+
+from datetime import datetime
+import pandas as pd
+import pytest
+from options_flow_analyzer.data_fetcher import OptionsDataFetcher
+from options_flow_analyzer.filter_expr import FilterError, compile_filter
+
+
+def _chain():
+    return pd.DataFrame(
+        {
+            "strike": [95.0, 100.0, 100.0, 105.0, 120.0],
+            "expiration": ["2024-01-05", "2024-01-05", "2024-01-19", "2024-02-16"]
+            + ["2024-02-16"],
+            "option_type": ["call", "call", "put", "put", "call"],
+            "volume": [100, 2500, 40, 300, 10],
+            "openInterest": [1000, 50, 400, 90, 0],
+            "lastPrice": [6.1, 2.5, 5.2, 2.2, 0.1],
+            "dollar_flow": [61000.0, 625000.0, 20800.0, 66000.0, 100.0],
+        }
+    )
+
+
+def test_filter_expression_mask():
+    """Test derived fields, ranges, sets and boolean combinations."""
+    df = _chain()
+    as_of = datetime(2024, 1, 2)
+
+    def rows(source, spot=100.0):
+        return list(compile_filter(source).indices(df, spot=spot, as_of=as_of))
+
+    assert rows("dte <= 14 and premium >= $50K") == [0, 1]
+    assert rows("vol_oi > 3 or type == puts") == [1, 2, 3, 4]
+    assert rows("moneyness in 0.95..1.05 and not expiration = 2024-01-05") == [2, 3]
+    assert rows("expiration in [2024-01-19, 2024-02-16] and strike not in [120]") == [
+        2,
+        3,
+    ]
+    assert rows("abs_delta >= 0.5 and type == call") == [0, 1]
+    assert rows("(volume > 1k or oi >= 1K) and price < 3") == [1]
+
+    filtered = OptionsDataFetcher().filter_options_data(
+        df, min_volume=50, where="option_type == call", spot=100.0
+    )
+    assert list(filtered["strike"]) == [95.0, 100.0]
+
+
+def test_filter_expression_errors():
+    """Test that malformed expressions and unknown fields raise FilterError."""
+    for source in ["", "volume >", "volume > 1 2", "(volume > 1", "dte ! 3"]:
+        with pytest.raises(FilterError):
+            compile_filter(source)
+    with pytest.raises(FilterError, match="Unknown filter field"):
+        compile_filter("gamma > 1").mask(_chain())
+    with pytest.raises(FilterError):
+        compile_filter("type > call").mask(_chain())
+    assert not compile_filter("volume > 0").mask(_chain().iloc[:0]).any()
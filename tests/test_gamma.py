@@ -0,0 +1,79 @@
+"""Tests for the dealer gamma profile."""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from options_flow_analyzer.analyzer import OptionsAnalyzer
+from options_flow_analyzer.gamma import GammaProfile
+from options_flow_analyzer.greeks import black_scholes, contract_arrays
+
+AS_OF = datetime(2024, 1, 2, 10, 0)
+
+
+def _chain():
+    # Heavy put open interest below spot, call open interest above it
+    return pd.DataFrame(
+        {
+            "strike": [90.0, 95.0, 100.0, 100.0, 105.0, 110.0],
+            "expiration": ["2024-01-19"] * 4 + ["2024-02-16"] * 2,
+            "option_type": ["put", "put", "call", "put", "call", "call"],
+            "openInterest": [5000, 4000, 1500, 1500, 3000, 2000],
+            "impliedVolatility": [0.30, 0.28, 0.25, 0.25, 0.22, 0.21],
+        }
+    )
+
+
+def test_curve_and_flip_match_black_scholes():
+    """Test the curve against summed Black-Scholes gamma and its roots."""
+    chain = _chain()
+    profile = GammaProfile(chain, 100.0, as_of=AS_OF)
+    c = contract_arrays(chain, as_of=AS_OF)
+    shares = np.where(c["is_call"], 1.0, -1.0) * c["open_interest"] * 100
+
+    spots = np.array([88.0, 97.0, 104.0])
+    expected = [
+        black_scholes(s, c["strike"], c["years"], c["iv"], c["is_call"])["gamma"]
+        @ shares
+        * s**2
+        * 0.01
+        for s in spots
+    ]
+    assert np.allclose(profile.curve(spots), expected, rtol=1e-9)
+
+    flips = profile.flip_levels(spot_range=0.20)
+    assert flips
+    dense = np.linspace(80.0, 120.0, 40001)
+    values = profile.curve(dense)
+    brute = dense[np.flatnonzero(np.sign(values[:-1]) != np.sign(values[1:]))]
+    assert np.allclose(flips, brute, atol=2e-3)
+
+
+def test_analyze_gamma_levels():
+    """Test walls, expiry contributions and the headline levels."""
+    chain = _chain()
+    # analyze_gamma_levels values the chain as of now
+    today = pd.Timestamp.now().normalize()
+    chain["expiration"] = [today + pd.Timedelta(days=14)] * 4 + [
+        today + pd.Timedelta(days=45)
+    ] * 2
+    results = OptionsAnalyzer().analyze_gamma_levels(chain, 100.0, top=2)
+    levels = results["gamma_levels"]
+    walls = results["gamma_walls"]
+    by_expiration = results["gamma_by_expiration"]
+
+    assert list(walls["option_type"]) == ["call", "call", "put", "put"]
+    assert (walls["gamma_exposure"][walls["option_type"] == "call"] > 0).all()
+    assert (walls["gamma_exposure"][walls["option_type"] == "put"] < 0).all()
+    assert levels["call_wall"] == walls["strike"].iloc[0]
+    assert levels["put_wall"] == walls["strike"].iloc[2]
+
+    assert len(by_expiration) == 2
+    assert np.isclose(by_expiration["net_gamma"].sum(), levels["total_gamma"])
+    assert np.isclose(by_expiration["gross_share"].sum(), 1.0)
+    assert levels["regime"] == (
+        "positive" if levels["total_gamma"] >= 0 else "negative"
+    )
+    if levels["flip_level"] is not None:
+        nearest = min(levels["flip_levels"], key=lambda level: abs(level - 100.0))
+        assert levels["flip_level"] == nearest
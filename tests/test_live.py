@@ -0,0 +1,55 @@
+"""Tests for the live dashboard."""
+
+import io
+import pandas as pd
+from rich.console import Console
+from options_flow_analyzer.display import OptionsDisplay
+from options_flow_analyzer.live import LIVE_PANELS, LiveDashboard
+
+
+def _chain(call_volume):
+    return pd.DataFrame(
+        {
+            "strike": [95.0, 100.0, 105.0],
+            "expiration": ["2024-01-19", "2024-01-19", "2024-02-16"],
+            "option_type": ["call", "put", "put"],
+            "volume": [call_volume, 40, 300],
+            "openInterest": [1000, 400, 90],
+            "lastPrice": [6.1, 5.2, 2.2],
+            "dollar_flow": [call_volume * 610.0, 20800.0, 66000.0],
+        }
+    )
+
+
+def _dashboard(volumes):
+    display = OptionsDisplay()
+    display.console = Console(file=io.StringIO(), width=120)
+    chains = iter(volumes)
+    return LiveDashboard(
+        "TEST",
+        lambda ticker: (_chain(next(chains)), 100.0),
+        interval=0,
+        max_fps=0,
+        display=display,
+    )
+
+
+def test_update_rebuilds_only_changed_panels():
+    """Test that unchanged data does not rebuild any panel."""
+    dashboard = _dashboard([100, 100, 120])
+
+    assert dashboard.update() == LIVE_PANELS
+    assert dashboard.update() == []
+    changed = dashboard.update()
+    assert "flow_summary" in changed
+    assert "max_pain" in changed
+
+
+def test_run_draws_frames_only_on_change():
+    """Test that the run loop skips frames when nothing changed."""
+    dashboard = _dashboard([100, 100, 100])
+
+    dashboard.run(iterations=3)
+
+    assert dashboard.refreshes == 3
+    assert dashboard.frames == 1
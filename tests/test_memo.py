@@ -0,0 +1,88 @@
+"""Tests for content-addressed memoization of analyzer results."""
+
+import pandas as pd
+import pytest
+from options_flow_analyzer import memo
+from options_flow_analyzer.analyzer import OptionsAnalyzer
+from options_flow_analyzer.memo import ResultCache, frame_fingerprint
+
+
+def _chain():
+    return pd.DataFrame(
+        {
+            "strike": [95.0, 100.0, 100.0, 105.0],
+            "expiration": ["2024-01-19", "2024-01-19", "2024-01-19", "2024-02-16"],
+            "option_type": ["call", "call", "put", "put"],
+            "volume": [100, 250, 40, 300],
+            "openInterest": [1000, 50, 400, 90],
+            "lastPrice": [6.1, 2.5, 5.2, 2.2],
+            "dollar_flow": [61000.0, 62500.0, 20800.0, 66000.0],
+        }
+    )
+
+
+def test_memoized_analyses_hit_and_evict():
+    """Test that equal chains hit, changed chains miss and results are copies."""
+    analyzer = OptionsAnalyzer(memo=ResultCache(max_entries=2))
+    first = analyzer.calculate_flow_summary(_chain())
+    first["net_volume"] = -1
+    second = analyzer.calculate_flow_summary(_chain())
+    assert second["net_volume"] != -1
+    assert analyzer.memo.stats()["hits"] == 1
+
+    changed = _chain()
+    changed.loc[0, "volume"] = 101
+    assert frame_fingerprint(changed) != frame_fingerprint(_chain())
+    assert analyzer.calculate_flow_summary(changed) != second
+
+    results, classified = analyzer.analyze_chain(_chain(), 100.0, detect_sweeps=True)
+    again, _ = analyzer.analyze_chain(_chain(), 100.0, detect_sweeps=True)
+    pd.testing.assert_frame_equal(results["strike_analysis"], again["strike_analysis"])
+    stats = analyzer.memo.stats()
+    assert stats["entries"] == 2 and stats["evictions"] == 1
+    assert stats["hits"] == 2 and stats["misses"] == 3
+
+
+def test_results_persist_on_disk(tmp_path, monkeypatch):
+    """Test that stored results are reused until the package source changes."""
+    path = str(tmp_path / "memo")
+    expected = OptionsAnalyzer(memo=ResultCache(path=path)).find_max_pain(_chain())
+
+    cache = ResultCache(path=path)
+    strike, table = OptionsAnalyzer(memo=cache).find_max_pain(_chain())
+    assert cache.stats()["disk_hits"] == 1
+    assert strike == expected[0]
+    pd.testing.assert_frame_equal(table, expected[1])
+
+    disabled = OptionsAnalyzer(memo=ResultCache(max_entries=0))
+    disabled.find_max_pain(_chain())
+    assert disabled.memo.stats()["misses"] == 0
+
+    # Edited source: the same call no longer finds the stored result
+    source = tmp_path / "src"
+    source.mkdir()
+    (source / "analyzer.py").write_text("# edited")
+    monkeypatch.setattr(memo, "_PACKAGE_DIR", str(source))
+    memo._key_salt.cache_clear()
+    try:
+        stale = ResultCache(path=path)
+        OptionsAnalyzer(memo=stale).find_max_pain(_chain())
+        assert stale.stats()["disk_hits"] == 0
+    finally:
+        memo._key_salt.cache_clear()
+
+
+def test_shared_directories_are_refused(tmp_path):
+    """Test that the cache is private and refuses directories others can write."""
+    path = tmp_path / "memo"
+    OptionsAnalyzer(memo=ResultCache(path=str(path))).find_max_pain(_chain())
+    assert path.stat().st_mode & 0o777 == 0o700
+
+    shared = tmp_path / "shared"
+    shared.mkdir()
+    shared.chmod(0o777)
+    with pytest.raises(PermissionError, match="Refusing"):
+        ResultCache(path=str(shared)).get("key")
+
+    # Analyzers memoize only into a cache they are given
+    assert not OptionsAnalyzer().memo.enabled
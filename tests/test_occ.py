@@ -0,0 +1,59 @@
+"""Tests for the vectorized OCC symbol codec."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from options_flow_analyzer.occ import encode_occ, normalize_occ, occ_frame, parse_occ
+
+
+def test_parse_and_encode_round_trip():
+    """Test that prefixed, padded and plain symbols parse and re-encode exactly."""
+    symbols = ["O:SPY251017C00500000", "AAPL  240119P00152500", "F240621C00012000"]
+    fields = parse_occ(symbols)
+
+    assert list(fields["underlying"]) == ["SPY", "AAPL", "F"]
+    assert list(fields["expiration"].astype(str)) == [
+        "2025-10-17",
+        "2024-01-19",
+        "2024-06-21",
+    ]
+    assert list(fields["option_type"]) == ["call", "put", "call"]
+    np.testing.assert_allclose(fields["strike"], [500.0, 152.5, 12.0])
+
+    assert list(normalize_occ(symbols)) == [
+        "SPY251017C00500000",
+        "AAPL240119P00152500",
+        "F240621C00012000",
+    ]
+    padded = encode_occ(
+        fields["underlying"],
+        fields["expiration"],
+        fields["option_type"],
+        fields["strike"],
+        padded=True,
+    )
+    assert padded[1] == symbols[1]
+    assert all(len(symbol) == 21 for symbol in padded)
+    prefixed = encode_occ("SPY", ["2025-10-17"], ["call"], [500.0], prefix="O:")
+    assert prefixed[0] == symbols[0]
+
+    frame = occ_frame(symbols)
+    assert frame["expiration"].iloc[0] == "2025-10-17"
+
+
+def test_parse_rejects_malformed_symbols():
+    """Test that symbols without a valid date, type or strike are rejected."""
+    with pytest.raises(ValueError, match="Not OCC option symbols"):
+        parse_occ(["SPY251017X00500000"])
+    # Month 13, February 31st and day 0 are not dates
+    for symbol in ["SPY251317C00500000", "SPY250231P00500000", "SPY251000C00500000"]:
+        with pytest.raises(ValueError):
+            parse_occ([symbol])
+    assert parse_occ(["SPY240229P00500000"])["expiration"][0] == np.datetime64(
+        "2024-02-29"
+    )
+    with pytest.raises(ValueError):
+        parse_occ(["SPY"])
+    with pytest.raises(ValueError):
+        parse_occ(["TOOLONGROOT251017C00500000"])
+    assert len(occ_frame(pd.Series([], dtype=object))) == 0
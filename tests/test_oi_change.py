@@ -0,0 +1,80 @@
+"""Tests for the day-over-day open interest change engine."""
+
+import numpy as np
+import pandas as pd
+from options_flow_analyzer.analyzer import OptionsAnalyzer
+from options_flow_analyzer.oi_change import (
+    OpenInterestChange,
+    estimate_opening_volume,
+    pack_contract_keys,
+)
+
+
+def _chains():
+    previous = pd.DataFrame(
+        {
+            "underlying_ticker": ["AAA", "AAA", "BBB", "BBB"],
+            "strike": [100.0, 100.0, 100.0, 52.5],
+            "expiration": ["2024-01-19", "2024-01-19", "2024-01-19", "2024-02-16"],
+            "option_type": ["call", "put", "call", "put"],
+            "openInterest": [1000, 500, 200, 50],
+        }
+    )
+    # Shuffled, one contract gone, one new listing, one unknown underlying
+    current = pd.DataFrame(
+        {
+            "underlying_ticker": ["BBB", "AAA", "CCC", "AAA", "BBB"],
+            "strike": [52.5, 100.0, 100.0, 105.0, 100.0],
+            "expiration": ["2024-02-16", "2024-01-19", "2024-01-19", "2024-01-19"]
+            + ["2024-01-19"],
+            "option_type": ["put", "call", "call", "call", "call"],
+            "volume": [30, 600, 10, 80, 100],
+            "openInterest": [70, 1400, 10, 80, 150],
+            "lastPrice": [1.0, 1.0, 1.0, 1.0, 1.0],
+            "dollar_flow": [3000.0, 60000.0, 1000.0, 8000.0, 10000.0],
+        }
+    )
+    return previous, current
+
+
+def test_join_matches_pandas_merge():
+    """Test the packed-key join against a pandas merge on the key columns."""
+    previous, current = _chains()
+    joined = OpenInterestChange(previous).join(current)
+
+    keys = ["underlying_ticker", "expiration", "option_type", "strike"]
+    expected = current.merge(
+        previous.rename(columns={"openInterest": "prev"}), on=keys, how="left"
+    )["prev"].fillna(0)
+    assert joined["prev_open_interest"].tolist() == expected.astype(int).tolist()
+    assert joined["oi_change"].tolist() == [20, 400, 10, 80, -50]
+
+    # Calls and puts at the same strike get different keys
+    assert len(set(pack_contract_keys(previous))) == len(previous)
+
+    opening = joined["opening_volume"] + joined["closing_volume"]
+    assert np.allclose(opening, current["volume"])
+    assert np.isnan(joined["volume_oi_change_ratio"]).sum() == 0
+    assert estimate_opening_volume(np.array([100]), np.array([-500]))[0] == 0
+
+
+def test_opening_flow_feeds_analyzer():
+    """Test that joined chains add opening flow and ΔOI tables."""
+    previous, current = _chains()
+    joined = OpenInterestChange(previous).join(current)
+    analyzer = OptionsAnalyzer()
+
+    summary = analyzer.calculate_flow_summary(joined)
+    assert np.isclose(
+        summary["opening_call_flow"],
+        joined.loc[joined["option_type"] == "call", "opening_flow"].sum(),
+    )
+    assert 0 < summary["opening_share"] <= 1
+
+    tables = analyzer.analyze_oi_change(joined)
+    by_expiration = tables["oi_change_by_expiration"]
+    assert "underlying_ticker" in by_expiration.columns
+    assert by_expiration["oi_change"].sum() == joined["oi_change"].sum()
+
+    unusual = analyzer.identify_unusual_activity(joined)
+    assert "opening_volume" in unusual.columns
@@ -0,0 +1,35 @@
+"""Tests for profiling spans."""
+
+from options_flow_analyzer import profiling
+from options_flow_analyzer.analyzer import OptionsAnalyzer
+from options_flow_analyzer.data_fetcher import OptionsDataFetcher
+from options_flow_analyzer.profiling import Profiler, span
+
+
+def test_spans_nest_under_profiler(tmp_path):
+    """Test that spans and decorated methods are recorded by path."""
+    chain = OptionsDataFetcher().get_sample_options_data("SPY")
+    with Profiler() as profiler:
+        with span("analysis"):
+            OptionsAnalyzer().analyze_chain(chain, 100.0, detect_sweeps=True)
+
+    paths = [row["path"] for row in profiler.report()]
+    assert paths[:3] == [
+        "analysis",
+        "analysis;analyze_chain",
+        "analysis;analyze_chain;detect_sweeps",
+    ]
+    assert all(row["wall_ms"] >= 0 and row["calls"] >= 1 for row in profiler.report())
+
+    folded = tmp_path / "profile.folded"
+    profiler.dump(str(folded))
+    assert "analysis;analyze_chain;detect_sweeps " in folded.read_text()
+
+
+def test_spans_are_noops_when_disabled():
+    """Test that spans outside a profiler record nothing."""
+    profiler = Profiler(memory=False)
+    with span("idle"):
+        pass
+    assert profiling._active is None
+    assert profiler.stats == {}
@@ -0,0 +1,45 @@
+"""Tests for universe ranking."""
+
+import pandas as pd
+from options_flow_analyzer.ranking import UniverseRanker, read_gex, write_gex
+
+
+def _chain(call_volume, put_volume):
+    return pd.DataFrame(
+        {
+            "strike": [100.0, 100.0],
+            "expiration": ["2024-01-19", "2024-01-19"],
+            "option_type": ["call", "put"],
+            "volume": [call_volume, put_volume],
+            "openInterest": [100, 100],
+            "lastPrice": [1.0, 1.0],
+            "dollar_flow": [call_volume * 100.0, put_volume * 100.0],
+        }
+    )
+
+
+def test_ranker_keeps_bounded_top_k():
+    """Test that only the top-K tickers per metric are retained, in order."""
+    ranker = UniverseRanker(top_k=2)
+    chains = {"AAA": (10, 0), "BBB": (0, 500), "CCC": (300, 0), "DDD": (50, 40)}
+
+    rankings = ranker.scan(chains, lambda ticker: (_chain(*chains[ticker]), 100.0))
+
+    assert ranker.tickers_processed == 4
+    net_premium = rankings["net_premium"]
+    assert list(net_premium["ticker"]) == ["BBB", "CCC"]
+    assert net_premium["net_premium"].iloc[0] == -50000.0
+    assert all(len(heap) <= 2 for heap in ranker._heaps.values())
+
+
+def test_ranker_gex_change_uses_previous_scan(tmp_path):
+    """Test that GEX change is ranked only for tickers with a saved value."""
+    path = str(tmp_path / "gex.json")
+    write_gex({"AAA": 0.0}, path)
+    ranker = UniverseRanker(top_k=5, previous_gex=read_gex(path))
+    ranker.add("AAA", _chain(10, 0), 100.0)
+    ranker.add("BBB", _chain(10, 0), 100.0)
+
+    gex_change = ranker.results()["gex_change"]
+    assert list(gex_change["ticker"]) == ["AAA"]
+    assert set(ranker.gex) == {"AAA", "BBB"}
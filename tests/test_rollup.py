@@ -0,0 +1,67 @@
+"""Tests for the hierarchical sector/ETF flow roll-up."""
+
+import numpy as np
+import pytest
+from options_flow_analyzer.rollup import FlowRollup, Taxonomy
+
+GROUPS = {
+    "Market": ["Technology", "Energy"],
+    "Technology": ["AAPL", "MSFT"],
+    "Energy": ["XOM"],
+    "QQQ holdings": {"AAPL": 0.5, "MSFT": 0.25},
+}
+
+
+def _totals(call_flow: float, put_flow: float) -> dict:
+    return {
+        "call_volume": 100,
+        "put_volume": 50,
+        "call_flow": call_flow,
+        "put_flow": put_flow,
+        "contracts": 10,
+    }
+
+
+def test_weighted_rollup_and_incremental_updates():
+    """Test that updates touch a ticker's path and match a full refresh."""
+    rollup = FlowRollup(Taxonomy(GROUPS))
+    assert rollup.taxonomy.groups == ["Market", "Technology", "Energy", "QQQ holdings"]
+    assert rollup.taxonomy.path("AAPL") == ["Market", "Technology", "QQQ holdings"]
+
+    rollup.update_many({"AAPL": _totals(1000.0, 200.0), "TSLA": _totals(1.0, 1.0)})
+    assert rollup.update("MSFT", _totals(400.0, 800.0)) == [
+        "Market",
+        "Technology",
+        "QQQ holdings",
+    ]
+    # A flow summary works as well as flow totals
+    rollup.update(
+        "XOM",
+        {
+            "total_call_volume": 10,
+            "total_put_volume": 30,
+            "total_call_flow": 50.0,
+            "total_put_flow": 150.0,
+            "total_contracts": 2,
+        },
+    )
+    rollup.update("AAPL", _totals(600.0, 200.0))
+
+    frame = rollup.frame().set_index("group")
+    assert frame.loc["Market", "net_dollar_flow"] == pytest.approx(-100.0)
+    assert frame.loc["Market", "tickers"] == 3
+    assert frame.loc["QQQ holdings", "net_dollar_flow"] == pytest.approx(100.0)
+    assert frame.loc["Energy", "put_call_ratio"] == pytest.approx(3.0)
+
+    incremental = rollup.totals.copy()
+    rollup.refresh()
+    np.testing.assert_allclose(rollup.totals, incremental)
+    technology = rollup.summary("Technology")
+    assert technology["total_call_flow"] == pytest.approx(1000.0)
+    assert technology["total_contracts"] == 20
+
+
+def test_taxonomy_rejects_cycles():
+    """Test that a group containing itself is rejected."""
+    with pytest.raises(ValueError, match="contains itself"):
+        Taxonomy({"A": ["B", "SPY"], "B": ["A"]})
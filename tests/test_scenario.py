@@ -0,0 +1,95 @@
+"""Tests for the Black-Scholes greeks and the scenario grid engine."""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from options_flow_analyzer.greeks import black_scholes, contract_arrays
+from options_flow_analyzer.scenario import ScenarioEngine
+
+AS_OF = datetime(2024, 1, 2, 10, 0)
+
+
+def _chain():
+    return pd.DataFrame(
+        {
+            "strike": [95.0, 100.0, 100.0, 105.0, 110.0],
+            "expiration": ["2024-01-19", "2024-01-19", "2024-01-19", "2024-02-16"]
+            + ["2024-03-15"],
+            "option_type": ["put", "call", "put", "call", "call"],
+            "openInterest": [800, 1200, 1500, 600, 300],
+            "impliedVolatility": [0.32, 0.25, 0.25, 0.0, 0.22],
+        }
+    )
+
+
+def test_greeks_match_finite_differences():
+    """Test that analytic delta, gamma and vanna agree with bumped prices."""
+    args = dict(strike=100.0, years=0.25, is_call=True)
+    base = black_scholes(101.0, iv=0.3, **args)
+    # Wide enough that the norm_cdf approximation error does not dominate
+    h = 0.05
+    up = black_scholes(101.0 + h, iv=0.3, **args)
+    down = black_scholes(101.0 - h, iv=0.3, **args)
+    assert np.isclose(base["delta"], (up["price"] - down["price"]) / (2 * h), rtol=1e-3)
+    assert np.isclose(base["gamma"], (up["delta"] - down["delta"]) / (2 * h), rtol=1e-3)
+    dv = 0.005
+    vol_up = black_scholes(101.0, iv=0.3 + dv, **args)
+    vol_down = black_scholes(101.0, iv=0.3 - dv, **args)
+    assert np.isclose(
+        base["vanna"], (vol_up["delta"] - vol_down["delta"]) / (2 * dv), rtol=1e-2
+    )
+
+
+def test_grid_matches_brute_force_repricing():
+    """Test the chunked grid against repricing every scenario one by one."""
+    chain = _chain()
+    engine = ScenarioEngine(chain, 100.0, rate=0.03, as_of=AS_OF)
+    spots = np.array([92.0, 100.0, 107.0])
+    iv_shifts = np.array([-0.05, 0.0, 0.08])
+    # max_bytes this small forces one contract per chunk
+    result = engine.grid(
+        spots=spots,
+        iv_shifts=iv_shifts,
+        time_shifts=[0.0, 5.0],
+        max_bytes=1,
+        dtype=np.float64,
+    )
+    fast = engine.grid(spots=spots, iv_shifts=iv_shifts, time_shifts=[0.0, 5.0])
+    assert result.surfaces["gamma"].shape == (2, 3, 3)
+
+    c = contract_arrays(chain, as_of=AS_OF)
+    assert c["iv"][3] == 0.30  # zero IV falls back to the default
+    shares = np.where(c["is_call"], 1.0, -1.0) * c["open_interest"] * 100
+    base = black_scholes(100.0, c["strike"], c["years"], c["iv"], c["is_call"], 0.03)
+    for t, days in enumerate([0.0, 5.0]):
+        for i, spot in enumerate(spots):
+            for j, shift in enumerate(iv_shifts):
+                g = black_scholes(
+                    spot,
+                    c["strike"],
+                    c["years"] - days / 365.0,
+                    c["iv"] + shift,
+                    c["is_call"],
+                    0.03,
+                )
+                expected = {
+                    "pnl": (g["price"] - base["price"]) @ shares,
+                    "delta": g["delta"] @ shares * spot,
+                    "gamma": g["gamma"] @ shares * spot**2 * 0.01,
+                    "vanna": g["vanna"] @ shares * spot * 0.01,
+                    "charm": g["charm"] @ shares * spot / 365.0,
+                }
+                for name, value in expected.items():
+                    assert np.isclose(
+                        result.surfaces[name][t, i, j], value, rtol=1e-9, atol=1e-6
+                    ), name
+
+    for name, surface in result.surfaces.items():
+        # float32 blocks: errors relative to the surface's scale
+        scale = np.abs(surface).max()
+        assert np.allclose(fast.surfaces[name], surface, rtol=0, atol=1e-5 * scale)
+
+    long_form = result.to_frame()
+    assert len(long_form) == 18
+    assert result.frame("pnl", 1).shape == (3, 3)
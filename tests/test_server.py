@@ -0,0 +1,108 @@
+"""Tests for the local analysis service."""
+
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import pandas as pd
+import pytest
+from options_flow_analyzer import cli
+from options_flow_analyzer.client import (
+    ServiceClient,
+    ServiceError,
+    ServiceUnavailable,
+)
+from options_flow_analyzer.config import Config
+from options_flow_analyzer.data_fetcher import OptionsDataFetcher
+from options_flow_analyzer.server import AnalysisService, create_server
+
+
+class _StaticFetcher(OptionsDataFetcher):
+    """Fetcher that serves a fixed chain and counts provider calls."""
+
+    calls = 0
+
+    def get_polygon_ticker_info(self, ticker):
+        return {"symbol": ticker, "current_price": 100.0}
+
+    def get_polygon_options_data(self, ticker, expiration=None):
+        self.calls += 1
+        return pd.DataFrame(
+            {
+                "strike": [95.0, 100.0, 105.0],
+                "expiration": ["2024-01-19", "2024-01-19", "2024-02-16"],
+                "option_type": ["call", "put", "put"],
+                "volume": [100, 40, 300],
+                "openInterest": [1000, 400, 90],
+                "lastPrice": [6.1, 5.2, 2.2],
+                "dollar_flow": [61000.0, 20800.0, 66000.0],
+            }
+        )
+
+
+@pytest.fixture
+def service_client():
+    fetcher = _StaticFetcher()
+    service = AnalysisService(cache_ttl=60, fetcher=fetcher)
+    server = create_server(service, "127.0.0.1", 0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield ServiceClient("127.0.0.1", server.server_address[1]), fetcher
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_repeated_analyze_is_served_from_cache(service_client):
+    """Test that a hot query is answered without refetching."""
+    client, fetcher = service_client
+    assert client.available()
+
+    first = client.request("analyze", {"ticker": "spy", "min_volume": 0})
+    second = client.request("analyze", {"ticker": "spy", "min_volume": 0})
+
+    assert first == second
+    assert fetcher.calls == 1
+    assert first["contracts_matched"] == 3
+    assert first["results"]["flow_summary"]["total_call_volume"] == 100
+    assert client.request("health")["hits"] == 1
+
+
+def test_bad_request_raises_service_error(service_client):
+    """Test that errors are returned with their status code."""
+    client, _ = service_client
+
+    with pytest.raises(ServiceError) as error:
+        client.request("analyze", {"min_volume": 0})
+    assert error.value.status == 400
+
+
+class _OtherHandler(BaseHTTPRequestHandler):
+    """An unrelated web server that answers every path with HTML."""
+
+    def do_GET(self):
+        self.send_response(200)
+        self.end_headers()
+        self.wfile.write(b"<html>not the analysis service</html>")
+
+    def log_message(self, format, *args):
+        pass
+
+
+def test_only_the_service_is_queried(service_client, monkeypatch):
+    """Test that other listeners are skipped and 404s warn like local runs."""
+    other = HTTPServer(("127.0.0.1", 0), _OtherHandler)
+    threading.Thread(target=other.serve_forever, daemon=True).start()
+    try:
+        client = ServiceClient("127.0.0.1", other.server_address[1])
+        assert not client.available()
+        with pytest.raises(ServiceUnavailable):
+            client.request("analyze", {"ticker": "SPY"})
+    finally:
+        other.shutdown()
+        other.server_close()
+
+    client, _ = service_client
+    monkeypatch.setattr(Config, "SERVER_PORT", client.port)
+    with pytest.raises(cli.typer.Exit) as exit:
+        cli._query_service("analyze", {"ticker": "SPY", "min_volume": 10**6})
+    assert exit.value.exit_code == 0
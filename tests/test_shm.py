@@ -0,0 +1,51 @@
+"""Tests for shared-memory chain handoff."""
+
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from options_flow_analyzer.analyzer import OptionsAnalyzer
+from options_flow_analyzer.shm import SharedChain, run_shared
+
+
+def _sample_chain():
+    return pd.DataFrame(
+        {
+            "strike": [95.0, 100.0, 105.0, 100.0],
+            "expiration": ["2024-01-19"] * 4,
+            "option_type": ["call", "call", "put", "put"],
+            "volume": [100, 250, 40, 300],
+            "openInterest": [1000, 50, 400, 90],
+            "lastPrice": [6.1, 2.5, 5.2, 2.2],
+            "dollar_flow": [61000.0, 62500.0, 20800.0, 66000.0],
+        }
+    )
+
+
+def test_shared_chain_round_trip_is_zero_copy():
+    """Test that attached frames view the shared block and match the source."""
+    df = _sample_chain()
+    with SharedChain.create(df) as owner:
+        attached = SharedChain.attach(owner.descriptor)
+        frame = attached.frame()
+
+        pd.testing.assert_frame_equal(frame, df, check_dtype=False)
+        view = frame["volume"].to_numpy()
+        assert not view.flags.writeable
+        assert np.shares_memory(view, np.frombuffer(attached._shm.buf, dtype=np.uint8))
+
+        del frame, view
+        attached.close()
+
+
+def test_run_shared_in_process_pool():
+    """Test that analyzer methods run in a worker against the shared chain."""
+    df = _sample_chain()
+    expected = OptionsAnalyzer().calculate_flow_summary(df)
+
+    with SharedChain.create(df) as chain:
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            result = pool.submit(
+                run_shared, chain.descriptor, "calculate_flow_summary"
+            ).result()
+
+    assert result == expected
@@ -0,0 +1,64 @@
+"""Tests for memory-mapped chain snapshots."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from options_flow_analyzer.snapshot import Snapshot, write_snapshot
+
+
+def _chain():
+    return pd.DataFrame(
+        {
+            "strike": [95.0, 100.0, 100.0, 105.0],
+            "expiration": ["2024-01-19", "2024-01-19", "2024-01-19", "2024-02-16"],
+            "option_type": ["call", "call", "put", "put"],
+            "volume": [100, 250, 40, 300],
+            "openInterest": [1000, 50, 400, 90],
+            "lastPrice": [6.1, 2.5, 5.2, 2.2],
+            "dollar_flow": [61000.0, 62500.0, 20800.0, 66000.0],
+        }
+    )
+
+
+def test_snapshot_round_trip(tmp_path):
+    """Test that a snapshot reloads the chain, spot price and contract keys."""
+    df = _chain()
+    path = str(tmp_path / "SPY.ofs")
+    write_snapshot(df, path, spot=101.5, ticker="SPY")
+
+    with Snapshot.open(path) as snapshot:
+        assert snapshot.rows == 4
+        assert snapshot.spot == 101.5
+        assert snapshot.ticker_info()["symbol"] == "SPY"
+
+        frame = snapshot.frame()
+        pd.testing.assert_frame_equal(frame.drop(columns="contract"), df)
+        assert frame["contract"].iloc[2] == "SPY240119P00100000"
+        assert frame["contract"].nunique() == 4
+
+        volume = snapshot.column("volume")
+        assert not volume.flags.writeable
+        del frame, volume
+
+    # Truncated files are rejected as non-snapshots
+    data = (tmp_path / "SPY.ofs").read_bytes()
+    for size in (10, 40):
+        broken = tmp_path / f"broken{size}.ofs"
+        broken.write_bytes(data[:size])
+        with pytest.raises(ValueError, match="not an options flow snapshot"):
+            Snapshot.open(str(broken))
+
+
+def test_snapshot_iter_chunks(tmp_path):
+    """Test that chunked reads cover every row once, in order."""
+    df = _chain()
+    path = str(tmp_path / "SPY.ofs")
+    write_snapshot(df, path, spot=100.0)
+
+    with Snapshot.open(path) as snapshot:
+        chunks = list(snapshot.iter_chunks(chunk_size=3, columns=["strike", "volume"]))
+
+    assert [len(chunk) for chunk in chunks] == [3, 1]
+    combined = pd.concat(chunks)
+    assert list(combined.columns) == ["strike", "volume"]
+    np.testing.assert_array_equal(combined["volume"], df["volume"])
@@ -0,0 +1,60 @@
+"""Tests for provider call telemetry."""
+
+import json
+from options_flow_analyzer import telemetry
+from options_flow_analyzer.data_fetcher import OptionsDataFetcher
+from options_flow_analyzer.telemetry import FetcherTelemetry
+
+
+class _Response:
+    def __init__(self, status_code, body=b"{}", headers=None):
+        self.status_code = status_code
+        self.content = body
+        self.headers = headers or {}
+
+
+class _Session:
+    def __init__(self, responses):
+        self.responses = list(responses)
+
+    def get(self, url, params=None):
+        return self.responses.pop(0)
+
+
+def test_http_get_retries_and_records(monkeypatch):
+    """Test that throttled responses are retried and every attempt is counted."""
+    waits = []
+    monkeypatch.setattr(telemetry.time, "sleep", waits.append)
+    fetcher = OptionsDataFetcher(telemetry=FetcherTelemetry())
+    fetcher.session = _Session(
+        [_Response(429, headers={"Retry-After": "3"}), _Response(200, b'{"ok": 1}')]
+    )
+
+    response = fetcher._http_get("https://example.test", {})
+
+    stats = fetcher.telemetry.snapshot()["providers"]["polygon"]
+    assert response.status_code == 200
+    assert waits == [3.0]
+    assert stats["requests"] == 2
+    assert stats["retries"] == 1
+    assert stats["errors"] == 1
+    assert stats["status_codes"] == {"429": 1, "200": 1}
+    assert stats["bytes"] == 11
+    assert stats["throttle_seconds"] == 3.0
+
+
+def test_write_text_and_json(tmp_path):
+    """Test both export formats."""
+    counters = FetcherTelemetry()
+    counters.record_request("polygon", 0.2, status=200, nbytes=100)
+    counters.record_cache("polygon", hit=True)
+
+    counters.write(str(tmp_path / "metrics.prom"))
+    text = (tmp_path / "metrics.prom").read_text()
+    assert 'options_flow_requests_total{provider="polygon"} 1' in text
+    assert 'options_flow_request_seconds_bucket{provider="polygon",le="0.25"} 1' in text
+
+    counters.write(str(tmp_path / "metrics.json"))
+    data = json.loads((tmp_path / "metrics.json").read_text())
+    assert data["providers"]["polygon"]["cache_hits"] == 1
+    assert data["providers"]["polygon"]["latency"]["p50"] == 0.25
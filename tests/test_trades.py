@@ -0,0 +1,152 @@
+"""Tests for trade-level sweep detection."""
+
+import pandas as pd
+from options_flow_analyzer.analyzer import OptionsAnalyzer
+from options_flow_analyzer.trades import TradeAnalyzer
+
+
+def _prints(rows):
+    return pd.DataFrame(
+        rows,
+        columns=[
+            "expiration",
+            "strike",
+            "option_type",
+            "timestamp",
+            "exchange",
+            "price",
+            "size",
+            "bid",
+            "ask",
+        ],
+    )
+
+
+def test_detect_sweeps_clusters_across_exchanges():
+    """Test that aggressive prints across exchanges within the window form a sweep."""
+    ms = 1_000_000
+    trades = _prints(
+        [
+            # Buy sweep across three exchanges within a few milliseconds
+            ["2024-01-19", 100.0, "call", 0, "CBOE", 2.10, 50, 2.00, 2.10],
+            ["2024-01-19", 100.0, "call", 3 * ms, "ISE", 2.10, 40, 2.00, 2.10],
+            ["2024-01-19", 100.0, "call", 7 * ms, "PHLX", 2.15, 30, 2.00, 2.10],
+            # Same contract, a second later: not part of the sweep
+            ["2024-01-19", 100.0, "call", 1000 * ms, "AMEX", 2.10, 10, 2.00, 2.10],
+            # Mid-market prints are never sweeps
+            ["2024-01-19", 95.0, "put", 0, "CBOE", 1.05, 100, 1.00, 1.10],
+            ["2024-01-19", 95.0, "put", 1 * ms, "ISE", 1.05, 100, 1.00, 1.10],
+            # Prints without a venue count toward size but not exchanges
+            ["2024-01-19", 105.0, "call", 0, "CBOE", 1.10, 20, 1.00, 1.10],
+            ["2024-01-19", 105.0, "call", 1 * ms, None, 1.10, 20, 1.00, 1.10],
+            ["2024-01-19", 105.0, "call", 2 * ms, " ", 1.10, 20, 1.00, 1.10],
+        ]
+    )
+
+    sweeps = TradeAnalyzer().detect_sweeps(trades, window_ms=50)
+
+    assert len(sweeps) == 1
+    sweep = sweeps.iloc[0]
+    assert sweep["side"] == "buy"
+    assert sweep["exchanges"] == 3
+    assert sweep["size"] == 120
+
+    venues = TradeAnalyzer().detect_sweeps(trades.iloc[6:], min_exchanges=1)
+    assert list(venues[["prints", "exchanges", "size"]].iloc[0]) == [3, 1, 60]
+    unknown = trades.iloc[7:].assign(exchange=None)
+    assert TradeAnalyzer().detect_sweeps(unknown, min_exchanges=1).empty
+
+
+def test_detect_sweeps_with_trades_relabels_chain():
+    """Test that trade-level sweeps drive the chain trade_type column."""
+    chain = pd.DataFrame(
+        {
+            "expiration": ["2024-01-19", "2024-01-19"],
+            "strike": [100.0, 105.0],
+            "option_type": ["call", "call"],
+            "volume": [120, 5000],
+            "openInterest": [1000, 100],
+            "dollar_flow": [25000.0, 900000.0],
+            "lastPrice": [2.1, 1.8],
+        }
+    )
+    trades = _prints(
+        [
+            ["2024-01-19", 100.0, "call", 0, "CBOE", 2.10, 60, 2.00, 2.10],
+            ["2024-01-19", 100.0, "call", 2_000_000, "ISE", 2.10, 60, 2.00, 2.10],
+        ]
+    )
+
+    result = OptionsAnalyzer().detect_sweeps(chain, trades=trades)
+
+    assert list(result["trade_type"]) == ["sweep", "block"]
+    assert result["sweep_confidence"].iloc[0] > 0
+    assert result["sweep_confidence"].iloc[1] == 0
+
+
+def test_classify_trade_side_quote_and_tick_rules():
+    """Test quote-rule classification with tick-rule fallback at the midpoint."""
+    trades = pd.DataFrame(
+        {
+            "expiration": ["2024-01-19"] * 4,
+            "strike": [100.0] * 4,
+            "option_type": ["call"] * 4,
+            "timestamp": [1, 2, 3, 4],
+            "price": [2.08, 2.02, 2.05, 2.05],
+            "size": [10, 10, 10, 10],
+        }
+    )
+    quotes = pd.DataFrame(
+        {
+            "expiration": ["2024-01-19"],
+            "strike": [100.0],
+            "option_type": ["call"],
+            "timestamp": [0],
+            "bid": [2.00],
+            "ask": [2.10],
+        }
+    )
+
+    trade_analyzer = TradeAnalyzer()
+    joined = trade_analyzer.attach_quotes(trades, quotes)
+    side = trade_analyzer.classify_trade_side(joined)
+
+    # Above mid, below mid, then two midpoint prints on an uptick
+    assert list(side) == [1, -1, 1, 1]
+
+
+def test_flow_summary_reports_signed_flow():
+    """Test that signed flow treats sold calls as bearish premium."""
+    chain = pd.DataFrame(
+        {
+            "expiration": ["2024-01-19", "2024-01-19"],
+            "strike": [100.0, 95.0],
+            "option_type": ["call", "put"],
+            "volume": [10, 10],
+            "openInterest": [100, 100],
+            "dollar_flow": [2000.0, 1000.0],
+            "lastPrice": [2.0, 1.0],
+        }
+    )
+    trades = pd.DataFrame(
+        {
+            "expiration": ["2024-01-19", "2024-01-19"],
+            "strike": [100.0, 95.0],
+            "option_type": ["call", "put"],
+            "timestamp": [1, 2],
+            "price": [2.0, 1.0],
+            "size": [10, 10],
+            "bid": [2.0, 0.9],
+            "ask": [2.2, 1.0],
+        }
+    )
+
+    analyzer = OptionsAnalyzer()
+    signed = analyzer.add_signed_flow(chain, trades)
+    summary = analyzer.calculate_flow_summary(signed)
+
+    # Calls sold at the bid, puts bought at the ask: both bearish
+    assert summary["call_sell_volume"] == 10
+    assert summary["put_buy_volume"] == 10
+    assert summary["signed_net_flow"] == -3000.0
+    assert not summary["signed_bullish_sentiment"]
@@ -0,0 +1,55 @@
+"""Tests for the watch scheduler."""
+
+import asyncio
+import pandas as pd
+from options_flow_analyzer.watch import TickerState, WatchScheduler
+
+
+def _chain(ticker):
+    return (
+        pd.DataFrame(
+            {
+                "strike": [95.0, 105.0],
+                "expiration": ["2024-01-19", "2024-01-19"],
+                "option_type": ["call", "put"],
+                "volume": [100, 300],
+                "openInterest": [1000, 90],
+                "lastPrice": [6.1, 2.2],
+                "dollar_flow": [61000.0, 66000.0],
+            }
+        ),
+        100.0,
+    )
+
+
+def test_budget_is_shared_fairly():
+    """Test that a tight budget is split evenly across due tickers."""
+    results = []
+    scheduler = WatchScheduler(
+        ["AAA", "BBB", "CCC"],
+        _chain,
+        results.append,
+        interval=0,
+        min_interval=0,
+        calls_per_minute=1200,
+    )
+
+    asyncio.run(scheduler.run(max_polls=9))
+
+    assert len(results) == 9
+    assert [state["polls"] for state in scheduler.summary()] == [3, 3, 3]
+
+
+def test_cadence_adapts_to_activity():
+    """Test that hot tickers speed up and quiet tickers slow down."""
+    results = []
+    scheduler = WatchScheduler(
+        ["AAA"], _chain, results.append, interval=60, min_interval=10, max_interval=600
+    )
+    state = TickerState("AAA", 60)
+
+    assert scheduler.next_interval(state, 1000.0) == 60
+    state.interval = 60
+    assert scheduler.next_interval(state, 2000.0) == 30
+    state.interval = 30
+    assert scheduler.next_interval(state, 2001.0) == 45